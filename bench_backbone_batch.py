@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from datavis.backbone import BACKBONE_SOURCE, BackboneEngine, DayRef, tick_input_arrays
+
+
+DAYREF = DayRef(
+    dayid=1,
+    brokerday=date(2026, 3, 2),
+    starttime=datetime(2026, 3, 1, 22, tzinfo=timezone.utc),
+    endtime=datetime(2026, 3, 2, 22, tzinfo=timezone.utc),
+)
+
+
+def make_tick_rows(count: int, seed: int = 17):
+    generator = random.Random(seed)
+    started = DAYREF.starttime + timedelta(minutes=1)
+    price = 2900.0
+    rows = []
+    for index in range(count):
+        price += generator.gauss(0.0, 0.12)
+        bid = Decimal(str(round(price, 2)))
+        rows.append(
+            {
+                "id": 1_000_000 + index,
+                "symbol": "XAUUSD",
+                "timestamp": started + timedelta(milliseconds=index * 400),
+                "bid": bid,
+                "ask": bid + Decimal("0.25"),
+                "mid": None,
+                "spread": None,
+            }
+        )
+    return rows
+
+
+def replay_streaming(rows, batch_size):
+    engine = BackboneEngine(symbol="XAUUSD", source=BACKBONE_SOURCE, input_kind="ticks")
+    engine.reset(DAYREF)
+    pivots, moves = [], []
+    for start in range(0, len(rows), batch_size):
+        batch_pivots, batch_moves = engine.process_rows(rows[start : start + batch_size])
+        pivots.extend(batch_pivots)
+        moves.extend(batch_moves)
+    return pivots, moves
+
+
+def replay_batch(rows):
+    engine = BackboneEngine(symbol="XAUUSD", source=BACKBONE_SOURCE, input_kind="ticks")
+    engine.reset(DAYREF)
+    return engine.process_batch(rows)
+
+
+def replay_columns(columns):
+    # The rebuild path: float8 columns straight from fetch_tick_columns_for_day.
+    engine = BackboneEngine(symbol="XAUUSD", source=BACKBONE_SOURCE, input_kind="ticks")
+    engine.reset(DAYREF)
+    return engine.process_arrays(tick_input_arrays(**columns, previous_spread=None))
+
+
+def best_of(repeat, func):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, (time.perf_counter() - started) * 1000.0)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the streaming and array backbone replays of one brokerday.")
+    parser.add_argument("--ticks", type=int, default=200000)
+    parser.add_argument("--batch-size", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = make_tick_rows(args.ticks)
+    streaming_ms, streamed = best_of(args.repeat, lambda: replay_streaming(rows, max(1, args.batch_size)))
+    batch_ms, batched = best_of(args.repeat, lambda: replay_batch(rows))
+    columns = {
+        "ids": [row["id"] for row in rows],
+        "timestamps": [row["timestamp"] for row in rows],
+        "bids": [float(row["bid"]) for row in rows],
+        "asks": [float(row["ask"]) for row in rows],
+        "mids": [None for _ in rows],
+        "spreads": [None for _ in rows],
+    }
+    columns_ms, columnar = best_of(args.repeat, lambda: replay_columns(columns))
+    assert streamed == batched == columnar, "batch replay diverged from the streaming engine"
+    print("ticks={0} pivots={1} moves={2}".format(len(rows), len(batched[0]), len(batched[1])))
+    for name, elapsed in (("streaming rows", streaming_ms), ("batch rows", batch_ms), ("batch columns", columns_ms)):
+        print("{0:<15} {1:9.2f} ms  x{2:.1f}".format(name, elapsed, streaming_ms / max(elapsed, 1e-9)))
+
+
+if __name__ == "__main__":
+    main()
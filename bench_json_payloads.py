@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+
+from datavis import app
+from datavis.fastjson import JSON_BACKEND, dumps, sse_event
+
+
+STARTED = datetime(2026, 3, 2, tzinfo=timezone.utc)
+
+
+def make_tick_rows(count: int):
+    rows = []
+    for index in range(count):
+        bid = Decimal("2900.00") + Decimal((index * 7) % 23) / 100
+        rows.append(
+            {
+                "id": 1_000_000 + index,
+                "symbol": "XAUUSD",
+                "timestamp": STARTED + timedelta(milliseconds=index * 137),
+                "bid": bid,
+                "ask": bid + Decimal("0.20"),
+                "mid": None,
+                "spread": None,
+            }
+        )
+    return rows
+
+
+def legacy_body(payload):
+    return json.dumps(jsonable_encoder(payload)).encode("utf-8")
+
+
+def legacy_sse(payload):
+    return "data: {0}\n\n".format(json.dumps(payload)).encode("utf-8")
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000.0)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the legacy and fast JSON paths on tick payloads.")
+    parser.add_argument("--ticks", type=int, default=10000)
+    parser.add_argument("--delta", type=int, default=250)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    rows = make_tick_rows(args.ticks)
+    bootstrap = {"rows": app.serialize_tick_rows(rows), "rowCount": len(rows), "lastId": rows[-1]["id"]}
+    deltas = [
+        {"rows": app.serialize_tick_rows(rows[start : start + args.delta]), "lastId": rows[start]["id"], "streamMode": "delta"}
+        for start in range(0, len(rows), args.delta)
+    ]
+    assert json.loads(legacy_body(bootstrap)) == json.loads(dumps(bootstrap))
+
+    cases = [
+        ("row serialization", lambda: app.serialize_tick_rows(rows), None),
+        ("bootstrap body", lambda: legacy_body(bootstrap), lambda: dumps(bootstrap)),
+        ("sse deltas", lambda: [legacy_sse(delta) for delta in deltas], lambda: [sse_event(delta) for delta in deltas]),
+    ]
+    print("backend={0} ticks={1} delta={2}".format(JSON_BACKEND, args.ticks, args.delta))
+    for name, legacy, fast in cases:
+        legacy_ms = best_of(args.repeat, legacy)
+        if fast is None:
+            print("{0:<18} {1:9.2f} ms".format(name, legacy_ms))
+            continue
+        fast_ms = best_of(args.repeat, fast)
+        print("{0:<18} legacy {1:9.2f} ms  fast {2:9.2f} ms  x{3:.1f}".format(name, legacy_ms, fast_ms, legacy_ms / max(fast_ms, 1e-9)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import time
+from collections import deque
+
+from datavis.backbone import RollingPercentileWindow
+
+
+class LegacyRollingPercentileWindow:
+    """The previous sorted-list implementation, kept here as the benchmark baseline."""
+
+    def __init__(self, *, window: int, quantile: float, min_periods: int) -> None:
+        self.window = max(1, int(window))
+        self.quantile = max(0.0, min(1.0, float(quantile)))
+        self.min_periods = max(1, int(min_periods))
+        self.values = deque()
+        self.sorted_values = []
+
+    def add(self, value):
+        numeric = float(value)
+        if len(self.values) >= self.window:
+            removed = self.values.popleft()
+            removed_index = self._bisect_left(self.sorted_values, removed)
+            if removed_index < len(self.sorted_values):
+                self.sorted_values.pop(removed_index)
+        self.sorted_values.insert(self._bisect_left(self.sorted_values, numeric), numeric)
+        self.values.append(numeric)
+        return self.current()
+
+    def current(self):
+        count = len(self.sorted_values)
+        if count < self.min_periods:
+            return None
+        if count == 1:
+            return float(self.sorted_values[0])
+        position = (count - 1) * self.quantile
+        lower_index = int(math.floor(position))
+        upper_index = int(math.ceil(position))
+        lower_value = self.sorted_values[lower_index]
+        upper_value = self.sorted_values[upper_index]
+        if lower_index == upper_index:
+            return float(lower_value)
+        return float(lower_value + ((upper_value - lower_value) * (position - float(lower_index))))
+
+    @staticmethod
+    def _bisect_left(values, needle):
+        low = 0
+        high = len(values)
+        while low < high:
+            middle = (low + high) // 2
+            if values[middle] < needle:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+def make_abs_deltas(count: int, seed: int = 11):
+    generator = random.Random(seed)
+    # Tick deltas are quantized to the 0.01 price step, so the window holds many duplicates.
+    return [abs(round(generator.gauss(0.0, 0.12), 2)) for _ in range(count)]
+
+
+def run(factory, values):
+    window = factory()
+    started = time.perf_counter()
+    results = [window.add(value) for value in values]
+    return (time.perf_counter() - started) * 1000.0, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the rolling q80 window against the legacy sorted-list version.")
+    parser.add_argument("--ticks", type=int, default=200000)
+    parser.add_argument("--windows", default="50,200,1000,5000,20000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    values = make_abs_deltas(args.ticks)
+    for window in [int(item) for item in args.windows.split(",") if item.strip()]:
+        legacy_best = fast_best = float("inf")
+        for _ in range(args.repeat):
+            legacy_ms, legacy = run(lambda: LegacyRollingPercentileWindow(window=window, quantile=0.80, min_periods=20), values)
+            fast_ms, fast = run(lambda: RollingPercentileWindow(window=window, quantile=0.80, min_periods=20), values)
+            assert legacy == fast, "q80 mismatch at window {0}".format(window)
+            legacy_best = min(legacy_best, legacy_ms)
+            fast_best = min(fast_best, fast_ms)
+        print(
+            "window={0:<6} legacy {1:9.2f} ms  ordered {2:9.2f} ms  x{3:.1f}  ({4:.2f} us/tick)".format(
+                window,
+                legacy_best,
+                fast_best,
+                legacy_best / max(fast_best, 1e-9),
+                fast_best * 1000.0 / max(1, len(values)),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional
+
+from datavis.brokerday import brokerday_bounds, brokerday_for_timestamp, tick_mid
+
+
+OPENING_MINUTES = 30
+
+
+@dataclass
+class OpeningRange:
+    broker_day: date
+    start: datetime
+    end: datetime
+    low: Optional[float] = None
+    high: Optional[float] = None
+    start_tick_id: Optional[int] = None
+    end_tick_id: Optional[int] = None
+    tick_count: int = 0
+    cursor_id: int = 0
+    final: bool = False
+
+    def add(self, *, low: Any, high: Any, start_tick_id: Any, end_tick_id: Any, tick_count: Any) -> None:
+        if not tick_count:
+            return
+        self.low = float(low) if self.low is None else min(self.low, float(low))
+        self.high = float(high) if self.high is None else max(self.high, float(high))
+        if self.start_tick_id is None:
+            self.start_tick_id = int(start_tick_id)
+        self.end_tick_id = int(end_tick_id)
+        self.tick_count += int(tick_count)
+
+    @property
+    def complete(self) -> bool:
+        return self.low is not None and self.high is not None and self.high > self.low
+
+
+def query_opening_window(cur: Any, *, symbol: str, after_id: int, through_id: int, start: datetime, end: datetime) -> Dict[str, Any]:
+    cur.execute(
+        """
+        SELECT
+            MIN(bid) AS opening_low,
+            MAX(ask) AS opening_high,
+            MIN(id) AS start_tick_id,
+            MAX(id) AS end_tick_id,
+            COUNT(*) AS tick_count
+        FROM public.ticks
+        WHERE symbol = %s AND id > %s AND id <= %s AND timestamp >= %s AND timestamp < %s
+        """,
+        (symbol, after_id, through_id, start, end),
+    )
+    return dict(cur.fetchone() or {})
+
+
+class AcdOpeningRangeCache:
+    def __init__(self, *, symbol: str, max_days: int = 8) -> None:
+        self.symbol = symbol
+        self.max_days = max(1, int(max_days))
+        self.window_queries = 0
+        self._lock = threading.Lock()
+        self._ranges: Dict[date, OpeningRange] = {}
+
+    def resolve(self, cur: Any, latest: Dict[str, Any]) -> OpeningRange:
+        broker_day = brokerday_for_timestamp(latest["timestamp"])
+        with self._lock:
+            opening = self._ranges.get(broker_day)
+            if opening is None:
+                day_start, _ = brokerday_bounds(broker_day)
+                opening = OpeningRange(broker_day=broker_day, start=day_start, end=day_start + timedelta(minutes=OPENING_MINUTES))
+                self._ranges[broker_day] = opening
+                for stale in sorted(self._ranges)[: -self.max_days]:
+                    self._ranges.pop(stale, None)
+            if opening.final:
+                return opening
+            latest_id = int(latest["id"])
+            if latest_id > opening.cursor_id:
+                # Only ticks newer than the last fold are read, so a forming range costs one id-range probe.
+                window = query_opening_window(
+                    cur,
+                    symbol=self.symbol,
+                    after_id=opening.cursor_id,
+                    through_id=latest_id,
+                    start=opening.start,
+                    end=opening.end,
+                )
+                self.window_queries += 1
+                opening.add(
+                    low=window.get("opening_low"),
+                    high=window.get("opening_high"),
+                    start_tick_id=window.get("start_tick_id"),
+                    end_tick_id=window.get("end_tick_id"),
+                    tick_count=window.get("tick_count"),
+                )
+                opening.cursor_id = latest_id
+            opening.final = latest["timestamp"] >= opening.end
+            return opening
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ranges.clear()
+
+
+def build_acd_payload(latest: Dict[str, Any], opening: OpeningRange) -> Dict[str, Any]:
+    if not opening.complete:
+        return {
+            "available": False,
+            "reason": "The 08:00-08:30 Sydney opening range is not complete.",
+            "brokerDay": opening.broker_day.isoformat(),
+        }
+    opening_high = float(opening.high)
+    opening_low = float(opening.low)
+    opening_range = opening_high - opening_low
+    a_offset = opening_range * 0.5
+    c_offset = opening_range
+    current_mid = float(tick_mid(latest))
+    levels = {
+        "cUp": opening_high + c_offset,
+        "aUp": opening_high + a_offset,
+        "openingHigh": opening_high,
+        "openingLow": opening_low,
+        "aDown": opening_low - a_offset,
+        "cDown": opening_low - c_offset,
+    }
+    if current_mid >= levels["aUp"]:
+        direction = "up"
+    elif current_mid <= levels["aDown"]:
+        direction = "down"
+    else:
+        direction = "neutral"
+    return {
+        "available": True,
+        "brokerDay": opening.broker_day.isoformat(),
+        "openingStart": opening.start.isoformat(),
+        "openingEnd": opening.end.isoformat(),
+        "startTickId": int(opening.start_tick_id or 0),
+        "endTickId": int(opening.end_tick_id or 0),
+        "tickCount": opening.tick_count,
+        "openingRange": opening_range,
+        "currentMid": current_mid,
+        "direction": direction,
+        "levels": levels,
+        "openingFinal": opening.final,
+    }
@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
 import csv
+import queue
 import re
 import secrets
 import base64
@@ -12,42 +14,62 @@ import hmac
 import hashlib
 import threading
 import time
-from collections import defaultdict
+import zlib
+from collections import OrderedDict
 from contextlib import contextmanager
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal, ROUND_HALF_UP
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional
+from typing import Any, AsyncGenerator, Callable, Dict, Generator, Iterable, List, Optional, Tuple
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import psycopg2
 import psycopg2.extras
-import sqlparse
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
 from fastapi.exception_handlers import http_exception_handler
 from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, StreamingResponse
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field, field_validator
 
-from datavis.backbone import BACKBONE_SOURCE
+from datavis.acd import AcdOpeningRangeCache, build_acd_payload
+from datavis.backbone import BACKBONE_NOTIFY_CHANNEL, BACKBONE_SOURCE
 from datavis.backbone import BIGBONES_SOURCE
+from datavis.backbone import DAY_REFS
 from datavis.backbone import load_state_row as load_backbone_state_row
 from datavis.backbone import resolve_current_day_ref as resolve_current_backbone_day_ref
+from datavis.backbone import resolve_day_ref_for_brokerday as resolve_backbone_day_ref_for_brokerday
 from datavis.backbone import resolve_day_ref_for_timestamp as resolve_backbone_day_ref_for_timestamp
-from datavis.brokerday import brokerday_bounds, brokerday_for_timestamp
+from datavis.backbone_feed import BackboneFeed
+from datavis.columnar import COLUMNAR_ENCODING, encode_columnar_payload
 from datavis.db import db_connect as shared_db_connect
+from datavis.fastjson import FastJSONResponse, sse_event
+from datavis.fastjson import dumps as fast_json_dumps
+from datavis.live_hub import LiveHub
+from datavis.metrics import PROMETHEUS_CONTENT_TYPE, MetricsRegistry
 from datavis.mavg import list_page_config_rows as list_mavg_config_rows
 from datavis.mavg import query_point_rows_after_value_id as query_mavg_points_after_value_id
 from datavis.mavg import query_point_rows_for_tick_range as query_mavg_points_for_tick_range
 from datavis.mavg import query_point_rows_for_time_range as query_mavg_points_for_time_range
 from datavis.rects import RectPaperService, RectServiceError
 from datavis.regression_channel import RegressionChannelError, fit_pitchfork, fit_regression_channel
+from datavis.review_playback import ReviewPlaybackError, ReviewPlaybackRegistry, ReviewPlaybackSession
+from datavis.services import ServiceRegistry
 from datavis.smart_scalp import SmartScalpError, SmartScalpService
-from datavis.structure import StructureEngine, replay_ticks
-from datavis.trading import CTraderGateway, load_broker_config
+from datavis.sql_jobs import SqlJobError, SqlJobManager
+from datavis.stream_buffer import SSE_CHANNELS, SseClientBuffer, SseClientRegistry, SseEvent
+from datavis.structure import SharedStructureEngine, empty_structure_updates, replay_ticks
+from datavis.worker_health import WorkerLagTracker, WorkerPosition, query_head, query_worker_positions
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+APP_MODULE_STARTED = time.perf_counter()
 BASE_DIR = Path(__file__).resolve().parent.parent
 FRONTEND_DIR = BASE_DIR / "frontend"
 ASSETS_DIR = FRONTEND_DIR / "assets"
@@ -65,6 +87,8 @@ DEFAULT_BACKBONE_REVIEW_WINDOW = int(os.getenv("DATAVIS_BACKBONE_REVIEW_WINDOW",
 MAX_BACKBONE_REVIEW_WINDOW = int(os.getenv("DATAVIS_BACKBONE_REVIEW_MAX_WINDOW", "6000"))
 DEFAULT_BACKBONE_CANDLE_COUNT = int(os.getenv("DATAVIS_BACKBONE_CANDLE_COUNT", "35"))
 MAX_BACKBONE_CANDLE_COUNT = int(os.getenv("DATAVIS_BACKBONE_MAX_CANDLES", "400"))
+DEFAULT_BACKBONE_OVERVIEW_DAYS = int(os.getenv("DATAVIS_BACKBONE_OVERVIEW_DAYS", "28"))
+MAX_BACKBONE_OVERVIEW_DAYS = int(os.getenv("DATAVIS_BACKBONE_MAX_OVERVIEW_DAYS", "366"))
 DEFAULT_BACKBONE_DETAIL_TICKS = int(os.getenv("DATAVIS_BACKBONE_DETAIL_TICKS", "2000"))
 DEFAULT_BACKBONE_LAYER = "backbone"
 DEFAULT_HISTORY_LIMIT = 2000
@@ -78,6 +102,19 @@ SQL_EXPORT_DIR = BASE_DIR / "logs" / "sql_exports"
 SQL_EXPORT_BATCH_SIZE = max(1000, int(os.getenv("DATAVIS_SQL_EXPORT_BATCH_SIZE", "5000")))
 SQL_EXPORT_TIMEOUT_MS = max(STATEMENT_TIMEOUT_MS, int(os.getenv("DATAVIS_SQL_EXPORT_TIMEOUT_MS", "60000")))
 SQL_EXPORT_LOG_EVERY_ROWS = max(SQL_EXPORT_BATCH_SIZE, int(os.getenv("DATAVIS_SQL_EXPORT_LOG_EVERY_ROWS", "50000")))
+SQL_EXPORT_CHUNK_BYTES = max(16384, int(os.getenv("DATAVIS_SQL_EXPORT_CHUNK_BYTES", "262144")))
+SQL_EXPORT_STREAM_QUEUE_CHUNKS = max(2, int(os.getenv("DATAVIS_SQL_EXPORT_STREAM_QUEUE_CHUNKS", "16")))
+SQL_EXPORT_STREAM_TTL_SECONDS = max(5.0, float(os.getenv("DATAVIS_SQL_EXPORT_STREAM_TTL_SECONDS", "60")))
+SQL_EXPORT_STREAM_MAX_PENDING = max(1, int(os.getenv("DATAVIS_SQL_EXPORT_STREAM_MAX_PENDING", "32")))
+SQL_EXPORT_SUFFIXES = {"none": ".csv", "gzip": ".csv.gz", "zstd": ".csv.zst"}
+SQL_EXPORT_MEDIA_TYPES = {"none": "text/csv", "gzip": "application/gzip", "zstd": "application/zstd"}
+SQL_JOB_DIR = BASE_DIR / "logs" / "sql_jobs"
+SQL_JOB_TIMEOUT_MS = max(STATEMENT_TIMEOUT_MS, int(os.getenv("DATAVIS_SQL_JOB_TIMEOUT_MS", "300000")))
+SQL_JOB_MAX_ROWS = max(MAX_QUERY_ROWS, int(os.getenv("DATAVIS_SQL_JOB_MAX_ROWS", "200000")))
+SQL_JOB_PAGE_ROWS = max(50, int(os.getenv("DATAVIS_SQL_JOB_PAGE_ROWS", "500")))
+SQL_JOB_COST_WARN = max(1.0, float(os.getenv("DATAVIS_SQL_JOB_COST_WARN", "1000000")))
+SQL_JOB_WORKERS = max(1, int(os.getenv("DATAVIS_SQL_JOB_WORKERS", "2")))
+SQL_JOB_MAX_JOBS = max(1, int(os.getenv("DATAVIS_SQL_JOB_MAX_JOBS", "50")))
 SQL_ADMIN_USER = os.getenv("DATAVIS_SQL_ADMIN_USER", "").strip()
 SQL_ADMIN_PASSWORD = os.getenv("DATAVIS_SQL_ADMIN_PASSWORD", "")
 STREAM_POLL_SECONDS = max(0.02, float(os.getenv("DATAVIS_STREAM_POLL_SECONDS", "0.05")))
@@ -89,7 +126,19 @@ STREAM_HEARTBEAT_SECONDS = max(
     STREAM_IDLE_POLL_SECONDS,
     float(os.getenv("DATAVIS_STREAM_HEARTBEAT_SECONDS", "5.0")),
 )
-REVIEW_STREAM_BATCH = int(os.getenv("DATAVIS_REVIEW_STREAM_BATCH", "256"))
+REVIEW_SESSION_CHUNK_TICKS = max(1000, int(os.getenv("DATAVIS_REVIEW_SESSION_CHUNK_TICKS", "20000")))
+REVIEW_SESSION_IDLE_SECONDS = max(5.0, float(os.getenv("DATAVIS_REVIEW_SESSION_IDLE_SECONDS", "120")))
+BACKBONE_FEED_SAFETY_SECONDS = max(0.5, float(os.getenv("DATAVIS_BACKBONE_FEED_SAFETY_SECONDS", "5")))
+BACKBONE_FEED_IDLE_SECONDS = max(0.0, float(os.getenv("DATAVIS_BACKBONE_FEED_IDLE_SECONDS", "30")))
+LIVE_WS_FRAME_SECONDS = max(0.016, float(os.getenv("DATAVIS_WS_FRAME_SECONDS", "0.05")))
+LIVE_WS_MAX_PENDING_ITEMS = max(100, int(os.getenv("DATAVIS_WS_MAX_PENDING_ITEMS", "5000")))
+SSE_COALESCE_BYTES = max(16 * 1024, int(os.getenv("DATAVIS_SSE_COALESCE_BYTES", str(256 * 1024))))
+SSE_RESYNC_BYTES = max(SSE_COALESCE_BYTES, int(os.getenv("DATAVIS_SSE_RESYNC_BYTES", str(4 * 1024 * 1024))))
+LIVE_WS_STATE_POLL_SECONDS = max(0.25, float(os.getenv("DATAVIS_WS_STATE_POLL_SECONDS", "1")))
+LIVE_WS_ACD_POLL_SECONDS = max(1.0, float(os.getenv("DATAVIS_WS_ACD_POLL_SECONDS", "15")))
+LIVE_WS_PUMP_IDLE_SECONDS = max(1.0, float(os.getenv("DATAVIS_WS_PUMP_IDLE_SECONDS", "30")))
+WORKER_LAG_WARN_TICKS = max(1, int(os.getenv("DATAVIS_WORKER_LAG_WARN_TICKS", "500")))
+WORKER_RATE_WINDOW_SECONDS = max(10.0, float(os.getenv("DATAVIS_WORKER_RATE_WINDOW_SECONDS", "300")))
 REVIEW_MAX_DELAY_MS = max(50, int(os.getenv("DATAVIS_REVIEW_MAX_DELAY_MS", "1500")))
 REVIEW_MIN_DELAY_MS = max(0, int(os.getenv("DATAVIS_REVIEW_MIN_DELAY_MS", "5")))
 DEFAULT_REVIEW_TIMEZONE = "Australia/Sydney"
@@ -109,12 +158,13 @@ app = FastAPI(
     docs_url=None,
     redoc_url=None,
     openapi_url=None,
+    default_response_class=FastJSONResponse,
 )
 app.mount("/assets", StaticFiles(directory=str(ASSETS_DIR)), name="assets")
 security = HTTPBasic(auto_error=False)
 RUNTIME_TRADE_SESSION_SECRET = TRADE_SESSION_SECRET or secrets.token_bytes(32)
-BROKER_CONFIG = load_broker_config(BASE_DIR)
-TRADE_GATEWAY = CTraderGateway(BROKER_CONFIG)
+WARM_SERVICES = [name.strip() for name in os.getenv("DATAVIS_WARM_SERVICES", "smart_scalp,rect_paper").split(",") if name.strip()]
+SERVICES = ServiceRegistry()
 AUDIT_LOGGER = logging.getLogger("datavis.trade.audit")
 PERF_LOGGER = logging.getLogger("datavis.perf")
 STREAM_LOGGER = logging.getLogger("datavis.stream")
@@ -124,8 +174,78 @@ SQL_SCHEMA_CACHE_TTL_MS = max(1000, int(os.getenv("DATAVIS_SQL_SCHEMA_CACHE_MS",
 HOT_PATH_LOG_THRESHOLD_MS = max(5.0, float(os.getenv("DATAVIS_HOT_PATH_LOG_MS", "75")))
 STREAM_ACTIVITY_LOCK = threading.Lock()
 STREAM_ACTIVITY_COUNTS: Dict[str, int] = {}
+METRICS = MetricsRegistry()
+HTTP_LATENCY = METRICS.histogram("http_request_duration_seconds", "Time until the response head is ready.", ("method", "route", "status"))
+DB_FETCH_LATENCY = METRICS.histogram("db_fetch_duration_seconds", "Database fetch time of chart payloads.", ("source",))
+SERIALIZE_LATENCY = METRICS.histogram("serialize_duration_seconds", "Serialization time of chart payloads.", ("source",))
+HOT_PATH_LATENCY = METRICS.histogram("hot_path_duration_seconds", "Elapsed time of hot_path_log operations.", ("name",))
+STREAM_FANOUT_LAG = METRICS.histogram("stream_fanout_lag_seconds", "Age of the newest tick when a live delta is sent.", ("stream",), highest=3600.0)
+SMART_SCALP_EVALUATION_LATENCY = METRICS.histogram("smart_scalp_evaluation_seconds", "Smart Scalp worker evaluation time.")
+METRICS.gauge(
+    "startup_seconds",
+    "Startup phase and lazy service construction times.",
+    lambda: {
+        (kind, name): elapsed / 1000.0
+        for kind, values in SERVICES.timings().items()
+        for name, elapsed in values.items()
+    },
+    ("kind", "name"),
+)
+METRICS.gauge("active_streams", "Open SSE streams and live socket subscribers.", lambda: active_stream_counts(), ("stream",))
+SSE_COALESCED = METRICS.counter("sse_coalesced_events", "SSE deltas folded into catch-up payloads for slow clients.", ("stream",))
+SSE_RESYNCS = METRICS.counter("sse_resyncs", "SSE clients told to reload because they fell too far behind.", ("stream",))
+SSE_CLIENTS = SseClientRegistry()
+WORKER_LAG = WorkerLagTracker(window_seconds=WORKER_RATE_WINDOW_SECONDS, lag_warn_ticks=WORKER_LAG_WARN_TICKS)
+METRICS.gauge(
+    "worker_lag_ticks",
+    "Ticks between the head and each worker's last processed tick, as of the last workers health read.",
+    lambda: {
+        (worker["name"],): float(worker["lagTicks"])
+        for worker in WORKER_LAG.last_report().get("workers", [])
+        if worker.get("lagTicks") is not None
+    },
+    ("worker",),
+)
+METRICS.gauge(
+    "sse_client_buffered_bytes",
+    "Bytes queued for each SSE client but not yet handed to the server.",
+    lambda: {(client.stream_name, client.client_id): stats["bufferedBytes"] for client, stats in SSE_CLIENTS.snapshot()},
+    ("stream", "client"),
+)
+METRICS.gauge(
+    "sse_client_lag_seconds",
+    "Age of the oldest undelivered event for each SSE client.",
+    lambda: {(client.stream_name, client.client_id): stats["lagSeconds"] for client, stats in SSE_CLIENTS.snapshot()},
+    ("stream", "client"),
+)
+METRICS.gauge(
+    "day_ref_cache_lookups",
+    "Day reference lookups answered from the shared cache versus the days table.",
+    lambda: {("hit",): DAY_REFS.hits, ("miss",): DAY_REFS.misses},
+    ("outcome",),
+)
 SQL_SCHEMA_CACHE_LOCK = threading.Lock()
 SQL_SCHEMA_CACHE: Dict[str, Any] = {"expiresAtMs": 0, "payload": None}
+SQL_EXPORT_STREAMS_LOCK = threading.Lock()
+SQL_EXPORT_STREAMS: "OrderedDict[str, Tuple[float, QueryExportRequest]]" = OrderedDict()
+REVIEW_SESSIONS = ReviewPlaybackRegistry(idle_seconds=REVIEW_SESSION_IDLE_SECONDS)
+ACD_OPENING_RANGES = AcdOpeningRangeCache(symbol=TICK_SYMBOL)
+LIVE_STRUCTURE = SharedStructureEngine(TICK_SYMBOL, retain_ticks=MAX_TICK_WINDOW)
+LIVE_STRUCTURE_SYNC_LOCK = threading.Lock()
+LIVE_HUB = LiveHub(max_pending_items=LIVE_WS_MAX_PENDING_ITEMS)
+LIVE_HUB_PUMP_LOCK = threading.Lock()
+LIVE_HUB_CURSORS: Dict[str, Optional[int]] = {"tickId": None, "mavgId": None, "backboneDayId": None, "backboneId": None}
+LIVE_HUB_PUMP_THREAD: Optional[threading.Thread] = None
+RANGE_CACHE_MAX_ENTRIES = max(0, int(os.getenv("DATAVIS_RANGE_CACHE_ENTRIES", "128")))
+RANGE_CACHE_CONTROL = "public, no-cache"
+RANGE_CACHE_LOCK = threading.Lock()
+RANGE_CACHE: "OrderedDict[str, bytes]" = OrderedDict()
+COALESCE_LATEST_TTL_SECONDS = max(0.0, float(os.getenv("DATAVIS_COALESCE_LATEST_TTL_MS", "750")) / 1000.0)
+COALESCE_WAIT_SECONDS = max(1.0, float(os.getenv("DATAVIS_COALESCE_WAIT_SECONDS", "30")))
+COALESCE_LOCK = threading.Lock()
+COALESCE_INFLIGHT: Dict[str, "CoalescedCall"] = {}
+COALESCE_RESULTS: Dict[str, Tuple[float, bytes]] = {}
+COALESCED_REQUESTS = METRICS.counter("coalesced_requests", "Bootstrap reads by single-flight outcome.", ("endpoint", "outcome"))
 BACKBONE_LAYER_SOURCES = {
     "backbone": BACKBONE_SOURCE,
     "bigbones": BIGBONES_SOURCE,
@@ -140,9 +260,23 @@ class QueryRequest(BaseModel):
     sql: str
 
 
+class SqlJobRequest(BaseModel):
+    sql: str
+    confirm: bool = False
+
+
 class QueryExportRequest(BaseModel):
     query: str
     filename: Optional[str] = Field(None, max_length=200)
+    engine: str = Field("copy", pattern="^(copy|cursor)$")
+    compression: str = Field("none", pattern="^(none|gzip|zstd)$")
+
+
+class ReviewSessionControlRequest(BaseModel):
+    sessionId: str = Field(..., min_length=1, max_length=64)
+    action: str = Field(..., pattern="^(pause|resume|seek|speed)$")
+    tickId: Optional[int] = Field(None, ge=1)
+    speed: Optional[float] = Field(None, gt=0)
 
 
 class TradeLoginRequest(BaseModel):
@@ -299,21 +433,35 @@ def ensure_database_url() -> str:
     return DATABASE_URL
 
 
-@contextmanager
-def db_connection(readonly: bool = False, autocommit: bool = False) -> Generator[Any, None, None]:
+def open_db_connection(readonly: bool = False, autocommit: bool = False) -> Any:
     if DATABASE_URL:
         conn = psycopg2.connect(ensure_database_url())
         conn.autocommit = autocommit
         if readonly:
             conn.set_session(readonly=True, autocommit=autocommit)
-    else:
-        conn = shared_db_connect(readonly=readonly, autocommit=autocommit)
+        return conn
+    return shared_db_connect(readonly=readonly, autocommit=autocommit)
+
+
+@contextmanager
+def db_connection(readonly: bool = False, autocommit: bool = False) -> Generator[Any, None, None]:
+    conn = open_db_connection(readonly=readonly, autocommit=autocommit)
     try:
         yield conn
     finally:
         conn.close()
 
 
+@contextmanager
+def readonly_connection(conn: Optional[Any] = None) -> Generator[Any, None, None]:
+    # Endpoints that already hold a connection (e.g. for a cache version lookup) pass it through.
+    if conn is not None:
+        yield conn
+        return
+    with db_connection(readonly=True) as opened:
+        yield opened
+
+
 def clamp_int(value: int, minimum: int, maximum: int) -> int:
     return max(minimum, min(value, maximum))
 
@@ -327,6 +475,7 @@ def elapsed_ms(started: float) -> float:
 
 
 def hot_path_log(name: str, *, elapsed: float, **fields: Any) -> None:
+    HOT_PATH_LATENCY.labels(name).observe_ms(elapsed)
     if elapsed < HOT_PATH_LOG_THRESHOLD_MS:
         return
     extra = " ".join(
@@ -345,6 +494,19 @@ def stream_open(name: str) -> int:
     return active
 
 
+def observe_stream_lag(name: str, latest_row: Optional[Dict[str, Any]]) -> None:
+    latest_ms = dt_to_ms(latest_row.get("timestamp")) if latest_row else None
+    if latest_ms is not None:
+        STREAM_FANOUT_LAG.labels(name).observe_ms(max(0, now_ms() - latest_ms))
+
+
+def active_stream_counts() -> Dict[Tuple[str, ...], float]:
+    with STREAM_ACTIVITY_LOCK:
+        counts = {(name,): float(active) for name, active in STREAM_ACTIVITY_COUNTS.items()}
+    counts[("live_socket_subscribers",)] = float(LIVE_HUB.subscriber_count())
+    return counts
+
+
 def stream_close(name: str) -> int:
     with STREAM_ACTIVITY_LOCK:
         active = max(0, int(STREAM_ACTIVITY_COUNTS.get(name) or 0) - 1)
@@ -579,7 +741,13 @@ def serialize_metrics_payload(
     fetch_ms: float,
     serialize_ms: float,
     latest_row: Optional[Dict[str, Any]],
+    source: str = "payload",
 ) -> Dict[str, Any]:
+    # Zero means the caller did not time that phase (heartbeats, empty polls).
+    if fetch_ms > 0:
+        DB_FETCH_LATENCY.labels(source).observe_ms(fetch_ms)
+    if serialize_ms > 0:
+        SERIALIZE_LATENCY.labels(source).observe_ms(serialize_ms)
     return {
         "serverSentAtMs": now_ms(),
         "fetchLatencyMs": fetch_ms,
@@ -590,10 +758,61 @@ def serialize_metrics_payload(
     }
 
 
-def format_sse(payload: Dict[str, Any], *, event_name: Optional[str] = None) -> str:
-    if event_name:
-        return "event: {0}\ndata: {1}\n\n".format(event_name, json.dumps(payload))
-    return "data: {0}\n\n".format(json.dumps(payload))
+def encode_payload(payload: Dict[str, Any], encoding: str = "json") -> Dict[str, Any]:
+    if encoding == COLUMNAR_ENCODING:
+        return encode_columnar_payload(payload)
+    return payload
+
+
+def format_sse(payload: Dict[str, Any], *, event_name: Optional[str] = None, encoding: str = "json") -> bytes:
+    return sse_event(encode_payload(payload, encoding), event_name=event_name)
+
+
+async def buffered_sse(events: Iterable[SseEvent], *, stream_name: str, channel: str, encoding: str = "json") -> AsyncGenerator[bytes, None]:
+    loop = asyncio.get_running_loop()
+    wake = asyncio.Event()
+    client = SseClientBuffer(
+        client_id=SSE_CLIENTS.next_client_id(stream_name),
+        stream_name=stream_name,
+        channel=SSE_CHANNELS[channel],
+        encode=lambda payload, event_name: format_sse(payload, event_name=event_name, encoding=encoding),
+        coalesce_bytes=SSE_COALESCE_BYTES,
+        resync_bytes=SSE_RESYNC_BYTES,
+        max_items=LIVE_WS_MAX_PENDING_ITEMS,
+        notify=lambda: loop.call_soon_threadsafe(wake.set),
+        logger=STREAM_LOGGER,
+    )
+    SSE_CLIENTS.register(client)
+    # The producer owns the database cursor; a client that stops reading only grows its own bounded buffer.
+    producer = threading.Thread(target=client.pump, args=(events,), name="datavis-sse-" + client.client_id, daemon=True)
+    producer.start()
+    try:
+        while True:
+            wake.clear()
+            chunk = client.take()
+            if chunk is not None:
+                yield chunk
+                continue
+            if client.finished:
+                return
+            await wake.wait()
+    finally:
+        client.close()
+        SSE_CLIENTS.unregister(client)
+        SSE_COALESCED.labels(stream_name).inc(client.coalesced)
+        SSE_RESYNCS.labels(stream_name).inc(client.resyncs)
+
+
+def sse_response(events: AsyncGenerator[bytes, None]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
 
 
 def require_sql_admin(credentials: Optional[HTTPBasicCredentials] = Depends(security)) -> Optional[str]:
@@ -619,6 +838,45 @@ def require_sql_admin(credentials: Optional[HTTPBasicCredentials] = Depends(secu
     return credentials.username
 
 
+class RequestLatencyMiddleware:
+    """Pure ASGI timing: observes when the response head is sent, without buffering bodies or breaking streams."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable[[], Any], send: Callable[[Dict[str, Any]], Any]) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status_code = 500
+        observed = False
+
+        def observe() -> None:
+            nonlocal observed
+            observed = True
+            # The router stores the matched route on the shared scope; label by its template so
+            # path parameters cannot blow up series cardinality.
+            route_path = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_LATENCY.labels(scope["method"], route_path, status_code).observe(time.perf_counter() - started)
+
+        async def send_timed(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start" and not observed:
+                status_code = int(message["status"])
+                observe()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            if not observed:
+                observe()
+
+
+app.add_middleware(RequestLatencyMiddleware)
+
+
 @app.exception_handler(HTTPException)
 async def datavis_http_exception_handler(request: Request, exc: HTTPException):
     if request.url.path.startswith("/api/sql/export-csv"):
@@ -698,7 +956,7 @@ def require_trade_auth(request: Request) -> str:
     payload = _trade_session_decode(request.cookies.get(TRADE_COOKIE_NAME, ""))
     if payload is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Trade login required.")
-    SMART_SCALP_SERVICE.touch_auth()
+    smart_scalp_service().touch_auth()
     return str(payload["u"])
 
 
@@ -726,9 +984,9 @@ def trade_auth_status_payload(
         "authenticated": bool(authenticated and auth_configured),
         "username": username if authenticated and auth_configured else None,
         "authConfigured": auth_configured,
-        "brokerConfigured": TRADE_GATEWAY.configured,
-        "configured": TRADE_GATEWAY.configured,
-        "broker": TRADE_GATEWAY.status(),
+        "brokerConfigured": trade_gateway().configured,
+        "configured": trade_gateway().configured,
+        "broker": trade_gateway().status(),
         "error": error,
         "message": resolved_message,
     }
@@ -757,7 +1015,7 @@ def trade_symbol_info() -> Dict[str, Any]:
     if _trade_not_configured():
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Broker integration is not configured.")
     try:
-        info = TRADE_GATEWAY.symbol_info()
+        info = trade_gateway().symbol_info()
     except Exception as exc:
         _handle_trade_gateway_error(exc)
     info["defaultLotSize"] = float(TRADE_DEFAULT_LOT_SIZE)
@@ -809,10 +1067,14 @@ def split_sql_script(sql_text: str) -> List[str]:
     text = (sql_text or "").strip()
     if not text:
         raise HTTPException(status_code=400, detail="SQL text is required.")
+    import sqlparse
+
     return [statement.strip() for statement in sqlparse.split(text) if statement.strip()]
 
 
 def statement_head(statement: str) -> str:
+    import sqlparse
+
     parsed = sqlparse.parse(statement)
     if not parsed:
         return "SQL"
@@ -1002,6 +1264,8 @@ def require_exportable_select_statement(sql_text: str) -> str:
     if len(statements) != 1:
         raise HTTPException(status_code=400, detail="CSV export only supports a single SELECT or WITH query.")
 
+    import sqlparse
+
     statement = statements[0].strip()
     parsed = sqlparse.parse(statement)
     if not parsed:
@@ -1018,18 +1282,24 @@ def default_sql_export_filename() -> str:
     return datetime.now().strftime("sql_export_%Y%m%d_%H%M%S.csv")
 
 
-def sanitize_sql_export_filename(filename: Optional[str]) -> str:
+def split_sql_export_filename(filename: str) -> tuple[str, str]:
+    for compression, suffix in sorted(SQL_EXPORT_SUFFIXES.items(), key=lambda item: len(item[1]), reverse=True):
+        if filename.lower().endswith(suffix):
+            return filename[: -len(suffix)], compression
+    return filename, "none"
+
+
+def sanitize_sql_export_filename(filename: Optional[str], compression: str = "none") -> str:
     raw = str(filename or "").strip()
     if not raw:
         raw = default_sql_export_filename()
     raw = raw.replace("\\", "/").rsplit("/", 1)[-1]
-    if raw.lower().endswith(".csv"):
-        raw = raw[:-4]
+    raw, _ = split_sql_export_filename(raw)
     safe_stem = re.sub(r"[^A-Za-z0-9._-]+", "_", raw).strip("._-")
     if not safe_stem:
         safe_stem = default_sql_export_filename()[:-4]
     safe_stem = safe_stem[:120].rstrip("._-") or default_sql_export_filename()[:-4]
-    return safe_stem + ".csv"
+    return safe_stem + SQL_EXPORT_SUFFIXES[compression]
 
 
 def csv_export_column_names(description: Any) -> List[str]:
@@ -1046,15 +1316,15 @@ def csv_export_row_values(row: Any) -> List[Any]:
     return [serialize_value(value) for value in row]
 
 
-def resolve_sql_export_target(filename: Optional[str]) -> tuple[str, Path, str]:
+def resolve_sql_export_target(filename: Optional[str], compression: str = "none") -> tuple[str, Path, str]:
     exports_dir = SQL_EXPORT_DIR.resolve()
     exports_dir.mkdir(parents=True, exist_ok=True)
     supplied_name = bool(str(filename or "").strip())
-    safe_name = sanitize_sql_export_filename(filename)
+    safe_name = sanitize_sql_export_filename(filename, compression)
     export_path = (exports_dir / safe_name).resolve()
     if not supplied_name and export_path.exists():
-        stem = export_path.stem
-        suffix = export_path.suffix or ".csv"
+        stem, _ = split_sql_export_filename(safe_name)
+        suffix = SQL_EXPORT_SUFFIXES[compression]
         counter = 1
         while export_path.exists():
             safe_name = "{0}_{1:02d}{2}".format(stem, counter, suffix)
@@ -1072,7 +1342,7 @@ def resolve_sql_export_download(filename: str) -> tuple[str, Path]:
     requested = str(filename or "").strip()
     if not requested:
         raise HTTPException(status_code=400, detail="Export filename is required.")
-    safe_name = sanitize_sql_export_filename(requested)
+    safe_name = sanitize_sql_export_filename(requested, split_sql_export_filename(requested)[1])
     if safe_name != requested:
         raise HTTPException(status_code=400, detail="Invalid export filename.")
     export_path = (SQL_EXPORT_DIR.resolve() / safe_name).resolve()
@@ -1097,8 +1367,9 @@ def remove_sql_export_artifacts(*paths: Path) -> None:
 
 
 def sql_export_metadata_target(export_path: Path, relative_path: str) -> tuple[Path, str]:
-    metadata_path = export_path.with_suffix(".json")
-    metadata_relative_path = Path(relative_path).with_suffix(".json").as_posix()
+    stem, _ = split_sql_export_filename(export_path.name)
+    metadata_path = export_path.with_name(stem + ".json")
+    metadata_relative_path = Path(relative_path).with_name(stem + ".json").as_posix()
     return metadata_path, metadata_relative_path
 
 
@@ -1111,6 +1382,9 @@ def write_sql_export_metadata(
     statement: str,
     row_count: int,
     elapsed_ms_value: float,
+    engine: str = "cursor",
+    compression: str = "none",
+    bytes_written: Optional[int] = None,
 ) -> None:
     payload = {
         "filename": safe_name,
@@ -1119,6 +1393,9 @@ def write_sql_export_metadata(
         "exportedAt": datetime.now(timezone.utc).isoformat(),
         "query": statement,
         "rowCount": row_count,
+        "engine": engine,
+        "compression": compression,
+        "bytesWritten": bytes_written,
         "batchSize": SQL_EXPORT_BATCH_SIZE,
         "timeoutMs": SQL_EXPORT_TIMEOUT_MS,
         "elapsedMs": elapsed_ms_value,
@@ -1126,23 +1403,196 @@ def write_sql_export_metadata(
     metadata_path.write_text(json.dumps(payload, ensure_ascii=True, indent=2), encoding="utf-8")
 
 
-def export_query_to_csv(sql_text: str, filename: Optional[str] = None) -> Dict[str, Any]:
+class SqlExportSink:
+    # File-like target for copy_expert: batches COPY rows into large chunks and compresses them on the way out.
+    def __init__(self, emit: Callable[[bytes], Any], compression: str = "none") -> None:
+        self._emit = emit
+        self._buffer = bytearray()
+        self._compressor = sql_export_compressor(compression)
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def write(self, data: Any) -> int:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._buffer += data
+        self.bytes_in += len(data)
+        if len(self._buffer) >= SQL_EXPORT_CHUNK_BYTES:
+            self._flush()
+        return len(data)
+
+    def _flush(self) -> None:
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        if self._compressor is not None:
+            chunk = self._compressor.compress(chunk)
+        if chunk:
+            self.bytes_out += len(chunk)
+            self._emit(chunk)
+
+    def close(self) -> None:
+        self._flush()
+        if self._compressor is not None:
+            tail = self._compressor.flush()
+            if tail:
+                self.bytes_out += len(tail)
+                self._emit(tail)
+
+
+def sql_export_compressor(compression: str) -> Any:
+    if compression == "gzip":
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+    if compression == "zstd":
+        if zstandard is None:
+            raise HTTPException(status_code=400, detail="zstd export requires the zstandard package on the server.")
+        return zstandard.ZstdCompressor(level=3).compressobj()
+    return None
+
+
+def sql_export_copy_sql(statement: str) -> str:
+    return f"COPY (SELECT * FROM ({statement}) AS sql_export_source) TO STDOUT WITH (FORMAT csv, HEADER true)"
+
+
+def prepare_sql_export_cursor(cur: Any, statement: str) -> List[str]:
+    cur.execute("SET LOCAL statement_timeout = %s", (SQL_EXPORT_TIMEOUT_MS,))
+    cur.execute("SET LOCAL lock_timeout = %s", (LOCK_TIMEOUT_MS,))
+    cur.execute(f"SELECT * FROM ({statement}) AS sql_export_source LIMIT 0")
+    if cur.description is None:
+        raise HTTPException(status_code=400, detail="CSV export query did not return a result set.")
+    return csv_export_column_names(cur.description)
+
+
+def sql_export_error(exc: Exception, *, statement: str, stage: str, **fields: Any) -> HTTPException:
+    if isinstance(exc, HTTPException):
+        return exc
+    if isinstance(exc, psycopg2.Error):
+        detail = serialize_pg_error(exc, statement=statement)
+        detail["stage"] = stage
+        detail.update(fields)
+        return HTTPException(status_code=400, detail=detail)
+    return HTTPException(
+        status_code=500,
+        detail={
+            "message": str(exc) or exc.__class__.__name__,
+            "exceptionType": exc.__class__.__name__,
+            "statement": statement,
+            "stage": stage,
+            **fields,
+        },
+    )
+
+
+def stream_query_to_csv(sql_text: str, *, filename: str, compression: str = "none") -> Generator[bytes, None, None]:
+    statement = require_exportable_select_statement(sql_text)
+    sql_export_compressor(compression)
+    chunks: "queue.Queue[Tuple[str, Any]]" = queue.Queue(maxsize=SQL_EXPORT_STREAM_QUEUE_CHUNKS)
+    cancelled = threading.Event()
+    progress = {"stage": "initializing", "rows": 0, "bytes": 0}
+
+    def put(kind: str, value: Any) -> None:
+        # A bounded queue keeps a slow download from buffering the whole result in memory.
+        deadline = time.monotonic() + SQL_EXPORT_TIMEOUT_MS / 1000.0
+        while not cancelled.is_set() and time.monotonic() < deadline:
+            try:
+                chunks.put((kind, value), timeout=0.5)
+                return
+            except queue.Full:
+                continue
+        raise RuntimeError("CSV stream was abandoned by the client.")
+
+    def produce() -> None:
+        try:
+            with db_connection(readonly=True, autocommit=False) as conn:
+                with conn.cursor() as cur:
+                    progress["stage"] = "describe_query"
+                    prepare_sql_export_cursor(cur, statement)
+                    put("ready", None)
+                    progress["stage"] = "copy_rows"
+                    sink = SqlExportSink(lambda chunk: put("data", chunk), compression)
+                    cur.copy_expert(sql_export_copy_sql(statement), sink, size=SQL_EXPORT_CHUNK_BYTES)
+                    sink.close()
+                    progress["rows"] = max(0, int(cur.rowcount or 0))
+                    progress["bytes"] = sink.bytes_out
+                conn.commit()
+            put("done", None)
+        except Exception as exc:
+            if cancelled.is_set():
+                return
+            try:
+                put("error", exc)
+            except RuntimeError:
+                return
+
+    started = time.perf_counter()
+    SQL_EXPORT_LOGGER.info("sql_export_stream_started filename=%s compression=%s", filename, compression)
+    threading.Thread(target=produce, name="datavis-sql-export-stream", daemon=True).start()
+    try:
+        kind, value = chunks.get(timeout=SQL_EXPORT_TIMEOUT_MS / 1000.0 + 5.0)
+    except queue.Empty as exc:
+        cancelled.set()
+        raise HTTPException(status_code=504, detail="CSV export query did not start before the timeout.") from exc
+    if kind == "error":
+        SQL_EXPORT_LOGGER.warning("sql_export_stream_failed filename=%s stage=%s", filename, progress["stage"], exc_info=value)
+        raise sql_export_error(value, statement=statement, stage=progress["stage"], filename=filename)
+
+    def body() -> Generator[bytes, None, None]:
+        try:
+            while True:
+                kind, value = chunks.get()
+                if kind == "data":
+                    yield value
+                elif kind == "done":
+                    SQL_EXPORT_LOGGER.info(
+                        "sql_export_stream_completed filename=%s rows=%s bytes=%s elapsed_ms=%.2f",
+                        filename,
+                        progress["rows"],
+                        progress["bytes"],
+                        elapsed_ms(started),
+                    )
+                    return
+                else:
+                    # Headers are already sent, so a mid-stream failure can only truncate the download.
+                    SQL_EXPORT_LOGGER.error(
+                        "sql_export_stream_failed filename=%s stage=%s",
+                        filename,
+                        progress["stage"],
+                        exc_info=value,
+                    )
+                    return
+        finally:
+            cancelled.set()
+
+    return body()
+
+
+def export_query_to_csv(
+    sql_text: str,
+    filename: Optional[str] = None,
+    *,
+    engine: str = "copy",
+    compression: str = "none",
+) -> Dict[str, Any]:
     statement = require_exportable_select_statement(sql_text)
+    if engine != "copy" and compression != "none":
+        raise HTTPException(status_code=400, detail="Compressed exports require the copy engine.")
+    sql_export_compressor(compression)
     SQL_EXPORT_DIR.mkdir(parents=True, exist_ok=True)
-    safe_name, export_path, relative_path = resolve_sql_export_target(filename)
+    safe_name, export_path, relative_path = resolve_sql_export_target(filename, compression)
     metadata_path, metadata_relative_path = sql_export_metadata_target(export_path, relative_path)
     download_url = "/api/sql/export-csv/{0}".format(safe_name)
     started = time.perf_counter()
     row_count = 0
+    bytes_written: Optional[int] = None
     next_progress_log_at = SQL_EXPORT_LOG_EVERY_ROWS
     active_stage = "initializing"
     cursor_name = "sql_export_{0}_{1}".format(export_path.stem[:32], secrets.token_hex(4))
     export_sql = f"SELECT * FROM ({statement}) AS sql_export_source"
-    describe_sql = f"{export_sql} LIMIT 0"
     SQL_EXPORT_LOGGER.info(
-        "sql_export_started filename=%s path=%s batch_size=%s timeout_ms=%s cursor=%s",
+        "sql_export_started filename=%s path=%s engine=%s compression=%s batch_size=%s timeout_ms=%s cursor=%s",
         safe_name,
         relative_path,
+        engine,
+        compression,
         SQL_EXPORT_BATCH_SIZE,
         SQL_EXPORT_TIMEOUT_MS,
         cursor_name,
@@ -1151,48 +1601,52 @@ def export_query_to_csv(sql_text: str, filename: Optional[str] = None) -> Dict[s
     with db_connection(readonly=True, autocommit=False) as conn:
         try:
             with conn.cursor() as settings_cur:
-                active_stage = "set_timeouts"
-                settings_cur.execute("SET LOCAL statement_timeout = %s", (SQL_EXPORT_TIMEOUT_MS,))
-                settings_cur.execute("SET LOCAL lock_timeout = %s", (LOCK_TIMEOUT_MS,))
                 active_stage = "describe_query"
-                settings_cur.execute(describe_sql)
-                if settings_cur.description is None:
-                    raise HTTPException(status_code=400, detail="CSV export query did not return a result set.")
-                column_names = csv_export_column_names(settings_cur.description)
+                column_names = prepare_sql_export_cursor(settings_cur, statement)
                 SQL_EXPORT_LOGGER.info(
                     "sql_export_query_ready filename=%s path=%s columns=%s",
                     safe_name,
                     relative_path,
                     len(column_names),
                 )
-            with conn.cursor(name=cursor_name) as cur:
-                cur.itersize = SQL_EXPORT_BATCH_SIZE
-                active_stage = "execute_query"
-                cur.execute(export_sql)
-                active_stage = "open_output"
-                with export_path.open("w", newline="", encoding="utf-8") as handle:
-                    writer = csv.writer(handle)
-                    active_stage = "write_header"
-                    writer.writerow(column_names)
-                    handle.flush()
-                    while True:
-                        active_stage = "fetch_rows"
-                        batch = cur.fetchmany(SQL_EXPORT_BATCH_SIZE)
-                        if not batch:
-                            break
-                        batch_size = len(batch)
-                        active_stage = "write_rows"
-                        writer.writerows(csv_export_row_values(row) for row in batch)
+                if engine == "copy":
+                    active_stage = "open_output"
+                    with export_path.open("wb") as handle:
+                        sink = SqlExportSink(handle.write, compression)
+                        active_stage = "copy_rows"
+                        settings_cur.copy_expert(sql_export_copy_sql(statement), sink, size=SQL_EXPORT_CHUNK_BYTES)
+                        sink.close()
+                    row_count = max(0, int(settings_cur.rowcount or 0))
+                    bytes_written = sink.bytes_out
+            if engine != "copy":
+                with conn.cursor(name=cursor_name) as cur:
+                    cur.itersize = SQL_EXPORT_BATCH_SIZE
+                    active_stage = "execute_query"
+                    cur.execute(export_sql)
+                    active_stage = "open_output"
+                    with export_path.open("w", newline="", encoding="utf-8") as handle:
+                        writer = csv.writer(handle)
+                        active_stage = "write_header"
+                        writer.writerow(column_names)
                         handle.flush()
-                        row_count += batch_size
-                        while row_count >= next_progress_log_at:
-                            SQL_EXPORT_LOGGER.info(
-                                "sql_export_progress filename=%s path=%s rows=%s",
-                                safe_name,
-                                relative_path,
-                                next_progress_log_at,
-                            )
-                            next_progress_log_at += SQL_EXPORT_LOG_EVERY_ROWS
+                        while True:
+                            active_stage = "fetch_rows"
+                            batch = cur.fetchmany(SQL_EXPORT_BATCH_SIZE)
+                            if not batch:
+                                break
+                            batch_size = len(batch)
+                            active_stage = "write_rows"
+                            writer.writerows(csv_export_row_values(row) for row in batch)
+                            handle.flush()
+                            row_count += batch_size
+                            while row_count >= next_progress_log_at:
+                                SQL_EXPORT_LOGGER.info(
+                                    "sql_export_progress filename=%s path=%s rows=%s",
+                                    safe_name,
+                                    relative_path,
+                                    next_progress_log_at,
+                                )
+                                next_progress_log_at += SQL_EXPORT_LOG_EVERY_ROWS
             conn.commit()
         except HTTPException as exc:
             conn.rollback()
@@ -1216,26 +1670,7 @@ def export_query_to_csv(sql_text: str, filename: Optional[str] = None) -> Dict[s
                 row_count,
                 active_stage,
             )
-            if isinstance(exc, psycopg2.Error):
-                detail = serialize_pg_error(exc, statement=statement)
-                detail["stage"] = active_stage
-                detail["filename"] = safe_name
-                detail["path"] = relative_path
-                raise HTTPException(
-                    status_code=400,
-                    detail=detail,
-                ) from exc
-            raise HTTPException(
-                status_code=500,
-                detail={
-                    "message": str(exc) or exc.__class__.__name__,
-                    "exceptionType": exc.__class__.__name__,
-                    "statement": statement,
-                    "stage": active_stage,
-                    "filename": safe_name,
-                    "path": relative_path,
-                },
-            ) from exc
+            raise sql_export_error(exc, statement=statement, stage=active_stage, filename=safe_name, path=relative_path) from exc
 
     active_stage = "write_metadata"
     elapsed_ms_value = elapsed_ms(started)
@@ -1248,6 +1683,9 @@ def export_query_to_csv(sql_text: str, filename: Optional[str] = None) -> Dict[s
             statement=statement,
             row_count=row_count,
             elapsed_ms_value=elapsed_ms_value,
+            engine=engine,
+            compression=compression,
+            bytes_written=bytes_written,
         )
     except Exception:
         SQL_EXPORT_LOGGER.warning(
@@ -1264,6 +1702,8 @@ def export_query_to_csv(sql_text: str, filename: Optional[str] = None) -> Dict[s
         "path": relative_path,
         "metadataPath": metadata_relative_path,
         "rows": row_count,
+        "engine": engine,
+        "compression": compression,
         "download_url": download_url,
     }
     SQL_EXPORT_LOGGER.info(
@@ -1345,62 +1785,8 @@ def load_acd_payload() -> Dict[str, Any]:
             latest = dict(cur.fetchone() or {})
             if not latest:
                 return {"available": False, "reason": "No live ticks are available."}
-            broker_day = brokerday_for_timestamp(latest["timestamp"])
-            day_start, _ = brokerday_bounds(broker_day)
-            opening_end = day_start + timedelta(minutes=30)
-            cur.execute(
-                """
-                SELECT
-                    MIN(bid) AS opening_low,
-                    MAX(ask) AS opening_high,
-                    MIN(id) AS start_tick_id,
-                    MAX(id) AS end_tick_id,
-                    COUNT(*) AS tick_count
-                FROM public.ticks
-                WHERE symbol = %s AND timestamp >= %s AND timestamp < %s
-                """,
-                (TICK_SYMBOL, day_start, opening_end),
-            )
-            opening = dict(cur.fetchone() or {})
-    opening_low = float(opening.get("opening_low") or 0.0)
-    opening_high = float(opening.get("opening_high") or 0.0)
-    if opening_high <= opening_low:
-        return {
-            "available": False,
-            "reason": "The 08:00-08:30 Sydney opening range is not complete.",
-            "brokerDay": broker_day.isoformat(),
-        }
-    opening_range = opening_high - opening_low
-    a_offset = opening_range * 0.5
-    c_offset = opening_range
-    current_mid = float(latest.get("mid") or ((float(latest["bid"]) + float(latest["ask"])) / 2.0))
-    levels = {
-        "cUp": opening_high + c_offset,
-        "aUp": opening_high + a_offset,
-        "openingHigh": opening_high,
-        "openingLow": opening_low,
-        "aDown": opening_low - a_offset,
-        "cDown": opening_low - c_offset,
-    }
-    if current_mid >= levels["aUp"]:
-        direction = "up"
-    elif current_mid <= levels["aDown"]:
-        direction = "down"
-    else:
-        direction = "neutral"
-    return {
-        "available": True,
-        "brokerDay": broker_day.isoformat(),
-        "openingStart": day_start.isoformat(),
-        "openingEnd": opening_end.isoformat(),
-        "startTickId": int(opening.get("start_tick_id") or 0),
-        "endTickId": int(opening.get("end_tick_id") or 0),
-        "tickCount": int(opening.get("tick_count") or 0),
-        "openingRange": opening_range,
-        "currentMid": current_mid,
-        "direction": direction,
-        "levels": levels,
-    }
+            opening = ACD_OPENING_RANGES.resolve(cur, latest)
+    return build_acd_payload(latest, opening)
 
 
 def query_bootstrap_rows(
@@ -1799,6 +2185,7 @@ def build_bigpicture_payload(
         "hasMoreRight": bool(global_bounds.get("lastId") and last_row and int(last_row["id"]) < int(global_bounds["lastId"])),
     }
     payload["metrics"] = serialize_metrics_payload(
+        source="bigpicture",
         fetch_ms=fetch_ms,
         serialize_ms=0.0,
         latest_row=last_row,
@@ -1837,6 +2224,7 @@ def load_bigpicture_window_payload(
     start_ts_ms: int,
     end_ts_ms: int,
     points: int,
+    conn: Optional[Any] = None,
 ) -> Dict[str, Any]:
     start_ts = ms_to_dt(start_ts_ms)
     end_ts = ms_to_dt(end_ts_ms)
@@ -1845,7 +2233,7 @@ def load_bigpicture_window_payload(
     if end_ts < start_ts:
         start_ts, end_ts = end_ts, start_ts
     fetch_started = time.perf_counter()
-    with db_connection(readonly=True) as conn:
+    with readonly_connection(conn) as conn:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
             global_bounds = query_tick_bounds(cur)
             rows, source_bounds = query_bigpicture_rows(
@@ -1929,6 +2317,41 @@ def structure_snapshot(rows: List[Dict[str, Any]], *, enabled: bool) -> Dict[str
         return empty_structure_payload()
 
 
+def sync_live_structure(cur: Any, *, after_id: int, rows: List[Dict[str, Any]]) -> None:
+    # `rows` are the ticks directly after `after_id` that the caller already fetched.
+    with LIVE_STRUCTURE_SYNC_LOCK:
+        hub_last_id = LIVE_STRUCTURE.last_tick_id
+        if hub_last_id is not None and hub_last_id < after_id:
+            gap_rows = query_rows_between(cur, hub_last_id + 1, after_id, MAX_TICK_WINDOW)
+            if len(gap_rows) < MAX_TICK_WINDOW:
+                LIVE_STRUCTURE.advance(gap_rows)
+            else:
+                hub_last_id = None
+        if hub_last_id is None:
+            LIVE_STRUCTURE.reset(query_window_ending_at(cur, after_id, MAX_TICK_WINDOW) if after_id else [])
+        LIVE_STRUCTURE.advance(rows)
+
+
+def live_structure_window_updates() -> Dict[str, List[Dict[str, Any]]]:
+    snapshot = LIVE_STRUCTURE.snapshot() or empty_structure_payload()
+    return {
+        "bars": snapshot["structureBars"],
+        "rangeBoxes": snapshot["rangeBoxes"],
+        "events": snapshot["structureEvents"],
+    }
+
+
+def live_structure_snapshot(cur: Any, rows: List[Dict[str, Any]], *, enabled: bool) -> Dict[str, Any]:
+    if not enabled or not rows:
+        return empty_structure_payload()
+    try:
+        sync_live_structure(cur, after_id=int(rows[-1]["id"]), rows=[])
+        return LIVE_STRUCTURE.snapshot(start_tick_id=int(rows[0]["id"])) or empty_structure_payload()
+    except Exception:
+        STREAM_LOGGER.exception("Shared live structure snapshot failed")
+        return structure_snapshot(rows, enabled=enabled)
+
+
 def apply_structure_flags(payload: Dict[str, Any], *, show_events: bool, show_structure: bool, show_ranges: bool) -> Dict[str, Any]:
     if not show_events:
         payload["structureEvents"] = []
@@ -1941,7 +2364,7 @@ def apply_structure_flags(payload: Dict[str, Any], *, show_events: bool, show_st
 
 def rect_snapshot_for_mode(mode: str) -> Optional[Dict[str, Any]]:
     try:
-        return RECT_PAPER_SERVICE.current_rect(mode)
+        return rect_paper_service().current_rect(mode)
     except Exception:
         return None
 
@@ -1961,14 +2384,17 @@ def build_range_payload(
     show_structure: bool,
     show_ranges: bool,
     mavg_payload: Optional[Dict[str, Any]] = None,
+    structure_payload: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     serialize_started = time.perf_counter()
     first_row = replay_rows[0] if replay_rows else None
     last_row = replay_rows[-1] if replay_rows else None
     first_row_id = first_row["id"] if first_row else None
     last_row_id = last_row["id"] if last_row else None
+    if structure_payload is None:
+        structure_payload = structure_snapshot(replay_rows, enabled=show_events or show_structure or show_ranges)
     snapshot = apply_structure_flags(
-        structure_snapshot(replay_rows, enabled=show_events or show_structure or show_ranges),
+        structure_payload,
         show_events=show_events,
         show_structure=show_structure,
         show_ranges=show_ranges,
@@ -1992,6 +2418,7 @@ def build_range_payload(
         **snapshot,
     }
     payload["metrics"] = serialize_metrics_payload(
+        source="range",
         fetch_ms=fetch_ms,
         serialize_ms=elapsed_ms(serialize_started),
         latest_row=last_row,
@@ -2039,6 +2466,11 @@ def load_bootstrap_payload(
                 end_id=replay_last_id,
                 include_configs=True,
             )
+            live_structure = (
+                live_structure_snapshot(cur, rows, enabled=show_events or show_structure or show_ranges)
+                if mode == "live"
+                else None
+            )
     payload = build_range_payload(
         mode=mode,
         window=effective_window,
@@ -2053,6 +2485,7 @@ def load_bootstrap_payload(
         show_structure=show_structure,
         show_ranges=show_ranges,
         mavg_payload=mavg_payload,
+        structure_payload=live_structure,
     )
     payload["rect"] = rect_snapshot_for_mode(mode)
     return payload
@@ -2104,6 +2537,7 @@ def load_next_payload(
         **snapshot,
         **mavg_payload,
         "metrics": serialize_metrics_payload(
+            source="next",
             fetch_ms=elapsed_ms(fetch_started),
             serialize_ms=elapsed_ms(serialize_started),
             latest_row=tick_rows[-1] if tick_rows else None,
@@ -2122,10 +2556,11 @@ def load_previous_payload(
     show_events: bool,
     show_structure: bool,
     show_ranges: bool,
+    conn: Optional[Any] = None,
 ) -> Dict[str, Any]:
     effective_limit = clamp_int(limit, 1, MAX_TICK_WINDOW)
     fetch_started = time.perf_counter()
-    with db_connection(readonly=True) as conn:
+    with readonly_connection(conn) as conn:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
             bounds_row = query_tick_bounds(cur)
             bounds = {"firstId": bounds_row.get("first_id"), "lastId": bounds_row.get("last_id")}
@@ -2163,6 +2598,7 @@ def load_previous_payload(
         **snapshot,
         **mavg_payload,
         "metrics": serialize_metrics_payload(
+            source="previous",
             fetch_ms=elapsed_ms(fetch_started),
             serialize_ms=elapsed_ms(serialize_started),
             latest_row=(replay_rows[-1] if replay_rows else (previous_rows[-1] if previous_rows else None)),
@@ -2288,8 +2724,8 @@ def query_backbone_item_count(cur: Any, *, table_name: str, day_id: int, source:
     if table_name not in {"backbonepivots", "backbonemoves"}:
         raise ValueError("Unsupported backbone table.")
     cur.execute(
-        "SELECT COUNT(*) AS row_count FROM public.{table_name} WHERE dayid = %s AND source = %s".format(table_name=table_name),
-        (day_id, source),
+        "SELECT COUNT(*) AS row_count FROM public.{table_name} WHERE dayid = %s AND source = %s AND symbol = %s".format(table_name=table_name),
+        (day_id, source, TICK_SYMBOL),
     )
     row = dict(cur.fetchone() or {})
     return int(row.get("row_count") or 0)
@@ -2308,11 +2744,12 @@ def query_backbone_last_pivot_before(
         FROM public.backbonepivots
         WHERE dayid = %s
           AND source = %s
+          AND symbol = %s
           AND tickid < %s
         ORDER BY tickid DESC, id DESC
         LIMIT 1
         """.format(select_sql=backbone_pivot_columns()),
-        (day_id, source, before_tick_id),
+        (day_id, source, TICK_SYMBOL, before_tick_id),
     )
     row = cur.fetchone()
     return dict(row) if row else None
@@ -2332,11 +2769,12 @@ def query_backbone_pivots_in_range(
         FROM public.backbonepivots
         WHERE dayid = %s
           AND source = %s
+          AND symbol = %s
           AND tickid >= %s
           AND tickid <= %s
         ORDER BY tickid ASC, id ASC
         """.format(select_sql=backbone_pivot_columns()),
-        (day_id, source, start_id, end_id),
+        (day_id, source, TICK_SYMBOL, start_id, end_id),
     )
     return [dict(row) for row in cur.fetchall()]
 
@@ -2388,63 +2826,61 @@ def query_backbone_candles(
     source: str,
     start_id: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
-    select_sql = backbone_move_columns()
+    # Stored ranges serve every backfilled move; rows written before the highprice/lowprice
+    # columns still scan their ticks until backfill-move-ranges reaches them.
+    select_sql = ", ".join("m." + column.strip() for column in backbone_move_columns().split(","))
+    range_sql = """
+        COALESCE(m.highprice, agg.highprice, GREATEST(m.startprice, m.endprice)) AS highprice,
+        COALESCE(m.lowprice, agg.lowprice, LEAST(m.startprice, m.endprice)) AS lowprice
+    """
+    fallback_sql = """
+        LEFT JOIN LATERAL (
+            SELECT
+                MAX(COALESCE(t.mid, (t.bid + t.ask) / 2.0)) AS highprice,
+                MIN(COALESCE(t.mid, (t.bid + t.ask) / 2.0)) AS lowprice
+            FROM public.ticks t
+            WHERE m.highprice IS NULL
+              AND t.symbol = %s
+              AND t.id >= m.starttickid
+              AND t.id <= m.endtickid
+        ) agg ON TRUE
+    """
     if start_id is None:
         cur.execute(
             """
-            SELECT
-                m.*,
-                COALESCE(agg.highprice, GREATEST(m.startprice, m.endprice)) AS highprice,
-                COALESCE(agg.lowprice, LEAST(m.startprice, m.endprice)) AS lowprice
+            SELECT {select_sql}, {range_sql}
             FROM (
-                SELECT {select_sql}
+                SELECT *
                 FROM public.backbonemoves
                 WHERE dayid = %s
                   AND source = %s
+                  AND symbol = %s
                 ORDER BY endtickid DESC, id DESC
                 LIMIT %s
             ) m
-            LEFT JOIN LATERAL (
-                SELECT
-                    MAX(COALESCE(t.mid, (t.bid + t.ask) / 2.0)) AS highprice,
-                    MIN(COALESCE(t.mid, (t.bid + t.ask) / 2.0)) AS lowprice
-                FROM public.ticks t
-                WHERE t.symbol = %s
-                  AND t.id >= m.starttickid
-                  AND t.id <= m.endtickid
-            ) agg ON TRUE
+            {fallback_sql}
             ORDER BY m.endtickid ASC, m.id ASC
-            """.format(select_sql=select_sql),
-            (day_id, source, limit, TICK_SYMBOL),
+            """.format(select_sql=select_sql, range_sql=range_sql, fallback_sql=fallback_sql),
+            (day_id, source, TICK_SYMBOL, limit, TICK_SYMBOL),
         )
     else:
         cur.execute(
             """
-            SELECT
-                m.*,
-                COALESCE(agg.highprice, GREATEST(m.startprice, m.endprice)) AS highprice,
-                COALESCE(agg.lowprice, LEAST(m.startprice, m.endprice)) AS lowprice
+            SELECT {select_sql}, {range_sql}
             FROM (
-                SELECT {select_sql}
+                SELECT *
                 FROM public.backbonemoves
                 WHERE dayid = %s
                   AND source = %s
+                  AND symbol = %s
                   AND endtickid >= %s
                 ORDER BY endtickid ASC, id ASC
                 LIMIT %s
             ) m
-            LEFT JOIN LATERAL (
-                SELECT
-                    MAX(COALESCE(t.mid, (t.bid + t.ask) / 2.0)) AS highprice,
-                    MIN(COALESCE(t.mid, (t.bid + t.ask) / 2.0)) AS lowprice
-                FROM public.ticks t
-                WHERE t.symbol = %s
-                  AND t.id >= m.starttickid
-                  AND t.id <= m.endtickid
-            ) agg ON TRUE
+            {fallback_sql}
             ORDER BY m.endtickid ASC, m.id ASC
-            """.format(select_sql=select_sql),
-            (day_id, source, start_id, limit, TICK_SYMBOL),
+            """.format(select_sql=select_sql, range_sql=range_sql, fallback_sql=fallback_sql),
+            (day_id, source, TICK_SYMBOL, start_id, limit, TICK_SYMBOL),
         )
     return [dict(row) for row in cur.fetchall()]
 
@@ -2489,6 +2925,7 @@ def build_backbone_candles_payload(
         "lastId": last_id,
     }
     payload["metrics"] = serialize_metrics_payload(
+        source="backbone_candles",
         fetch_ms=fetch_ms,
         serialize_ms=elapsed_ms(serialize_started),
         latest_row={"id": last_id, "timestamp": candles[-1].get("endtime")} if candles else None,
@@ -2496,12 +2933,12 @@ def build_backbone_candles_payload(
     return payload
 
 
-def load_backbone_candles_payload(*, count: int, start_id: Optional[int], layer: str) -> Dict[str, Any]:
+def load_backbone_candles_payload(*, count: int, start_id: Optional[int], layer: str, conn: Optional[Any] = None) -> Dict[str, Any]:
     layer = normalize_backbone_layer(layer)
     source = BACKBONE_LAYER_SOURCES[layer]
     effective_count = clamp_int(count, 1, MAX_BACKBONE_CANDLE_COUNT)
     fetch_started = time.perf_counter()
-    with db_connection(readonly=True) as conn:
+    with readonly_connection(conn) as conn:
         if start_id is None:
             dayref = resolve_current_backbone_day_ref(conn, symbol=TICK_SYMBOL)
             if dayref is None:
@@ -2540,6 +2977,101 @@ def load_backbone_candles_payload(*, count: int, start_id: Optional[int], layer:
     )
 
 
+def query_backbone_day_summaries(cur: Any, *, symbol: str, source: str, days: int, end: Optional[date]) -> List[Dict[str, Any]]:
+    cur.execute(
+        """
+        SELECT *
+        FROM (
+            SELECT *
+            FROM public.backbonedaysummary
+            WHERE symbol = %s
+              AND source = %s
+              AND (%s::date IS NULL OR brokerday <= %s::date)
+            ORDER BY brokerday DESC
+            LIMIT %s
+        ) d
+        ORDER BY d.brokerday ASC
+        """,
+        (symbol, source, end, end, days),
+    )
+    return [dict(row) for row in cur.fetchall()]
+
+
+def serialize_backbone_day_summary_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    def optional_float(name: str) -> Optional[float]:
+        return float(row[name]) if row.get(name) is not None else None
+
+    return {
+        "dayId": int(row.get("dayid") or 0),
+        "brokerday": serialize_value(row.get("brokerday")),
+        "firstMoveTimeMs": dt_to_ms(row.get("firstmovetime")),
+        "lastMoveTimeMs": dt_to_ms(row.get("lastmovetime")),
+        "pivotCount": int(row.get("pivotcount") or 0),
+        "moveCount": int(row.get("movecount") or 0),
+        "upMoveCount": int(row.get("upmovecount") or 0),
+        "downMoveCount": int(row.get("downmovecount") or 0),
+        "avgMoveSize": optional_float("avgmovesize"),
+        "maxMoveSize": optional_float("maxmovesize"),
+        "avgMoveSeconds": optional_float("avgmoveseconds"),
+        "avgMoveTicks": optional_float("avgmoveticks"),
+        "thresholdP10": optional_float("thresholdp10"),
+        "thresholdP50": optional_float("thresholdp50"),
+        "thresholdP90": optional_float("thresholdp90"),
+        "open": optional_float("dayopen"),
+        "high": optional_float("dayhigh"),
+        "low": optional_float("daylow"),
+        "close": optional_float("dayclose"),
+        "updatedAt": serialize_value(row.get("updatedat")),
+    }
+
+
+def summarize_backbone_overview(days: List[Dict[str, Any]]) -> Dict[str, Any]:
+    move_count = sum(day["moveCount"] for day in days)
+    sized = [day for day in days if day["avgMoveSize"] is not None and day["moveCount"]]
+    highs = [day["high"] for day in days if day["high"] is not None]
+    lows = [day["low"] for day in days if day["low"] is not None]
+    return {
+        "dayCount": len(days),
+        "moveCount": move_count,
+        "movesPerDay": round(move_count / len(days), 2) if days else None,
+        # Weighted by each day's move count, so it equals the mean over every move in the window.
+        "avgMoveSize": sum(day["avgMoveSize"] * day["moveCount"] for day in sized) / sum(day["moveCount"] for day in sized) if sized else None,
+        "high": max(highs) if highs else None,
+        "low": min(lows) if lows else None,
+    }
+
+
+def load_backbone_overview_payload(*, days: int, layer: str, end: Optional[date]) -> Dict[str, Any]:
+    layer = normalize_backbone_layer(layer)
+    source = BACKBONE_LAYER_SOURCES[layer]
+    effective_days = clamp_int(days, 1, MAX_BACKBONE_OVERVIEW_DAYS)
+    fetch_started = time.perf_counter()
+    with db_connection(readonly=True) as conn:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            rows = query_backbone_day_summaries(cur, symbol=TICK_SYMBOL, source=source, days=effective_days, end=end)
+    fetch_ms = elapsed_ms(fetch_started)
+    serialize_started = time.perf_counter()
+    serialized = [serialize_backbone_day_summary_row(row) for row in rows]
+    payload = {
+        "view": "overview",
+        "layer": layer,
+        "layerLabel": BACKBONE_LAYER_LABELS[layer],
+        "symbol": TICK_SYMBOL,
+        "source": source,
+        "requestedDays": effective_days,
+        "end": serialize_value(end),
+        "days": serialized,
+        "summary": summarize_backbone_overview(serialized),
+    }
+    payload["metrics"] = serialize_metrics_payload(
+        source="backbone_overview",
+        fetch_ms=fetch_ms,
+        serialize_ms=elapsed_ms(serialize_started),
+        latest_row=None,
+    )
+    return payload
+
+
 def build_backbone_detail_payload(
     *,
     dayref: Any,
@@ -2584,6 +3116,7 @@ def build_backbone_detail_payload(
         "liveLeg": live_leg,
     }
     payload["metrics"] = serialize_metrics_payload(
+        source="backbone_detail",
         fetch_ms=fetch_ms,
         serialize_ms=elapsed_ms(serialize_started),
         latest_row=tick_rows[-1] if tick_rows else None,
@@ -2591,10 +3124,10 @@ def build_backbone_detail_payload(
     return payload
 
 
-def load_backbone_detail_payload(*, ticks: int, start_id: Optional[int]) -> Dict[str, Any]:
+def load_backbone_detail_payload(*, ticks: int, start_id: Optional[int], conn: Optional[Any] = None) -> Dict[str, Any]:
     effective_ticks = clamp_int(ticks, 1, MAX_TICK_WINDOW)
     fetch_started = time.perf_counter()
-    with db_connection(readonly=True) as conn:
+    with readonly_connection(conn) as conn:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
             if start_id is None:
                 dayref = resolve_current_backbone_day_ref(conn, symbol=TICK_SYMBOL)
@@ -2680,9 +3213,10 @@ def query_backbone_pivots_for_day(cur: Any, *, day_id: int, source: str = BACKBO
         FROM public.backbonepivots
         WHERE dayid = %s
           AND source = %s
+          AND symbol = %s
         ORDER BY tickid ASC, id ASC
         """.format(select_sql=backbone_pivot_columns()),
-        (day_id, source),
+        (day_id, source, TICK_SYMBOL),
     )
     return [dict(row) for row in cur.fetchall()]
 
@@ -2694,9 +3228,10 @@ def query_backbone_moves_for_day(cur: Any, *, day_id: int, source: str = BACKBON
         FROM public.backbonemoves
         WHERE dayid = %s
           AND source = %s
+          AND symbol = %s
         ORDER BY endtickid ASC, id ASC
         """.format(select_sql=backbone_move_columns()),
-        (day_id, source),
+        (day_id, source, TICK_SYMBOL),
     )
     return [dict(row) for row in cur.fetchall()]
 
@@ -2715,11 +3250,12 @@ def query_backbone_pivots_from(
         FROM public.backbonepivots
         WHERE dayid = %s
           AND source = %s
+          AND symbol = %s
           AND tickid >= %s
         ORDER BY tickid ASC, id ASC
         LIMIT %s
         """.format(select_sql=backbone_pivot_columns()),
-        (day_id, source, start_id, limit),
+        (day_id, source, TICK_SYMBOL, start_id, limit),
     )
     return [dict(row) for row in cur.fetchall()]
 
@@ -2738,11 +3274,12 @@ def query_backbone_moves_from(
         FROM public.backbonemoves
         WHERE dayid = %s
           AND source = %s
+          AND symbol = %s
           AND endtickid >= %s
         ORDER BY endtickid ASC, id ASC
         LIMIT %s
         """.format(select_sql=backbone_move_columns()),
-        (day_id, source, start_id, limit),
+        (day_id, source, TICK_SYMBOL, start_id, limit),
     )
     return [dict(row) for row in cur.fetchall()]
 
@@ -2763,11 +3300,12 @@ def query_backbone_pivots_after(
             FROM public.backbonepivots
             WHERE dayid = %s
               AND source = %s
+              AND symbol = %s
               AND tickid > %s
             ORDER BY tickid ASC, id ASC
             LIMIT %s
             """.format(select_sql=backbone_pivot_columns()),
-            (day_id, source, after_id, limit),
+            (day_id, source, TICK_SYMBOL, after_id, limit),
         )
     else:
         cur.execute(
@@ -2776,12 +3314,13 @@ def query_backbone_pivots_after(
             FROM public.backbonepivots
             WHERE dayid = %s
               AND source = %s
+              AND symbol = %s
               AND tickid > %s
               AND tickid <= %s
             ORDER BY tickid ASC, id ASC
             LIMIT %s
             """.format(select_sql=backbone_pivot_columns()),
-            (day_id, source, after_id, end_id, limit),
+            (day_id, source, TICK_SYMBOL, after_id, end_id, limit),
         )
     return [dict(row) for row in cur.fetchall()]
 
@@ -2802,11 +3341,12 @@ def query_backbone_moves_after(
             FROM public.backbonemoves
             WHERE dayid = %s
               AND source = %s
+              AND symbol = %s
               AND endtickid > %s
             ORDER BY endtickid ASC, id ASC
             LIMIT %s
             """.format(select_sql=backbone_move_columns()),
-            (day_id, source, after_id, limit),
+            (day_id, source, TICK_SYMBOL, after_id, limit),
         )
     else:
         cur.execute(
@@ -2815,16 +3355,78 @@ def query_backbone_moves_after(
             FROM public.backbonemoves
             WHERE dayid = %s
               AND source = %s
+              AND symbol = %s
               AND endtickid > %s
               AND endtickid <= %s
             ORDER BY endtickid ASC, id ASC
             LIMIT %s
             """.format(select_sql=backbone_move_columns()),
-            (day_id, source, after_id, end_id, limit),
+            (day_id, source, TICK_SYMBOL, after_id, end_id, limit),
         )
     return [dict(row) for row in cur.fetchall()]
 
 
+def query_backbone_pivots_after_row(
+    cur: Any,
+    *,
+    day_id: int,
+    after_row_id: int,
+    limit: int,
+    source: str = BACKBONE_SOURCE,
+) -> List[Dict[str, Any]]:
+    cur.execute(
+        """
+        SELECT {select_sql}
+        FROM public.backbonepivots
+        WHERE dayid = %s
+          AND source = %s
+          AND symbol = %s
+          AND id > %s
+        ORDER BY id ASC
+        LIMIT %s
+        """.format(select_sql=backbone_pivot_columns()),
+        (day_id, source, TICK_SYMBOL, after_row_id, limit),
+    )
+    return [dict(row) for row in cur.fetchall()]
+
+
+def query_backbone_moves_after_row(
+    cur: Any,
+    *,
+    day_id: int,
+    after_row_id: int,
+    limit: int,
+    source: str = BACKBONE_SOURCE,
+) -> List[Dict[str, Any]]:
+    cur.execute(
+        """
+        SELECT {select_sql}
+        FROM public.backbonemoves
+        WHERE dayid = %s
+          AND source = %s
+          AND symbol = %s
+          AND id > %s
+        ORDER BY id ASC
+        LIMIT %s
+        """.format(select_sql=backbone_move_columns()),
+        (day_id, source, TICK_SYMBOL, after_row_id, limit),
+    )
+    return [dict(row) for row in cur.fetchall()]
+
+
+def query_backbone_max_row_ids(cur: Any, *, day_id: int, source: str = BACKBONE_SOURCE) -> Tuple[int, int]:
+    cur.execute(
+        """
+        SELECT
+            (SELECT COALESCE(MAX(id), 0) FROM public.backbonepivots WHERE dayid = %s AND source = %s AND symbol = %s) AS pivotid,
+            (SELECT COALESCE(MAX(id), 0) FROM public.backbonemoves WHERE dayid = %s AND source = %s AND symbol = %s) AS moveid
+        """,
+        (day_id, source, TICK_SYMBOL, day_id, source, TICK_SYMBOL),
+    )
+    row = cur.fetchone()
+    return int(row["pivotid"] or 0), int(row["moveid"] or 0)
+
+
 def build_backbone_payload(
     *,
     mode: str,
@@ -2885,6 +3487,7 @@ def build_backbone_payload(
     }
     latest_row = tick_rows[-1] if tick_rows else {"id": last_id, "timestamp": tick_bounds.get("last_timestamp")}
     payload["metrics"] = serialize_metrics_payload(
+        source="backbone",
         fetch_ms=fetch_ms,
         serialize_ms=elapsed_ms(serialize_started),
         latest_row=latest_row,
@@ -3006,7 +3609,7 @@ def load_backbone_next_payload(
                     "endId": end_id,
                     "endReached": False,
                     "state": None,
-                    "metrics": serialize_metrics_payload(fetch_ms=elapsed_ms(fetch_started), serialize_ms=0.0, latest_row=None),
+                    "metrics": serialize_metrics_payload(source="backbone_next", fetch_ms=elapsed_ms(fetch_started), serialize_ms=0.0, latest_row=None),
                 }
             resolved_day_id = dayref.dayid
             brokerday = dayref.brokerday
@@ -3035,6 +3638,7 @@ def load_backbone_next_payload(
         "endReached": bool(end_id is not None and last_id >= end_id),
         "state": serialize_backbone_state_row(state_row, brokerday=brokerday, day_id=resolved_day_id),
         "metrics": serialize_metrics_payload(
+            source="backbone_next",
             fetch_ms=elapsed_ms(fetch_started),
             serialize_ms=0.0,
             latest_row=(tick_rows[-1] if tick_rows else {"id": last_id, "timestamp": state_row.get("updatedat") if state_row else None}),
@@ -3042,132 +3646,433 @@ def load_backbone_next_payload(
     }
 
 
-def stream_backbone_events(
-    *,
-    after_id: int,
-    limit: int,
-    show_ticks: bool,
-) -> Generator[str, None, None]:
-    last_id = max(0, after_id)
-    effective_limit = clamp_int(limit, 1, MAX_STREAM_BATCH)
-    last_heartbeat = time.monotonic()
-    idle_sleep = STREAM_POLL_SECONDS
-    active_day_id: Optional[int] = None
-    try:
-        with db_connection(readonly=True, autocommit=True) as conn:
-            while True:
-                dayref = resolve_current_backbone_day_ref(conn, symbol=TICK_SYMBOL)
-                if dayref is None:
-                    if time.monotonic() - last_heartbeat >= STREAM_HEARTBEAT_SECONDS:
-                        payload = {
-                            "dayId": None,
-                            "brokerday": None,
-                            "pivotUpdates": [],
-                            "moveUpdates": [],
-                            "rows": [],
-                            "rowCount": 0,
-                            "lastId": last_id,
-                            "streamMode": "heartbeat",
-                            "state": None,
-                            **serialize_metrics_payload(fetch_ms=0.0, serialize_ms=0.0, latest_row=None),
-                        }
-                        yield format_sse(payload, event_name="heartbeat")
-                        last_heartbeat = time.monotonic()
-                    time.sleep(idle_sleep)
-                    idle_sleep = STREAM_IDLE_POLL_SECONDS
-                    continue
+def range_cache_etag(key: str, version: str) -> str:
+    digest = hashlib.sha256("{0}|{1}".format(key, version).encode("utf-8")).hexdigest()[:32]
+    return '"{0}"'.format(digest)
 
-                if active_day_id is None:
-                    active_day_id = dayref.dayid
-                elif dayref.dayid != active_day_id:
-                    active_day_id = dayref.dayid
-                    last_id = 0
-                    state_row = load_backbone_state_row(conn, symbol=TICK_SYMBOL, dayid=dayref.dayid)
-                    payload = {
-                        "dayId": dayref.dayid,
-                        "brokerday": serialize_value(dayref.brokerday),
-                        "dayChanged": True,
-                        "pivotUpdates": [],
-                        "moveUpdates": [],
-                        "rows": [],
-                        "rowCount": 0,
-                        "lastId": 0,
-                        "streamMode": "reset",
-                        "state": serialize_backbone_state_row(state_row, brokerday=dayref.brokerday, day_id=dayref.dayid),
-                        **serialize_metrics_payload(fetch_ms=0.0, serialize_ms=0.0, latest_row=None),
-                    }
-                    yield format_sse(payload)
-                    last_heartbeat = time.monotonic()
-                    idle_sleep = STREAM_POLL_SECONDS
-                    continue
 
-                state_row = load_backbone_state_row(conn, symbol=TICK_SYMBOL, dayid=dayref.dayid)
-                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                    fetch_started = time.perf_counter()
-                    pivot_rows = query_backbone_pivots_after(cur, day_id=dayref.dayid, after_id=last_id, limit=effective_limit)
-                    move_rows = query_backbone_moves_after(cur, day_id=dayref.dayid, after_id=last_id, limit=effective_limit)
-                    tick_rows = query_rows_after(cur, last_id, effective_limit) if show_ticks else []
-                    fetch_ms = elapsed_ms(fetch_started)
-
-                if pivot_rows or move_rows or tick_rows:
-                    last_id = max(
-                        [last_id]
-                        + [int(row.get("tickid") or 0) for row in pivot_rows]
-                        + [int(row.get("endtickid") or 0) for row in move_rows]
-                        + [int(row.get("id") or 0) for row in tick_rows]
-                    )
-                    payload = {
-                        "dayId": dayref.dayid,
-                        "brokerday": serialize_value(dayref.brokerday),
-                        "pivotUpdates": serialize_backbone_pivot_rows(pivot_rows),
-                        "pivotCount": len(pivot_rows),
-                        "moveUpdates": serialize_backbone_move_rows(move_rows),
-                        "moveCount": len(move_rows),
-                        "rows": serialize_tick_rows(tick_rows) if show_ticks else [],
-                        "rowCount": len(tick_rows) if show_ticks else 0,
-                        "lastId": last_id,
-                        "streamMode": "delta",
-                        "state": serialize_backbone_state_row(state_row, brokerday=dayref.brokerday, day_id=dayref.dayid),
-                        **serialize_metrics_payload(
-                            fetch_ms=fetch_ms,
-                            serialize_ms=0.0,
-                            latest_row=(tick_rows[-1] if tick_rows else {"id": last_id, "timestamp": state_row.get("updatedat") if state_row else None}),
-                        ),
-                    }
-                    yield format_sse(payload)
-                    last_heartbeat = time.monotonic()
-                    idle_sleep = STREAM_POLL_SECONDS
-                    continue
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match") or ""
+    candidates = [item.strip() for item in header.split(",") if item.strip()]
+    return "*" in candidates or etag in candidates or "W/{0}".format(etag) in candidates
 
-                now = time.monotonic()
-                if now - last_heartbeat >= STREAM_HEARTBEAT_SECONDS:
-                    payload = {
-                        "dayId": dayref.dayid,
-                        "brokerday": serialize_value(dayref.brokerday),
-                        "pivotUpdates": [],
-                        "moveUpdates": [],
-                        "rows": [],
-                        "rowCount": 0,
-                        "lastId": last_id,
-                        "streamMode": "heartbeat",
-                        "state": serialize_backbone_state_row(state_row, brokerday=dayref.brokerday, day_id=dayref.dayid),
-                        **serialize_metrics_payload(
-                            fetch_ms=0.0,
-                            serialize_ms=0.0,
-                            latest_row={"id": last_id, "timestamp": state_row.get("updatedat") if state_row else None},
-                        ),
-                    }
-                    yield format_sse(payload, event_name="heartbeat")
-                    last_heartbeat = now
-                time.sleep(idle_sleep)
-                idle_sleep = STREAM_IDLE_POLL_SECONDS
-    except GeneratorExit:
+
+def range_cache_get(etag: str) -> Optional[bytes]:
+    with RANGE_CACHE_LOCK:
+        body = RANGE_CACHE.get(etag)
+        if body is not None:
+            RANGE_CACHE.move_to_end(etag)
+        return body
+
+
+def range_cache_put(etag: str, body: bytes) -> None:
+    if RANGE_CACHE_MAX_ENTRIES <= 0:
         return
+    with RANGE_CACHE_LOCK:
+        RANGE_CACHE[etag] = body
+        RANGE_CACHE.move_to_end(etag)
+        while len(RANGE_CACHE) > RANGE_CACHE_MAX_ENTRIES:
+            RANGE_CACHE.popitem(last=False)
 
 
-def stream_events(
+def clear_range_cache() -> None:
+    with RANGE_CACHE_LOCK:
+        RANGE_CACHE.clear()
+
+
+def cached_range_response(
+    request: Request,
     *,
-    after_id: int,
+    key: str,
+    version: Optional[str],
+    build: Callable[[], Dict[str, Any]],
+) -> Any:
+    if version is None:
+        return build()
+    etag = range_cache_etag(key, version)
+    headers = {"ETag": etag, "Cache-Control": RANGE_CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    body = range_cache_get(etag)
+    if body is None:
+        body = fast_json_dumps(build())
+        range_cache_put(etag, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+class CoalescedCall:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.body: Optional[bytes] = None
+        self.error: Optional[BaseException] = None
+
+
+def coalesce_key(endpoint: str, **params: Any) -> str:
+    return "{0}?{1}".format(endpoint, json.dumps(params, sort_keys=True, default=str, separators=(",", ":")))
+
+
+def coalesced_json_response(*, endpoint: str, key: str, ttl_seconds: float, build: Callable[[], Dict[str, Any]]) -> Response:
+    now = time.monotonic()
+    with COALESCE_LOCK:
+        cached = COALESCE_RESULTS.get(key)
+        call = COALESCE_INFLIGHT.get(key)
+        leader = call is None and not (cached and cached[0] > now)
+        if leader:
+            call = CoalescedCall()
+            COALESCE_INFLIGHT[key] = call
+    if call is None:
+        COALESCED_REQUESTS.labels(endpoint, "cached").inc()
+        return Response(content=cached[1], media_type="application/json")
+
+    if leader:
+        COALESCED_REQUESTS.labels(endpoint, "leader").inc()
+        try:
+            call.body = fast_json_dumps(build())
+        except BaseException as exc:
+            call.error = exc
+        finally:
+            with COALESCE_LOCK:
+                COALESCE_INFLIGHT.pop(key, None)
+                finished = time.monotonic()
+                for stale in [item for item, (expires, _) in COALESCE_RESULTS.items() if expires <= finished]:
+                    COALESCE_RESULTS.pop(stale, None)
+                if call.error is None and ttl_seconds > 0:
+                    COALESCE_RESULTS[key] = (finished + ttl_seconds, call.body)
+            call.done.set()
+    elif call.done.wait(COALESCE_WAIT_SECONDS):
+        COALESCED_REQUESTS.labels(endpoint, "follower").inc()
+    else:
+        # A stuck leader must not hold every follower hostage; compute independently instead.
+        COALESCED_REQUESTS.labels(endpoint, "timeout").inc()
+        return Response(content=fast_json_dumps(build()), media_type="application/json")
+    if call.error is not None:
+        raise call.error
+    return Response(content=call.body, media_type="application/json")
+
+
+def query_mavg_cache_version(cur: Any) -> Dict[str, Any]:
+    cur.execute(
+        """
+        SELECT
+            (SELECT COUNT(*) FROM public.mavgconfig) AS config_count,
+            (SELECT MAX(updatedat) FROM public.mavgconfig) AS config_updatedat,
+            (SELECT MIN(lasttickid) FROM public.mavgstate WHERE symbol = %s) AS last_tick_id,
+            (SELECT MIN(lastticktime) FROM public.mavgstate WHERE symbol = %s) AS last_tick_time
+        """,
+        (TICK_SYMBOL, TICK_SYMBOL),
+    )
+    return dict(cur.fetchone() or {})
+
+
+def tick_range_cache_version(conn: Any, *, range_end_id: Optional[int] = None, range_end_ts: Optional[datetime] = None) -> Optional[str]:
+    # Runs on the request's own connection, which the payload build reuses on a cache miss.
+    try:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            bounds = query_tick_bounds(cur)
+            mavg = query_mavg_cache_version(cur)
+    except Exception:
+        PERF_LOGGER.exception("Range cache version lookup failed")
+        conn.rollback()
+        return None
+    last_id = int(bounds.get("last_id") or 0)
+    last_ts_ms = dt_to_ms(bounds.get("last_timestamp")) or 0
+    mavg_tick_id = int(mavg.get("last_tick_id") or 0)
+    mavg_tick_ms = dt_to_ms(mavg.get("last_tick_time")) or 0
+    if range_end_id is not None:
+        tick_part = "sealed" if last_id > range_end_id else str(last_id)
+        mavg_part = "sealed" if mavg_tick_id >= range_end_id else str(mavg_tick_id)
+    else:
+        end_ms = dt_to_ms(range_end_ts) or 0
+        tick_part = "sealed" if last_ts_ms > end_ms else str(last_id)
+        mavg_part = "sealed" if mavg_tick_ms >= end_ms else str(mavg_tick_ms)
+    return "{0}:{1}:{2}:{3}:{4}".format(
+        bounds.get("first_id"),
+        tick_part,
+        mavg_part,
+        mavg.get("config_count"),
+        dt_to_ms(mavg.get("config_updatedat")),
+    )
+
+
+def backbone_range_cache_version(conn: Any, *, start_id: Optional[int], source: str) -> Optional[str]:
+    try:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            latest_row = query_latest_tick(cur)
+            tick_row = query_tick_by_id(cur, start_id) if start_id is not None else None
+        if start_id is not None:
+            if tick_row is None:
+                return None
+            dayref = resolve_backbone_day_ref_for_timestamp(conn, symbol=TICK_SYMBOL, timestamp=tick_row["timestamp"])
+        else:
+            dayref = resolve_current_backbone_day_ref(conn, symbol=TICK_SYMBOL)
+        if dayref is None:
+            return None
+        state_row = load_backbone_state_row(conn, symbol=TICK_SYMBOL, dayid=dayref.dayid, source=source)
+    except Exception:
+        PERF_LOGGER.exception("Backbone range cache version lookup failed")
+        conn.rollback()
+        return None
+    latest_ts = latest_row.get("timestamp") if latest_row else None
+    day_open = latest_ts is None or latest_ts < dayref.endtime
+    return "{0}:{1}:{2}:{3}".format(
+        dayref.dayid,
+        int((state_row or {}).get("lastprocessedtickid") or 0),
+        dt_to_ms((state_row or {}).get("updatedat")),
+        int(latest_row["id"]) if day_open and latest_row else "sealed",
+    )
+
+
+def backbone_stream_payload(
+    cursor: Dict[str, Any],
+    *,
+    stream_mode: str,
+    pivot_rows: Optional[List[Dict[str, Any]]] = None,
+    move_rows: Optional[List[Dict[str, Any]]] = None,
+    tick_rows: Optional[List[Dict[str, Any]]] = None,
+    fetch_ms: float = 0.0,
+) -> Dict[str, Any]:
+    pivot_rows = pivot_rows or []
+    move_rows = move_rows or []
+    tick_rows = tick_rows or []
+    payload = {
+        "dayId": cursor.get("dayId"),
+        "brokerday": cursor.get("brokerday"),
+        "pivotUpdates": serialize_backbone_pivot_rows(pivot_rows),
+        "pivotCount": len(pivot_rows),
+        "moveUpdates": serialize_backbone_move_rows(move_rows),
+        "moveCount": len(move_rows),
+        "rows": serialize_tick_rows(tick_rows),
+        "rowCount": len(tick_rows),
+        "lastId": int(cursor.get("lastId") or 0),
+        "streamMode": stream_mode,
+        "state": cursor.get("state"),
+        **serialize_metrics_payload(
+            source="backbone_stream",
+            fetch_ms=fetch_ms,
+            serialize_ms=0.0,
+            latest_row=(tick_rows[-1] if tick_rows else {"id": cursor.get("lastId"), "timestamp": cursor.get("updatedAt")}),
+        ),
+    }
+    if stream_mode == "reset":
+        payload["dayChanged"] = True
+    return payload
+
+
+def backbone_feed_cursor(
+    dayref: Any,
+    state_row: Optional[Dict[str, Any]],
+    *,
+    pivot_row_id: int,
+    move_row_id: int,
+    last_id: int,
+) -> Dict[str, Any]:
+    return {
+        "dayId": dayref.dayid,
+        "brokerday": serialize_value(dayref.brokerday),
+        "pivotRowId": pivot_row_id,
+        "moveRowId": move_row_id,
+        "lastId": last_id,
+        "state": serialize_backbone_state_row(state_row, brokerday=dayref.brokerday, day_id=dayref.dayid),
+        "updatedAt": state_row.get("updatedat") if state_row else None,
+    }
+
+
+def backbone_feed_prime(conn: Any) -> Dict[str, Any]:
+    dayref = resolve_current_backbone_day_ref(conn, symbol=TICK_SYMBOL)
+    if dayref is None:
+        return {"dayId": None, "brokerday": None, "pivotRowId": 0, "moveRowId": 0, "lastId": 0, "state": None, "updatedAt": None}
+    state_row = load_backbone_state_row(conn, symbol=TICK_SYMBOL, dayid=dayref.dayid)
+    with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+        pivot_row_id, move_row_id = query_backbone_max_row_ids(cur, day_id=dayref.dayid)
+    return backbone_feed_cursor(
+        dayref,
+        state_row,
+        pivot_row_id=pivot_row_id,
+        move_row_id=move_row_id,
+        last_id=int(state_row.get("lastprocessedtickid") or 0) if state_row else 0,
+    )
+
+
+def backbone_feed_day_ref(conn: Any, cursor: Dict[str, Any], notifications: List[Dict[str, Any]]) -> Any:
+    # The worker names the day it just committed, which the shared cache answers without a query;
+    # only the periodic safety read has to look up the latest tick.
+    mine = [item for item in notifications if item.get("symbol") == TICK_SYMBOL and item.get("brokerday")]
+    if any(item.get("reset") for item in mine):
+        # A rebuild is how operators apply corrected days rows, so drop what this process cached.
+        DAY_REFS.invalidate(TICK_SYMBOL)
+    # Range rebuilds of past days notify too; they must not pull the live stream backwards.
+    current = [item["brokerday"] for item in mine if not cursor.get("brokerday") or str(item["brokerday"]) >= str(cursor["brokerday"])]
+    if current:
+        return resolve_backbone_day_ref_for_brokerday(conn, symbol=TICK_SYMBOL, brokerday=date.fromisoformat(max(map(str, current))))
+    return resolve_current_backbone_day_ref(conn, symbol=TICK_SYMBOL)
+
+
+def backbone_feed_load(
+    conn: Any,
+    cursor: Dict[str, Any],
+    notifications: List[Dict[str, Any]],
+    wants_ticks: bool,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Read everything the worker committed past the feed cursor, once for all subscribers."""
+    if notifications and not any(item.get("symbol") == TICK_SYMBOL for item in notifications):
+        # One worker notifies for every symbol it runs; commits for other instruments cost this process no reads.
+        return [], cursor
+    dayref = backbone_feed_day_ref(conn, cursor, notifications)
+    if dayref is None:
+        return [], cursor
+    payloads: List[Dict[str, Any]] = []
+    state_row = load_backbone_state_row(conn, symbol=TICK_SYMBOL, dayid=dayref.dayid)
+    rebuilt = any(item.get("reset") and item.get("dayId") == dayref.dayid for item in notifications)
+    if rebuilt or cursor.get("dayId") != dayref.dayid:
+        # Rebuilt rows get fresh ids, so clients drop what they hold and the day replays from the start.
+        cursor = backbone_feed_cursor(dayref, state_row, pivot_row_id=0, move_row_id=0, last_id=0)
+        payloads.append(backbone_stream_payload(cursor, stream_mode="reset"))
+
+    end_id = int(state_row.get("lastprocessedtickid") or 0) if state_row else 0
+    with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+        while True:
+            fetch_started = time.perf_counter()
+            pivot_rows = query_backbone_pivots_after_row(cur, day_id=dayref.dayid, after_row_id=cursor["pivotRowId"], limit=MAX_STREAM_BATCH)
+            move_rows = query_backbone_moves_after_row(cur, day_id=dayref.dayid, after_row_id=cursor["moveRowId"], limit=MAX_STREAM_BATCH)
+            tick_rows = query_rows_after(cur, cursor["lastId"], MAX_STREAM_BATCH, end_id=end_id) if wants_ticks else []
+            fetch_ms = elapsed_ms(fetch_started)
+            last_id = int(tick_rows[-1]["id"]) if len(tick_rows) >= MAX_STREAM_BATCH else max(int(cursor["lastId"]), end_id)
+            if not pivot_rows and not move_rows and not tick_rows and last_id == cursor["lastId"]:
+                break
+            cursor = backbone_feed_cursor(
+                dayref,
+                state_row,
+                pivot_row_id=int(pivot_rows[-1]["id"]) if pivot_rows else cursor["pivotRowId"],
+                move_row_id=int(move_rows[-1]["id"]) if move_rows else cursor["moveRowId"],
+                last_id=last_id,
+            )
+            payload = backbone_stream_payload(
+                cursor,
+                stream_mode="delta",
+                pivot_rows=pivot_rows,
+                move_rows=move_rows,
+                tick_rows=tick_rows,
+                fetch_ms=fetch_ms,
+            )
+            # Subscribers that want ticks but joined mid-load fill this range themselves.
+            payload["ticksIncluded"] = bool(wants_ticks)
+            payload["ticksAfterId"] = int(tick_rows[0]["id"]) - 1 if tick_rows else last_id
+            payloads.append(payload)
+            if len(pivot_rows) < MAX_STREAM_BATCH and len(move_rows) < MAX_STREAM_BATCH and len(tick_rows) < MAX_STREAM_BATCH:
+                break
+    return payloads, cursor
+
+
+BACKBONE_FEED = BackboneFeed(
+    channel=BACKBONE_NOTIFY_CHANNEL,
+    connect=lambda: db_connection(readonly=True, autocommit=True),
+    prime=backbone_feed_prime,
+    load=backbone_feed_load,
+    safety_seconds=BACKBONE_FEED_SAFETY_SECONDS,
+    idle_seconds=BACKBONE_FEED_IDLE_SECONDS,
+    logger=STREAM_LOGGER,
+)
+
+
+def backbone_catch_up(
+    *,
+    day_id: int,
+    after_id: int,
+    end_id: int,
+    limit: int,
+    show_ticks: bool,
+    cursor: Dict[str, Any],
+) -> Generator[Dict[str, Any], None, None]:
+    pivot_after = move_after = tick_after = after_id
+    with db_connection(readonly=True, autocommit=True) as conn:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            while True:
+                fetch_started = time.perf_counter()
+                pivot_rows = query_backbone_pivots_after(cur, day_id=day_id, after_id=pivot_after, limit=limit, end_id=end_id)
+                move_rows = query_backbone_moves_after(cur, day_id=day_id, after_id=move_after, limit=limit, end_id=end_id)
+                tick_rows = query_rows_after(cur, tick_after, limit, end_id=end_id) if show_ticks else []
+                fetch_ms = elapsed_ms(fetch_started)
+                if not pivot_rows and not move_rows and not tick_rows:
+                    return
+                pivot_after = int(pivot_rows[-1].get("tickid") or pivot_after) if pivot_rows else end_id
+                move_after = int(move_rows[-1].get("endtickid") or move_after) if move_rows else end_id
+                tick_after = int(tick_rows[-1].get("id") or tick_after) if tick_rows else end_id
+                yield backbone_stream_payload(
+                    dict(cursor, lastId=min(pivot_after, move_after, tick_after if show_ticks else end_id)),
+                    stream_mode="delta",
+                    pivot_rows=pivot_rows,
+                    move_rows=move_rows,
+                    tick_rows=tick_rows,
+                    fetch_ms=fetch_ms,
+                )
+                if len(pivot_rows) < limit and len(move_rows) < limit and len(tick_rows) < limit:
+                    return
+
+
+def fill_backbone_ticks(payload: Dict[str, Any], *, after_id: int) -> Dict[str, Any]:
+    end_id = int(payload.get("lastId") or 0)
+    if end_id <= after_id:
+        return payload
+    tick_rows: List[Dict[str, Any]] = []
+    with db_connection(readonly=True, autocommit=True) as conn:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            while True:
+                page = query_rows_after(cur, after_id, MAX_STREAM_BATCH, end_id=end_id)
+                tick_rows.extend(page)
+                if len(page) < MAX_STREAM_BATCH:
+                    break
+                after_id = int(page[-1]["id"])
+    return dict(payload, rows=serialize_tick_rows(tick_rows), rowCount=len(tick_rows))
+
+
+def stream_backbone_events(
+    *,
+    after_id: int,
+    limit: int,
+    show_ticks: bool,
+    feed: Optional[BackboneFeed] = None,
+) -> Generator[SseEvent, None, None]:
+    feed = feed or BACKBONE_FEED
+    effective_limit = clamp_int(limit, 1, MAX_STREAM_BATCH)
+    subscription, cursor = feed.subscribe(wants_ticks=show_ticks)
+    try:
+        last_id = max(0, after_id)
+        if cursor.get("dayId") is not None:
+            # Everything up to the subscribe-time cursor comes from the catch-up read; the feed delivers the rest.
+            for payload in backbone_catch_up(
+                day_id=int(cursor["dayId"]),
+                after_id=last_id,
+                end_id=int(cursor.get("lastId") or 0),
+                limit=effective_limit,
+                show_ticks=show_ticks,
+                cursor=cursor,
+            ):
+                yield payload, None
+            last_id = max(last_id, int(cursor.get("lastId") or 0))
+        while True:
+            payload = subscription.get(STREAM_HEARTBEAT_SECONDS)
+            if payload is None:
+                # Restarts the listener if its connection dropped; it resumes from the cursor it had.
+                feed.ensure_started()
+                yield backbone_stream_payload(feed.cursor(), stream_mode="heartbeat"), "heartbeat"
+                continue
+            if payload["streamMode"] == "reset":
+                last_id = 0
+            elif show_ticks and not payload.get("ticksIncluded", True):
+                payload = fill_backbone_ticks(payload, after_id=max(last_id, int(payload.get("ticksAfterId") or 0)))
+            elif not show_ticks and payload["rowCount"]:
+                payload = dict(payload, rows=[], rowCount=0)
+            last_id = max(last_id, int(payload.get("lastId") or 0))
+            yield payload, None
+    except GeneratorExit:
+        return
+    finally:
+        feed.unsubscribe(subscription)
+
+
+def stream_events(
+    *,
+    after_id: int,
     after_mavg_id: int,
     limit: int,
     window: int,
@@ -3178,29 +4083,25 @@ def stream_events(
     max_window: int = MAX_TICK_WINDOW,
     rect_mode: Optional[str] = None,
     stream_name: str = "live_stream",
-) -> Generator[str, None, None]:
+) -> Generator[SseEvent, None, None]:
     last_id = max(0, after_id)
     last_mavg_id = max(0, after_mavg_id)
     effective_limit = clamp_int(limit, 1, MAX_STREAM_BATCH)
-    effective_window = clamp_int(window, 1, max_window)
     last_heartbeat = time.monotonic()
     idle_sleep = STREAM_POLL_SECONDS
     structure_enabled = show_events or show_structure or show_ranges
-    engine = StructureEngine(symbol=TICK_SYMBOL) if structure_enabled else None
 
     stream_open(stream_name)
     try:
         try:
             with db_connection(readonly=True, autocommit=True) as conn:
                 with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                    if engine is not None and last_id:
-                        seed_rows = query_window_ending_at(cur, last_id, effective_window)
-                        for row in seed_rows:
-                            try:
-                                engine.process_tick(row)
-                            except Exception:
-                                engine = None
-                                break
+                    if structure_enabled:
+                        try:
+                            sync_live_structure(cur, after_id=last_id, rows=[])
+                        except Exception:
+                            STREAM_LOGGER.exception("Shared live structure sync failed")
+                            structure_enabled = False
 
                     while True:
                         fetch_started = time.perf_counter()
@@ -3213,21 +4114,22 @@ def stream_events(
                             serialize_started = time.perf_counter()
                             latest_tick_row = tick_rows[-1] if tick_rows else query_latest_tick(cur)
                             payload_rows = serialize_tick_rows(tick_rows) if show_ticks else []
-                            updates = {"bars": [], "rangeBoxes": [], "events": []}
-                            if engine is not None:
+                            updates = empty_structure_updates()
+                            if structure_enabled and tick_rows:
                                 try:
-                                    for row in tick_rows:
-                                        delta = engine.process_tick(row)
-                                        updates["bars"].extend(delta["bars"])
-                                        updates["rangeBoxes"].extend(delta["rangeBoxes"])
-                                        updates["events"].extend(delta["events"])
+                                    sync_live_structure(cur, after_id=last_id, rows=tick_rows)
+                                    updates = LIVE_STRUCTURE.updates_after(
+                                        last_id,
+                                        through_tick_id=int(latest_tick_row["id"]),
+                                    ) or live_structure_window_updates()
                                 except Exception:
-                                    updates = {"bars": [], "rangeBoxes": [], "events": []}
-                                    engine = None
+                                    STREAM_LOGGER.exception("Shared live structure update failed")
+                                    updates = empty_structure_updates()
+                                    structure_enabled = False
                             rect_snapshot = rect_snapshot_for_mode(rect_mode) if rect_mode else None
                             if rect_mode:
                                 for row in tick_rows:
-                                    rect_snapshot = RECT_PAPER_SERVICE.process_tick(rect_mode, row) or rect_snapshot
+                                    rect_snapshot = rect_paper_service().process_tick(rect_mode, row) or rect_snapshot
 
                             if tick_rows:
                                 last_id = int(latest_tick_row["id"])
@@ -3243,12 +4145,14 @@ def stream_events(
                                 "streamMode": "delta",
                                 "rect": rect_snapshot,
                                 **serialize_metrics_payload(
+                                    source=stream_name,
                                     fetch_ms=fetch_ms,
                                     serialize_ms=elapsed_ms(serialize_started),
                                     latest_row=latest_tick_row,
                                 ),
                             }
-                            yield format_sse(payload)
+                            observe_stream_lag(stream_name, latest_tick_row)
+                            yield payload, None
                             last_heartbeat = time.monotonic()
                             idle_sleep = STREAM_POLL_SECONDS
                             continue
@@ -3269,12 +4173,13 @@ def stream_events(
                                 "rect": rect_snapshot_for_mode(rect_mode) if rect_mode else None,
                                 "pollSleepMs": round(idle_sleep * 1000.0, 2),
                                 **serialize_metrics_payload(
+                                    source=stream_name,
                                     fetch_ms=fetch_ms,
                                     serialize_ms=0.0,
                                     latest_row=latest_row,
                                 ),
                             }
-                            yield format_sse(payload, event_name="heartbeat")
+                            yield payload, "heartbeat"
                             last_heartbeat = now
                         time.sleep(idle_sleep)
                         idle_sleep = STREAM_IDLE_POLL_SECONDS
@@ -3284,6 +4189,74 @@ def stream_events(
         stream_close(stream_name)
 
 
+def load_review_chunk(after_id: int, end_id: int, limit: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    with db_connection(readonly=True) as conn:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            rows = query_rows_after(cur, after_id, limit, end_id=end_id)
+            mavg_rows = safe_query_mavg_points_for_tick_range(
+                cur,
+                page="live",
+                start_id=after_id + 1,
+                end_id=int(rows[-1]["id"]),
+            ) if rows else []
+    return rows, mavg_rows
+
+
+def review_session_id(*, after_id: int, end_id: int, window: int, fresh: bool = False) -> str:
+    # Tabs reviewing the same range share one clock; a fresh session opts out with its own nonce.
+    base = "{0}-{1}-{2}".format(after_id, end_id, window)
+    return "{0}-{1}".format(base, secrets.token_hex(6)) if fresh else base
+
+
+def open_review_session(
+    *,
+    session_id: Optional[str],
+    after_id: int,
+    end_id: int,
+    speed: float,
+    window: int,
+    rect_mode: str,
+    fresh: bool = False,
+) -> ReviewPlaybackSession:
+    if session_id:
+        try:
+            session = REVIEW_SESSIONS.get(session_id)
+        except ReviewPlaybackError:
+            session = None
+        if session is not None and not session.finished:
+            session.set_speed(speed)
+            return session
+    effective_window = clamp_int(window, 1, MAX_TICK_WINDOW)
+    new_session_id = review_session_id(after_id=after_id, end_id=end_id, window=effective_window, fresh=fresh)
+
+    def create() -> ReviewPlaybackSession:
+        with db_connection(readonly=True) as conn:
+            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                seed_rows = query_window_ending_at(cur, after_id, effective_window) if after_id else []
+        return ReviewPlaybackSession(
+            session_id=new_session_id,
+            symbol=TICK_SYMBOL,
+            after_id=after_id,
+            end_id=end_id,
+            seed_rows=seed_rows,
+            load_chunk=load_review_chunk,
+            on_tick=lambda row: rect_paper_service().process_tick(rect_mode, row),
+            retain_ticks=effective_window,
+            chunk_size=REVIEW_SESSION_CHUNK_TICKS,
+            max_gap_ms=REVIEW_MAX_DELAY_MS,
+            speed=speed,
+        )
+
+    session, created = REVIEW_SESSIONS.get_or_create(new_session_id, create)
+    if not created and session.finished:
+        # A finished replay is never rejoined; the next viewer of the range starts it over.
+        REVIEW_SESSIONS.discard(new_session_id, session)
+        session, created = REVIEW_SESSIONS.get_or_create(new_session_id, create)
+    if not created:
+        session.set_speed(speed)
+    return session
+
+
 def stream_review_events(
     *,
     after_id: int,
@@ -3294,117 +4267,298 @@ def stream_review_events(
     show_events: bool,
     show_structure: bool,
     show_ranges: bool,
+    session_id: Optional[str] = None,
+    fresh_session: bool = False,
     rect_mode: str = "review",
     stream_name: str = "live_review_stream",
-) -> Generator[str, None, None]:
+    encoding: str = "json",
+) -> Generator[bytes, None, None]:
     last_id = max(0, after_id)
-    effective_window = clamp_int(window, 1, MAX_TICK_WINDOW)
-    effective_batch = clamp_int(REVIEW_STREAM_BATCH, 1, MAX_STREAM_BATCH)
-    speed_multiplier = max(0.1, float(speed or 1.0))
-    structure_enabled = show_events or show_structure or show_ranges
-    engine = StructureEngine(symbol=TICK_SYMBOL) if structure_enabled else None
-    previous_row: Optional[Dict[str, Any]] = None
+    fetch_started = time.perf_counter()
+    session = open_review_session(
+        session_id=session_id,
+        after_id=last_id,
+        end_id=end_id,
+        speed=speed,
+        window=window,
+        rect_mode=rect_mode,
+        fresh=fresh_session,
+    )
+    fetch_ms = elapsed_ms(fetch_started)
+    subscriber = session.join(after_id=last_id)
 
     stream_open(stream_name)
     try:
         try:
-            with db_connection(readonly=True, autocommit=True) as conn:
-                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                    if engine is not None and last_id:
-                        seed_rows = query_window_ending_at(cur, last_id, effective_window)
-                        for row in seed_rows:
-                            try:
-                                engine.process_tick(row)
-                            except Exception:
-                                engine = None
-                                break
-                        previous_row = seed_rows[-1] if seed_rows else None
+            while True:
+                frame = session.next_frame(
+                    subscriber,
+                    timeout=STREAM_HEARTBEAT_SECONDS,
+                    min_interval=REVIEW_MIN_DELAY_MS / 1000.0,
+                )
+                if frame is None:
+                    payload = {
+                        "rows": [],
+                        "rowCount": 0,
+                        "structureBarUpdates": [],
+                        "rangeBoxUpdates": [],
+                        "structureEvents": [],
+                        "mavgPoints": [],
+                        "lastId": last_id,
+                        "endId": end_id,
+                        "streamMode": "heartbeat",
+                        "review": session.state(),
+                        **serialize_metrics_payload(source=stream_name, fetch_ms=0.0, serialize_ms=0.0, latest_row=None),
+                    }
+                    yield format_sse(payload, event_name="heartbeat", encoding=encoding)
+                    continue
 
-                    while last_id < end_id:
-                        fetch_started = time.perf_counter()
-                        batch_rows = query_rows_after(cur, last_id, effective_batch, end_id=end_id)
-                        fetch_ms = elapsed_ms(fetch_started)
-                        mavg_rows = safe_query_mavg_points_for_tick_range(
-                            cur,
-                            page="live",
-                            start_id=(last_id + 1) if batch_rows else 0,
-                            end_id=int(batch_rows[-1]["id"]) if batch_rows else 0,
-                        ) if batch_rows else []
-                        mavg_rows_by_tickid: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
-                        for mavg_row in mavg_rows:
-                            mavg_rows_by_tickid[int(mavg_row["tickid"])].append(mavg_row)
-                        if not batch_rows:
-                            payload = {
-                                "rows": [],
-                                "rowCount": 0,
-                                "structureBarUpdates": [],
-                                "rangeBoxUpdates": [],
-                                "structureEvents": [],
-                                "mavgPoints": [],
-                                "lastId": last_id,
-                                "endId": end_id,
-                                "endReached": True,
-                                "streamMode": "complete",
-                                "rect": rect_snapshot_for_mode(rect_mode),
-                                **serialize_metrics_payload(
-                                    fetch_ms=fetch_ms,
-                                    serialize_ms=0.0,
-                                    latest_row=query_latest_tick(cur),
-                                ),
-                            }
-                            yield format_sse(payload)
-                            return
+                serialize_started = time.perf_counter()
+                last_id = frame.last_id or last_id
+                payload = {
+                    "rows": serialize_tick_rows(frame.rows) if show_ticks else [],
+                    "rowCount": len(frame.rows) if show_ticks else 0,
+                    "structureBarUpdates": frame.structure["bars"] if show_structure else [],
+                    "rangeBoxUpdates": frame.structure["rangeBoxes"] if show_ranges else [],
+                    "structureEvents": frame.structure["events"] if show_events else [],
+                    "mavgPoints": serialize_mavg_points(frame.mavg_rows),
+                    "mavgCursorId": max((int(item["id"]) for item in frame.mavg_rows), default=None),
+                    "lastId": last_id,
+                    "endId": end_id,
+                    "endReached": bool(frame.complete or last_id >= end_id),
+                    "streamMode": frame.kind,
+                    "rect": rect_snapshot_for_mode(rect_mode),
+                    "review": session.state(),
+                    **serialize_metrics_payload(
+                        source=stream_name,
+                        fetch_ms=fetch_ms,
+                        serialize_ms=elapsed_ms(serialize_started),
+                        latest_row=frame.rows[-1] if frame.rows else None,
+                    ),
+                }
+                yield format_sse(payload, encoding=encoding)
+                fetch_ms = 0.0
+                if payload["endReached"]:
+                    return
+        except GeneratorExit:
+            return
+    finally:
+        session.leave()
+        stream_close(stream_name)
 
-                        for row in batch_rows:
-                            delay_ms = 0
-                            if previous_row and previous_row.get("timestamp") and row.get("timestamp"):
-                                delta_ms = max(0, dt_to_ms(row["timestamp"]) - dt_to_ms(previous_row["timestamp"]))
-                                delay_ms = min(REVIEW_MAX_DELAY_MS, int(round(delta_ms / speed_multiplier)))
-                            if delay_ms > 0:
-                                time.sleep(max(REVIEW_MIN_DELAY_MS, delay_ms) / 1000.0)
 
-                            serialize_started = time.perf_counter()
-                            updates = {"bars": [], "rangeBoxes": [], "events": []}
-                            if engine is not None:
-                                try:
-                                    delta = engine.process_tick(row)
-                                    updates["bars"].extend(delta["bars"])
-                                    updates["rangeBoxes"].extend(delta["rangeBoxes"])
-                                    updates["events"].extend(delta["events"])
-                                except Exception:
-                                    updates = {"bars": [], "rangeBoxes": [], "events": []}
-                                    engine = None
+def query_latest_mavg_value_id(cur: Any) -> int:
+    cur.execute("SELECT COALESCE(MAX(id), 0) AS id FROM public.mavgvalue")
+    return int((cur.fetchone() or {}).get("id") or 0)
 
-                            last_id = int(row["id"])
-                            rect_snapshot = RECT_PAPER_SERVICE.process_tick(rect_mode, row)
-                            payload = {
-                                "rows": serialize_tick_rows([row]) if show_ticks else [],
-                                "rowCount": 1 if show_ticks else 0,
-                                "structureBarUpdates": updates["bars"] if show_structure else [],
-                                "rangeBoxUpdates": updates["rangeBoxes"] if show_ranges else [],
-                                "structureEvents": updates["events"] if show_events else [],
-                                "mavgPoints": serialize_mavg_points(mavg_rows_by_tickid.get(last_id, [])),
-                                "mavgCursorId": max((int(item["id"]) for item in mavg_rows_by_tickid.get(last_id, [])), default=None),
-                                "lastId": last_id,
-                                "endId": end_id,
-                                "endReached": bool(last_id >= end_id),
-                                "streamMode": "delta",
-                                "rect": rect_snapshot or rect_snapshot_for_mode(rect_mode),
-                                "playbackDelayMs": delay_ms,
-                                **serialize_metrics_payload(
-                                    fetch_ms=fetch_ms,
-                                    serialize_ms=elapsed_ms(serialize_started),
-                                    latest_row=row,
-                                ),
-                            }
-                            yield format_sse(payload)
-                            previous_row = row
-                            if last_id >= end_id:
-                                return
-        except GeneratorExit:
+
+def live_hub_cursors() -> Dict[str, Optional[int]]:
+    with LIVE_HUB_PUMP_LOCK:
+        return dict(LIVE_HUB_CURSORS)
+
+
+def ensure_live_hub_pump() -> None:
+    global LIVE_HUB_PUMP_THREAD
+    with LIVE_HUB_PUMP_LOCK:
+        if LIVE_HUB_PUMP_THREAD is not None and LIVE_HUB_PUMP_THREAD.is_alive():
             return
+        with db_connection(readonly=True, autocommit=True) as conn:
+            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                latest_row = query_latest_tick(cur)
+                latest_id = int(latest_row["id"]) if latest_row else 0
+                LIVE_HUB_CURSORS.update(
+                    tickId=latest_id,
+                    mavgId=query_latest_mavg_value_id(cur),
+                    backboneDayId=None,
+                    backboneId=latest_id,
+                )
+        LIVE_HUB.reset_state()
+        LIVE_HUB_PUMP_THREAD = threading.Thread(target=run_live_hub_pump, name="datavis-live-hub", daemon=True)
+        LIVE_HUB_PUMP_THREAD.start()
+
+
+def live_hub_poll_market(cur: Any) -> bool:
+    cursors = live_hub_cursors()
+    last_id = int(cursors["tickId"] or 0)
+    last_mavg_id = int(cursors["mavgId"] or 0)
+    fetch_started = time.perf_counter()
+    tick_rows = query_rows_after(cur, last_id, MAX_STREAM_BATCH)
+    mavg_payload = mavg_updates_payload(cur, page="live", after_value_id=last_mavg_id) if LIVE_HUB.wants("mavg") else None
+    fetch_ms = elapsed_ms(fetch_started)
+    published = False
+    if tick_rows:
+        updates = empty_structure_updates()
+        try:
+            sync_live_structure(cur, after_id=last_id, rows=tick_rows)
+            updates = LIVE_STRUCTURE.updates_after(last_id, through_tick_id=int(tick_rows[-1]["id"])) or live_structure_window_updates()
+        except Exception:
+            STREAM_LOGGER.exception("Live hub structure update failed")
+        if LIVE_HUB.wants("rect"):
+            rect_snapshot = rect_snapshot_for_mode("live")
+            for row in tick_rows:
+                rect_snapshot = rect_paper_service().process_tick("live", row) or rect_snapshot
+            LIVE_HUB.publish("rect", {"rect": jsonable_encoder(rect_snapshot)})
+        last_id = int(tick_rows[-1]["id"])
+        with LIVE_HUB_PUMP_LOCK:
+            LIVE_HUB_CURSORS["tickId"] = last_id
+        LIVE_HUB.publish(
+            "ticks",
+            {
+                "rows": serialize_tick_rows(tick_rows),
+                "structureBarUpdates": updates["bars"],
+                "rangeBoxUpdates": updates["rangeBoxes"],
+                "structureEvents": updates["events"],
+                "lastId": last_id,
+                **serialize_metrics_payload(source="live_hub", fetch_ms=fetch_ms, serialize_ms=0.0, latest_row=tick_rows[-1]),
+            },
+        )
+        observe_stream_lag("live_hub", tick_rows[-1])
+        published = True
+    if mavg_payload and mavg_payload["mavgPoints"]:
+        with LIVE_HUB_PUMP_LOCK:
+            LIVE_HUB_CURSORS["mavgId"] = int(mavg_payload["mavgCursorId"])
+        LIVE_HUB.publish("mavg", mavg_payload)
+        published = True
+    return published
+
+
+def live_hub_backbone_payload(cur: Any, dayref: Any, *, after_id: int, end_id: Optional[int] = None) -> Dict[str, Any]:
+    pivot_rows = query_backbone_pivots_after(cur, day_id=dayref.dayid, after_id=after_id, limit=MAX_STREAM_BATCH, end_id=end_id)
+    move_rows = query_backbone_moves_after(cur, day_id=dayref.dayid, after_id=after_id, limit=MAX_STREAM_BATCH, end_id=end_id)
+    return {
+        "dayId": dayref.dayid,
+        "brokerday": serialize_value(dayref.brokerday),
+        "pivotUpdates": serialize_backbone_pivot_rows(pivot_rows),
+        "moveUpdates": serialize_backbone_move_rows(move_rows),
+        "lastId": max(
+            [after_id]
+            + [int(row.get("tickid") or 0) for row in pivot_rows]
+            + [int(row.get("endtickid") or 0) for row in move_rows]
+        ),
+    }
+
+
+def live_hub_poll_backbone(conn: Any) -> None:
+    dayref = resolve_current_backbone_day_ref(conn, symbol=TICK_SYMBOL)
+    if dayref is None:
+        return
+    cursors = live_hub_cursors()
+    day_changed = cursors["backboneDayId"] is not None and cursors["backboneDayId"] != dayref.dayid
+    after_id = 0 if day_changed else int(cursors["backboneId"] or 0)
+    state_row = load_backbone_state_row(conn, symbol=TICK_SYMBOL, dayid=dayref.dayid)
+    with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+        payload = live_hub_backbone_payload(cur, dayref, after_id=after_id)
+    with LIVE_HUB_PUMP_LOCK:
+        LIVE_HUB_CURSORS.update(backboneDayId=dayref.dayid, backboneId=payload["lastId"])
+    if payload["pivotUpdates"] or payload["moveUpdates"] or day_changed:
+        payload["state"] = serialize_backbone_state_row(state_row, brokerday=dayref.brokerday, day_id=dayref.dayid)
+        if day_changed:
+            payload["dayChanged"] = True
+        LIVE_HUB.publish("backbone", payload)
+
+
+def run_live_hub_pump() -> None:
+    global LIVE_HUB_PUMP_THREAD
+    idle_since: Optional[float] = None
+    next_state_poll = 0.0
+    next_acd_poll = 0.0
+    try:
+        with db_connection(readonly=True, autocommit=True) as conn:
+            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                while True:
+                    now = time.monotonic()
+                    if LIVE_HUB.subscriber_count() == 0:
+                        idle_since = idle_since or now
+                        if now - idle_since >= LIVE_WS_PUMP_IDLE_SECONDS:
+                            return
+                        time.sleep(STREAM_IDLE_POLL_SECONDS)
+                        continue
+                    idle_since = None
+                    published = live_hub_poll_market(cur)
+                    if now >= next_state_poll:
+                        next_state_poll = now + LIVE_WS_STATE_POLL_SECONDS
+                        if LIVE_HUB.wants("smart"):
+                            LIVE_HUB.publish("smart", jsonable_encoder(smart_scalp_service().snapshot_state()))
+                        if LIVE_HUB.wants("backbone"):
+                            live_hub_poll_backbone(conn)
+                    if now >= next_acd_poll and LIVE_HUB.wants("acd"):
+                        next_acd_poll = now + LIVE_WS_ACD_POLL_SECONDS
+                        LIVE_HUB.publish("acd", load_acd_payload())
+                    time.sleep(STREAM_POLL_SECONDS if published else STREAM_IDLE_POLL_SECONDS)
+    except Exception:
+        STREAM_LOGGER.exception("Live hub pump failed")
     finally:
-        stream_close(stream_name)
+        with LIVE_HUB_PUMP_LOCK:
+            if LIVE_HUB_PUMP_THREAD is threading.current_thread():
+                LIVE_HUB_PUMP_THREAD = None
+
+
+def load_live_socket_catchup(
+    *,
+    channels: List[str],
+    after_id: int,
+    after_mavg_id: int,
+    after_backbone_id: Optional[int],
+) -> Dict[str, Dict[str, Any]]:
+    # Called after subscribing: anything newer than the pump cursors is already queued for the socket.
+    cursors = live_hub_cursors()
+    through_id = int(cursors["tickId"] or 0)
+    catchup: Dict[str, Dict[str, Any]] = {}
+    with db_connection(readonly=True, autocommit=True) as conn:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            if "ticks" in channels and 0 < after_id < through_id:
+                rows = query_rows_after(cur, after_id, MAX_TICK_WINDOW + 1, end_id=through_id)
+                if len(rows) > MAX_TICK_WINDOW:
+                    catchup["ticks"] = {"resync": True, "lastId": through_id}
+                else:
+                    updates = LIVE_STRUCTURE.updates_after(after_id, through_tick_id=through_id) or live_structure_window_updates()
+                    catchup["ticks"] = {
+                        "rows": serialize_tick_rows(rows),
+                        "structureBarUpdates": updates["bars"],
+                        "rangeBoxUpdates": updates["rangeBoxes"],
+                        "structureEvents": updates["events"],
+                        "lastId": through_id,
+                    }
+            if "mavg" in channels and 0 < after_mavg_id < int(cursors["mavgId"] or 0):
+                catchup["mavg"] = mavg_updates_payload(cur, page="live", after_value_id=after_mavg_id)
+            if "backbone" in channels and after_backbone_id is not None:
+                dayref = resolve_current_backbone_day_ref(conn, symbol=TICK_SYMBOL)
+                if dayref is not None and (cursors["backboneDayId"] in (None, dayref.dayid)):
+                    catchup["backbone"] = live_hub_backbone_payload(
+                        cur,
+                        dayref,
+                        after_id=after_backbone_id,
+                        end_id=int(cursors["backboneId"] or 0),
+                    )
+    return catchup
+
+
+def resolve_live_socket_channels(requested: Any, *, authenticated: bool) -> Tuple[List[str], List[str]]:
+    channels: List[str] = []
+    denied: List[str] = []
+    for name in requested if isinstance(requested, list) else []:
+        name = str(name)
+        if name not in LIVE_HUB.channels or (name == "smart" and not authenticated):
+            denied.append(name)
+        elif name not in channels:
+            channels.append(name)
+    return channels, denied
+
+
+def filter_live_socket_batch(batch: Dict[str, Dict[str, Any]], options: Dict[str, bool], *, encoding: str) -> Dict[str, Dict[str, Any]]:
+    ticks = batch.get("ticks")
+    if ticks is not None:
+        ticks = dict(ticks)
+        if not options.get("showTicks", True):
+            ticks["rows"] = []
+        if not options.get("showStructure", True):
+            ticks["structureBarUpdates"] = []
+        if not options.get("showRanges", True):
+            ticks["rangeBoxUpdates"] = []
+        if not options.get("showEvents", True):
+            ticks["structureEvents"] = []
+        batch = {**batch, "ticks": ticks}
+    return {name: encode_payload(payload, encoding) for name, payload in batch.items()}
 
 
 def smart_scalp_ticks_after(after_id: int, limit: int) -> List[Dict[str, Any]]:
@@ -3430,12 +4584,12 @@ def smart_scalp_latest_tick() -> Optional[Dict[str, Any]]:
 
 
 def smart_scalp_snapshot() -> Dict[str, Any]:
-    snapshot, _ = TRADE_GATEWAY.snapshot_or_last_known()
+    snapshot, _ = trade_gateway().snapshot_or_last_known()
     return snapshot
 
 
 def smart_scalp_broker_status() -> Dict[str, Any]:
-    return TRADE_GATEWAY.status()
+    return trade_gateway().status()
 
 
 def _audit_trade_action(
@@ -3471,7 +4625,7 @@ def smart_scalp_place_market_order(
 ) -> Dict[str, Any]:
     payload = TradeMarketOrderRequest(side=side, lotSize=float(volume), stopLoss=stop_loss, takeProfit=take_profit)
     broker_volume = trade_volume_from_request(payload)
-    result = TRADE_GATEWAY.place_market_order(
+    result = trade_gateway().place_market_order(
         side=payload.side,
         volume=broker_volume,
         stop_loss=payload.stopLoss,
@@ -3495,7 +4649,7 @@ def smart_scalp_close_position(
     reason: Optional[str] = None,
     source: str = "smart",
 ) -> Dict[str, Any]:
-    result = TRADE_GATEWAY.close_position(position_id=position_id, volume=volume)
+    result = trade_gateway().close_position(position_id=position_id, volume=volume)
     _audit_trade_action(
         action="close_position",
         source=source,
@@ -3506,27 +4660,72 @@ def smart_scalp_close_position(
     return result
 
 
-SMART_SCALP_SERVICE = SmartScalpService(
-    symbol=TICK_SYMBOL,
-    fetch_ticks_after=smart_scalp_ticks_after,
-    fetch_recent_ticks=smart_scalp_recent_ticks,
-    fetch_latest_tick=smart_scalp_latest_tick,
-    fetch_snapshot=smart_scalp_snapshot,
-    fetch_broker_status=smart_scalp_broker_status,
-    place_market_order=smart_scalp_place_market_order,
-    close_position=smart_scalp_close_position,
-    smart_lot_size=0.01,
+def build_trade_gateway() -> Any:
+    # Deferred so chart-only workers never import Twisted or the cTrader protobuf modules.
+    from datavis.trading import CTraderGateway, load_broker_config
+
+    return CTraderGateway(load_broker_config(BASE_DIR))
+
+
+def build_smart_scalp_service() -> SmartScalpService:
+    service = SmartScalpService(
+        symbol=TICK_SYMBOL,
+        fetch_ticks_after=smart_scalp_ticks_after,
+        fetch_recent_ticks=smart_scalp_recent_ticks,
+        fetch_latest_tick=smart_scalp_latest_tick,
+        fetch_snapshot=smart_scalp_snapshot,
+        fetch_broker_status=smart_scalp_broker_status,
+        place_market_order=smart_scalp_place_market_order,
+        close_position=smart_scalp_close_position,
+        smart_lot_size=0.01,
+        evaluation_observer=SMART_SCALP_EVALUATION_LATENCY.labels().observe_ms,
+    )
+    service.start()
+    return service
+
+
+def build_rect_paper_service() -> RectPaperService:
+    service = RectPaperService(db_factory=db_connection, symbol=TICK_SYMBOL)
+    service.start()
+    return service
+
+
+def trade_gateway() -> Any:
+    return SERVICES.get("trade_gateway")
+
+
+def smart_scalp_service() -> SmartScalpService:
+    return SERVICES.get("smart_scalp")
+
+
+def rect_paper_service() -> RectPaperService:
+    return SERVICES.get("rect_paper")
+
+
+SERVICES.register("trade_gateway", build_trade_gateway)
+SERVICES.register("smart_scalp", build_smart_scalp_service, stop=lambda service: service.stop())
+SERVICES.register("rect_paper", build_rect_paper_service, stop=lambda service: service.stop())
+SQL_JOBS = SqlJobManager(
+    connect=open_db_connection,
+    spill_dir=SQL_JOB_DIR,
+    statement_timeout_ms=SQL_JOB_TIMEOUT_MS,
+    lock_timeout_ms=LOCK_TIMEOUT_MS,
+    max_result_rows=SQL_JOB_MAX_ROWS,
+    cost_warn=SQL_JOB_COST_WARN,
+    serialize_value=serialize_value,
+    serialize_error=serialize_pg_error,
+    max_workers=SQL_JOB_WORKERS,
+    max_jobs=SQL_JOB_MAX_JOBS,
 )
-RECT_PAPER_SERVICE = RectPaperService(db_factory=db_connection, symbol=TICK_SYMBOL)
 
 
 def _trade_not_configured() -> bool:
-    return not TRADE_GATEWAY.configured
+    return not trade_gateway().configured
 
 
 def _handle_trade_gateway_error(exc: Exception) -> None:
     detail = str(exc) or "Trade request failed."
-    SMART_SCALP_SERVICE.reset(reason=detail, restore_close_preference=True)
+    smart_scalp_service().reset(reason=detail, restore_close_preference=True)
     status_code = getattr(exc, "status_code", None) or status.HTTP_502_BAD_GATEWAY
     if not isinstance(status_code, int):
         status_code = status.HTTP_502_BAD_GATEWAY
@@ -3549,9 +4748,9 @@ def _handle_trade_gateway_error(exc: Exception) -> None:
         detail={
             "error": error_code,
             "message": detail,
-            "brokerConfigured": TRADE_GATEWAY.configured,
-            "configured": TRADE_GATEWAY.configured,
-            "broker": TRADE_GATEWAY.status(),
+            "brokerConfigured": trade_gateway().configured,
+            "configured": trade_gateway().configured,
+            "broker": trade_gateway().status(),
         },
     ) from exc
 
@@ -3570,10 +4769,10 @@ def _handle_smart_scalp_error(exc: Exception) -> None:
         detail={
             "error": error_code,
             "message": message,
-            "brokerConfigured": TRADE_GATEWAY.configured,
-            "configured": TRADE_GATEWAY.configured,
-            "broker": TRADE_GATEWAY.status(),
-            "smart": SMART_SCALP_SERVICE.snapshot_state(),
+            "brokerConfigured": trade_gateway().configured,
+            "configured": trade_gateway().configured,
+            "broker": trade_gateway().status(),
+            "smart": smart_scalp_service().snapshot_state(),
         },
     ) from exc
 
@@ -3597,16 +4796,45 @@ def _handle_rect_error(exc: Exception) -> None:
     ) from exc
 
 
+def _handle_sql_job_error(exc: Exception) -> None:
+    if isinstance(exc, SqlJobError):
+        status_code = int(getattr(exc, "status_code", status.HTTP_400_BAD_REQUEST))
+        error_code = str(getattr(exc, "code", "") or "SQL_JOB_ERROR")
+    else:
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        error_code = "SQL_JOB_FAILED"
+    raise HTTPException(
+        status_code=status_code,
+        detail={"error": error_code, "message": str(exc) or "SQL job request failed."},
+    ) from exc
+
+
+def _handle_review_error(exc: Exception) -> None:
+    if isinstance(exc, ReviewPlaybackError):
+        status_code = int(getattr(exc, "status_code", status.HTTP_400_BAD_REQUEST))
+        error_code = str(getattr(exc, "code", "") or "REVIEW_ERROR")
+    else:
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        error_code = "REVIEW_FAILED"
+    raise HTTPException(
+        status_code=status_code,
+        detail={"error": error_code, "message": str(exc) or "Review session request failed."},
+    ) from exc
+
+
 @app.on_event("startup")
 def app_startup() -> None:
-    SMART_SCALP_SERVICE.start()
-    RECT_PAPER_SERVICE.start()
+    started = time.perf_counter()
+    # Trading services warm in the background so the worker serves charts before Twisted is loaded.
+    if WARM_SERVICES:
+        SERVICES.warm(WARM_SERVICES)
+    SERVICES.record_phase("startup", elapsed_ms(started))
 
 
 @app.on_event("shutdown")
 def app_shutdown() -> None:
-    SMART_SCALP_SERVICE.stop()
-    RECT_PAPER_SERVICE.stop()
+    SERVICES.stop_all()
+    SQL_JOBS.shutdown()
 
 
 @app.get("/", include_in_schema=False)
@@ -3663,6 +4891,39 @@ def api_health() -> Dict[str, Any]:
     }
 
 
+def smart_scalp_position() -> WorkerPosition:
+    if not SERVICES.started("smart_scalp"):
+        return WorkerPosition("smart_scalp", None, active=False, detail={"backendState": "not_started"})
+    progress = smart_scalp_service().progress()
+    return WorkerPosition(
+        "smart_scalp",
+        progress["lastTickId"] or None,
+        last_tick_time=ms_to_dt(progress.get("lastTickTimestampMs")),
+        active=progress["active"],
+        detail={"backendState": progress.get("backendState"), "lastPollAtMs": progress.get("lastPollAtMs")},
+    )
+
+
+@app.get("/api/health/workers")
+def api_health_workers() -> Dict[str, Any]:
+    with db_connection(readonly=True, autocommit=True) as conn:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            head = query_head(cur, symbol=TICK_SYMBOL)
+            positions = query_worker_positions(cur, symbol=TICK_SYMBOL)
+    positions.append(smart_scalp_position())
+    return {
+        "ok": True,
+        "symbol": TICK_SYMBOL,
+        **WORKER_LAG.report(head=head, positions=positions),
+        "serverTimeMs": now_ms(),
+    }
+
+
+@app.get("/api/metrics")
+def metrics_exposition() -> Response:
+    return Response(content=METRICS.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 @app.get("/api/live/acd")
 def live_acd() -> Dict[str, Any]:
     return load_acd_payload()
@@ -3678,10 +4939,57 @@ def sql_query(payload: QueryRequest, _: Optional[str] = Depends(require_sql_admi
     return execute_query(payload.sql)
 
 
+@app.post("/api/sql/jobs")
+def sql_job_submit(payload: SqlJobRequest, _: Optional[str] = Depends(require_sql_admin)) -> Dict[str, Any]:
+    statements = split_sql_script(payload.sql)
+    statement_types = [statement_head(statement) for statement in statements]
+    try:
+        warnings = SQL_JOBS.preflight(statements, statement_types)
+    except psycopg2.Error as exc:
+        raise HTTPException(status_code=400, detail=serialize_pg_error(exc)) from exc
+    if warnings and not payload.confirm:
+        return {"requiresConfirmation": True, "warnings": warnings}
+    job = SQL_JOBS.submit(statements, statement_types, warnings=warnings)
+    with SQL_SCHEMA_CACHE_LOCK:
+        SQL_SCHEMA_CACHE["expiresAtMs"] = 0
+        SQL_SCHEMA_CACHE["payload"] = None
+    return {"requiresConfirmation": False, "job": SQL_JOBS.summary(job.job_id)}
+
+
+@app.get("/api/sql/jobs/{job_id}")
+def sql_job_status(job_id: str, _: Optional[str] = Depends(require_sql_admin)) -> Dict[str, Any]:
+    try:
+        return SQL_JOBS.summary(job_id)
+    except Exception as exc:
+        _handle_sql_job_error(exc)
+
+
+@app.get("/api/sql/jobs/{job_id}/results/{result_index}")
+def sql_job_result_page(
+    job_id: str,
+    result_index: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(SQL_JOB_PAGE_ROWS, ge=1, le=5000),
+    _: Optional[str] = Depends(require_sql_admin),
+) -> Dict[str, Any]:
+    try:
+        return SQL_JOBS.page(job_id, result_index, offset=offset, limit=limit)
+    except Exception as exc:
+        _handle_sql_job_error(exc)
+
+
+@app.post("/api/sql/jobs/{job_id}/cancel")
+def sql_job_cancel(job_id: str, _: Optional[str] = Depends(require_sql_admin)) -> Dict[str, Any]:
+    try:
+        return SQL_JOBS.cancel(job_id)
+    except Exception as exc:
+        _handle_sql_job_error(exc)
+
+
 @app.post("/api/sql/export-csv", response_model=None)
 def sql_export_csv(payload: QueryExportRequest, _: Optional[str] = Depends(require_sql_admin)):
     try:
-        return export_query_to_csv(payload.query, payload.filename)
+        return export_query_to_csv(payload.query, payload.filename, engine=payload.engine, compression=payload.compression)
     except HTTPException as exc:
         detail = exc.detail
         if isinstance(detail, dict):
@@ -3699,12 +5007,65 @@ def sql_export_csv(payload: QueryExportRequest, _: Optional[str] = Depends(requi
         return JSONResponse(status_code=500, content={"ok": False, "error": detail["message"], "detail": detail})
 
 
+def register_sql_export_stream(payload: QueryExportRequest) -> str:
+    # The SQL travels in the POST body; the browser download only carries this single-use id.
+    stream_id = secrets.token_urlsafe(16)
+    now = time.monotonic()
+    with SQL_EXPORT_STREAMS_LOCK:
+        for key, (expires_at, _) in list(SQL_EXPORT_STREAMS.items()):
+            if expires_at <= now:
+                del SQL_EXPORT_STREAMS[key]
+        SQL_EXPORT_STREAMS[stream_id] = (now + SQL_EXPORT_STREAM_TTL_SECONDS, payload)
+        while len(SQL_EXPORT_STREAMS) > SQL_EXPORT_STREAM_MAX_PENDING:
+            SQL_EXPORT_STREAMS.popitem(last=False)
+    return stream_id
+
+
+def claim_sql_export_stream(stream_id: str) -> Optional[QueryExportRequest]:
+    with SQL_EXPORT_STREAMS_LOCK:
+        entry = SQL_EXPORT_STREAMS.pop(stream_id, None)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    return entry[1]
+
+
+@app.post("/api/sql/export-csv-stream")
+def sql_export_csv_stream_prepare(payload: QueryExportRequest, _: Optional[str] = Depends(require_sql_admin)) -> Dict[str, Any]:
+    if not payload.query.strip():
+        raise HTTPException(status_code=400, detail="SQL text is required.")
+    stream_id = register_sql_export_stream(payload)
+    return {
+        "ok": True,
+        "streamId": stream_id,
+        "downloadUrl": "/api/sql/export-csv-stream/{0}".format(stream_id),
+        "expiresInSeconds": SQL_EXPORT_STREAM_TTL_SECONDS,
+    }
+
+
+@app.get("/api/sql/export-csv-stream/{stream_id}", response_model=None)
+def sql_export_csv_stream(stream_id: str, _: Optional[str] = Depends(require_sql_admin)) -> StreamingResponse:
+    payload = claim_sql_export_stream(stream_id)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Streaming export not found or expired; start it again.")
+    safe_name = sanitize_sql_export_filename(payload.filename, payload.compression)
+    return StreamingResponse(
+        stream_query_to_csv(payload.query, filename=safe_name, compression=payload.compression),
+        media_type=SQL_EXPORT_MEDIA_TYPES[payload.compression],
+        headers={
+            "Content-Disposition": 'attachment; filename="{0}"'.format(safe_name),
+            "Cache-Control": "no-store",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @app.get("/api/sql/export-csv/{filename}")
 def sql_export_csv_download(filename: str, _: Optional[str] = Depends(require_sql_admin)) -> FileResponse:
     safe_name, export_path = resolve_sql_export_download(filename)
     if not export_path.is_file():
         raise HTTPException(status_code=404, detail="Export file not found.")
-    return FileResponse(path=export_path, media_type="text/csv", filename=safe_name)
+    _, compression = split_sql_export_filename(safe_name)
+    return FileResponse(path=export_path, media_type=SQL_EXPORT_MEDIA_TYPES[compression], filename=safe_name)
 
 
 @app.get("/api/motion/signals/recent")
@@ -3752,15 +5113,15 @@ def trade_login(payload: TradeLoginRequest, response: Response) -> Any:
     if not (valid_user and valid_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid trade credentials.")
     _set_trade_cookie(response, username)
-    SMART_SCALP_SERVICE.reset(reason="Trade login successful. Smart Close defaults to ON.", restore_close_preference=True)
-    SMART_SCALP_SERVICE.touch_auth()
+    smart_scalp_service().reset(reason="Trade login successful. Smart Close defaults to ON.", restore_close_preference=True)
+    smart_scalp_service().touch_auth()
     return {"ok": True, "username": username}
 
 
 @app.post("/api/trade/logout")
 def trade_logout(response: Response) -> Dict[str, Any]:
     _clear_trade_cookie(response)
-    SMART_SCALP_SERVICE.reset(reason="Trade session logged out. Smart Close remains server-side.", restore_close_preference=True)
+    smart_scalp_service().reset(reason="Trade session logged out. Smart Close remains server-side.", restore_close_preference=True)
     return {"ok": True}
 
 
@@ -3768,7 +5129,7 @@ def trade_logout(response: Response) -> Dict[str, Any]:
 def trade_me(request: Request, response: Response) -> Dict[str, Any]:
     if not trade_login_configured():
         _clear_trade_cookie(response)
-        SMART_SCALP_SERVICE.reset(reason="Trade login is not configured on the server.")
+        smart_scalp_service().reset(reason="Trade login is not configured on the server.")
         return trade_auth_status_payload(
             authenticated=False,
             username=None,
@@ -3778,7 +5139,7 @@ def trade_me(request: Request, response: Response) -> Dict[str, Any]:
     payload = _trade_session_decode(request.cookies.get(TRADE_COOKIE_NAME, ""))
     username = str(payload["u"]) if payload else None
     if username:
-        SMART_SCALP_SERVICE.touch_auth()
+        smart_scalp_service().touch_auth()
     return trade_auth_status_payload(authenticated=bool(username), username=username)
 
 
@@ -3788,7 +5149,7 @@ def trade_open(username: str = Depends(require_trade_auth)) -> Dict[str, Any]:
     if _trade_not_configured():
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Broker integration is not configured.")
     try:
-        snapshot, stale_snapshot = TRADE_GATEWAY.snapshot_or_last_known()
+        snapshot, stale_snapshot = trade_gateway().snapshot_or_last_known()
         volume_info = dict(snapshot.get("volumeInfo") or {})
         volume_info["defaultLotSize"] = float(TRADE_DEFAULT_LOT_SIZE)
         return {
@@ -3800,8 +5161,8 @@ def trade_open(username: str = Depends(require_trade_auth)) -> Dict[str, Any]:
             "pendingOrders": snapshot.get("pendingOrders", []),
             "snapshotMeta": snapshot.get("snapshotMeta"),
             "staleSnapshot": stale_snapshot,
-            "smart": SMART_SCALP_SERVICE.snapshot_state(),
-            "broker": TRADE_GATEWAY.status(),
+            "smart": smart_scalp_service().snapshot_state(),
+            "broker": trade_gateway().status(),
             "serverTimeMs": now_ms(),
         }
     except Exception as exc:
@@ -3817,12 +5178,12 @@ def trade_history(
     if _trade_not_configured():
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Broker integration is not configured.")
     try:
-        payload = TRADE_GATEWAY.history(limit=clamp_int(limit, 1, TRADE_HISTORY_MAX_LIMIT))
+        payload = trade_gateway().history(limit=clamp_int(limit, 1, TRADE_HISTORY_MAX_LIMIT))
         volume_info = dict(payload.get("volumeInfo") or {})
         volume_info["defaultLotSize"] = float(TRADE_DEFAULT_LOT_SIZE)
         payload["volumeInfo"] = volume_info
-        payload["broker"] = TRADE_GATEWAY.status()
-        payload["smart"] = SMART_SCALP_SERVICE.snapshot_state()
+        payload["broker"] = trade_gateway().status()
+        payload["smart"] = smart_scalp_service().snapshot_state()
         payload["serverTimeMs"] = now_ms()
         return payload
     except Exception as exc:
@@ -3836,7 +5197,7 @@ def trade_order_market(payload: TradeMarketOrderRequest, username: str = Depends
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Broker integration is not configured.")
     try:
         volume = trade_volume_from_request(payload)
-        result = TRADE_GATEWAY.place_market_order(
+        result = trade_gateway().place_market_order(
             side=payload.side,
             volume=volume,
             stop_loss=payload.stopLoss,
@@ -3850,14 +5211,14 @@ def trade_order_market(payload: TradeMarketOrderRequest, username: str = Depends
             volume=volume,
             lot_size=payload.lotSize,
         )
-        SMART_SCALP_SERVICE.reset(reason="Manual market order submitted. Smart Close restored.", restore_close_preference=True)
+        smart_scalp_service().reset(reason="Manual market order submitted. Smart Close restored.", restore_close_preference=True)
         return {
             "ok": True,
             "result": result,
             "submittedVolume": volume,
             "submittedLotSize": payload.lotSize,
-            "smart": SMART_SCALP_SERVICE.snapshot_state(),
-            "broker": TRADE_GATEWAY.status(),
+            "smart": smart_scalp_service().snapshot_state(),
+            "broker": trade_gateway().status(),
             "serverTimeMs": now_ms(),
         }
     except HTTPException:
@@ -3872,7 +5233,7 @@ def trade_position_close(payload: TradePositionCloseRequest, username: str = Dep
     if _trade_not_configured():
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Broker integration is not configured.")
     try:
-        result = TRADE_GATEWAY.close_position(position_id=payload.positionId, volume=payload.volume)
+        result = trade_gateway().close_position(position_id=payload.positionId, volume=payload.volume)
         _audit_trade_action(
             action="close_position",
             source="manual",
@@ -3880,12 +5241,12 @@ def trade_position_close(payload: TradePositionCloseRequest, username: str = Dep
             position_id=payload.positionId,
             volume=payload.volume,
         )
-        SMART_SCALP_SERVICE.reset(reason="Manual close submitted. Smart Close restored.", restore_close_preference=True)
+        smart_scalp_service().reset(reason="Manual close submitted. Smart Close restored.", restore_close_preference=True)
         return {
             "ok": True,
             "result": result,
-            "smart": SMART_SCALP_SERVICE.snapshot_state(),
-            "broker": TRADE_GATEWAY.status(),
+            "smart": smart_scalp_service().snapshot_state(),
+            "broker": trade_gateway().status(),
             "serverTimeMs": now_ms(),
         }
     except Exception as exc:
@@ -3904,14 +5265,14 @@ def trade_position_amend(payload: TradePositionAmendRequest, username: str = Dep
     if payload.stopLoss is None and payload.takeProfit is None and not payload.clearStopLoss and not payload.clearTakeProfit:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one of stopLoss or takeProfit is required.")
     try:
-        result = TRADE_GATEWAY.amend_position_sltp(
+        result = trade_gateway().amend_position_sltp(
             position_id=payload.positionId,
             stop_loss=payload.stopLoss,
             take_profit=payload.takeProfit,
             clear_stop_loss=payload.clearStopLoss,
             clear_take_profit=payload.clearTakeProfit,
         )
-        return {"ok": True, "result": result, "broker": TRADE_GATEWAY.status(), "serverTimeMs": now_ms()}
+        return {"ok": True, "result": result, "broker": trade_gateway().status(), "serverTimeMs": now_ms()}
     except Exception as exc:
         _handle_trade_gateway_error(exc)
 
@@ -3919,14 +5280,14 @@ def trade_position_amend(payload: TradePositionAmendRequest, username: str = Dep
 @app.get("/api/trade/smart")
 def trade_smart_state(username: str = Depends(require_trade_auth)) -> Dict[str, Any]:
     _ = username
-    return SMART_SCALP_SERVICE.snapshot_state()
+    return smart_scalp_service().snapshot_state()
 
 
 @app.post("/api/trade/smart/context")
 def trade_smart_context(payload: TradeSmartContextRequest, username: str = Depends(require_trade_auth)) -> Dict[str, Any]:
     _ = username
     try:
-        return SMART_SCALP_SERVICE.set_context(page=payload.page, mode=payload.mode, run=payload.run)
+        return smart_scalp_service().set_context(page=payload.page, mode=payload.mode, run=payload.run)
     except Exception as exc:
         _handle_smart_scalp_error(exc)
 
@@ -3937,7 +5298,7 @@ def trade_smart_entry(payload: TradeSmartEntryArmRequest, username: str = Depend
     if _trade_not_configured():
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Broker integration is not configured.")
     try:
-        return SMART_SCALP_SERVICE.arm_entry(side=payload.side, armed=payload.armed)
+        return smart_scalp_service().arm_entry(side=payload.side, armed=payload.armed)
     except Exception as exc:
         _handle_smart_scalp_error(exc)
 
@@ -3948,7 +5309,7 @@ def trade_smart_close(payload: TradeSmartCloseArmRequest, username: str = Depend
     if _trade_not_configured():
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Broker integration is not configured.")
     try:
-        return SMART_SCALP_SERVICE.arm_close(armed=payload.armed)
+        return smart_scalp_service().arm_close(armed=payload.armed)
     except Exception as exc:
         _handle_smart_scalp_error(exc)
 
@@ -3993,7 +5354,7 @@ def trade_close_config(payload: TradeCloseConfigRequest, username: str = Depends
                 end_tick_id=payload.endTickId,
                 anchor_tick_id=payload.anchorTickId,
             )
-        return SMART_SCALP_SERVICE.set_close_configuration(mode=payload.mode, channel=drawing)
+        return smart_scalp_service().set_close_configuration(mode=payload.mode, channel=drawing)
     except RegressionChannelError as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -4007,7 +5368,7 @@ def trade_close_config(payload: TradeCloseConfigRequest, username: str = Depends
 def trade_smart_config(payload: TradeSmartConfigRequest, username: str = Depends(require_trade_auth)) -> Dict[str, Any]:
     _ = username
     try:
-        return SMART_SCALP_SERVICE.update_config(payload.model_dump(exclude_none=True))
+        return smart_scalp_service().update_config(payload.model_dump(exclude_none=True))
     except Exception as exc:
         _handle_smart_scalp_error(exc)
 
@@ -4040,7 +5401,7 @@ def live_rect_state(mode: str = Query("review", pattern="^(live|review)$")) -> D
 @app.post("/api/live/rect")
 def live_rect_create(payload: RectCreateRequest) -> Dict[str, Any]:
     try:
-        rect = RECT_PAPER_SERVICE.create_rect(
+        rect = rect_paper_service().create_rect(
             mode=payload.mode,
             leftx=payload.leftx,
             rightx=payload.rightx,
@@ -4057,7 +5418,7 @@ def live_rect_create(payload: RectCreateRequest) -> Dict[str, Any]:
 @app.patch("/api/live/rect/{rect_id}")
 def live_rect_update(rect_id: int, payload: RectUpdateRequest) -> Dict[str, Any]:
     try:
-        rect = RECT_PAPER_SERVICE.update_rect(
+        rect = rect_paper_service().update_rect(
             rect_id=rect_id,
             mode=payload.mode,
             leftx=payload.leftx,
@@ -4074,7 +5435,7 @@ def live_rect_update(rect_id: int, payload: RectUpdateRequest) -> Dict[str, Any]
 @app.post("/api/live/rect/{rect_id}/smart-close")
 def live_rect_smart_close(rect_id: int, payload: RectSmartCloseRequest) -> Dict[str, Any]:
     try:
-        rect = RECT_PAPER_SERVICE.set_smart_close(rect_id=rect_id, mode=payload.mode, enabled=payload.enabled)
+        rect = rect_paper_service().set_smart_close(rect_id=rect_id, mode=payload.mode, enabled=payload.enabled)
         return {"rect": rect}
     except Exception as exc:
         _handle_rect_error(exc)
@@ -4083,7 +5444,7 @@ def live_rect_smart_close(rect_id: int, payload: RectSmartCloseRequest) -> Dict[
 @app.post("/api/live/rect/{rect_id}/clear")
 def live_rect_clear(rect_id: int, payload: RectModeRequest) -> Dict[str, Any]:
     try:
-        RECT_PAPER_SERVICE.clear_rect(rect_id=rect_id, mode=payload.mode)
+        rect_paper_service().clear_rect(rect_id=rect_id, mode=payload.mode)
         return {"rect": None}
     except Exception as exc:
         _handle_rect_error(exc)
@@ -4092,7 +5453,7 @@ def live_rect_clear(rect_id: int, payload: RectModeRequest) -> Dict[str, Any]:
 @app.post("/api/live/rect/{rect_id}/manual-close")
 def live_rect_manual_close(rect_id: int, payload: RectModeRequest) -> Dict[str, Any]:
     try:
-        rect = RECT_PAPER_SERVICE.manual_close(rect_id=rect_id, mode=payload.mode)
+        rect = rect_paper_service().manual_close(rect_id=rect_id, mode=payload.mode)
         return {"rect": rect}
     except Exception as exc:
         _handle_rect_error(exc)
@@ -4108,39 +5469,83 @@ def backbone_review_start(
 
 @app.get("/api/backbone/candles")
 def backbone_candles(
+    request: Request,
     candles: int = Query(DEFAULT_BACKBONE_CANDLE_COUNT, ge=1, le=MAX_BACKBONE_CANDLE_COUNT),
     layer: str = Query(DEFAULT_BACKBONE_LAYER),
     id: Optional[int] = Query(None, ge=1),
-) -> Dict[str, Any]:
-    return load_backbone_candles_payload(count=candles, start_id=id, layer=layer)
+) -> Any:
+    layer = normalize_backbone_layer(layer)
+    with db_connection(readonly=True) as conn:
+        return cached_range_response(
+            request,
+            key="backbone-candles:{0}:{1}:{2}".format(candles, layer, id),
+            version=backbone_range_cache_version(conn, start_id=id, source=BACKBONE_LAYER_SOURCES[layer]),
+            build=lambda: load_backbone_candles_payload(count=candles, start_id=id, layer=layer, conn=conn),
+        )
+
+
+@app.get("/api/backbone/overview")
+def backbone_overview(
+    days: int = Query(DEFAULT_BACKBONE_OVERVIEW_DAYS, ge=1, le=MAX_BACKBONE_OVERVIEW_DAYS),
+    layer: str = Query(DEFAULT_BACKBONE_LAYER),
+    end: Optional[date] = Query(None),
+) -> Response:
+    layer = normalize_backbone_layer(layer)
+    return coalesced_json_response(
+        endpoint="backbone-overview",
+        key=coalesce_key("backbone-overview", days=days, layer=layer, end=end),
+        ttl_seconds=COALESCE_LATEST_TTL_SECONDS,
+        build=lambda: load_backbone_overview_payload(days=days, layer=layer, end=end),
+    )
 
 
 @app.get("/api/backbone/detail")
 def backbone_detail(
+    request: Request,
     ticks: int = Query(DEFAULT_BACKBONE_DETAIL_TICKS, ge=1, le=MAX_TICK_WINDOW),
     id: Optional[int] = Query(None, ge=1),
-) -> Dict[str, Any]:
-    return load_backbone_detail_payload(ticks=ticks, start_id=id)
+    encoding: str = Query("json", pattern="^(json|columnar)$"),
+) -> Any:
+    with db_connection(readonly=True) as conn:
+        return cached_range_response(
+            request,
+            key="backbone-detail:{0}:{1}:{2}".format(ticks, id, encoding),
+            version=backbone_range_cache_version(conn, start_id=id, source=BACKBONE_SOURCE),
+            build=lambda: encode_payload(load_backbone_detail_payload(ticks=ticks, start_id=id, conn=conn), encoding),
+        )
 
 
 @app.get("/api/bigpicture/bootstrap")
 def bigpicture_bootstrap(
     points: int = Query(DEFAULT_BIGPICTURE_POINTS, ge=200, le=MAX_BIGPICTURE_POINTS),
-) -> Dict[str, Any]:
-    return load_bigpicture_bootstrap_payload(points)
+) -> Response:
+    return coalesced_json_response(
+        endpoint="bigpicture-bootstrap",
+        key=coalesce_key("bigpicture-bootstrap", points=points),
+        ttl_seconds=COALESCE_LATEST_TTL_SECONDS,
+        build=lambda: load_bigpicture_bootstrap_payload(points),
+    )
 
 
 @app.get("/api/bigpicture/window")
 def bigpicture_window(
+    request: Request,
     startTsMs: int = Query(..., ge=1),
     endTsMs: int = Query(..., ge=1),
     points: int = Query(DEFAULT_BIGPICTURE_POINTS, ge=200, le=MAX_BIGPICTURE_POINTS),
-) -> Dict[str, Any]:
-    return load_bigpicture_window_payload(
-        start_ts_ms=startTsMs,
-        end_ts_ms=endTsMs,
-        points=points,
-    )
+) -> Any:
+    with db_connection(readonly=True) as conn:
+        return cached_range_response(
+            request,
+            key="bigpicture-window:{0}:{1}:{2}".format(startTsMs, endTsMs, points),
+            version=tick_range_cache_version(conn, range_end_ts=ms_to_dt(max(startTsMs, endTsMs))),
+            build=lambda: load_bigpicture_window_payload(
+                start_ts_ms=startTsMs,
+                end_ts_ms=endTsMs,
+                points=points,
+                conn=conn,
+            ),
+        )
 
 
 @app.get("/api/live/bootstrap")
@@ -4152,15 +5557,34 @@ def live_bootstrap(
     showEvents: bool = Query(True),
     showStructure: bool = Query(True),
     showRanges: bool = Query(True),
-) -> Dict[str, Any]:
-    return load_bootstrap_payload(
-        mode=mode,
-        start_id=id,
-        window=window,
-        show_ticks=showTicks,
-        show_events=showEvents,
-        show_structure=showStructure,
-        show_ranges=showRanges,
+    encoding: str = Query("json", pattern="^(json|columnar)$"),
+) -> Response:
+    return coalesced_json_response(
+        endpoint="live-bootstrap",
+        key=coalesce_key(
+            "live-bootstrap",
+            mode=mode,
+            id=id,
+            window=window,
+            showTicks=showTicks,
+            showEvents=showEvents,
+            showStructure=showStructure,
+            showRanges=showRanges,
+            encoding=encoding,
+        ),
+        ttl_seconds=COALESCE_LATEST_TTL_SECONDS if mode == "live" else 0.0,
+        build=lambda: encode_payload(
+            load_bootstrap_payload(
+                mode=mode,
+                start_id=id,
+                window=window,
+                show_ticks=showTicks,
+                show_events=showEvents,
+                show_structure=showStructure,
+                show_ranges=showRanges,
+            ),
+            encoding,
+        ),
     )
 
 
@@ -4174,8 +5598,9 @@ def live_next(
     showEvents: bool = Query(True),
     showStructure: bool = Query(True),
     showRanges: bool = Query(True),
-) -> Dict[str, Any]:
-    return load_next_payload(
+    encoding: str = Query("json", pattern="^(json|columnar)$"),
+) -> FastJSONResponse:
+    payload = load_next_payload(
         after_id=afterId,
         limit=limit,
         end_id=endId,
@@ -4185,30 +5610,51 @@ def live_next(
         show_structure=showStructure,
         show_ranges=showRanges,
     )
+    # Returning the response directly skips FastAPI's jsonable_encoder walk over every row.
+    return FastJSONResponse(encode_payload(payload, encoding))
 
 
 @app.get("/api/live/previous")
 def live_previous(
+    request: Request,
     beforeId: int = Query(..., ge=1),
     currentLastId: Optional[int] = Query(None, ge=1),
     limit: int = Query(DEFAULT_HISTORY_LIMIT, ge=1, le=MAX_TICK_WINDOW),
-    mode: str = Query("live", pattern="^(live|review)$"),
     showTicks: bool = Query(True),
     showEvents: bool = Query(True),
     showStructure: bool = Query(True),
     showRanges: bool = Query(True),
-) -> Dict[str, Any]:
-    payload = load_previous_payload(
-        before_id=beforeId,
-        current_last_id=currentLastId,
-        limit=limit,
-        show_ticks=showTicks,
-        show_events=showEvents,
-        show_structure=showStructure,
-        show_ranges=showRanges,
-    )
-    payload["rect"] = rect_snapshot_for_mode(mode)
-    return payload
+    encoding: str = Query("json", pattern="^(json|columnar)$"),
+) -> Any:
+    # The body only depends on the requested tick range, so the paper-rect snapshot is left to the stream.
+    with db_connection(readonly=True) as conn:
+        return cached_range_response(
+            request,
+            key="live-previous:{0}:{1}:{2}:{3}{4}{5}{6}:{7}".format(
+                beforeId,
+                currentLastId,
+                limit,
+                int(showTicks),
+                int(showEvents),
+                int(showStructure),
+                int(showRanges),
+                encoding,
+            ),
+            version=tick_range_cache_version(conn, range_end_id=currentLastId or (beforeId - 1)),
+            build=lambda: encode_payload(
+                load_previous_payload(
+                    before_id=beforeId,
+                    current_last_id=currentLastId,
+                    limit=limit,
+                    show_ticks=showTicks,
+                    show_events=showEvents,
+                    show_structure=showStructure,
+                    show_ranges=showRanges,
+                    conn=conn,
+                ),
+                encoding,
+            ),
+        )
 
 
 @app.get("/api/live/stream")
@@ -4221,28 +5667,129 @@ def live_stream(
     showEvents: bool = Query(True),
     showStructure: bool = Query(True),
     showRanges: bool = Query(True),
+    encoding: str = Query("json", pattern="^(json|columnar)$"),
 ) -> StreamingResponse:
-    return StreamingResponse(
-        stream_events(
-            after_id=afterId,
-            after_mavg_id=afterMavgId,
-            limit=limit,
-            window=window,
-            show_ticks=showTicks,
-            show_events=showEvents,
-            show_structure=showStructure,
-            show_ranges=showRanges,
-            rect_mode="live",
-        ),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
+    return sse_response(
+        buffered_sse(
+            stream_events(
+                after_id=afterId,
+                after_mavg_id=afterMavgId,
+                limit=limit,
+                window=window,
+                show_ticks=showTicks,
+                show_events=showEvents,
+                show_structure=showStructure,
+                show_ranges=showRanges,
+                rect_mode="live",
+            ),
+            stream_name="live_stream",
+            channel="live",
+            encoding=encoding,
+        )
     )
 
 
+@app.websocket("/ws/live")
+async def live_socket(websocket: WebSocket, encoding: str = Query("json", pattern="^(json|columnar)$")) -> None:
+    await websocket.accept()
+    loop = asyncio.get_running_loop()
+    wake = asyncio.Event()
+    send_lock = asyncio.Lock()
+    authenticated = _trade_session_decode(websocket.cookies.get(TRADE_COOKIE_NAME, "")) is not None
+    current: Dict[str, Any] = {"subscriber": None, "options": {}}
+
+    def notify() -> None:
+        loop.call_soon_threadsafe(wake.set)
+
+    async def send(message: Dict[str, Any]) -> None:
+        async with send_lock:
+            await websocket.send_text(fast_json_dumps(message).decode("utf-8"))
+
+    async def flush_loop() -> None:
+        seq = 0
+        while True:
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if current["subscriber"] is not None:
+                    await run_in_threadpool(ensure_live_hub_pump)
+                await send({"type": "heartbeat", "serverSentAtMs": now_ms()})
+                continue
+            wake.clear()
+            subscriber = current["subscriber"]
+            batch = subscriber.drain() if subscriber is not None else {}
+            if batch:
+                seq += 1
+                # Sending awaits the client; while it is slow the hub keeps coalescing into one pending batch.
+                await send(
+                    {
+                        "type": "batch",
+                        "seq": seq,
+                        "channels": filter_live_socket_batch(batch, current["options"], encoding=encoding),
+                        "coalesced": subscriber.coalesced,
+                        "dropped": subscriber.dropped,
+                        "resyncs": subscriber.resyncs,
+                        "serverSentAtMs": now_ms(),
+                    }
+                )
+                await asyncio.sleep(LIVE_WS_FRAME_SECONDS)
+
+    stream_open("live_socket")
+    flusher = asyncio.create_task(flush_loop())
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except json.JSONDecodeError:
+                await send({"type": "error", "error": "invalid_message", "message": "Messages must be JSON objects."})
+                continue
+            if not isinstance(message, dict) or message.get("action") != "subscribe":
+                await send({"type": "error", "error": "invalid_action", "message": "Only the subscribe action is supported."})
+                continue
+            channels, denied = resolve_live_socket_channels(message.get("channels"), authenticated=authenticated)
+            previous = current["subscriber"]
+            current["subscriber"] = None
+            if previous is not None:
+                LIVE_HUB.unsubscribe(previous)
+            subscriber = None
+            try:
+                subscriber = LIVE_HUB.subscribe(channels, notify=notify)
+                await run_in_threadpool(ensure_live_hub_pump)
+                catchup = await run_in_threadpool(
+                    load_live_socket_catchup,
+                    channels=channels,
+                    after_id=max(0, int(message.get("afterId") or 0)),
+                    after_mavg_id=max(0, int(message.get("afterMavgId") or 0)),
+                    after_backbone_id=int(message["afterBackboneId"]) if message.get("afterBackboneId") is not None else None,
+                )
+            except Exception:
+                STREAM_LOGGER.exception("Live socket subscribe failed")
+                if subscriber is not None:
+                    LIVE_HUB.unsubscribe(subscriber)
+                await send({"type": "error", "error": "subscribe_failed", "message": "Live subscription failed."})
+                continue
+            current["options"] = {key: bool(value) for key, value in (message.get("options") or {}).items()}
+            await send(
+                {
+                    "type": "subscribed",
+                    "channels": channels,
+                    "denied": denied,
+                    "catchup": filter_live_socket_batch(catchup, current["options"], encoding=encoding),
+                    "frameMs": round(LIVE_WS_FRAME_SECONDS * 1000.0, 2),
+                    "serverSentAtMs": now_ms(),
+                }
+            )
+            current["subscriber"] = subscriber
+            wake.set()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        flusher.cancel()
+        if current["subscriber"] is not None:
+            LIVE_HUB.unsubscribe(current["subscriber"])
+        stream_close("live_socket")
+
+
 @app.get("/api/live/review-stream")
 def live_review_stream(
     afterId: int = Query(0, ge=0),
@@ -4253,6 +5800,9 @@ def live_review_stream(
     showEvents: bool = Query(True),
     showStructure: bool = Query(True),
     showRanges: bool = Query(True),
+    session: Optional[str] = Query(None, max_length=64),
+    freshSession: bool = Query(False),
+    encoding: str = Query("json", pattern="^(json|columnar)$"),
 ) -> StreamingResponse:
     return StreamingResponse(
         stream_review_events(
@@ -4264,7 +5814,10 @@ def live_review_stream(
             show_events=showEvents,
             show_structure=showStructure,
             show_ranges=showRanges,
+            session_id=session,
+            fresh_session=freshSession,
             rect_mode="review",
+            encoding=encoding,
         ),
         media_type="text/event-stream",
         headers={
@@ -4275,6 +5828,33 @@ def live_review_stream(
     )
 
 
+@app.get("/api/live/review-session")
+def live_review_session(sessionId: str = Query(..., min_length=1, max_length=64)) -> Dict[str, Any]:
+    try:
+        return REVIEW_SESSIONS.get(sessionId).state()
+    except Exception as exc:
+        _handle_review_error(exc)
+
+
+@app.post("/api/live/review-session")
+def live_review_session_control(payload: ReviewSessionControlRequest) -> Dict[str, Any]:
+    try:
+        session = REVIEW_SESSIONS.get(payload.sessionId)
+        if payload.action == "pause":
+            session.pause()
+        elif payload.action == "resume":
+            session.resume()
+        elif payload.action == "speed":
+            if payload.speed is None:
+                raise ReviewPlaybackError("A speed is required.", code="REVIEW_SPEED_REQUIRED")
+            session.set_speed(payload.speed)
+        else:
+            if payload.tickId is None:
+                raise ReviewPlaybackError("A tick id is required to seek.", code="REVIEW_TICK_REQUIRED")
+            session.seek(payload.tickId)
+        return session.state()
+    except Exception as exc:
+        _handle_review_error(exc)
 
 
 @app.get("/api/backbone/bootstrap")
@@ -4283,12 +5863,21 @@ def backbone_bootstrap(
     id: Optional[int] = Query(None, ge=1),
     window: int = Query(DEFAULT_BACKBONE_REVIEW_WINDOW, ge=1, le=MAX_BACKBONE_REVIEW_WINDOW),
     showTicks: bool = Query(False),
-) -> Dict[str, Any]:
-    return load_backbone_bootstrap_payload(
-        mode=mode,
-        start_id=id,
-        window=window,
-        show_ticks=showTicks,
+    encoding: str = Query("json", pattern="^(json|columnar)$"),
+) -> Response:
+    return coalesced_json_response(
+        endpoint="backbone-bootstrap",
+        key=coalesce_key("backbone-bootstrap", mode=mode, id=id, window=window, showTicks=showTicks, encoding=encoding),
+        ttl_seconds=COALESCE_LATEST_TTL_SECONDS if mode == "live" else 0.0,
+        build=lambda: encode_payload(
+            load_backbone_bootstrap_payload(
+                mode=mode,
+                start_id=id,
+                window=window,
+                show_ticks=showTicks,
+            ),
+            encoding,
+        ),
     )
 
 
@@ -4299,14 +5888,16 @@ def backbone_next(
     dayId: Optional[int] = Query(None, ge=1),
     endId: Optional[int] = Query(None, ge=1),
     showTicks: bool = Query(False),
-) -> Dict[str, Any]:
-    return load_backbone_next_payload(
+    encoding: str = Query("json", pattern="^(json|columnar)$"),
+) -> FastJSONResponse:
+    payload = load_backbone_next_payload(
         after_id=afterId,
         limit=limit,
         day_id=dayId,
         end_id=endId,
         show_ticks=showTicks,
     )
+    return FastJSONResponse(encode_payload(payload, encoding))
 
 
 @app.get("/api/backbone/stream")
@@ -4314,18 +5905,20 @@ def backbone_stream(
     afterId: int = Query(0, ge=0),
     limit: int = Query(250, ge=1, le=MAX_STREAM_BATCH),
     showTicks: bool = Query(False),
+    encoding: str = Query("json", pattern="^(json|columnar)$"),
 ) -> StreamingResponse:
-    return StreamingResponse(
-        stream_backbone_events(
-            after_id=afterId,
-            limit=limit,
-            show_ticks=showTicks,
-        ),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
+    return sse_response(
+        buffered_sse(
+            stream_backbone_events(
+                after_id=afterId,
+                limit=limit,
+                show_ticks=showTicks,
+            ),
+            stream_name="backbone_stream",
+            channel="backbone",
+            encoding=encoding,
+        )
     )
 
+
+SERVICES.record_phase("app_module", elapsed_ms(APP_MODULE_STARTED))
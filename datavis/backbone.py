@@ -1,16 +1,23 @@
 from __future__ import annotations
 
 import argparse
+import bisect
+import csv
+import io
 import json
 import math
 import os
-from collections import deque
+import struct
+import threading
+import time
+from collections import OrderedDict, deque
 from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, Generator, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 import psycopg2
 import psycopg2.extras
 from dotenv import load_dotenv
@@ -35,6 +42,19 @@ DELTA_Q80_WEIGHT = 3.00
 DELTA_STD_WEIGHT = 3.00
 THRESHOLD_FLOOR = 0.25
 ABS_DELTA_MIN_PERIODS = 20
+CHECKPOINT_SECONDS = max(1.0, float(os.getenv("DATAVIS_BACKBONE_CHECKPOINT_SECONDS", "30")))
+CHECKPOINT_MAGIC = b"BBCK"
+CHECKPOINT_FORMAT = 2
+# magic, format, engine version, processed count, last tick id, last tick time (epoch us),
+# prevmid, lastvalidspread, currentthreshold, spread ema, threshold ema, delta mean, delta variance,
+# direction, confirmed pivot (tickid, time us, price, index), candidate extreme (same),
+# leg high/low, tail high/low, window length.
+CHECKPOINT_HEADER = struct.Struct("<4sHHqqqdddddddbqqdqqqdqddddH")
+CHECKPOINT_DIRECTIONS = {None: 0, "Up": 1, "Down": 2}
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+BACKBONE_NOTIFY_CHANNEL = "datavis_backbone"
+DAY_REF_CACHE_ENTRIES = max(16, int(os.getenv("DATAVIS_DAY_REF_CACHE_ENTRIES", "512")))
+DAY_REF_PROVISIONAL_SECONDS = max(1.0, float(os.getenv("DATAVIS_DAY_REF_PROVISIONAL_SECONDS", "30")))
 
 _DAYS_TABLE_DESCRIPTOR: Any = ...
 
@@ -55,6 +75,21 @@ class DaysTableDescriptor:
     symbolcol: Optional[str]
 
 
+@dataclass(frozen=True)
+class BackboneParams:
+    spread_span: int = SPREAD_SPAN
+    noise_window: int = NOISE_WINDOW
+    threshold_smooth_span: int = THRESHOLD_SMOOTH_SPAN
+    spread_weight: float = SPREAD_WEIGHT
+    delta_q80_weight: float = DELTA_Q80_WEIGHT
+    delta_std_weight: float = DELTA_STD_WEIGHT
+    threshold_floor: float = THRESHOLD_FLOOR
+    abs_delta_min_periods: int = ABS_DELTA_MIN_PERIODS
+
+
+DEFAULT_PARAMS = BackboneParams()
+
+
 @dataclass
 class BackbonePoint:
     index: int
@@ -103,6 +138,16 @@ def _as_utc(value: datetime) -> datetime:
     return value.astimezone(timezone.utc)
 
 
+def _epoch_micros(value: Optional[datetime]) -> int:
+    if value is None:
+        return 0
+    return (_as_utc(value) - EPOCH) // timedelta(microseconds=1)
+
+
+def _from_epoch_micros(value: int) -> Optional[datetime]:
+    return EPOCH + timedelta(microseconds=value) if value else None
+
+
 def _safe_float(value: Any) -> Optional[float]:
     if value is None:
         return None
@@ -112,6 +157,14 @@ def _safe_float(value: Any) -> Optional[float]:
         return None
 
 
+def _widen(current: Optional[Tuple[float, float]], other: Optional[Tuple[float, float]]) -> Optional[Tuple[float, float]]:
+    if other is None:
+        return current
+    if current is None:
+        return other
+    return max(current[0], other[0]), min(current[1], other[1])
+
+
 def _derive_spread(row: Dict[str, Any]) -> Optional[float]:
     spread = _safe_float(row.get("spread"))
     if spread is not None:
@@ -169,12 +222,72 @@ def describe_days_table(conn: Any) -> Optional[DaysTableDescriptor]:
     return descriptor
 
 
-def resolve_day_ref_for_timestamp(conn: Any, *, symbol: str, timestamp: datetime) -> DayRef:
+class DayRefCache:
+    """Process-wide day lookups keyed by symbol and brokerday.
+
+    A day's row never changes once it exists, so confirmed entries stay until evicted or invalidated;
+    provisional ones (no row yet, synthetic fallback) expire quickly so a late-created row is picked up.
+    """
+
+    def __init__(self, *, max_entries: int = DAY_REF_CACHE_ENTRIES, provisional_seconds: float = DAY_REF_PROVISIONAL_SECONDS) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.provisional_seconds = float(provisional_seconds)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[Optional[float], Any]]" = OrderedDict()
+
+    def get(self, key: Tuple[Any, ...]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or time.monotonic() < entry[0]):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Tuple[Any, ...], value: Any, *, provisional: bool = False) -> Any:
+        expires_at = time.monotonic() + self.provisional_seconds if provisional else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if len(key) > 1 and key[1] == symbol]:
+                del self._entries[key]
+
+
+DAY_REFS = DayRefCache()
+
+
+def resolve_day_ref_for_timestamp(conn: Any, *, symbol: str, timestamp: datetime, cache: Optional[DayRefCache] = DAY_REFS) -> DayRef:
     brokerday = brokerday_for_timestamp(timestamp)
+    key = ("day", symbol, brokerday)
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None and cached.starttime <= _as_utc(timestamp) < cached.endtime:
+        return cached
+    dayref, confirmed = _query_day_ref(conn, symbol=symbol, timestamp=timestamp, brokerday=brokerday)
+    # Only the row covering the day's own start can stand for every timestamp in that brokerday.
+    if cache is not None and dayref.brokerday == brokerday:
+        cache.put(key, dayref, provisional=not confirmed)
+    return dayref
+
+
+def _query_day_ref(conn: Any, *, symbol: str, timestamp: datetime, brokerday: date) -> Tuple[DayRef, bool]:
     fallback_start, fallback_end = brokerday_bounds(brokerday)
     descriptor = describe_days_table(conn)
     if descriptor is None:
-        return DayRef(dayid=_synthetic_dayid(brokerday), brokerday=brokerday, starttime=fallback_start, endtime=fallback_end)
+        return DayRef(dayid=_synthetic_dayid(brokerday), brokerday=brokerday, starttime=fallback_start, endtime=fallback_end), True
 
     with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
         if descriptor.startcol and descriptor.endcol:
@@ -201,11 +314,14 @@ def resolve_day_ref_for_timestamp(conn: Any, *, symbol: str, timestamp: datetime
             row = dict(cur.fetchone() or {})
             if row:
                 resolved_day = row.get(descriptor.datecol) if descriptor.datecol else brokerday
-                return DayRef(
-                    dayid=int(row["id"]),
-                    brokerday=resolved_day or brokerday,
-                    starttime=_as_utc(row.get(descriptor.startcol) or fallback_start),
-                    endtime=_as_utc(row.get(descriptor.endcol) or fallback_end),
+                return (
+                    DayRef(
+                        dayid=int(row["id"]),
+                        brokerday=resolved_day or brokerday,
+                        starttime=_as_utc(row.get(descriptor.startcol) or fallback_start),
+                        endtime=_as_utc(row.get(descriptor.endcol) or fallback_end),
+                    ),
+                    True,
                 )
 
         if descriptor.datecol:
@@ -227,14 +343,17 @@ def resolve_day_ref_for_timestamp(conn: Any, *, symbol: str, timestamp: datetime
             row = dict(cur.fetchone() or {})
             if row:
                 resolved_day = row.get(descriptor.datecol) or brokerday
-                return DayRef(
-                    dayid=int(row["id"]),
-                    brokerday=resolved_day,
-                    starttime=fallback_start,
-                    endtime=fallback_end,
+                return (
+                    DayRef(
+                        dayid=int(row["id"]),
+                        brokerday=resolved_day,
+                        starttime=fallback_start,
+                        endtime=fallback_end,
+                    ),
+                    True,
                 )
 
-    return DayRef(dayid=_synthetic_dayid(brokerday), brokerday=brokerday, starttime=fallback_start, endtime=fallback_end)
+    return DayRef(dayid=_synthetic_dayid(brokerday), brokerday=brokerday, starttime=fallback_start, endtime=fallback_end), False
 
 
 def resolve_day_ref_for_brokerday(conn: Any, *, symbol: str, brokerday: date) -> DayRef:
@@ -242,6 +361,15 @@ def resolve_day_ref_for_brokerday(conn: Any, *, symbol: str, brokerday: date) ->
     return resolve_day_ref_for_timestamp(conn, symbol=symbol, timestamp=starttime)
 
 
+def find_day_ref_for_brokerday(conn: Any, *, symbol: str, brokerday: date) -> Optional[DayRef]:
+    """The brokerday's own days row, or None for weekends and holidays that have none (never a synthetic id)."""
+    starttime, _ = brokerday_bounds(brokerday)
+    dayref, confirmed = _query_day_ref(conn, symbol=symbol, timestamp=starttime, brokerday=brokerday)
+    if not confirmed or dayref.brokerday != brokerday:
+        return None
+    return dayref
+
+
 def fetch_latest_tick(conn: Any, *, symbol: str) -> Optional[Dict[str, Any]]:
     with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
         cur.execute(
@@ -305,6 +433,30 @@ def iter_ticks_for_day(conn: Any, *, symbol: str, dayref: DayRef, batch_size: in
             yield [dict(row) for row in rows]
 
 
+def fetch_tick_columns_for_day(conn: Any, *, symbol: str, dayref: DayRef, batch_size: int) -> Dict[str, List[Any]]:
+    """Whole-day tick columns for the batch engine; prices arrive as float8 so no Decimal is built per row."""
+    columns: Dict[str, List[Any]] = {name: [] for name in ("ids", "timestamps", "bids", "asks", "mids", "spreads")}
+    with conn.cursor(name="backbone_day_tick_columns") as cur:
+        cur.itersize = max(1, int(batch_size))
+        cur.execute(
+            """
+            SELECT id, timestamp, bid::float8, ask::float8, mid::float8, spread::float8
+            FROM public.ticks
+            WHERE symbol = %s
+              AND timestamp >= %s
+              AND timestamp < %s
+            ORDER BY timestamp ASC, id ASC
+            """,
+            (symbol, dayref.starttime, dayref.endtime),
+        )
+        while True:
+            rows = cur.fetchmany(cur.itersize)
+            if not rows:
+                return columns
+            for name, values in zip(columns, zip(*rows)):
+                columns[name].extend(values)
+
+
 def fetch_ticks_after_for_day(conn: Any, *, symbol: str, dayref: DayRef, after_id: int, limit: int) -> List[Dict[str, Any]]:
     with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
         cur.execute(
@@ -323,7 +475,48 @@ def fetch_ticks_after_for_day(conn: Any, *, symbol: str, dayref: DayRef, after_i
         return [dict(row) for row in cur.fetchall()]
 
 
-def fetch_day_latest_move(conn: Any, *, dayref: DayRef, source: str) -> Optional[Dict[str, Any]]:
+def fetch_ticks_after_for_symbols(
+    conn: Any,
+    *,
+    cursors: Sequence[Tuple[str, DayRef, int]],
+    limit: int,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """fetch_ticks_after_for_day for several (symbol, dayref, after_id) cursors in one round trip, `limit` per symbol."""
+    if not cursors:
+        return {}
+    with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+        cur.execute(
+            """
+            SELECT t.id, t.symbol, t.timestamp, t.bid, t.ask, t.mid, t.spread
+            FROM unnest(%s::text[], %s::timestamptz[], %s::timestamptz[], %s::bigint[])
+                WITH ORDINALITY AS c(symbol, starttime, endtime, afterid, ord)
+            CROSS JOIN LATERAL (
+                SELECT id, symbol, timestamp, bid, ask, mid, spread
+                FROM public.ticks
+                WHERE symbol = c.symbol
+                  AND timestamp >= c.starttime
+                  AND timestamp < c.endtime
+                  AND id > c.afterid
+                ORDER BY timestamp ASC, id ASC
+                LIMIT %s
+            ) AS t
+            ORDER BY c.ord, t.timestamp ASC, t.id ASC
+            """,
+            (
+                [symbol for symbol, _, _ in cursors],
+                [dayref.starttime for _, dayref, _ in cursors],
+                [dayref.endtime for _, dayref, _ in cursors],
+                [int(after_id) for _, _, after_id in cursors],
+                limit,
+            ),
+        )
+        rows: Dict[str, List[Dict[str, Any]]] = {symbol: [] for symbol, _, _ in cursors}
+        for row in cur.fetchall():
+            rows[row["symbol"]].append(dict(row))
+        return rows
+
+
+def fetch_day_latest_move(conn: Any, *, symbol: str, dayref: DayRef, source: str) -> Optional[Dict[str, Any]]:
     with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
         cur.execute(
             """
@@ -331,10 +524,11 @@ def fetch_day_latest_move(conn: Any, *, dayref: DayRef, source: str) -> Optional
             FROM public.backbonemoves
             WHERE dayid = %s
               AND source = %s
+              AND symbol = %s
             ORDER BY endtickid DESC, id DESC
             LIMIT 1
             """,
-            (dayref.dayid, source),
+            (dayref.dayid, source, symbol),
         )
         row = cur.fetchone()
     return dict(row) if row else None
@@ -365,12 +559,106 @@ def delete_day(conn: Any, *, dayid: int, symbol: str, source: Optional[str] = No
                 "DELETE FROM public.backbonestate WHERE symbol = %s AND dayid = %s AND source = %s",
                 (symbol, dayid, source),
             )
-            cur.execute("DELETE FROM public.backbonemoves WHERE dayid = %s AND source = %s", (dayid, source))
-            cur.execute("DELETE FROM public.backbonepivots WHERE dayid = %s AND source = %s", (dayid, source))
+            cur.execute("DELETE FROM public.backbonemoves WHERE dayid = %s AND source = %s AND symbol = %s", (dayid, source, symbol))
+            cur.execute("DELETE FROM public.backbonepivots WHERE dayid = %s AND source = %s AND symbol = %s", (dayid, source, symbol))
+            cur.execute(
+                "DELETE FROM public.backbonedaysummary WHERE symbol = %s AND dayid = %s AND source = %s",
+                (symbol, dayid, source),
+            )
             return
         cur.execute("DELETE FROM public.backbonestate WHERE symbol = %s AND dayid = %s", (symbol, dayid))
-        cur.execute("DELETE FROM public.backbonemoves WHERE dayid = %s", (dayid,))
-        cur.execute("DELETE FROM public.backbonepivots WHERE dayid = %s", (dayid,))
+        cur.execute("DELETE FROM public.backbonemoves WHERE dayid = %s AND symbol = %s", (dayid, symbol))
+        cur.execute("DELETE FROM public.backbonepivots WHERE dayid = %s AND symbol = %s", (dayid, symbol))
+        cur.execute("DELETE FROM public.backbonedaysummary WHERE symbol = %s AND dayid = %s", (symbol, dayid))
+
+
+class OrderedMultiset:
+    """Sorted multiset kept as bounded sorted sublists so updates cost O(sqrt n) C-level bisects and memmoves."""
+
+    def __init__(self, *, load: int = 1024) -> None:
+        self.load = max(4, int(load))
+        self._lists: List[List[float]] = []
+        self._maxes: List[float] = []
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, value: float) -> None:
+        lists = self._lists
+        if len(lists) == 1:
+            bucket = lists[0]
+            bisect.insort(bucket, value)
+            self._len += 1
+            if self._len > self.load * 2:
+                self._split(0)
+            return
+        if not lists:
+            lists.append([value])
+            self._maxes.append(value)
+            self._len = 1
+            return
+        maxes = self._maxes
+        index = bisect.bisect_left(maxes, value)
+        if index == len(maxes):
+            index -= 1
+        bucket = lists[index]
+        bisect.insort(bucket, value)
+        maxes[index] = bucket[-1]
+        self._len += 1
+        if len(bucket) > self.load * 2:
+            self._split(index)
+
+    def discard(self, value: float) -> bool:
+        lists = self._lists
+        if len(lists) == 1:
+            index = 0
+        else:
+            index = bisect.bisect_left(self._maxes, value)
+            if index == len(self._maxes):
+                return False
+        bucket = lists[index]
+        position = bisect.bisect_left(bucket, value)
+        if position >= len(bucket) or bucket[position] != value:
+            return False
+        del bucket[position]
+        self._len -= 1
+        if len(lists) > 1:
+            if bucket:
+                self._maxes[index] = bucket[-1]
+            else:
+                del lists[index]
+                del self._maxes[index]
+        elif not bucket:
+            self._lists = []
+            self._maxes = []
+        return True
+
+    def __getitem__(self, index: int) -> float:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("OrderedMultiset index out of range")
+        for bucket in self._lists:
+            if index < len(bucket):
+                return bucket[index]
+            index -= len(bucket)
+        raise IndexError("OrderedMultiset index out of range")
+
+    def pair(self, lower: int, upper: int) -> Tuple[float, float]:
+        lists = self._lists
+        if len(lists) == 1:
+            bucket = lists[0]
+            return bucket[lower], bucket[upper]
+        return self[lower], self[upper]
+
+    def _split(self, index: int) -> None:
+        bucket = self._lists[index]
+        half = len(bucket) // 2
+        self._lists.insert(index + 1, bucket[half:])
+        del bucket[half:]
+        # The single-sublist fast path does not track maxes, so rebuild them here.
+        self._maxes = [item[-1] for item in self._lists]
 
 
 class RollingPercentileWindow:
@@ -379,26 +667,25 @@ class RollingPercentileWindow:
         self.quantile = max(0.0, min(1.0, float(quantile)))
         self.min_periods = max(1, int(min_periods))
         self.values: deque[float] = deque()
-        self.sorted_values: List[float] = []
+        self.sorted_values = OrderedMultiset()
 
     def restore(self, values: Sequence[float]) -> None:
         self.values = deque()
-        self.sorted_values = []
+        self.sorted_values = OrderedMultiset()
         for value in values[-self.window :]:
             self.add(float(value))
 
     def add(self, value: Optional[float]) -> Optional[float]:
-        if value is None or not math.isfinite(float(value)):
+        if value is None:
             return self.current()
         numeric = float(value)
-        if len(self.values) >= self.window:
-            removed = self.values.popleft()
-            removed_index = self._bisect_left(self.sorted_values, removed)
-            if removed_index < len(self.sorted_values):
-                self.sorted_values.pop(removed_index)
-        insert_at = self._bisect_left(self.sorted_values, numeric)
-        self.sorted_values.insert(insert_at, numeric)
-        self.values.append(numeric)
+        if not math.isfinite(numeric):
+            return self.current()
+        values = self.values
+        if len(values) >= self.window:
+            self.sorted_values.discard(values.popleft())
+        self.sorted_values.add(numeric)
+        values.append(numeric)
         return self.current()
 
     def current(self) -> Optional[float]:
@@ -408,27 +695,14 @@ class RollingPercentileWindow:
         if count == 1:
             return float(self.sorted_values[0])
         position = (count - 1) * self.quantile
-        lower_index = int(math.floor(position))
-        upper_index = int(math.ceil(position))
-        lower_value = self.sorted_values[lower_index]
-        upper_value = self.sorted_values[upper_index]
+        lower_index = int(position)
+        upper_index = lower_index + 1 if position > lower_index else lower_index
+        lower_value, upper_value = self.sorted_values.pair(lower_index, upper_index)
         if lower_index == upper_index:
             return float(lower_value)
         ratio = position - float(lower_index)
         return float(lower_value + ((upper_value - lower_value) * ratio))
 
-    @staticmethod
-    def _bisect_left(values: Sequence[float], needle: float) -> int:
-        low = 0
-        high = len(values)
-        while low < high:
-            middle = (low + high) // 2
-            if values[middle] < needle:
-                low = middle + 1
-            else:
-                high = middle
-        return low
-
 
 class EmaTracker:
     def __init__(self, *, span: int) -> None:
@@ -478,6 +752,89 @@ class EwmStdTracker:
         return math.sqrt(max(0.0, float(self.variance)))
 
 
+def rolling_quantile_series(
+    values: Sequence[float],
+    *,
+    start: int,
+    window: int,
+    quantile: float,
+    min_periods: int,
+) -> List[float]:
+    """RollingPercentileWindow.current() after each of values[start:] is added, NaN while under min_periods.
+
+    values[:start] seed the window. A single sorted list with C bisect/insort beats both the
+    multiset's method calls and a partition over sliding windows at the engine's window size.
+    """
+    seed = list(values[max(0, start - window) : start])
+    ordered = sorted(seed)
+    recent = deque(seed)
+    output: List[float] = []
+    append = output.append
+    nan = math.nan
+    for value in values[start:]:
+        if len(recent) >= window:
+            del ordered[bisect.bisect_left(ordered, recent.popleft())]
+        bisect.insort(ordered, value)
+        recent.append(value)
+        count = len(ordered)
+        if count < min_periods:
+            append(nan)
+            continue
+        position = (count - 1) * quantile
+        lower_index = int(position)
+        if position > lower_index:
+            lower_value = ordered[lower_index]
+            append(lower_value + ((ordered[lower_index + 1] - lower_value) * (position - float(lower_index))))
+        else:
+            append(ordered[lower_index])
+    return output
+
+
+def ema_series(values: Sequence[float], *, span: int, initial: Optional[float]) -> List[float]:
+    # The recurrence stays a scalar loop so every step rounds exactly like EmaTracker.update.
+    alpha = 2.0 / (max(1, int(span)) + 1.0)
+    current = initial
+    output: List[float] = []
+    append = output.append
+    for sample in values:
+        current = sample if current is None else current + (alpha * (sample - current))
+        append(current)
+    return output
+
+
+def ewm_std_series(
+    values: Sequence[float],
+    *,
+    span: int,
+    mean: Optional[float],
+    variance: float,
+) -> Tuple[List[float], Optional[float], float]:
+    alpha = 2.0 / (max(1, int(span)) + 1.0)
+    keep = 1.0 - alpha
+    output: List[float] = []
+    append = output.append
+    for sample in values:
+        if mean is None:
+            mean = sample
+            variance = 0.0
+        else:
+            previous_mean = mean
+            mean = previous_mean + (alpha * (sample - previous_mean))
+            variance = keep * (variance + (alpha * ((sample - previous_mean) ** 2)))
+        append(variance)
+    return output, mean, variance
+
+
+def _move_price_range(row: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    # Rows written before highprice/lowprice existed fall back to the move's endpoints.
+    high = _safe_float(row.get("highprice"))
+    low = _safe_float(row.get("lowprice"))
+    if high is not None and low is not None:
+        return high, low
+    endpoints = [value for value in (_safe_float(row.get("startprice")), _safe_float(row.get("endprice"))) if value is not None]
+    return (max(endpoints), min(endpoints)) if endpoints else None
+
+
 def normalize_input_batch(
     rows: Sequence[Dict[str, Any]],
     *,
@@ -493,6 +850,7 @@ def normalize_input_batch(
             item["_pointid"] = int(item.get("endtickid") or 0) or None
             item["_pointtime"] = item.get("endtime")
             item["_midvalue"] = _safe_float(item.get("endprice"))
+            item["_rangevalue"] = _move_price_range(item)
             spread = _safe_float(item.get("thresholdatconfirm"))
             if spread is None:
                 spread = abs(_safe_float(item.get("pricedelta")) or 0.0) or None
@@ -502,6 +860,7 @@ def normalize_input_batch(
             item["_midvalue"] = _safe_float(item.get("mid"))
             if item["_midvalue"] is None:
                 item["_midvalue"] = _safe_float(tick_mid(item))
+            item["_rangevalue"] = None
             spread = _derive_spread(item)
         raw_spreads.append(spread)
         prepared.append(item)
@@ -527,15 +886,138 @@ def normalize_input_batch(
     return prepared
 
 
+@dataclass
+class BackboneInputArrays:
+    rowcount: int
+    pointids: List[int]
+    pointtimes: List[datetime]
+    mids: np.ndarray
+    spreads: np.ndarray
+    # Per-point price range; None means each point's range is its own mid (ticks).
+    highs: Optional[np.ndarray] = None
+    lows: Optional[np.ndarray] = None
+
+
+def _float_column(values: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    present = np.fromiter((value is not None for value in values), dtype=bool, count=len(values))
+    return np.array([value if value is not None else math.nan for value in values], dtype=np.float64), present
+
+
+def _fill_spreads(raw_spreads: np.ndarray, previous_spread: Optional[float]) -> np.ndarray:
+    # Forward fill exactly as normalize_input_batch does for a single batch.
+    finite = np.isfinite(raw_spreads)
+    fill_value = _safe_float(previous_spread)
+    if fill_value is None:
+        fill_value = float(raw_spreads[int(np.argmax(finite))]) if finite.any() else 0.0
+    sources = np.where(finite, np.arange(len(raw_spreads)), -1)
+    np.maximum.accumulate(sources, out=sources)
+    return np.where(sources >= 0, raw_spreads[np.maximum(sources, 0)], fill_value)
+
+
+def _input_arrays(
+    *,
+    pointids: Sequence[Any],
+    pointtimes: Sequence[Any],
+    mids: np.ndarray,
+    raw_spreads: np.ndarray,
+    previous_spread: Optional[float],
+    highs: Optional[np.ndarray] = None,
+    lows: Optional[np.ndarray] = None,
+) -> BackboneInputArrays:
+    rowcount = len(pointids)
+    ids = np.array([int(value or 0) for value in pointids], dtype=np.int64)
+    valid = (ids > 0) & np.fromiter((isinstance(value, datetime) for value in pointtimes), dtype=bool, count=rowcount)
+    valid_rows = np.flatnonzero(valid)
+    mid_values = mids[valid_rows]
+    mid_values[~np.isfinite(mid_values)] = np.nan
+    return BackboneInputArrays(
+        rowcount=rowcount,
+        pointids=ids[valid_rows].tolist(),
+        pointtimes=[pointtimes[row] for row in valid_rows.tolist()],
+        mids=mid_values,
+        spreads=_fill_spreads(raw_spreads, previous_spread)[valid_rows],
+        highs=highs[valid_rows] if highs is not None else None,
+        lows=lows[valid_rows] if lows is not None else None,
+    )
+
+
+def tick_input_arrays(
+    *,
+    ids: Sequence[Any],
+    timestamps: Sequence[Any],
+    bids: Sequence[Any],
+    asks: Sequence[Any],
+    mids: Sequence[Any],
+    spreads: Sequence[Any],
+    previous_spread: Optional[float],
+) -> BackboneInputArrays:
+    """Columnar normalize_input_batch for ticks; None marks a NULL column, which is not the same as a stored NaN."""
+    bid, has_bid = _float_column(bids)
+    ask, has_ask = _float_column(asks)
+    mid, has_mid = _float_column(mids)
+    spread, has_spread = _float_column(spreads)
+    quote_mid = np.where(has_bid & has_ask, (bid + ask) / 2.0, np.where(has_bid, bid, ask))
+    mid_values = np.where(has_mid, mid, quote_mid)
+    raw_spreads = np.where(has_spread, spread, np.where(has_bid & has_ask, ask - bid, np.nan))
+    return _input_arrays(
+        pointids=ids,
+        pointtimes=timestamps,
+        mids=mid_values,
+        raw_spreads=raw_spreads,
+        previous_spread=previous_spread,
+    )
+
+
+def prepare_input_arrays(
+    rows: Iterable[Dict[str, Any]],
+    *,
+    previous_spread: Optional[float],
+    input_kind: str,
+) -> BackboneInputArrays:
+    rows = list(rows)
+    if input_kind != "backbone_moves":
+        return tick_input_arrays(
+            ids=[row.get("id") for row in rows],
+            timestamps=[row.get("timestamp") for row in rows],
+            bids=[row.get("bid") for row in rows],
+            asks=[row.get("ask") for row in rows],
+            mids=[row.get("mid") for row in rows],
+            spreads=[row.get("spread") for row in rows],
+            previous_spread=previous_spread,
+        )
+    raw_spreads: List[float] = []
+    for row in rows:
+        spread = _safe_float(row.get("thresholdatconfirm"))
+        if spread is None:
+            spread = abs(_safe_float(row.get("pricedelta")) or 0.0) or None
+        raw_spreads.append(math.nan if spread is None else spread)
+    end_prices = [_safe_float(row.get("endprice")) for row in rows]
+    ranges = [_move_price_range(row) or (math.nan, math.nan) for row in rows]
+    return _input_arrays(
+        pointids=[row.get("endtickid") for row in rows],
+        pointtimes=[row.get("endtime") for row in rows],
+        mids=np.array([math.nan if value is None else value for value in end_prices], dtype=np.float64),
+        raw_spreads=np.array(raw_spreads, dtype=np.float64),
+        previous_spread=previous_spread,
+        highs=np.array([item[0] for item in ranges], dtype=np.float64),
+        lows=np.array([item[1] for item in ranges], dtype=np.float64),
+    )
+
+
 class BackboneEngine:
-    def __init__(self, *, symbol: str, source: str, input_kind: str) -> None:
+    def __init__(self, *, symbol: str, source: str, input_kind: str, params: BackboneParams = DEFAULT_PARAMS) -> None:
         self.symbol = symbol
         self.source = source
         self.input_kind = input_kind
-        self.abs_window = RollingPercentileWindow(window=NOISE_WINDOW, quantile=0.80, min_periods=ABS_DELTA_MIN_PERIODS)
-        self.spread_ema = EmaTracker(span=SPREAD_SPAN)
-        self.threshold_ema = EmaTracker(span=THRESHOLD_SMOOTH_SPAN)
-        self.delta_std = EwmStdTracker(span=NOISE_WINDOW)
+        self.params = params
+        self.abs_window = RollingPercentileWindow(
+            window=params.noise_window,
+            quantile=0.80,
+            min_periods=params.abs_delta_min_periods,
+        )
+        self.spread_ema = EmaTracker(span=params.spread_span)
+        self.threshold_ema = EmaTracker(span=params.threshold_smooth_span)
+        self.delta_std = EwmStdTracker(span=params.noise_window)
         self.reset()
 
     def reset(self, dayref: Optional[DayRef] = None) -> None:
@@ -545,61 +1027,18 @@ class BackboneEngine:
         self.processedtickcount = 0
         self.prevmid: Optional[float] = None
         self.lastvalidspread: Optional[float] = None
-        self.currentthreshold: float = THRESHOLD_FLOOR
+        self.currentthreshold: float = self.params.threshold_floor
         self.direction: Optional[str] = None
         self.confirmedpivot: Optional[BackbonePoint] = None
         self.candidateextreme: Optional[BackbonePoint] = None
+        # Price range from the confirmed pivot through the candidate, and of the points after the candidate.
+        self.legrange: Optional[Tuple[float, float]] = None
+        self.tailrange: Optional[Tuple[float, float]] = None
         self.spread_ema.restore(None)
         self.threshold_ema.restore(None)
         self.delta_std.restore(mean=None, variance=None)
         self.abs_window.restore([])
 
-    def restore(self, *, dayref: DayRef, state_row: Dict[str, Any]) -> None:
-        self.reset(dayref)
-        statejson = state_row.get("statejson")
-        if isinstance(statejson, str):
-            try:
-                statejson = json.loads(statejson)
-            except json.JSONDecodeError:
-                statejson = {}
-        statejson = statejson if isinstance(statejson, dict) else {}
-
-        self.lastprocessedtickid = int(state_row.get("lastprocessedtickid") or 0) or None
-        self.lastprocessedtime = _as_utc(state_row["updatedat"]) if state_row.get("updatedat") else None
-        self.prevmid = _safe_float(statejson.get("prevmid"))
-        self.lastvalidspread = _safe_float(statejson.get("lastvalidspread"))
-        self.processedtickcount = int(statejson.get("processedtickcount") or 0)
-        self.currentthreshold = max(THRESHOLD_FLOOR, _safe_float(state_row.get("currentthreshold")) or THRESHOLD_FLOOR)
-        self.direction = str(state_row.get("direction") or "").strip() or None
-        self.spread_ema.restore(statejson.get("spreadema"))
-        self.threshold_ema.restore(statejson.get("thresholdema"))
-        self.delta_std.restore(mean=statejson.get("deltaewmmean"), variance=statejson.get("deltaewmvariance"))
-        self.abs_window.restore([float(value) for value in statejson.get("absdeltas") or [] if _safe_float(value) is not None])
-
-        confirmed_tickid = int(state_row.get("confirmedpivottickid") or 0)
-        confirmed_time = state_row.get("confirmedpivottime")
-        confirmed_price = _safe_float(state_row.get("confirmedpivotprice"))
-        confirmed_index = int(statejson.get("confirmedpivotindex") or 0)
-        if confirmed_tickid and confirmed_time is not None and confirmed_price is not None:
-            self.confirmedpivot = BackbonePoint(
-                tickid=confirmed_tickid,
-                ticktime=_as_utc(confirmed_time),
-                price=confirmed_price,
-                index=confirmed_index,
-            )
-
-        candidate_tickid = int(state_row.get("candidateextremetickid") or 0)
-        candidate_time = state_row.get("candidateextremetime")
-        candidate_price = _safe_float(state_row.get("candidateextremeprice"))
-        candidate_index = int(statejson.get("candidateextremeindex") or 0)
-        if candidate_tickid and candidate_time is not None and candidate_price is not None:
-            self.candidateextreme = BackbonePoint(
-                tickid=candidate_tickid,
-                ticktime=_as_utc(candidate_time),
-                price=candidate_price,
-                index=candidate_index,
-            )
-
     def state_matches_version(self, state_row: Optional[Dict[str, Any]]) -> bool:
         if not state_row:
             return False
@@ -642,7 +1081,6 @@ class BackboneEngine:
                     "thresholdema": self.threshold_ema.value,
                     "deltaewmmean": self.delta_std.mean,
                     "deltaewmvariance": self.delta_std.variance,
-                    "absdeltas": list(self.abs_window.values),
                     "confirmedpivotindex": self.confirmedpivot.index if self.confirmedpivot else None,
                     "candidateextremeindex": self.candidateextreme.index if self.candidateextreme else None,
                 }
@@ -650,6 +1088,96 @@ class BackboneEngine:
         }
         return payload
 
+    def checkpoint_bytes(self) -> bytes:
+        """Full engine state as a compact blob; restoring it and replaying later ticks is equivalent to never stopping."""
+
+        def point_fields(point: Optional[BackbonePoint]) -> Tuple[int, int, float, int]:
+            if point is None:
+                return 0, 0, math.nan, 0
+            return point.tickid, _epoch_micros(point.ticktime), point.price, point.index
+
+        def optional(value: Optional[float]) -> float:
+            return math.nan if value is None else float(value)
+
+        window = list(self.abs_window.values)
+        header = CHECKPOINT_HEADER.pack(
+            CHECKPOINT_MAGIC,
+            CHECKPOINT_FORMAT,
+            BACKBONE_VERSION,
+            self.processedtickcount,
+            int(self.lastprocessedtickid or 0),
+            _epoch_micros(self.lastprocessedtime),
+            optional(self.prevmid),
+            optional(self.lastvalidspread),
+            float(self.currentthreshold),
+            optional(self.spread_ema.value),
+            optional(self.threshold_ema.value),
+            optional(self.delta_std.mean),
+            float(self.delta_std.variance),
+            CHECKPOINT_DIRECTIONS[self.direction],
+            *point_fields(self.confirmedpivot),
+            *point_fields(self.candidateextreme),
+            *(self.legrange or (math.nan, math.nan)),
+            *(self.tailrange or (math.nan, math.nan)),
+            len(window),
+        )
+        return header + struct.pack("<{0}d".format(len(window)), *window)
+
+    def restore_checkpoint(self, *, dayref: DayRef, blob: Any) -> bool:
+        data = bytes(blob or b"")
+        if len(data) < CHECKPOINT_HEADER.size:
+            return False
+        fields = CHECKPOINT_HEADER.unpack_from(data)
+        magic, checkpoint_format, engine_version = fields[:3]
+        window_length = fields[-1]
+        if (
+            magic != CHECKPOINT_MAGIC
+            or checkpoint_format != CHECKPOINT_FORMAT
+            or engine_version != BACKBONE_VERSION
+            or len(data) != CHECKPOINT_HEADER.size + (8 * window_length)
+        ):
+            return False
+        (
+            processedtickcount,
+            lastprocessedtickid,
+            lastprocessedtime,
+            prevmid,
+            lastvalidspread,
+            currentthreshold,
+            spreadema,
+            thresholdema,
+            deltamean,
+            deltavariance,
+            direction,
+        ) = fields[3:14]
+
+        def point(tickid: int, ticktime: int, price: float, index: int) -> Optional[BackbonePoint]:
+            if not tickid:
+                return None
+            return BackbonePoint(index=index, price=price, tickid=tickid, ticktime=_from_epoch_micros(ticktime))
+
+        def optional(value: float) -> Optional[float]:
+            return None if math.isnan(value) else value
+
+        self.reset(dayref)
+        self.processedtickcount = processedtickcount
+        self.lastprocessedtickid = lastprocessedtickid or None
+        self.lastprocessedtime = _from_epoch_micros(lastprocessedtime)
+        self.prevmid = optional(prevmid)
+        self.lastvalidspread = optional(lastvalidspread)
+        self.currentthreshold = currentthreshold
+        self.spread_ema.value = optional(spreadema)
+        self.threshold_ema.value = optional(thresholdema)
+        self.delta_std.mean = optional(deltamean)
+        self.delta_std.variance = deltavariance
+        self.direction = {code: name for name, code in CHECKPOINT_DIRECTIONS.items()}[direction]
+        self.confirmedpivot = point(*fields[14:18])
+        self.candidateextreme = point(*fields[18:22])
+        self.legrange = None if math.isnan(fields[22]) else (fields[22], fields[23])
+        self.tailrange = None if math.isnan(fields[24]) else (fields[24], fields[25])
+        self.abs_window.restore(list(struct.unpack_from("<{0}d".format(window_length), data, CHECKPOINT_HEADER.size)))
+        return True
+
     def process_rows(self, rows: Sequence[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         pivots: List[Dict[str, Any]] = []
         moves: List[Dict[str, Any]] = []
@@ -684,7 +1212,8 @@ class BackboneEngine:
         spread = _safe_float(row.get("_spreadvalue"))
         if spread is not None and math.isfinite(spread):
             self.lastvalidspread = spread
-        spread_ema = self.spread_ema.update(self.lastvalidspread if self.lastvalidspread is not None else THRESHOLD_FLOOR)
+        params = self.params
+        spread_ema = self.spread_ema.update(self.lastvalidspread if self.lastvalidspread is not None else params.threshold_floor)
 
         mid = _safe_float(row.get("_midvalue"))
         delta: Optional[float] = None
@@ -694,23 +1223,27 @@ class BackboneEngine:
         abs_delta_q80 = self.abs_window.current() or 0.0
         delta_std = self.delta_std.update(delta)
         threshold_raw = max(
-            float(spread_ema or 0.0) * SPREAD_WEIGHT,
-            float(abs_delta_q80) * DELTA_Q80_WEIGHT,
-            float(delta_std) * DELTA_STD_WEIGHT,
-            THRESHOLD_FLOOR,
+            float(spread_ema or 0.0) * params.spread_weight,
+            float(abs_delta_q80) * params.delta_q80_weight,
+            float(delta_std) * params.delta_std_weight,
+            params.threshold_floor,
         )
         adaptive_threshold = self.threshold_ema.update(threshold_raw)
-        self.currentthreshold = float(adaptive_threshold or threshold_raw or THRESHOLD_FLOOR)
+        self.currentthreshold = float(adaptive_threshold or threshold_raw or params.threshold_floor)
 
         if mid is None or not math.isfinite(mid):
             return [], []
 
         point = BackbonePoint(index=self.processedtickcount, price=float(mid), tickid=tickid, ticktime=ticktime)
+        point_range = row.get("_rangevalue") or (point.price, point.price)
         emitted_pivots: List[Dict[str, Any]] = []
         emitted_moves: List[Dict[str, Any]] = []
 
         if self.confirmedpivot is None:
             self.confirmedpivot = point
+            # A leg starts at its pivot's price; whatever led into the pivot belongs to the previous leg.
+            self.legrange = (point.price, point.price)
+            self.tailrange = None
             emitted_pivots.append(self._pivot_row(point, pivottype="Start", threshold=self.currentthreshold))
             self.prevmid = point.price
             return emitted_pivots, emitted_moves
@@ -722,30 +1255,229 @@ class BackboneEngine:
             elif point.price <= self.confirmedpivot.price - self.currentthreshold:
                 self.direction = "Down"
                 self.candidateextreme = point
+            self.legrange = _widen(_widen(self.legrange, self.tailrange), point_range)
+            self.tailrange = None
         elif self.direction == "Up":
             if self.candidateextreme is None or point.price >= self.candidateextreme.price:
                 self.candidateextreme = point
+                self.legrange = _widen(_widen(self.legrange, self.tailrange), point_range)
+                self.tailrange = None
             elif self.candidateextreme.price - point.price >= self.currentthreshold:
                 confirmed = self.candidateextreme
                 emitted_pivots.append(self._pivot_row(confirmed, pivottype="High", threshold=self.currentthreshold))
-                emitted_moves.append(self._move_row(self.confirmedpivot, confirmed, direction="Up", threshold=self.currentthreshold))
+                emitted_moves.append(
+                    self._move_row(self.confirmedpivot, confirmed, direction="Up", threshold=self.currentthreshold, price_range=self.legrange)
+                )
                 self.confirmedpivot = confirmed
                 self.direction = "Down"
                 self.candidateextreme = point
+                self.legrange = _widen(_widen((confirmed.price, confirmed.price), self.tailrange), point_range)
+                self.tailrange = None
+            else:
+                self.tailrange = _widen(self.tailrange, point_range)
         else:
             if self.candidateextreme is None or point.price <= self.candidateextreme.price:
                 self.candidateextreme = point
+                self.legrange = _widen(_widen(self.legrange, self.tailrange), point_range)
+                self.tailrange = None
             elif point.price - self.candidateextreme.price >= self.currentthreshold:
                 confirmed = self.candidateextreme
                 emitted_pivots.append(self._pivot_row(confirmed, pivottype="Low", threshold=self.currentthreshold))
-                emitted_moves.append(self._move_row(self.confirmedpivot, confirmed, direction="Down", threshold=self.currentthreshold))
+                emitted_moves.append(
+                    self._move_row(self.confirmedpivot, confirmed, direction="Down", threshold=self.currentthreshold, price_range=self.legrange)
+                )
                 self.confirmedpivot = confirmed
                 self.direction = "Up"
                 self.candidateextreme = point
+                self.legrange = _widen(_widen((confirmed.price, confirmed.price), self.tailrange), point_range)
+                self.tailrange = None
+            else:
+                self.tailrange = _widen(self.tailrange, point_range)
 
         self.prevmid = point.price
         return emitted_pivots, emitted_moves
 
+    def process_batch(self, rows: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Same result as process_rows(rows) in a single call, with the indicator series computed over arrays."""
+        if self.dayref is None:
+            return self.process_rows(list(rows))
+        return self.process_arrays(
+            prepare_input_arrays(rows, previous_spread=self.lastvalidspread, input_kind=self.input_kind)
+        )
+
+    def process_arrays(self, arrays: BackboneInputArrays) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        count = len(arrays.pointids)
+        if count <= 0:
+            return [], []
+        params = self.params
+        mids = arrays.mids
+        spreads = arrays.spreads
+        has_mid = ~np.isnan(mids)
+        mid_rows = np.flatnonzero(has_mid)
+        mid_values = mids[mid_rows]
+
+        # Deltas exist where this row and the previous priced row both have a mid.
+        previous_mids = np.empty_like(mid_values)
+        if len(mid_values):
+            previous_mids[0] = np.nan if self.prevmid is None else self.prevmid
+            previous_mids[1:] = mid_values[:-1]
+        deltas = mid_values - previous_mids
+        delta_mask = np.isfinite(deltas)
+        delta_rows = mid_rows[delta_mask]
+        deltas = deltas[delta_mask]
+        # Rows map to the last indicator update at or before them; -1 means "still the restored value".
+        update_index = np.cumsum(np.bincount(delta_rows, minlength=count)) - 1
+
+        restored = list(self.abs_window.values)
+        abs_values = restored + np.abs(deltas).tolist()
+        q80_updates = rolling_quantile_series(
+            abs_values,
+            start=len(restored),
+            window=self.abs_window.window,
+            quantile=self.abs_window.quantile,
+            min_periods=self.abs_window.min_periods,
+        )
+        q80_updates.append(self.abs_window.current() or 0.0)
+        q80_values = np.nan_to_num(np.array(q80_updates, dtype=np.float64), nan=0.0)[update_index]
+
+        variances, delta_mean, delta_variance = ewm_std_series(
+            deltas.tolist(),
+            span=params.noise_window,
+            mean=self.delta_std.mean,
+            variance=self.delta_std.variance,
+        )
+        std_values = np.sqrt(np.maximum(np.append(np.array(variances, dtype=np.float64), self.delta_std.variance), 0.0))[update_index]
+
+        spread_emas = ema_series(spreads.tolist(), span=params.spread_span, initial=self.spread_ema.value)
+        threshold_raw = np.maximum(
+            np.maximum(np.array(spread_emas, dtype=np.float64) * params.spread_weight, q80_values * params.delta_q80_weight),
+            np.maximum(std_values * params.delta_std_weight, params.threshold_floor),
+        )
+        thresholds = ema_series(threshold_raw.tolist(), span=params.threshold_smooth_span, initial=self.threshold_ema.value)
+
+        highs = arrays.highs[mid_rows] if arrays.highs is not None else mid_values
+        lows = arrays.lows[mid_rows] if arrays.lows is not None else mid_values
+        pivots, moves = self._run_pivots(arrays, mid_rows.tolist(), mid_values.tolist(), thresholds, highs, lows)
+
+        self.abs_window.restore(abs_values[-self.abs_window.window :])
+        self.delta_std.mean = delta_mean
+        self.delta_std.variance = delta_variance
+        self.spread_ema.value = spread_emas[-1]
+        self.threshold_ema.value = thresholds[-1]
+        self.currentthreshold = float(thresholds[-1] or threshold_raw[-1] or params.threshold_floor)
+        self.lastvalidspread = float(spreads[-1])
+        self.processedtickcount += count
+        self.lastprocessedtickid = arrays.pointids[-1]
+        self.lastprocessedtime = _as_utc(arrays.pointtimes[-1])
+        if len(mid_values):
+            self.prevmid = float(mid_values[-1])
+        return pivots, moves
+
+    def _run_pivots(
+        self,
+        arrays: BackboneInputArrays,
+        rows: List[int],
+        prices: List[float],
+        thresholds: List[float],
+        highs: np.ndarray,
+        lows: np.ndarray,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        base_index = self.processedtickcount + 1
+        pointids = arrays.pointids
+        pointtimes = arrays.pointtimes
+
+        def point_at(row: int, price: float) -> BackbonePoint:
+            return BackbonePoint(index=base_index + row, price=price, tickid=pointids[row], ticktime=_as_utc(pointtimes[row]))
+
+        def span(start: int, stop: int) -> Optional[Tuple[float, float]]:
+            if stop <= start:
+                return None
+            return float(highs[start:stop].max()), float(lows[start:stop].min())
+
+        emitted_pivots: List[Dict[str, Any]] = []
+        emitted_moves: List[Dict[str, Any]] = []
+        direction = self.direction
+        confirmed = self.confirmedpivot
+        # The candidate changes on most ticks of a trend, so it is tracked by position and materialized on confirm.
+        candidate_row: Optional[int] = None
+        candidate_price = self.candidateextreme.price if self.candidateextreme is not None else None
+        # Leg and tail ranges are folded lazily: positions from `segment` on are not in them yet, and
+        # split at candidate_position when the candidate was found in this batch.
+        candidate_position: Optional[int] = None
+        leg_range, tail_range = self.legrange, self.tailrange
+        segment = 0
+        position = 0
+        total = len(rows)
+        if confirmed is None and total:
+            row = rows[0]
+            confirmed = point_at(row, prices[0])
+            emitted_pivots.append(self._pivot_row(confirmed, pivottype="Start", threshold=thresholds[row]))
+            leg_range, tail_range = (confirmed.price, confirmed.price), None
+            position = segment = 1
+        confirmed_price = confirmed.price if confirmed is not None else 0.0
+
+        def confirm(extreme: BackbonePoint, current: int) -> Tuple[Optional[Tuple[float, float]], Optional[Tuple[float, float]]]:
+            # Returns the finished move's range and the new leg's range, which starts at the new pivot.
+            if candidate_position is None:
+                move_range = leg_range
+                leg = _widen(_widen((extreme.price, extreme.price), tail_range), span(segment, current + 1))
+            else:
+                move_range = _widen(_widen(leg_range, tail_range), span(segment, candidate_position + 1))
+                leg = _widen((extreme.price, extreme.price), span(candidate_position + 1, current + 1))
+            return move_range, leg
+
+        while position < total:
+            row = rows[position]
+            price = prices[position]
+            threshold = thresholds[row]
+            position += 1
+            if direction is None:
+                if price >= confirmed_price + threshold:
+                    direction = "Up"
+                elif price <= confirmed_price - threshold:
+                    direction = "Down"
+                else:
+                    continue
+                candidate_row, candidate_price, candidate_position = row, price, position - 1
+            elif direction == "Up":
+                if candidate_price is None or price >= candidate_price:
+                    candidate_row, candidate_price, candidate_position = row, price, position - 1
+                elif candidate_price - price >= threshold:
+                    extreme = self.candidateextreme if candidate_row is None else point_at(candidate_row, candidate_price)
+                    move_range, leg_range = confirm(extreme, position - 1)
+                    tail_range, segment = None, position
+                    emitted_pivots.append(self._pivot_row(extreme, pivottype="High", threshold=threshold))
+                    emitted_moves.append(self._move_row(confirmed, extreme, direction="Up", threshold=threshold, price_range=move_range))
+                    confirmed, confirmed_price = extreme, extreme.price
+                    direction = "Down"
+                    candidate_row, candidate_price, candidate_position = row, price, position - 1
+            else:
+                if candidate_price is None or price <= candidate_price:
+                    candidate_row, candidate_price, candidate_position = row, price, position - 1
+                elif price - candidate_price >= threshold:
+                    extreme = self.candidateextreme if candidate_row is None else point_at(candidate_row, candidate_price)
+                    move_range, leg_range = confirm(extreme, position - 1)
+                    tail_range, segment = None, position
+                    emitted_pivots.append(self._pivot_row(extreme, pivottype="Low", threshold=threshold))
+                    emitted_moves.append(self._move_row(confirmed, extreme, direction="Down", threshold=threshold, price_range=move_range))
+                    confirmed, confirmed_price = extreme, extreme.price
+                    direction = "Up"
+                    candidate_row, candidate_price, candidate_position = row, price, position - 1
+
+        if candidate_position is not None:
+            leg_range = _widen(_widen(leg_range, tail_range), span(segment, candidate_position + 1))
+            tail_range = span(candidate_position + 1, total)
+        elif direction is None:
+            leg_range = _widen(leg_range, span(segment, total))
+        else:
+            tail_range = _widen(tail_range, span(segment, total))
+        self.legrange, self.tailrange = leg_range, tail_range
+        self.direction = direction
+        self.confirmedpivot = confirmed
+        if candidate_row is not None:
+            self.candidateextreme = point_at(candidate_row, candidate_price)
+        return emitted_pivots, emitted_moves
+
     def _pivot_row(self, point: BackbonePoint, *, pivottype: str, threshold: float) -> Dict[str, Any]:
         return {
             "dayid": self.dayref.dayid if self.dayref else None,
@@ -754,10 +1486,20 @@ class BackboneEngine:
             "price": point.price,
             "pivottype": pivottype,
             "threshold": float(threshold),
+            "symbol": self.symbol,
             "source": self.source,
         }
 
-    def _move_row(self, start: BackbonePoint, end: BackbonePoint, *, direction: str, threshold: float) -> Dict[str, Any]:
+    def _move_row(
+        self,
+        start: BackbonePoint,
+        end: BackbonePoint,
+        *,
+        direction: str,
+        threshold: float,
+        price_range: Optional[Tuple[float, float]],
+    ) -> Dict[str, Any]:
+        high, low = price_range or (max(start.price, end.price), min(start.price, end.price))
         return {
             "dayid": self.dayref.dayid if self.dayref else None,
             "starttickid": start.tickid,
@@ -770,6 +1512,9 @@ class BackboneEngine:
             "pricedelta": float(end.price - start.price),
             "tickcount": max(1, int(end.index - start.index + 1)),
             "thresholdatconfirm": float(threshold),
+            "highprice": float(high),
+            "lowprice": float(low),
+            "symbol": self.symbol,
             "source": self.source,
         }
 
@@ -778,61 +1523,73 @@ def insert_pivots(conn: Any, pivots: Sequence[Dict[str, Any]]) -> None:
     if not pivots:
         return
     with conn.cursor() as cur:
-        for pivot in pivots:
-            cur.execute(
-                """
-                INSERT INTO public.backbonepivots (
-                    dayid, tickid, ticktime, price, pivottype, threshold, source
-                ) VALUES (
-                    %(dayid)s, %(tickid)s, %(ticktime)s, %(price)s, %(pivottype)s, %(threshold)s, %(source)s
-                )
-                ON CONFLICT (dayid, tickid, pivottype, source)
-                DO UPDATE SET
-                    ticktime = EXCLUDED.ticktime,
-                    price = EXCLUDED.price,
-                    threshold = EXCLUDED.threshold
-                """,
-                pivot,
+        # One round trip per page; the live worker writes every symbol's rows from a poll together.
+        psycopg2.extras.execute_batch(
+            cur,
+            """
+            INSERT INTO public.backbonepivots (
+                dayid, tickid, ticktime, price, pivottype, threshold, symbol, source
+            ) VALUES (
+                %(dayid)s, %(tickid)s, %(ticktime)s, %(price)s, %(pivottype)s, %(threshold)s, %(symbol)s, %(source)s
             )
+            ON CONFLICT (dayid, symbol, tickid, pivottype, source)
+            DO UPDATE SET
+                ticktime = EXCLUDED.ticktime,
+                price = EXCLUDED.price,
+                threshold = EXCLUDED.threshold
+            """,
+            pivots,
+            page_size=200,
+        )
 
 
 def insert_moves(conn: Any, moves: Sequence[Dict[str, Any]]) -> None:
     if not moves:
         return
     with conn.cursor() as cur:
-        for move in moves:
-            cur.execute(
-                """
-                INSERT INTO public.backbonemoves (
-                    dayid, starttickid, endtickid, starttime, endtime,
-                    startprice, endprice, direction, pricedelta, tickcount,
-                    thresholdatconfirm, source
-                ) VALUES (
-                    %(dayid)s, %(starttickid)s, %(endtickid)s, %(starttime)s, %(endtime)s,
-                    %(startprice)s, %(endprice)s, %(direction)s, %(pricedelta)s, %(tickcount)s,
-                    %(thresholdatconfirm)s, %(source)s
-                )
-                ON CONFLICT (dayid, starttickid, endtickid, direction, source)
-                DO UPDATE SET
-                    starttime = EXCLUDED.starttime,
-                    endtime = EXCLUDED.endtime,
-                    startprice = EXCLUDED.startprice,
-                    endprice = EXCLUDED.endprice,
-                    pricedelta = EXCLUDED.pricedelta,
-                    tickcount = EXCLUDED.tickcount,
-                    thresholdatconfirm = EXCLUDED.thresholdatconfirm
-                """,
-                move,
+        # One round trip per page; the live worker writes every symbol's rows from a poll together.
+        psycopg2.extras.execute_batch(
+            cur,
+            """
+            INSERT INTO public.backbonemoves (
+                dayid, starttickid, endtickid, starttime, endtime,
+                startprice, endprice, direction, pricedelta, tickcount,
+                thresholdatconfirm, highprice, lowprice, symbol, source
+            ) VALUES (
+                %(dayid)s, %(starttickid)s, %(endtickid)s, %(starttime)s, %(endtime)s,
+                %(startprice)s, %(endprice)s, %(direction)s, %(pricedelta)s, %(tickcount)s,
+                %(thresholdatconfirm)s, %(highprice)s, %(lowprice)s, %(symbol)s, %(source)s
             )
+            ON CONFLICT (dayid, symbol, starttickid, endtickid, direction, source)
+            DO UPDATE SET
+                starttime = EXCLUDED.starttime,
+                endtime = EXCLUDED.endtime,
+                startprice = EXCLUDED.startprice,
+                endprice = EXCLUDED.endprice,
+                pricedelta = EXCLUDED.pricedelta,
+                tickcount = EXCLUDED.tickcount,
+                thresholdatconfirm = EXCLUDED.thresholdatconfirm,
+                highprice = EXCLUDED.highprice,
+                lowprice = EXCLUDED.lowprice
+            """,
+            moves,
+            page_size=200,
+        )
 
 
 def upsert_state(conn: Any, state_row: Optional[Dict[str, Any]]) -> None:
-    if state_row is None:
+    upsert_states(conn, [state_row])
+
+
+def upsert_states(conn: Any, state_rows: Sequence[Optional[Dict[str, Any]]]) -> None:
+    rows = [row for row in state_rows if row is not None]
+    if not rows:
         return
     with conn.cursor() as cur:
-        cur.execute(
+        psycopg2.extras.execute_batch(
+            cur,
             """
-                INSERT INTO public.backbonestate (
+            INSERT INTO public.backbonestate (
                 dayid, symbol, source, lastprocessedtickid,
                 confirmedpivottickid, confirmedpivottime, confirmedpivotprice,
                 direction, candidateextremetickid, candidateextremetime,
@@ -857,165 +1614,421 @@ def upsert_state(conn: Any, state_row: Optional[Dict[str, Any]]) -> None:
                 statejson = EXCLUDED.statejson,
                 updatedat = EXCLUDED.updatedat
             """,
-            state_row,
+            rows,
+        )
+
+
+def write_checkpoint(conn: Any, engine: BackboneEngine) -> None:
+    if engine.dayref is None:
+        return
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE public.backbonestate
+            SET checkpointtickid = %s,
+                checkpointat = %s,
+                checkpoint = %s
+            WHERE dayid = %s
+              AND symbol = %s
+              AND source = %s
+            """,
+            (
+                engine.lastprocessedtickid,
+                utc_now(),
+                psycopg2.Binary(engine.checkpoint_bytes()),
+                engine.dayref.dayid,
+                engine.symbol,
+                engine.source,
+            ),
+        )
+
+
+PIVOT_COPY_COLUMNS = ("dayid", "tickid", "ticktime", "price", "pivottype", "threshold", "symbol", "source")
+MOVE_COPY_COLUMNS = (
+    "dayid",
+    "starttickid",
+    "endtickid",
+    "starttime",
+    "endtime",
+    "startprice",
+    "endprice",
+    "direction",
+    "pricedelta",
+    "tickcount",
+    "thresholdatconfirm",
+    "highprice",
+    "lowprice",
+    "symbol",
+    "source",
+)
+
+
+def _copy_rows(conn: Any, table: str, columns: Sequence[str], rows: Sequence[Dict[str, Any]]) -> None:
+    if not rows:
+        return
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for row in rows:
+        writer.writerow([("" if row[column] is None else row[column]) for column in columns])
+    buffer.seek(0)
+    with conn.cursor() as cur:
+        cur.copy_expert(
+            "COPY {0} ({1}) FROM STDIN WITH (FORMAT csv)".format(table, ", ".join(columns)),
+            buffer,
+        )
+
+
+def notify_backbone(conn: Any, *, symbol: str, dayref: DayRef, lastprocessedtickid: Optional[int], reset: bool = False) -> None:
+    """Queue a commit-time notification for stream listeners; Postgres drops it if the transaction rolls back."""
+    payload = {
+        "symbol": symbol,
+        "dayId": dayref.dayid,
+        "brokerday": dayref.brokerday.isoformat(),
+        "lastTickId": lastprocessedtickid,
+        "reset": bool(reset),
+    }
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_notify(%s, %s)", (BACKBONE_NOTIFY_CHANNEL, json.dumps(payload, separators=(",", ":"))))
+
+
+def refresh_day_summaries(
+    conn: Any,
+    *,
+    symbol: str,
+    dayid: int,
+    brokerday: date,
+    sources: Sequence[str] = (BACKBONE_SOURCE, BIGBONES_SOURCE),
+) -> None:
+    """Recompute one day's backbonedaysummary rows from its stored moves; callers only do this when moves changed."""
+    if not sources:
+        return
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO public.backbonedaysummary (
+                dayid, symbol, source, brokerday, firstmovetime, lastmovetime,
+                pivotcount, movecount, upmovecount, downmovecount,
+                avgmovesize, maxmovesize, avgmoveseconds, avgmoveticks,
+                thresholdp10, thresholdp50, thresholdp90,
+                dayopen, dayhigh, daylow, dayclose, updatedat
+            )
+            SELECT
+                m.dayid,
+                m.symbol,
+                m.source,
+                %(brokerday)s,
+                MIN(m.starttime),
+                MAX(m.endtime),
+                (
+                    SELECT COUNT(*)
+                    FROM public.backbonepivots p
+                    WHERE p.dayid = m.dayid
+                      AND p.symbol = m.symbol
+                      AND p.source = m.source
+                ),
+                COUNT(*),
+                COUNT(*) FILTER (WHERE m.direction = 'Up'),
+                COUNT(*) FILTER (WHERE m.direction = 'Down'),
+                AVG(ABS(m.pricedelta)),
+                MAX(ABS(m.pricedelta)),
+                AVG(EXTRACT(EPOCH FROM (m.endtime - m.starttime))),
+                AVG(m.tickcount),
+                percentile_cont(0.1) WITHIN GROUP (ORDER BY m.thresholdatconfirm),
+                percentile_cont(0.5) WITHIN GROUP (ORDER BY m.thresholdatconfirm),
+                percentile_cont(0.9) WITHIN GROUP (ORDER BY m.thresholdatconfirm),
+                (ARRAY_AGG(m.startprice ORDER BY m.starttickid ASC, m.id ASC))[1],
+                MAX(COALESCE(m.highprice, GREATEST(m.startprice, m.endprice))),
+                MIN(COALESCE(m.lowprice, LEAST(m.startprice, m.endprice))),
+                (ARRAY_AGG(m.endprice ORDER BY m.endtickid DESC, m.id DESC))[1],
+                NOW()
+            FROM public.backbonemoves m
+            WHERE m.dayid = %(dayid)s
+              AND m.symbol = %(symbol)s
+              AND m.source = ANY(%(sources)s)
+            GROUP BY m.dayid, m.symbol, m.source
+            ON CONFLICT (dayid, symbol, source)
+            DO UPDATE SET
+                brokerday = EXCLUDED.brokerday,
+                firstmovetime = EXCLUDED.firstmovetime,
+                lastmovetime = EXCLUDED.lastmovetime,
+                pivotcount = EXCLUDED.pivotcount,
+                movecount = EXCLUDED.movecount,
+                upmovecount = EXCLUDED.upmovecount,
+                downmovecount = EXCLUDED.downmovecount,
+                avgmovesize = EXCLUDED.avgmovesize,
+                maxmovesize = EXCLUDED.maxmovesize,
+                avgmoveseconds = EXCLUDED.avgmoveseconds,
+                avgmoveticks = EXCLUDED.avgmoveticks,
+                thresholdp10 = EXCLUDED.thresholdp10,
+                thresholdp50 = EXCLUDED.thresholdp50,
+                thresholdp90 = EXCLUDED.thresholdp90,
+                dayopen = EXCLUDED.dayopen,
+                dayhigh = EXCLUDED.dayhigh,
+                daylow = EXCLUDED.daylow,
+                dayclose = EXCLUDED.dayclose,
+                updatedat = EXCLUDED.updatedat
+            """,
+            {"symbol": symbol, "brokerday": brokerday, "dayid": dayid, "sources": list(sources)},
         )
 
 
+def emitted_move_sources(moves: Sequence[Dict[str, Any]]) -> List[str]:
+    return sorted({str(move["source"]) for move in moves})
+
+
+def copy_pivots(conn: Any, pivots: Sequence[Dict[str, Any]]) -> None:
+    """Bulk insert for a day whose rows were just deleted; unlike insert_pivots it does not upsert."""
+    _copy_rows(conn, "public.backbonepivots", PIVOT_COPY_COLUMNS, pivots)
+
+
+def copy_moves(conn: Any, moves: Sequence[Dict[str, Any]]) -> None:
+    _copy_rows(conn, "public.backbonemoves", MOVE_COPY_COLUMNS, moves)
+
+
+def rebuild_day(
+    conn: Any,
+    *,
+    symbol: str,
+    dayref: DayRef,
+    batch_size: int = 400,
+    backbone_engine: Optional[BackboneEngine] = None,
+    bigbones_engine: Optional[BackboneEngine] = None,
+) -> Dict[str, Any]:
+    """Replace one brokerday's backbone and bigbones rows from its ticks; the caller owns the transaction.
+
+    A day without ticks is left untouched: the engines are reset to it, but no rows, state, checkpoint
+    or notification are written.
+    """
+    backbone_engine = backbone_engine or BackboneEngine(symbol=symbol, source=BACKBONE_SOURCE, input_kind="ticks")
+    bigbones_engine = bigbones_engine or BackboneEngine(symbol=symbol, source=BIGBONES_SOURCE, input_kind="backbone_moves")
+    backbone_engine.reset(dayref)
+    bigbones_engine.reset(dayref)
+    arrays = tick_input_arrays(
+        **fetch_tick_columns_for_day(conn, symbol=symbol, dayref=dayref, batch_size=max(batch_size, 10000)),
+        previous_spread=None,
+    )
+    if not arrays.rowcount:
+        return {"dayid": dayref.dayid, "brokerday": dayref.brokerday, "tickcount": 0, "empty": True, "reason": "no ticks"}
+    delete_day(conn, dayid=dayref.dayid, symbol=symbol, source=BACKBONE_SOURCE)
+    delete_day(conn, dayid=dayref.dayid, symbol=symbol, source=BIGBONES_SOURCE)
+
+    # A full-day replay goes through the array path; it emits exactly what process_rows would.
+    pivots, moves = backbone_engine.process_arrays(arrays)
+    bigbone_pivots, bigbone_moves = bigbones_engine.process_batch(moves)
+    copy_pivots(conn, pivots + bigbone_pivots)
+    copy_moves(conn, moves + bigbone_moves)
+    upsert_state(conn, backbone_engine.current_state_row())
+    upsert_state(conn, bigbones_engine.current_state_row())
+    write_checkpoint(conn, backbone_engine)
+    write_checkpoint(conn, bigbones_engine)
+    refresh_day_summaries(conn, symbol=symbol, dayid=dayref.dayid, brokerday=dayref.brokerday)
+    notify_backbone(conn, symbol=symbol, dayref=dayref, lastprocessedtickid=backbone_engine.lastprocessedtickid, reset=True)
+
+    return {
+        "dayid": dayref.dayid,
+        "brokerday": dayref.brokerday,
+        "tickcount": arrays.rowcount,
+        "pivotcount": len(pivots),
+        "movecount": len(moves),
+        "bigbonepivotcount": len(bigbone_pivots),
+        "bigbonemovecount": len(bigbone_moves),
+    }
+
+
 class BackboneLiveRuntime:
-    def __init__(self, *, symbol: str, batch_size: int = 400) -> None:
+    def __init__(self, *, symbol: str, batch_size: int = 400, checkpoint_seconds: float = CHECKPOINT_SECONDS) -> None:
         self.symbol = symbol
         self.batch_size = max(1, int(batch_size))
         self.backbone_engine = BackboneEngine(symbol=symbol, source=BACKBONE_SOURCE, input_kind="ticks")
         self.bigbones_engine = BackboneEngine(symbol=symbol, source=BIGBONES_SOURCE, input_kind="backbone_moves")
+        self.checkpoint_seconds = max(0.0, float(checkpoint_seconds))
+        self._checkpointed_at: Optional[float] = None
+        self._checkpointed_tickid: Optional[int] = None
+
+    def checkpoint(self, conn: Any) -> None:
+        write_checkpoint(conn, self.backbone_engine)
+        write_checkpoint(conn, self.bigbones_engine)
+        self._mark_checkpoint()
+
+    def _mark_checkpoint(self) -> None:
+        self._checkpointed_at = time.monotonic()
+        self._checkpointed_tickid = self.backbone_engine.lastprocessedtickid
+
+    def _maybe_checkpoint(self, conn: Any) -> None:
+        if self.backbone_engine.lastprocessedtickid == self._checkpointed_tickid:
+            return
+        if self._checkpointed_at is None or time.monotonic() - self._checkpointed_at >= self.checkpoint_seconds:
+            self.checkpoint(conn)
 
     def bootstrap(self, conn: Any) -> Dict[str, Any]:
         dayref = resolve_current_day_ref(conn, symbol=self.symbol)
         if dayref is None:
             self.backbone_engine.reset()
             self.bigbones_engine.reset()
-            return {
-                "dayid": None,
-                "brokerday": None,
-                "tickcount": 0,
-                "pivotcount": 0,
-                "movecount": 0,
-                "bigbonepivotcount": 0,
-                "bigbonemovecount": 0,
-            }
-
-        latest_tick = fetch_day_latest_tick(conn, symbol=self.symbol, dayref=dayref)
-        latest_backbone_move = fetch_day_latest_move(conn, dayref=dayref, source=BACKBONE_SOURCE)
+            return _live_result(None)
+
         state_row = load_state_row(conn, symbol=self.symbol, dayid=dayref.dayid, source=BACKBONE_SOURCE)
         bigbones_state_row = load_state_row(conn, symbol=self.symbol, dayid=dayref.dayid, source=BIGBONES_SOURCE)
-        backbone_current = bool(
-            latest_tick
-            and state_row
-            and self.backbone_engine.state_matches_version(state_row)
-            and int(state_row.get("lastprocessedtickid") or 0) == int(latest_tick.get("id") or 0)
-        )
-        bigbones_current = False
-        if latest_backbone_move is None:
-            bigbones_current = bigbones_state_row is None or (
-                self.bigbones_engine.state_matches_version(bigbones_state_row)
-                and int(bigbones_state_row.get("lastprocessedtickid") or 0) <= 0
-            )
-        else:
-            bigbones_current = bool(
-                bigbones_state_row
-                and self.bigbones_engine.state_matches_version(bigbones_state_row)
-                and int(bigbones_state_row.get("lastprocessedtickid") or 0) == int(latest_backbone_move.get("endtickid") or 0)
-            )
         if (
-            backbone_current
-            and bigbones_current
+            state_row
+            and bigbones_state_row
+            and self.backbone_engine.restore_checkpoint(dayref=dayref, blob=state_row.get("checkpoint"))
+            and self.bigbones_engine.restore_checkpoint(dayref=dayref, blob=bigbones_state_row.get("checkpoint"))
         ):
-            self.backbone_engine.restore(dayref=dayref, state_row=state_row)
-            if bigbones_state_row:
-                self.bigbones_engine.restore(dayref=dayref, state_row=bigbones_state_row)
-            else:
-                self.bigbones_engine.reset(dayref)
-            return {
-                "dayid": dayref.dayid,
-                "brokerday": dayref.brokerday,
-                "tickcount": 0,
-                "pivotcount": 0,
-                "movecount": 0,
-                "bigbonepivotcount": 0,
-                "bigbonemovecount": 0,
-            }
-
-        delete_day(conn, dayid=dayref.dayid, symbol=self.symbol, source=BACKBONE_SOURCE)
-        delete_day(conn, dayid=dayref.dayid, symbol=self.symbol, source=BIGBONES_SOURCE)
-        self.backbone_engine.reset(dayref)
-        self.bigbones_engine.reset(dayref)
-
-        tickcount = 0
-        pivotcount = 0
-        movecount = 0
-        bigbonepivotcount = 0
-        bigbonemovecount = 0
-        for batch in iter_ticks_for_day(conn, symbol=self.symbol, dayref=dayref, batch_size=self.batch_size):
-            tickcount += len(batch)
-            pivots, moves = self.backbone_engine.process_rows(batch)
-            bigbone_pivots, bigbone_moves = self.bigbones_engine.process_rows(moves)
-            pivotcount += len(pivots)
-            movecount += len(moves)
-            bigbonepivotcount += len(bigbone_pivots)
-            bigbonemovecount += len(bigbone_moves)
-            insert_pivots(conn, pivots)
-            insert_moves(conn, moves)
-            insert_pivots(conn, bigbone_pivots)
-            insert_moves(conn, bigbone_moves)
-            upsert_state(conn, self.backbone_engine.current_state_row())
-            upsert_state(conn, self.bigbones_engine.current_state_row())
-
-        if tickcount <= 0:
-            upsert_state(conn, self.backbone_engine.current_state_row())
-            upsert_state(conn, self.bigbones_engine.current_state_row())
-
-        return {
-            "dayid": dayref.dayid,
-            "brokerday": dayref.brokerday,
-            "tickcount": tickcount,
-            "pivotcount": pivotcount,
-            "movecount": movecount,
-            "bigbonepivotcount": bigbonepivotcount,
-            "bigbonemovecount": bigbonemovecount,
-        }
-
-    def process_once(self, conn: Any) -> Dict[str, Any]:
-        dayref = resolve_current_day_ref(conn, symbol=self.symbol)
-        if dayref is None:
-            return {
-                "dayid": None,
-                "brokerday": None,
-                "tickcount": 0,
-                "pivotcount": 0,
-                "movecount": 0,
-                "bigbonepivotcount": 0,
-                "bigbonemovecount": 0,
-            }
-
-        if (
+            # Both checkpoints are written in one transaction. process_once replays the ticks after them,
+            # and pivots or moves already stored past the checkpoint are re-emitted identically and upserted.
+            self._mark_checkpoint()
+            return _live_result(dayref)
+
+        result = rebuild_day(
+            conn,
+            symbol=self.symbol,
+            dayref=dayref,
+            batch_size=self.batch_size,
+            backbone_engine=self.backbone_engine,
+            bigbones_engine=self.bigbones_engine,
+        )
+        self._mark_checkpoint()
+        return result
+
+    def current_dayref(self, conn: Any) -> Optional[DayRef]:
+        # Until the day's computed end no tick can belong to a later day, so the poll skips the lookup.
+        dayref = self.backbone_engine.dayref
+        if dayref is not None and self.bigbones_engine.dayref == dayref and utc_now() < dayref.endtime:
+            return dayref
+        return resolve_current_day_ref(conn, symbol=self.symbol)
+
+    def needs_bootstrap(self, dayref: DayRef) -> bool:
+        return (
             self.backbone_engine.dayref is None
             or self.bigbones_engine.dayref is None
             or self.backbone_engine.dayref.dayid != dayref.dayid
             or self.bigbones_engine.dayref.dayid != dayref.dayid
-        ):
+        )
+
+    def advance(self, rows: Sequence[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Feed fetched ticks through both engines; writing what they emit is left to the caller."""
+        pivots, moves = self.backbone_engine.process_rows(rows)
+        bigbone_pivots, bigbone_moves = self.bigbones_engine.process_rows(moves)
+        return {"pivots": pivots, "moves": moves, "bigbonepivots": bigbone_pivots, "bigbonemoves": bigbone_moves}
+
+    def state_rows(self) -> List[Optional[Dict[str, Any]]]:
+        return [self.backbone_engine.current_state_row(), self.bigbones_engine.current_state_row()]
+
+    def process_once(self, conn: Any) -> Dict[str, Any]:
+        dayref = self.current_dayref(conn)
+        if dayref is None:
+            return _live_result(None)
+        if self.needs_bootstrap(dayref):
             return self.bootstrap(conn)
 
         after_id = int(self.backbone_engine.lastprocessedtickid or 0)
         rows = fetch_ticks_after_for_day(conn, symbol=self.symbol, dayref=dayref, after_id=after_id, limit=self.batch_size)
         if not rows:
-            upsert_state(conn, self.backbone_engine.current_state_row())
-            upsert_state(conn, self.bigbones_engine.current_state_row())
-            return {
-                "dayid": dayref.dayid,
-                "brokerday": dayref.brokerday,
-                "tickcount": 0,
-                "pivotcount": 0,
-                "movecount": 0,
-                "bigbonepivotcount": 0,
-                "bigbonemovecount": 0,
-            }
+            upsert_states(conn, self.state_rows())
+            self._maybe_checkpoint(conn)
+            return _live_result(dayref)
+
+        emitted = self.advance(rows)
+        insert_pivots(conn, emitted["pivots"])
+        insert_moves(conn, emitted["moves"])
+        insert_pivots(conn, emitted["bigbonepivots"])
+        insert_moves(conn, emitted["bigbonemoves"])
+        upsert_states(conn, self.state_rows())
+        self._maybe_checkpoint(conn)
+        refresh_day_summaries(
+            conn,
+            symbol=self.symbol,
+            dayid=dayref.dayid,
+            brokerday=dayref.brokerday,
+            sources=emitted_move_sources(emitted["moves"] + emitted["bigbonemoves"]),
+        )
+        notify_backbone(conn, symbol=self.symbol, dayref=dayref, lastprocessedtickid=self.backbone_engine.lastprocessedtickid)
+        return _live_result(dayref, len(rows), emitted)
+
+
+def _live_result(dayref: Optional[DayRef], tickcount: int = 0, emitted: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> Dict[str, Any]:
+    emitted = emitted or {}
+    return {
+        "dayid": dayref.dayid if dayref else None,
+        "brokerday": dayref.brokerday if dayref else None,
+        "tickcount": tickcount,
+        "pivotcount": len(emitted.get("pivots", ())),
+        "movecount": len(emitted.get("moves", ())),
+        "bigbonepivotcount": len(emitted.get("bigbonepivots", ())),
+        "bigbonemovecount": len(emitted.get("bigbonemoves", ())),
+    }
+
+
+class BackboneMultiRuntime:
+    """Engine pairs for several symbols behind one connection: one tick query and one transaction per poll."""
+
+    def __init__(self, *, symbols: Sequence[str], batch_size: int = 400, checkpoint_seconds: float = CHECKPOINT_SECONDS) -> None:
+        self.runtimes: Dict[str, BackboneLiveRuntime] = {}
+        for symbol in symbols:
+            symbol = str(symbol).strip().upper()
+            if symbol and symbol not in self.runtimes:
+                self.runtimes[symbol] = BackboneLiveRuntime(symbol=symbol, batch_size=batch_size, checkpoint_seconds=checkpoint_seconds)
+        if not self.runtimes:
+            raise ValueError("BackboneMultiRuntime needs at least one symbol")
+        self.batch_size = max(1, int(batch_size))
 
-        pivots, moves = self.backbone_engine.process_rows(rows)
-        bigbone_pivots, bigbone_moves = self.bigbones_engine.process_rows(moves)
-        insert_pivots(conn, pivots)
-        insert_moves(conn, moves)
-        insert_pivots(conn, bigbone_pivots)
-        insert_moves(conn, bigbone_moves)
-        upsert_state(conn, self.backbone_engine.current_state_row())
-        upsert_state(conn, self.bigbones_engine.current_state_row())
-        return {
-            "dayid": dayref.dayid,
-            "brokerday": dayref.brokerday,
-            "tickcount": len(rows),
-            "pivotcount": len(pivots),
-            "movecount": len(moves),
-            "bigbonepivotcount": len(bigbone_pivots),
-            "bigbonemovecount": len(bigbone_moves),
-        }
+    def bootstrap(self, conn: Any) -> Dict[str, Dict[str, Any]]:
+        return {symbol: runtime.bootstrap(conn) for symbol, runtime in self.runtimes.items()}
+
+    def checkpoint(self, conn: Any) -> None:
+        for runtime in self.runtimes.values():
+            runtime.checkpoint(conn)
+
+    def process_once(self, conn: Any) -> Dict[str, Dict[str, Any]]:
+        """Advance every symbol by up to batch_size ticks; the caller commits the whole poll at once."""
+        results: Dict[str, Dict[str, Any]] = {}
+        ready: Dict[str, DayRef] = {}
+        for symbol, runtime in self.runtimes.items():
+            dayref = runtime.current_dayref(conn)
+            if dayref is None:
+                results[symbol] = _live_result(None)
+            elif runtime.needs_bootstrap(dayref):
+                # A day rollover replays (or restores) that symbol's day; the others keep streaming.
+                results[symbol] = runtime.bootstrap(conn)
+            else:
+                ready[symbol] = dayref
+
+        fetched = fetch_ticks_after_for_symbols(
+            conn,
+            cursors=[(symbol, dayref, int(self.runtimes[symbol].backbone_engine.lastprocessedtickid or 0)) for symbol, dayref in ready.items()],
+            limit=self.batch_size,
+        )
+        emitted: Dict[str, List[Dict[str, Any]]] = {"pivots": [], "moves": [], "bigbonepivots": [], "bigbonemoves": []}
+        state_rows: List[Optional[Dict[str, Any]]] = []
+        # Symbols that took ticks this poll, with the sources whose moves changed.
+        advanced: Dict[str, List[str]] = {}
+        for symbol, dayref in ready.items():
+            runtime = self.runtimes[symbol]
+            rows = fetched.get(symbol) or []
+            if rows:
+                symbol_emitted = runtime.advance(rows)
+                for key, values in symbol_emitted.items():
+                    emitted[key].extend(values)
+                advanced[symbol] = emitted_move_sources(symbol_emitted["moves"] + symbol_emitted["bigbonemoves"])
+                results[symbol] = _live_result(dayref, len(rows), symbol_emitted)
+            else:
+                results[symbol] = _live_result(dayref)
+            state_rows.extend(runtime.state_rows())
+
+        # Backbone rows before bigbones rows, as the single-symbol path writes them.
+        insert_pivots(conn, emitted["pivots"])
+        insert_moves(conn, emitted["moves"])
+        insert_pivots(conn, emitted["bigbonepivots"])
+        insert_moves(conn, emitted["bigbonemoves"])
+        upsert_states(conn, state_rows)
+        for symbol in ready:
+            self.runtimes[symbol]._maybe_checkpoint(conn)
+        for symbol, sources in advanced.items():
+            runtime = self.runtimes[symbol]
+            refresh_day_summaries(conn, symbol=symbol, dayid=ready[symbol].dayid, brokerday=ready[symbol].brokerday, sources=sources)
+            notify_backbone(conn, symbol=symbol, dayref=ready[symbol], lastprocessedtickid=runtime.backbone_engine.lastprocessedtickid)
+        return results
 
 
 def rebuild_current_day(conn: Any, *, symbol: str, batch_size: int = 400) -> Dict[str, Any]:
@@ -1028,9 +2041,79 @@ def reset_current_day(conn: Any, *, symbol: str) -> Dict[str, Any]:
     if dayref is None:
         return {"dayid": None, "brokerday": None, "deleted": False}
     delete_day(conn, dayid=dayref.dayid, symbol=symbol)
+    notify_backbone(conn, symbol=symbol, dayref=dayref, lastprocessedtickid=None, reset=True)
     return {"dayid": dayref.dayid, "brokerday": dayref.brokerday, "deleted": True}
 
 
+def days_missing_move_ranges(conn: Any, *, symbol: str) -> List[int]:
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT DISTINCT m.dayid
+            FROM public.backbonemoves m
+            WHERE m.highprice IS NULL
+              AND m.symbol = %s
+            ORDER BY m.dayid ASC
+            """,
+            (symbol,),
+        )
+        return [int(row[0]) for row in cur.fetchall()]
+
+
+def backfill_move_ranges(conn: Any, *, symbol: str, dayid: int) -> int:
+    """Fill highprice/lowprice for one day's older moves from their ticks, priced the way the engine prices a tick."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE public.backbonemoves m
+            SET (highprice, lowprice) = (
+                SELECT
+                    COALESCE(MAX(ticks.price), GREATEST(m.startprice, m.endprice)),
+                    COALESCE(MIN(ticks.price), LEAST(m.startprice, m.endprice))
+                FROM (
+                    SELECT COALESCE(t.mid, (t.bid + t.ask) / 2.0, t.bid, t.ask) AS price
+                    FROM public.ticks t
+                    WHERE t.symbol = %s
+                      AND t.id >= m.starttickid
+                      AND t.id <= m.endtickid
+                ) ticks
+            )
+            WHERE m.dayid = %s
+              AND m.symbol = %s
+              AND m.highprice IS NULL
+            """,
+            (symbol, dayid, symbol),
+        )
+        return int(cur.rowcount or 0)
+
+
+def days_missing_day_summaries(conn: Any, *, symbol: str) -> List[Tuple[int, date]]:
+    """(dayid, brokerday) for days with moves but no summary rows, such as those built before the table existed."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT s.dayid, MIN(m.starttime)
+            FROM public.backbonestate s
+            JOIN public.backbonemoves m
+              ON m.dayid = s.dayid
+             AND m.symbol = s.symbol
+             AND m.source = s.source
+            WHERE s.symbol = %s
+              AND NOT EXISTS (
+                  SELECT 1
+                  FROM public.backbonedaysummary d
+                  WHERE d.dayid = s.dayid
+                    AND d.symbol = s.symbol
+                    AND d.source = s.source
+              )
+            GROUP BY s.dayid
+            ORDER BY s.dayid ASC
+            """,
+            (symbol,),
+        )
+        return [(int(row[0]), brokerday_for_timestamp(row[1])) for row in cur.fetchall()]
+
+
 def _print(message: str) -> None:
     print(message, flush=True)
 
@@ -1042,12 +2125,167 @@ def build_jobs_parser() -> argparse.ArgumentParser:
     subparsers = parser.add_subparsers(dest="command", required=True)
     subparsers.add_parser("rebuild-current-day", help="Rebuild the current broker day backbone rows.")
     subparsers.add_parser("reset-current-day", help="Delete the current broker day backbone rows and state.")
+    subparsers.add_parser("backfill-move-ranges", help="Fill highprice/lowprice on moves written before the engine stored them.")
+    subparsers.add_parser("backfill-day-summaries", help="Write backbonedaysummary rows for days that have moves but no summary.")
+    rebuild_range = subparsers.add_parser("rebuild-range", help="Rebuild a range of past broker days across a process pool.")
+    _add_brokerday_window_arguments(rebuild_range)
+    rebuild_range.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1), help="Worker processes.")
+    rebuild_range.add_argument("--max-connections", type=int, default=None, help="Cap on concurrent DB connections.")
+    rebuild_range.add_argument("--journal", default=None, help="Progress journal path (JSON lines).")
+    rebuild_range.add_argument("--restart", action="store_true", help="Ignore days the journal already marks done.")
+    sweep = subparsers.add_parser("sweep", help="Score engine parameter sets over past broker days without writing rows.")
+    _add_brokerday_window_arguments(sweep)
+    sweep.set_defaults(days=10)
+    sweep.add_argument(
+        "--grid",
+        action="append",
+        default=[],
+        help="Parameter values as name=v1,v2 (repeatable; the sweep runs the cartesian product), e.g. spread_weight=0.4,0.5.",
+    )
+    sweep.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1), help="Worker processes.")
+    sweep.add_argument("--output", default=None, help="Also write the results as a JSON array to this path.")
     return parser
 
 
+def _add_brokerday_window_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--start", type=date.fromisoformat, help="First brokerday (YYYY-MM-DD).")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last brokerday; defaults to the day before the current one.")
+    parser.add_argument("--days", type=int, default=60, help="Days ending at --end when --start is omitted.")
+
+
+def _brokerday_window(args: argparse.Namespace, *, symbol: str) -> Optional[Tuple[date, date]]:
+    end = args.end
+    if end is None:
+        with db_connection(readonly=True, autocommit=True) as conn:
+            current = resolve_current_day_ref(conn, symbol=symbol)
+        if current is None:
+            _print("no ticks for symbol={0}".format(symbol))
+            return None
+        end = current.brokerday - timedelta(days=1)
+    return args.start or end - timedelta(days=max(1, int(args.days)) - 1), end
+
+
+def rebuild_range_main(args: argparse.Namespace, *, symbol: str) -> int:
+    from datavis.backbone_backfill import REBUILD_MAX_CONNECTIONS, RebuildJournal, brokerday_range, default_journal_path, rebuild_range
+
+    window = _brokerday_window(args, symbol=symbol)
+    if window is None:
+        return 1
+    start, end = window
+    journal = RebuildJournal(Path(args.journal) if args.journal else default_journal_path(symbol))
+
+    def report(entry: Dict[str, Any]) -> None:
+        if entry["status"] == "empty":
+            _print("brokerday={0} skipped: {1}".format(entry["brokerday"], entry.get("reason")))
+        elif entry["status"] == "done":
+            _print(
+                "brokerday={0} dayid={1} ticks={2} pivots={3} moves={4} elapsed_ms={5}".format(
+                    entry["brokerday"], entry.get("dayid"), entry.get("ticks"), entry.get("pivots"), entry.get("moves"), entry.get("elapsedMs")
+                )
+            )
+        else:
+            _print("brokerday={0} failed: {1}".format(entry["brokerday"], entry.get("error")))
+
+    summary = rebuild_range(
+        symbol=symbol,
+        brokerdays=brokerday_range(start, end),
+        journal=journal,
+        workers=max(1, int(args.workers)),
+        max_connections=max(1, int(args.max_connections or REBUILD_MAX_CONNECTIONS)),
+        batch_size=max(1, int(args.batch_size)),
+        resume=not args.restart,
+        on_result=report,
+    )
+    _print(
+        "range={0}..{1} days={2} skipped={3} done={4} empty={5} failed={6} workers={7} journal={8}".format(
+            start.isoformat(),
+            end.isoformat(),
+            summary["days"],
+            summary["skipped"],
+            summary["done"],
+            summary["empty"],
+            summary["failed"],
+            summary["workers"],
+            journal.path,
+        )
+    )
+    return 1 if summary["failed"] else 0
+
+
+def sweep_main(args: argparse.Namespace, *, symbol: str) -> int:
+    from datavis.backbone_backfill import brokerday_range
+    from datavis.backbone_sweep import load_days, parse_grid, run_sweep
+
+    try:
+        param_sets = parse_grid(args.grid)
+    except ValueError as exc:
+        _print("invalid --grid: {0}".format(exc))
+        return 2
+    window = _brokerday_window(args, symbol=symbol)
+    if window is None:
+        return 1
+    start, end = window
+    started = time.perf_counter()
+    days = load_days(symbol=symbol, brokerdays=brokerday_range(start, end))
+    _print(
+        "loaded days={0} ticks={1} elapsed_ms={2:.0f} param_sets={3}".format(
+            len(days), sum(len(arrays.pointids) for arrays in days.values()), (time.perf_counter() - started) * 1000.0, len(param_sets)
+        )
+    )
+    if not days:
+        return 1
+
+    def report(result: Dict[str, Any]) -> None:
+        changed = {key: value for key, value in result["params"].items() if getattr(DEFAULT_PARAMS, key) != value}
+        _print(
+            "params={0} moves/day={1} median_size={2} median_seconds={3} mean_threshold={4} bigbone_moves={5} elapsed_ms={6}".format(
+                json.dumps(changed, separators=(",", ":")) if changed else "default",
+                result["movesPerDay"],
+                result["medianMoveSize"],
+                result["medianMoveSeconds"],
+                result["meanThreshold"],
+                result["bigboneMoves"],
+                result["elapsedMs"],
+            )
+        )
+
+    results = run_sweep(symbol=symbol, days=days, param_sets=param_sets, workers=max(1, int(args.workers)), on_result=report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    _print("range={0}..{1} param_sets={2} elapsed_ms={3:.0f}".format(start.isoformat(), end.isoformat(), len(results), (time.perf_counter() - started) * 1000.0))
+    return 0
+
+
 def jobs_main() -> int:
     args = build_jobs_parser().parse_args()
     symbol = str(args.symbol or DEFAULT_SYMBOL).strip().upper() or DEFAULT_SYMBOL
+    if args.command == "rebuild-range":
+        return rebuild_range_main(args, symbol=symbol)
+    if args.command == "sweep":
+        return sweep_main(args, symbol=symbol)
+    if args.command == "backfill-move-ranges":
+        with db_connection(readonly=True, autocommit=True) as conn:
+            dayids = days_missing_move_ranges(conn, symbol=symbol)
+        total = 0
+        for dayid in dayids:
+            # One short transaction per day keeps the live worker's upserts from waiting on row locks.
+            with db_connection(readonly=False, autocommit=False) as conn:
+                updated = backfill_move_ranges(conn, symbol=symbol, dayid=dayid)
+                conn.commit()
+            total += updated
+            _print("dayid={0} moves={1}".format(dayid, updated))
+        _print("days={0} moves={1}".format(len(dayids), total))
+        return 0
+    if args.command == "backfill-day-summaries":
+        with db_connection(readonly=True, autocommit=True) as conn:
+            days = days_missing_day_summaries(conn, symbol=symbol)
+        for dayid, brokerday in days:
+            with db_connection(readonly=False, autocommit=False) as conn:
+                refresh_day_summaries(conn, symbol=symbol, dayid=dayid, brokerday=brokerday)
+                conn.commit()
+            _print("brokerday={0} dayid={1}".format(brokerday.isoformat(), dayid))
+        _print("days={0}".format(len(days)))
+        return 0
     with db_connection(readonly=False, autocommit=False) as conn:
         if args.command == "rebuild-current-day":
             result = rebuild_current_day(conn, symbol=symbol, batch_size=max(1, int(args.batch_size)))
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from datavis.backbone import (
+    BACKBONE_VERSION,
+    BASE_DIR,
+    db_connection,
+    find_day_ref_for_brokerday,
+    rebuild_day,
+    utc_now,
+)
+
+
+REBUILD_JOURNAL_DIR = BASE_DIR / "logs" / "backbone_rebuild"
+REBUILD_MAX_CONNECTIONS = max(1, int(os.getenv("DATAVIS_BACKBONE_REBUILD_MAX_CONNECTIONS", "4")))
+
+
+def brokerday_range(start: date, end: date) -> List[date]:
+    if end < start:
+        return []
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def default_journal_path(symbol: str) -> Path:
+    return REBUILD_JOURNAL_DIR / "{0}.jsonl".format(symbol)
+
+
+class RebuildJournal:
+    """Append-only JSON-lines record of finished days; the last entry for a day wins on resume."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def entries(self) -> List[Dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        entries: List[Dict[str, Any]] = []
+        with self.path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write leaves at most one torn trailing line.
+                    continue
+                if isinstance(entry, dict):
+                    entries.append(entry)
+        return entries
+
+    def completed(self, *, symbol: str, engine_version: int = BACKBONE_VERSION) -> Set[date]:
+        latest: Dict[str, Dict[str, Any]] = {}
+        for entry in self.entries():
+            if entry.get("symbol") == symbol and entry.get("brokerday"):
+                latest[str(entry["brokerday"])] = entry
+        return {
+            date.fromisoformat(brokerday)
+            for brokerday, entry in latest.items()
+            if entry.get("status") in {"done", "empty"} and int(entry.get("engineVersion") or 0) == int(engine_version)
+        }
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        payload = json.dumps(entry, default=str, separators=(",", ":"))
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(payload + "\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+
+
+def rebuild_brokerday(symbol: str, brokerday: date, batch_size: int) -> Dict[str, Any]:
+    """Pool worker: one connection and one transaction for one brokerday."""
+    started = time.perf_counter()
+    with db_connection(readonly=False, autocommit=False) as conn:
+        dayref = find_day_ref_for_brokerday(conn, symbol=symbol, brokerday=brokerday)
+        if dayref is None:
+            result: Dict[str, Any] = {"dayid": None, "brokerday": brokerday, "tickcount": 0, "empty": True, "reason": "no days row"}
+        else:
+            result = rebuild_day(conn, symbol=symbol, dayref=dayref, batch_size=batch_size)
+        conn.commit()
+    result["elapsedms"] = round((time.perf_counter() - started) * 1000.0, 1)
+    return result
+
+
+def rebuild_range(
+    *,
+    symbol: str,
+    brokerdays: Iterable[date],
+    journal: RebuildJournal,
+    workers: int,
+    max_connections: int = REBUILD_MAX_CONNECTIONS,
+    batch_size: int = 400,
+    resume: bool = True,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    executor_factory: Callable[[int], Any] = lambda size: ProcessPoolExecutor(max_workers=size),
+    worker: Callable[[str, date, int], Dict[str, Any]] = rebuild_brokerday,
+) -> Dict[str, Any]:
+    days = sorted(set(brokerdays))
+    skipped = journal.completed(symbol=symbol) if resume else set()
+    pending = [day for day in days if day not in skipped]
+    # Every in-flight day holds exactly one connection, so the DB cap bounds the pool.
+    pool_size = max(1, min(int(workers), int(max_connections), len(pending) or 1))
+    summary = {"days": len(days), "skipped": len(days) - len(pending), "done": 0, "empty": 0, "failed": 0, "workers": pool_size}
+    if not pending:
+        return summary
+
+    with executor_factory(pool_size) as executor:
+        queue = list(reversed(pending))
+        running: Dict[Future, date] = {}
+        while queue or running:
+            # Submit only up to the pool size so an interrupted run leaves nothing half-queued.
+            while queue and len(running) < pool_size:
+                day = queue.pop()
+                running[executor.submit(worker, symbol, day, batch_size)] = day
+            finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in finished:
+                day = running.pop(future)
+                entry: Dict[str, Any] = {
+                    "symbol": symbol,
+                    "brokerday": day.isoformat(),
+                    "engineVersion": BACKBONE_VERSION,
+                    "finishedAt": utc_now().isoformat(),
+                }
+                error = future.exception()
+                result = future.result() if error is None else {}
+                if error is None and result.get("empty"):
+                    # Weekends and holidays: nothing was written, and a resumed run need not look again.
+                    entry.update({"status": "empty", "dayid": result.get("dayid"), "reason": result.get("reason")})
+                    summary["empty"] += 1
+                elif error is None:
+                    entry.update(
+                        {
+                            "status": "done",
+                            "dayid": result.get("dayid"),
+                            "ticks": result.get("tickcount"),
+                            "pivots": result.get("pivotcount"),
+                            "moves": result.get("movecount"),
+                            "bigbonePivots": result.get("bigbonepivotcount"),
+                            "bigboneMoves": result.get("bigbonemovecount"),
+                            "elapsedMs": result.get("elapsedms"),
+                        }
+                    )
+                    summary["done"] += 1
+                else:
+                    entry.update({"status": "failed", "error": "{0}: {1}".format(type(error).__name__, error)})
+                    summary["failed"] += 1
+                journal.record(entry)
+                if on_result is not None:
+                    on_result(entry)
+    return summary
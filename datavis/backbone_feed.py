@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import select
+import threading
+import time
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple
+
+
+FeedCursor = Dict[str, Any]
+FeedLoader = Callable[[Any, FeedCursor, List[Dict[str, Any]], bool], Tuple[List[Dict[str, Any]], FeedCursor]]
+
+
+class BackboneFeedSubscription:
+    def __init__(self, *, wants_ticks: bool) -> None:
+        self.wants_ticks = bool(wants_ticks)
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+
+    def put(self, payload: Dict[str, Any]) -> None:
+        self._queue.put(payload)
+
+    def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        try:
+            return self._queue.get(timeout=max(0.0, float(timeout)))
+        except queue.Empty:
+            return None
+
+
+class BackboneFeed:
+    """One LISTEN connection per process that turns worker commit notifications into shared backbone deltas.
+
+    Subscribers block on their own queue, so an idle client costs no queries; the database is read
+    once per notification for everyone, plus a slow safety read in case a notification was missed.
+    """
+
+    def __init__(
+        self,
+        *,
+        channel: str,
+        connect: Callable[[], ContextManager[Any]],
+        prime: Callable[[Any], FeedCursor],
+        load: FeedLoader,
+        safety_seconds: float = 5.0,
+        idle_seconds: float = 30.0,
+        ready_timeout: float = 5.0,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.channel = channel
+        self.safety_seconds = max(0.05, float(safety_seconds))
+        self.idle_seconds = max(0.0, float(idle_seconds))
+        self.ready_timeout = max(0.1, float(ready_timeout))
+        self.notifications = 0
+        self.loads = 0
+        self._connect = connect
+        self._prime = prime
+        self._load = load
+        self._logger = logger or logging.getLogger("datavis.backbone_feed")
+        self._lock = threading.Lock()
+        self._subscribers: List[BackboneFeedSubscription] = []
+        self._cursor: FeedCursor = {}
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._stopping = threading.Event()
+
+    def subscribe(self, *, wants_ticks: bool) -> Tuple[BackboneFeedSubscription, FeedCursor]:
+        """Register a subscriber and return the cursor its catch-up read must stop at; later deltas start there."""
+        subscription = BackboneFeedSubscription(wants_ticks=wants_ticks)
+        self.ensure_started()
+        self._ready.wait(self.ready_timeout)
+        with self._lock:
+            self._subscribers.append(subscription)
+            return subscription, dict(self._cursor)
+
+    def unsubscribe(self, subscription: BackboneFeedSubscription) -> None:
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def cursor(self) -> FeedCursor:
+        with self._lock:
+            return dict(self._cursor)
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._ready.clear()
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="datavis-backbone-feed", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        idle_since: Optional[float] = None
+        try:
+            with self._connect() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("LISTEN {0}".format(self.channel))
+                # Prime or catch up only after LISTEN so nothing committed in between is lost.
+                with self._lock:
+                    resuming = bool(self._cursor)
+                if resuming:
+                    self._load_and_publish(conn, [])
+                else:
+                    cursor = self._prime(conn)
+                    with self._lock:
+                        self._cursor = cursor
+                self._ready.set()
+                next_safety_load = time.monotonic() + self.safety_seconds
+                while not self._stopping.is_set():
+                    now = time.monotonic()
+                    if self.subscriber_count() == 0:
+                        idle_since = idle_since or now
+                        if now - idle_since >= self.idle_seconds:
+                            return
+                    else:
+                        idle_since = None
+                    readable, _, _ = select.select([conn], [], [], max(0.0, min(1.0, next_safety_load - now)))
+                    notifications = self._drain(conn) if readable else []
+                    if notifications or time.monotonic() >= next_safety_load:
+                        self._load_and_publish(conn, notifications)
+                        next_safety_load = time.monotonic() + self.safety_seconds
+        except Exception:
+            self._logger.exception("backbone_feed_failed channel=%s", self.channel)
+        finally:
+            self._ready.set()
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    def _drain(self, conn: Any) -> List[Dict[str, Any]]:
+        conn.poll()
+        notifications: List[Dict[str, Any]] = []
+        while conn.notifies:
+            notify = conn.notifies.pop(0)
+            try:
+                payload = json.loads(notify.payload or "{}")
+            except json.JSONDecodeError:
+                payload = {}
+            notifications.append(payload if isinstance(payload, dict) else {})
+        self.notifications += len(notifications)
+        return notifications
+
+    def _load_and_publish(self, conn: Any, notifications: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            cursor = dict(self._cursor)
+            wants_ticks = any(subscriber.wants_ticks for subscriber in self._subscribers)
+        payloads, cursor = self._load(conn, cursor, notifications, wants_ticks)
+        self.loads += 1
+        with self._lock:
+            # Cursor and fan-out move together so a concurrent subscribe sees either both or neither.
+            self._cursor = cursor
+            for subscriber in self._subscribers:
+                for payload in payloads:
+                    subscriber.put(payload)
@@ -2,34 +2,52 @@ from __future__ import annotations
 
 import argparse
 import os
-import time
+import signal
+import threading
+from typing import Any, Callable
 
-from datavis.backbone import BackboneLiveRuntime, db_connection
+from datavis.backbone import BackboneMultiRuntime, db_connection
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Run the live backbone incremental worker.")
-    parser.add_argument("--symbol", default=os.getenv("DATAVIS_SYMBOL", "XAUUSD"), help="Symbol to process.")
-    parser.add_argument("--batch-size", type=int, default=400, help="Tick batch size per poll.")
+    parser.add_argument("--symbol", default=os.getenv("DATAVIS_SYMBOL", "XAUUSD"), help="Symbol to process when --symbols is empty.")
+    parser.add_argument(
+        "--symbols",
+        default=os.getenv("DATAVIS_BACKBONE_SYMBOLS", ""),
+        help="Comma-separated symbols served by this one worker, e.g. XAUUSD,EURUSD.",
+    )
+    parser.add_argument("--batch-size", type=int, default=400, help="Tick batch size per symbol per poll.")
     parser.add_argument("--poll-seconds", type=float, default=0.20, help="Sleep time between empty polls.")
     return parser
 
 
-def main() -> int:
-    args = build_parser().parse_args()
-    runtime = BackboneLiveRuntime(symbol=str(args.symbol).strip().upper(), batch_size=max(1, int(args.batch_size)))
-    poll_seconds = max(0.05, float(args.poll_seconds))
-
-    with db_connection(readonly=False, autocommit=False) as conn:
+def run_worker(runtime: Any, *, poll_seconds: float, stop: threading.Event, connect: Callable[..., Any] = db_connection) -> None:
+    """Bootstrap, then poll on one connection until `stop` is set between polls; only then write the shutdown checkpoint."""
+    with connect(readonly=False, autocommit=False) as conn:
         runtime.bootstrap(conn)
         conn.commit()
-
-    while True:
-        with db_connection(readonly=False, autocommit=False) as conn:
-            result = runtime.process_once(conn)
+        while not stop.is_set():
+            results = runtime.process_once(conn)
             conn.commit()
-        if int(result.get("tickcount") or 0) <= 0:
-            time.sleep(poll_seconds)
+            if all(int(result.get("tickcount") or 0) <= 0 for result in results.values()):
+                stop.wait(poll_seconds)
+        # Reached only after the last poll committed, so the checkpoint never runs ahead of stored rows.
+        # A poll that raised rolled back rows the engines already hold in memory; that path must not checkpoint.
+        runtime.checkpoint(conn)
+        conn.commit()
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    symbols = [symbol for symbol in str(args.symbols or "").split(",") if symbol.strip()] or [str(args.symbol)]
+    runtime = BackboneMultiRuntime(symbols=symbols, batch_size=max(1, int(args.batch_size)))
+
+    # systemd stops the worker with SIGTERM; finish the current poll, then stop.
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    run_worker(runtime, poll_seconds=max(0.05, float(args.poll_seconds)), stop=stop)
+    return 0
 
 
 if __name__ == "__main__":
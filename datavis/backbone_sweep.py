@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import dataclasses
+import itertools
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from datavis.backbone import (
+    BACKBONE_SOURCE,
+    BIGBONES_SOURCE,
+    DEFAULT_PARAMS,
+    BackboneEngine,
+    BackboneInputArrays,
+    BackboneParams,
+    DayRef,
+    _epoch_micros,
+    _from_epoch_micros,
+    db_connection,
+    fetch_tick_columns_for_day,
+    find_day_ref_for_brokerday,
+    tick_input_arrays,
+)
+from datavis.brokerday import brokerday_bounds
+
+
+# Column order inside the shared block; each is one contiguous 8-byte array over all days.
+SHARED_COLUMNS = (("pointids", np.int64), ("pointtimes", np.int64), ("mids", np.float64), ("spreads", np.float64))
+SWEEP_PARAMETERS = {field.name: field.type for field in dataclasses.fields(BackboneParams)}
+
+
+class EpochTimes:
+    """Read-only datetime view over epoch microseconds; the engine only materializes times at pivots."""
+
+    def __init__(self, micros: np.ndarray) -> None:
+        self.micros = micros
+
+    def __len__(self) -> int:
+        return len(self.micros)
+
+    def __getitem__(self, index: int) -> Optional[datetime]:
+        return _from_epoch_micros(int(self.micros[index]))
+
+
+class SharedDaySet:
+    """Tick columns for a set of brokerdays in one shared-memory block that sweep workers attach to without copying."""
+
+    def __init__(self, block: shared_memory.SharedMemory, days: List[Dict[str, Any]], total: int, *, owner: bool) -> None:
+        self.block = block
+        self.days = days
+        self.total = total
+        self.owner = owner
+        self.columns = {
+            name: np.ndarray((total,), dtype=dtype, buffer=block.buf, offset=index * 8 * total)
+            for index, (name, dtype) in enumerate(SHARED_COLUMNS)
+        }
+
+    @classmethod
+    def create(cls, days: Dict[date, BackboneInputArrays]) -> "SharedDaySet":
+        total = sum(len(arrays.pointids) for arrays in days.values())
+        block = shared_memory.SharedMemory(create=True, size=max(8, 8 * total * len(SHARED_COLUMNS)))
+        layout: List[Dict[str, Any]] = []
+        offset = 0
+        for brokerday in sorted(days):
+            arrays = days[brokerday]
+            layout.append({"brokerday": brokerday, "start": offset, "stop": offset + len(arrays.pointids), "rowcount": arrays.rowcount})
+            offset += len(arrays.pointids)
+        shared = cls(block, layout, total, owner=True)
+        for entry in layout:
+            arrays = days[entry["brokerday"]]
+            window = slice(entry["start"], entry["stop"])
+            shared.columns["pointids"][window] = arrays.pointids
+            shared.columns["pointtimes"][window] = [_epoch_micros(value) for value in arrays.pointtimes]
+            shared.columns["mids"][window] = arrays.mids
+            shared.columns["spreads"][window] = arrays.spreads
+        return shared
+
+    @classmethod
+    def attach(cls, descriptor: Dict[str, Any]) -> "SharedDaySet":
+        return cls(shared_memory.SharedMemory(name=descriptor["name"]), descriptor["days"], descriptor["total"], owner=False)
+
+    def descriptor(self) -> Dict[str, Any]:
+        return {"name": self.block.name, "days": self.days, "total": self.total}
+
+    def day_arrays(self) -> Iterator[Tuple[date, BackboneInputArrays]]:
+        for entry in self.days:
+            window = slice(entry["start"], entry["stop"])
+            yield entry["brokerday"], BackboneInputArrays(
+                rowcount=entry["rowcount"],
+                pointids=self.columns["pointids"][window],
+                pointtimes=EpochTimes(self.columns["pointtimes"][window]),
+                # process_arrays indexes and slices these but never writes to them.
+                mids=self.columns["mids"][window],
+                spreads=self.columns["spreads"][window],
+            )
+
+    def close(self) -> None:
+        self.columns = {}
+        self.block.close()
+        if self.owner:
+            self.block.unlink()
+
+
+def parse_grid(specs: Sequence[str]) -> List[BackboneParams]:
+    """Cartesian product of `name=v1,v2,...` specs over the default parameters."""
+    axes: List[Tuple[str, List[Any]]] = []
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        name = name.strip().replace("-", "_")
+        if name not in SWEEP_PARAMETERS or not values.strip():
+            raise ValueError("expected name=v1,v2 with name one of {0}: {1!r}".format(", ".join(SWEEP_PARAMETERS), spec))
+        cast = int if SWEEP_PARAMETERS[name] in (int, "int") else float
+        axes.append((name, [cast(value) for value in values.split(",") if value.strip()]))
+    if not axes:
+        return [DEFAULT_PARAMS]
+    names = [name for name, _ in axes]
+    return [dataclasses.replace(DEFAULT_PARAMS, **dict(zip(names, combo))) for combo in itertools.product(*(values for _, values in axes))]
+
+
+def load_days(*, symbol: str, brokerdays: Sequence[date], batch_size: int = 10000) -> Dict[date, BackboneInputArrays]:
+    days: Dict[date, BackboneInputArrays] = {}
+    with db_connection(readonly=True, autocommit=True) as conn:
+        for brokerday in brokerdays:
+            dayref = find_day_ref_for_brokerday(conn, symbol=symbol, brokerday=brokerday)
+            if dayref is None:
+                continue
+            arrays = tick_input_arrays(
+                **fetch_tick_columns_for_day(conn, symbol=symbol, dayref=dayref, batch_size=batch_size),
+                previous_spread=None,
+            )
+            if arrays.pointids:
+                days[brokerday] = arrays
+    return days
+
+
+def summarize(params: BackboneParams, days: List[Dict[str, Any]], elapsed_ms: float) -> Dict[str, Any]:
+    moves = [move for day in days for move in day["moves"]]
+    sizes = [abs(float(move["pricedelta"])) for move in moves]
+    seconds = [(move["endtime"] - move["starttime"]).total_seconds() for move in moves]
+    day_count = max(1, len(days))
+    return {
+        "params": dataclasses.asdict(params),
+        "days": len(days),
+        "ticks": sum(day["ticks"] for day in days),
+        "pivots": sum(day["pivots"] for day in days),
+        "moves": len(moves),
+        "bigboneMoves": sum(day["bigboneMoves"] for day in days),
+        "movesPerDay": round(len(moves) / day_count, 2),
+        "meanMoveSize": round(statistics.fmean(sizes), 4) if sizes else None,
+        "medianMoveSize": round(statistics.median(sizes), 4) if sizes else None,
+        "medianMoveSeconds": round(statistics.median(seconds), 1) if seconds else None,
+        "meanMoveTicks": round(statistics.fmean(move["tickcount"] for move in moves), 1) if moves else None,
+        "meanThreshold": round(statistics.fmean(move["thresholdatconfirm"] for move in moves), 4) if moves else None,
+        "elapsedMs": round(elapsed_ms, 1),
+    }
+
+
+def evaluate_params(shared: SharedDaySet, params: BackboneParams, *, symbol: str) -> Dict[str, Any]:
+    started = time.perf_counter()
+    days: List[Dict[str, Any]] = []
+    for brokerday, arrays in shared.day_arrays():
+        # Nothing is written, so the day only needs to exist in memory.
+        starttime, endtime = brokerday_bounds(brokerday)
+        dayref = DayRef(dayid=0, brokerday=brokerday, starttime=starttime, endtime=endtime)
+        backbone = BackboneEngine(symbol=symbol, source=BACKBONE_SOURCE, input_kind="ticks", params=params)
+        bigbones = BackboneEngine(symbol=symbol, source=BIGBONES_SOURCE, input_kind="backbone_moves", params=params)
+        backbone.reset(dayref)
+        bigbones.reset(dayref)
+        pivots, moves = backbone.process_arrays(arrays)
+        days.append(
+            {
+                "ticks": len(arrays.pointids),
+                "pivots": len(pivots),
+                "moves": moves,
+                "bigboneMoves": len(bigbones.process_batch(moves)[1]),
+            }
+        )
+    return summarize(params, days, (time.perf_counter() - started) * 1000.0)
+
+
+_WORKER_DAYS: Optional[SharedDaySet] = None
+
+
+def _attach_worker(descriptor: Dict[str, Any]) -> None:
+    global _WORKER_DAYS
+    _WORKER_DAYS = SharedDaySet.attach(descriptor)
+
+
+def _evaluate_in_worker(index: int, params: BackboneParams, symbol: str) -> Tuple[int, Dict[str, Any]]:
+    if _WORKER_DAYS is None:
+        raise RuntimeError("sweep worker started without its shared day set")
+    return index, evaluate_params(_WORKER_DAYS, params, symbol=symbol)
+
+
+def run_sweep(
+    *,
+    symbol: str,
+    days: Dict[date, BackboneInputArrays],
+    param_sets: Sequence[BackboneParams],
+    workers: int,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    executor_factory: Callable[..., Any] = ProcessPoolExecutor,
+) -> List[Dict[str, Any]]:
+    """Evaluate every parameter set over the same days; results come back in param_sets order."""
+    shared = SharedDaySet.create(days)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(param_sets)
+    try:
+        pool_size = max(1, min(int(workers), len(param_sets) or 1))
+        with executor_factory(max_workers=pool_size, initializer=_attach_worker, initargs=(shared.descriptor(),)) as executor:
+            futures = [executor.submit(_evaluate_in_worker, index, params, symbol) for index, params in enumerate(param_sets)]
+            for future in as_completed(futures):
+                index, result = future.result()
+                results[index] = result
+                if on_result is not None:
+                    on_result(result)
+    finally:
+        shared.close()
+    return [result for result in results if result is not None]
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+COLUMNAR_ENCODING = "columnar"
+COLUMNAR_VERSION = 1
+MAX_PRICE_DECIMALS = 6
+
+# (column, kind) pairs. "delta" columns are integers sent as first value + successive differences,
+# "scaled" columns are decimals sent the same way after multiplying by a shared power of ten,
+# "iso" columns are dropped and rebuilt by the client from the named millisecond column.
+TICK_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("id", "delta"),
+    ("symbol", "plain"),
+    ("timestampMs", "delta"),
+    ("timestamp", "iso:timestampMs"),
+    ("bid", "scaled"),
+    ("ask", "scaled"),
+    ("mid", "scaled"),
+    ("spread", "scaled"),
+)
+MAVG_POINT_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("valueId", "delta"),
+    ("configId", "plain"),
+    ("tickId", "delta"),
+    ("timestampMs", "delta"),
+    ("timestamp", "iso:timestampMs"),
+    ("value", "plain"),
+)
+BACKBONE_PIVOT_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("id", "delta"),
+    ("dayId", "plain"),
+    ("tickId", "delta"),
+    ("tickTimeMs", "delta"),
+    ("tickTime", "iso:tickTimeMs"),
+    ("price", "scaled"),
+    ("pivotType", "plain"),
+    ("threshold", "plain"),
+    ("source", "plain"),
+    ("createdAt", "plain"),
+)
+COLUMNAR_PAYLOAD_KEYS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "rows": TICK_COLUMNS,
+    "mavgPoints": MAVG_POINT_COLUMNS,
+    "pivots": BACKBONE_PIVOT_COLUMNS,
+    "pivotUpdates": BACKBONE_PIVOT_COLUMNS,
+}
+
+
+def normalize_encoding(value: Optional[str]) -> str:
+    normalized = str(value or "").strip().lower()
+    return COLUMNAR_ENCODING if normalized == COLUMNAR_ENCODING else "json"
+
+
+def delta_encode(values: Sequence[int]) -> List[int]:
+    encoded: List[int] = []
+    previous = 0
+    for value in values:
+        current = int(value)
+        encoded.append(current - previous)
+        previous = current
+    return encoded
+
+
+def delta_decode(values: Sequence[int]) -> List[int]:
+    decoded: List[int] = []
+    running = 0
+    for value in values:
+        running += int(value)
+        decoded.append(running)
+    return decoded
+
+
+def price_decimals(values: Sequence[float]) -> Optional[int]:
+    for decimals in range(MAX_PRICE_DECIMALS + 1):
+        scale = 10 ** decimals
+        if all(round(value * scale) / scale == value for value in values):
+            return decimals
+    return None
+
+
+def encode_column(values: List[Any], kind: str) -> Dict[str, Any]:
+    if values and all(value == values[0] for value in values):
+        return {"type": "const", "value": values[0]}
+    if kind == "delta" and all(isinstance(value, int) for value in values):
+        return {"type": "delta", "data": delta_encode(values)}
+    if kind == "scaled" and all(isinstance(value, (int, float)) for value in values):
+        decimals = price_decimals(values)
+        if decimals is not None:
+            scale = 10 ** decimals
+            return {"type": "scaled", "scale": scale, "data": delta_encode([round(value * scale) for value in values])}
+    return {"type": "plain", "data": values}
+
+
+def encode_columns(items: Sequence[Dict[str, Any]], spec: Sequence[Tuple[str, str]]) -> Dict[str, Any]:
+    columns: Dict[str, Any] = {}
+    for name, kind in spec:
+        if kind.startswith("iso:"):
+            columns[name] = {"type": "iso", "from": kind.split(":", 1)[1]}
+            continue
+        columns[name] = encode_column([item.get(name) for item in items], kind)
+    return {"count": len(items), "columns": columns}
+
+
+def decode_columns(block: Dict[str, Any]) -> List[Dict[str, Any]]:
+    count = int(block.get("count") or 0)
+    columns = block.get("columns") or {}
+    decoded: Dict[str, List[Any]] = {}
+    for name, column in columns.items():
+        column_type = column.get("type")
+        if column_type == "const":
+            decoded[name] = [column.get("value")] * count
+        elif column_type == "delta":
+            decoded[name] = delta_decode(column["data"])
+        elif column_type == "scaled":
+            scale = column["scale"]
+            decoded[name] = [value / scale if scale != 1 else float(value) for value in delta_decode(column["data"])]
+        elif column_type == "plain":
+            decoded[name] = list(column["data"])
+    return [{name: values[index] for name, values in decoded.items()} for index in range(count)]
+
+
+def encode_columnar_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    encoded = dict(payload)
+    for key, spec in COLUMNAR_PAYLOAD_KEYS.items():
+        items = encoded.get(key)
+        if isinstance(items, list):
+            encoded[key] = encode_columns(items, spec)
+    encoded["encoding"] = COLUMNAR_ENCODING
+    encoded["encodingVersion"] = COLUMNAR_VERSION
+    return encoded
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError("Object of type {0} is not JSON serializable".format(type(value).__name__))
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(payload: Any) -> bytes:
+        return orjson.dumps(payload, default=_default, option=_ORJSON_OPTIONS)
+
+else:
+
+    def dumps(payload: Any) -> bytes:
+        return json.dumps(payload, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+def sse_event(payload: Any, *, event_name: Optional[str] = None) -> bytes:
+    if event_name:
+        return b"event: " + event_name.encode("utf-8") + b"\ndata: " + dumps(payload) + b"\n\n"
+    return b"data: " + dumps(payload) + b"\n\n"
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class LiveChannel:
+    name: str
+    append_keys: Tuple[str, ...] = ()
+    merge_keys: Tuple[str, ...] = ()
+
+    @property
+    def is_state(self) -> bool:
+        return not self.append_keys and not self.merge_keys
+
+
+LIVE_CHANNELS: Dict[str, LiveChannel] = {
+    "ticks": LiveChannel(
+        "ticks",
+        append_keys=("rows", "structureEvents"),
+        merge_keys=("structureBarUpdates", "rangeBoxUpdates"),
+    ),
+    "mavg": LiveChannel("mavg", append_keys=("mavgPoints",)),
+    "backbone": LiveChannel("backbone", merge_keys=("pivotUpdates", "moveUpdates")),
+    "rect": LiveChannel("rect"),
+    "smart": LiveChannel("smart"),
+    "acd": LiveChannel("acd"),
+}
+
+
+def _merge_by_id(current: List[Dict[str, Any]], updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    merged = {item.get("id"): item for item in current}
+    for item in updates:
+        merged.pop(item.get("id"), None)
+        merged[item.get("id")] = item
+    return list(merged.values())
+
+
+class LiveHubSubscriber:
+    def __init__(self, channels: Iterable[str], *, notify: Optional[Callable[[], None]] = None) -> None:
+        self.channels = frozenset(channels)
+        self.coalesced = 0
+        self.dropped = 0
+        self.resyncs = 0
+        self._notify = notify
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+
+    def offer(self, channel: LiveChannel, payload: Dict[str, Any], *, max_pending_items: int) -> None:
+        with self._lock:
+            current = self._pending.get(channel.name)
+            if current is None or channel.is_state:
+                if current is not None:
+                    self.coalesced += 1
+                self._pending[channel.name] = {
+                    key: list(value or []) if key in channel.append_keys else value for key, value in payload.items()
+                }
+            elif current.get("resync"):
+                self.dropped += 1
+                current.update({key: value for key, value in payload.items() if key not in channel.append_keys + channel.merge_keys})
+            else:
+                self.coalesced += 1
+                for key, value in payload.items():
+                    if key in channel.append_keys:
+                        current.setdefault(key, []).extend(value or [])
+                    elif key in channel.merge_keys:
+                        current[key] = _merge_by_id(list(current.get(key) or []), list(value or []))
+                    else:
+                        current[key] = value
+            pending = self._pending[channel.name]
+            if not channel.is_state and not pending.get("resync"):
+                size = sum(len(pending.get(key) or []) for key in channel.append_keys + channel.merge_keys)
+                if size > max_pending_items:
+                    # A client this far behind resyncs over REST instead of growing the queue.
+                    self.resyncs += 1
+                    self._pending[channel.name] = {
+                        "resync": True,
+                        **{key: value for key, value in pending.items() if key not in channel.append_keys + channel.merge_keys},
+                    }
+        if self._notify is not None:
+            self._notify()
+
+    def has_pending(self) -> bool:
+        with self._lock:
+            return bool(self._pending)
+
+    def drain(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            return pending
+
+
+class LiveHub:
+    def __init__(self, *, channels: Optional[Dict[str, LiveChannel]] = None, max_pending_items: int = 5000) -> None:
+        self.channels = dict(channels or LIVE_CHANNELS)
+        self.max_pending_items = max(1, int(max_pending_items))
+        self._lock = threading.Lock()
+        self._subscribers: List[LiveHubSubscriber] = []
+        self._latest: Dict[str, Dict[str, Any]] = {}
+
+    def subscribe(self, channels: Iterable[str], *, notify: Optional[Callable[[], None]] = None) -> LiveHubSubscriber:
+        names = [name for name in channels if name in self.channels]
+        subscriber = LiveHubSubscriber(names, notify=notify)
+        with self._lock:
+            self._subscribers.append(subscriber)
+            latest = [(self.channels[name], self._latest[name]) for name in names if name in self._latest]
+        for channel, payload in latest:
+            subscriber.offer(channel, payload, max_pending_items=self.max_pending_items)
+        return subscriber
+
+    def unsubscribe(self, subscriber: LiveHubSubscriber) -> None:
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def wants(self, channel_name: str) -> bool:
+        with self._lock:
+            return any(channel_name in subscriber.channels for subscriber in self._subscribers)
+
+    def publish(self, channel_name: str, payload: Dict[str, Any]) -> int:
+        channel = self.channels[channel_name]
+        with self._lock:
+            if channel.is_state:
+                if self._latest.get(channel_name) == payload:
+                    return 0
+                self._latest[channel_name] = payload
+            targets = [subscriber for subscriber in self._subscribers if channel_name in subscriber.channels]
+        for subscriber in targets:
+            subscriber.offer(channel, payload, max_pending_items=self.max_pending_items)
+        return len(targets)
+
+    def reset_state(self, channel_name: Optional[str] = None) -> None:
+        with self._lock:
+            if channel_name is None:
+                self._latest.clear()
+            else:
+                self._latest.pop(channel_name, None)
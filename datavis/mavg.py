@@ -10,9 +10,10 @@ from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Deque, Dict, Generator, Iterable, List, Optional, Sequence
+from typing import Any, Deque, Dict, Generator, Iterable, List, Optional, Sequence, Tuple
 
 import psycopg2
+import psycopg2.errors
 import psycopg2.extras
 from dotenv import load_dotenv
 
@@ -31,6 +32,18 @@ MAX_BIGPICTURE_POINTS = max(200, int(os.getenv("DATAVIS_BIGPICTURE_MAX_POINTS",
 MAX_MAVG_STREAM_BATCH = max(200, int(os.getenv("DATAVIS_MAVG_STREAM_BATCH", "4000")))
 EMA_WARMUP_MULTIPLIER = max(2, int(os.getenv("DATAVIS_MAVG_EMA_WARMUP_MULTIPLIER", "5")))
 MAX_BOOTSTRAP_SECONDS = max(3600, int(os.getenv("DATAVIS_MAVG_MAX_BOOTSTRAP_SECONDS", "21600")))
+MAVG_LOD_RESOLUTIONS: Tuple[int, ...] = tuple(
+    sorted(
+        {
+            max(1, int(value))
+            for value in os.getenv("DATAVIS_MAVG_LOD_RESOLUTIONS", "10,60,300,900,3600,14400").split(",")
+            if value.strip()
+        }
+    )
+)
+# Each LOD bucket keeps the same four representatives the bucketed time-range query picks.
+LOD_SLOTS = ("first", "low", "high", "last")
+LOD_FIELDS = ("valueid", "tickid", "ticktime", "value")
 
 
 @dataclass(frozen=True)
@@ -268,6 +281,7 @@ def load_sma_seed_rows(
 def delete_config_rows(conn: Any, *, configid: int) -> None:
     with conn.cursor() as cur:
         cur.execute("DELETE FROM public.mavgvalue WHERE configid = %s", (configid,))
+        cur.execute("DELETE FROM public.mavglod WHERE configid = %s", (configid,))
         cur.execute("DELETE FROM public.mavgstate WHERE configid = %s", (configid,))
 
 
@@ -275,7 +289,7 @@ def insert_values(conn: Any, rows: Sequence[Dict[str, Any]]) -> None:
     if not rows:
         return
     with conn.cursor() as cur:
-        psycopg2.extras.execute_values(
+        inserted = psycopg2.extras.execute_values(
             cur,
             """
             INSERT INTO public.mavgvalue (configid, tickid, ticktime, value)
@@ -284,6 +298,7 @@ def insert_values(conn: Any, rows: Sequence[Dict[str, Any]]) -> None:
             DO UPDATE SET
                 ticktime = EXCLUDED.ticktime,
                 value = EXCLUDED.value
+            RETURNING id, configid, tickid, (xmax = 0) AS inserted
             """,
             [(
                 int(row["configid"]),
@@ -292,7 +307,178 @@ def insert_values(conn: Any, rows: Sequence[Dict[str, Any]]) -> None:
                 float(row["value"]),
             ) for row in rows],
             page_size=min(2000, len(rows)),
+            fetch=True,
+        )
+    value_ids = {(int(item[1]), int(item[2])): (int(item[0]), bool(item[3])) for item in inserted}
+    points = [
+        {**row, "id": value_ids[(int(row["configid"]), int(row["tickid"]))][0]}
+        for row in rows
+        if (int(row["configid"]), int(row["tickid"])) in value_ids
+    ]
+    # New values can only widen a bucket, so they merge; a rewritten value may have been its bucket's low or high.
+    rewritten = set(
+        fold_lod_buckets(point for point in points if not value_ids[(int(point["configid"]), int(point["tickid"]))][1])
+    )
+    merged = fold_lod_buckets(point for point in points if value_ids[(int(point["configid"]), int(point["tickid"]))][1])
+    upsert_lod_buckets(conn, {key: bucket for key, bucket in merged.items() if key not in rewritten})
+    recompute_lod_buckets(conn, rewritten)
+
+
+def lod_bucket_start(ticktime: datetime, resolution: int) -> datetime:
+    epoch = math.floor(_as_utc(ticktime).timestamp() / resolution) * resolution
+    return datetime.fromtimestamp(epoch, tz=timezone.utc)
+
+
+def _lod_slot_key(slot: str, point: Dict[str, Any]) -> Tuple[Any, ...]:
+    ticktime = _as_utc(point["ticktime"])
+    if slot == "low":
+        return (float(point["value"]), ticktime, int(point["tickid"]))
+    if slot == "high":
+        return (-float(point["value"]), ticktime, int(point["tickid"]))
+    return (ticktime, int(point["tickid"]))
+
+
+def merge_lod_bucket(target: Dict[str, Any], source: Dict[str, Any]) -> Dict[str, Any]:
+    target["valuecount"] = int(target.get("valuecount") or 0) + int(source.get("valuecount") or 0)
+    for slot in LOD_SLOTS:
+        current = target.get(slot)
+        candidate = source.get(slot)
+        if candidate is None:
+            continue
+        if current is None:
+            target[slot] = candidate
+            continue
+        current_key = _lod_slot_key(slot, current)
+        candidate_key = _lod_slot_key(slot, candidate)
+        if candidate_key > current_key if slot == "last" else candidate_key < current_key:
+            target[slot] = candidate
+    return target
+
+
+def fold_lod_buckets(
+    points: Iterable[Dict[str, Any]],
+    *,
+    resolutions: Sequence[int] = MAVG_LOD_RESOLUTIONS,
+) -> Dict[Tuple[int, int, datetime], Dict[str, Any]]:
+    buckets: Dict[Tuple[int, int, datetime], Dict[str, Any]] = {}
+    for point in points:
+        single = {"valuecount": 1, **{slot: point for slot in LOD_SLOTS}}
+        for resolution in resolutions:
+            key = (int(point["configid"]), int(resolution), lod_bucket_start(point["ticktime"], resolution))
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = dict(single)
+            else:
+                merge_lod_bucket(bucket, single)
+    return buckets
+
+
+def _lod_conflict_assignments() -> str:
+    conditions = {
+        "first": "(EXCLUDED.firstticktime, EXCLUDED.firsttickid) < (l.firstticktime, l.firsttickid)",
+        "low": "(EXCLUDED.lowvalue, EXCLUDED.lowticktime, EXCLUDED.lowtickid) < (l.lowvalue, l.lowticktime, l.lowtickid)",
+        "high": "(-EXCLUDED.highvalue, EXCLUDED.highticktime, EXCLUDED.hightickid) < (-l.highvalue, l.highticktime, l.hightickid)",
+        "last": "(EXCLUDED.lastticktime, EXCLUDED.lasttickid) >= (l.lastticktime, l.lasttickid)",
+    }
+    return ",\n".join(
+        "{0}{1} = CASE WHEN {2} THEN EXCLUDED.{0}{1} ELSE l.{0}{1} END".format(slot, field, conditions[slot])
+        for slot in LOD_SLOTS
+        for field in LOD_FIELDS
+    )
+
+
+LOD_COLUMNS = ["configid", "resolutionseconds", "bucketstart", "valuecount"] + [slot + field for slot in LOD_SLOTS for field in LOD_FIELDS]
+LOD_UPSERT_SQL = """
+    INSERT INTO public.mavglod AS l ({columns})
+    VALUES %s
+    ON CONFLICT (configid, resolutionseconds, bucketstart)
+    DO UPDATE SET
+        valuecount = l.valuecount + EXCLUDED.valuecount,
+        {assignments}
+""".format(columns=", ".join(LOD_COLUMNS), assignments=_lod_conflict_assignments())
+
+
+def upsert_lod_buckets(conn: Any, buckets: Dict[Tuple[int, int, datetime], Dict[str, Any]]) -> None:
+    if not buckets:
+        return
+    values = []
+    for (configid, resolution, bucketstart), bucket in sorted(buckets.items()):
+        row: List[Any] = [configid, resolution, bucketstart, int(bucket["valuecount"])]
+        for slot in LOD_SLOTS:
+            point = bucket[slot]
+            row.extend([int(point["id"]), int(point["tickid"]), point["ticktime"], float(point["value"])])
+        values.append(tuple(row))
+    with conn.cursor() as cur:
+        psycopg2.extras.execute_values(cur, LOD_UPSERT_SQL, values, page_size=min(2000, len(values)))
+
+
+LOD_SLOT_ORDER = {
+    "first": "v.ticktime ASC, v.tickid ASC",
+    "low": "v.value ASC, v.ticktime ASC, v.tickid ASC",
+    "high": "v.value DESC, v.ticktime ASC, v.tickid ASC",
+    "last": "v.ticktime DESC, v.tickid DESC",
+}
+LOD_BUCKET_FILTER = (
+    "v.configid = a.configid AND v.ticktime >= a.bucketstart"
+    " AND v.ticktime < a.bucketstart + a.resolutionseconds * INTERVAL '1 second'"
+)
+LOD_RECOMPUTE_SQL = """
+    INSERT INTO public.mavglod ({columns})
+    SELECT a.configid, a.resolutionseconds, a.bucketstart, c.valuecount, {slot_columns}
+    FROM (VALUES %s) AS a (configid, resolutionseconds, bucketstart)
+    CROSS JOIN LATERAL (
+        SELECT COUNT(*) AS valuecount FROM public.mavgvalue v WHERE {bucket_filter}
+    ) c
+    {slot_joins}
+    ON CONFLICT (configid, resolutionseconds, bucketstart)
+    DO UPDATE SET
+        {assignments}
+""".format(
+    columns=", ".join(LOD_COLUMNS),
+    slot_columns=", ".join("{0}_pick.{1}".format(slot, field) for slot in LOD_SLOTS for field in ("id", "tickid", "ticktime", "value")),
+    bucket_filter=LOD_BUCKET_FILTER,
+    slot_joins="\n    ".join(
+        "CROSS JOIN LATERAL (\n"
+        "        SELECT v.id, v.tickid, v.ticktime, v.value FROM public.mavgvalue v\n"
+        "        WHERE {0}\n"
+        "        ORDER BY {1} LIMIT 1\n"
+        "    ) {2}_pick".format(LOD_BUCKET_FILTER, LOD_SLOT_ORDER[slot], slot)
+        for slot in LOD_SLOTS
+    ),
+    assignments=",\n        ".join("{0} = EXCLUDED.{0}".format(column) for column in LOD_COLUMNS[3:]),
+)
+
+
+def recompute_lod_buckets(conn: Any, keys: Iterable[Tuple[int, int, datetime]]) -> None:
+    values = sorted(set(keys))
+    if not values:
+        return
+    with conn.cursor() as cur:
+        psycopg2.extras.execute_values(cur, LOD_RECOMPUTE_SQL, values, page_size=min(500, len(values)))
+
+
+def rebuild_lod(conn: Any, *, configid: int, batch_size: int = 20000) -> int:
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM public.mavglod WHERE configid = %s", (configid,))
+    total = 0
+    with conn.cursor(name="mavg_lod_rebuild_{0}".format(configid), cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+        cur.itersize = batch_size
+        cur.execute(
+            """
+            SELECT id, configid, tickid, ticktime, value
+            FROM public.mavgvalue
+            WHERE configid = %s
+            ORDER BY ticktime ASC, tickid ASC
+            """,
+            (configid,),
         )
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            total += len(rows)
+            upsert_lod_buckets(conn, fold_lod_buckets(dict(row) for row in rows))
+    return total
 
 
 def upsert_state(conn: Any, row: Optional[Dict[str, Any]]) -> None:
@@ -584,6 +770,76 @@ def query_point_rows_after_value_id(
     return [dict(row) for row in cur.fetchall()]
 
 
+def lod_bucket_count(target_points: int) -> int:
+    return max(1, min(MAX_BIGPICTURE_POINTS, target_points) // 4)
+
+
+def lod_resolution_for_range(start_ts: datetime, end_ts: datetime, bucket_count: int) -> Optional[int]:
+    # The coarsest stored resolution that is still at least as fine as the requested buckets.
+    bucket_seconds = max(0.0, (end_ts - start_ts).total_seconds()) / max(1, bucket_count)
+    eligible = [resolution for resolution in MAVG_LOD_RESOLUTIONS if resolution <= bucket_seconds]
+    return eligible[-1] if eligible else None
+
+
+def query_lod_rows(cur: Any, *, page: str, resolution: int, start_ts: datetime, end_ts: datetime) -> List[Dict[str, Any]]:
+    show_column = "showonlive" if page == "live" else "showonbig"
+    cur.execute(
+        """
+        SELECT l.{columns}
+        FROM public.mavglod l
+        JOIN public.mavgconfig c
+          ON c.id = l.configid
+        WHERE c.isenabled = TRUE
+          AND c.{show_column} = TRUE
+          AND l.resolutionseconds = %s
+          AND l.bucketstart > %s
+          AND l.bucketstart <= %s
+        ORDER BY l.configid ASC, l.bucketstart ASC
+        """.format(columns=", l.".join(LOD_COLUMNS), show_column=show_column),
+        (resolution, start_ts - timedelta(seconds=resolution), end_ts),
+    )
+    return [dict(row) for row in cur.fetchall()]
+
+
+def downsample_lod_rows(
+    rows: Iterable[Dict[str, Any]],
+    *,
+    start_ts: datetime,
+    end_ts: datetime,
+    bucket_count: int,
+) -> List[Dict[str, Any]]:
+    span = max(1e-6, (end_ts - start_ts).total_seconds() + 0.000001)
+    merged: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    for row in rows:
+        configid = int(row["configid"])
+        # Place each stored bucket by its midpoint so float edges do not shift it into a neighbour.
+        offset = (_as_utc(row["bucketstart"]) - start_ts).total_seconds() + int(row["resolutionseconds"]) / 2.0
+        bucket = min(bucket_count, max(1, int(offset / span * bucket_count) + 1))
+        source: Dict[str, Any] = {"valuecount": row.get("valuecount")}
+        for slot in LOD_SLOTS:
+            # Edge buckets straddle the window; representatives outside it must not win a slot.
+            ticktime = _as_utc(row[slot + "ticktime"])
+            source[slot] = {
+                "id": row[slot + "valueid"],
+                "configid": configid,
+                "tickid": row[slot + "tickid"],
+                "ticktime": ticktime,
+                "value": row[slot + "value"],
+            } if start_ts <= ticktime <= end_ts else None
+        target = merged.get((configid, bucket))
+        if target is None:
+            merged[(configid, bucket)] = source
+        else:
+            merge_lod_bucket(target, source)
+    points: Dict[int, Dict[str, Any]] = {}
+    for bucket in merged.values():
+        for slot in LOD_SLOTS:
+            point = bucket.get(slot)
+            if point is not None:
+                points[int(point["id"])] = point
+    return sorted(points.values(), key=lambda point: (int(point["configid"]), int(point["tickid"])))
+
+
 def query_point_rows_for_time_range(
     cur: Any,
     *,
@@ -591,9 +847,39 @@ def query_point_rows_for_time_range(
     start_ts: datetime,
     end_ts: datetime,
     target_points: int,
+) -> List[Dict[str, Any]]:
+    start_ts = _as_utc(start_ts)
+    end_ts = _as_utc(end_ts)
+    bucket_count = lod_bucket_count(target_points)
+    resolution = lod_resolution_for_range(start_ts, end_ts, bucket_count)
+    if resolution is not None:
+        # Until the LOD migration is applied the bucketed scan below stays the source of truth.
+        savepoint = not cur.connection.autocommit
+        if savepoint:
+            cur.execute("SAVEPOINT mavg_lod")
+        try:
+            lod_rows = query_lod_rows(cur, page=page, resolution=resolution, start_ts=start_ts, end_ts=end_ts)
+        except psycopg2.errors.UndefinedTable:
+            if savepoint:
+                cur.execute("ROLLBACK TO SAVEPOINT mavg_lod")
+            lod_rows = []
+        else:
+            if savepoint:
+                cur.execute("RELEASE SAVEPOINT mavg_lod")
+        if lod_rows:
+            return downsample_lod_rows(lod_rows, start_ts=start_ts, end_ts=end_ts, bucket_count=bucket_count)
+    return query_raw_point_rows_for_time_range(cur, page=page, start_ts=start_ts, end_ts=end_ts, bucket_count=bucket_count)
+
+
+def query_raw_point_rows_for_time_range(
+    cur: Any,
+    *,
+    page: str,
+    start_ts: datetime,
+    end_ts: datetime,
+    bucket_count: int,
 ) -> List[Dict[str, Any]]:
     show_column = "showonlive" if page == "live" else "showonbig"
-    bucket_count = max(1, min(MAX_BIGPICTURE_POINTS, target_points) // 4)
     cur.execute(
         """
         WITH params AS (
@@ -831,6 +1117,7 @@ def build_jobs_parser() -> argparse.ArgumentParser:
     recent = subparsers.add_parser("backfill-recent", help="Backfill enabled MA configs for a recent lookback window.")
     recent.add_argument("--days", type=float, default=3.0, help="Recent lookback window in broker days.")
     subparsers.add_parser("bootstrap-enabled", help="Seed enabled MA configs with a recent lightweight history.")
+    subparsers.add_parser("rebuild-lod", help="Rebuild the downsampled LOD aggregates from stored MA values.")
     return parser
 
 
@@ -863,4 +1150,12 @@ def jobs_main() -> int:
                 )
             )
             return 0
+        if args.command == "rebuild-lod":
+            configs = load_enabled_configs(conn, page=None)
+            total = 0
+            for config in configs:
+                total += rebuild_lod(conn, configid=config.id)
+                conn.commit()
+            _print("configs={0} values={1} resolutions={2}".format(len(configs), total, ",".join(str(item) for item in MAVG_LOD_RESOLUTIONS)))
+            return 0
     return 1
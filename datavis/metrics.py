@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import math
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[Any], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = ['{0}="{1}"'.format(name, _escape_label(value)) for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append('{0}="{1}"'.format(extra[0], extra[1]))
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class LatencyHistogram:
+    # Log-linear buckets in the HDR style: each power of two is split into a few linear
+    # sub-buckets, so the bucket index comes from frexp() instead of a search.
+    def __init__(self, *, lowest: float = 1e-4, highest: float = 100.0, sub_buckets: int = 4) -> None:
+        self.sub_buckets = max(1, int(sub_buckets))
+        self.min_exponent = math.frexp(lowest)[1]
+        self.max_exponent = math.frexp(highest)[1]
+        self.bounds: List[float] = [math.ldexp(0.5, self.min_exponent)]
+        for exponent in range(self.min_exponent, self.max_exponent + 1):
+            for index in range(1, self.sub_buckets + 1):
+                self.bounds.append(math.ldexp(0.5 + 0.5 * index / self.sub_buckets, exponent))
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._count = 0
+        self._sum = 0.0
+
+    def _index(self, value: float) -> int:
+        if value <= self.bounds[0]:
+            return 0
+        if value > self.bounds[-1]:
+            return len(self.bounds)
+        mantissa, exponent = math.frexp(value)
+        slot = math.ceil((mantissa - 0.5) * 2.0 * self.sub_buckets)
+        return (exponent - self.min_exponent) * self.sub_buckets + slot
+
+    def observe(self, value: float) -> None:
+        index = self._index(max(0.0, float(value)))
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+
+    def observe_ms(self, value_ms: float) -> None:
+        self.observe(float(value_ms) / 1000.0)
+
+    def snapshot(self) -> Tuple[List[int], int, float]:
+        with self._lock:
+            return list(self._counts), self._count, self._sum
+
+    def quantile(self, q: float) -> Optional[float]:
+        counts, count, _ = self.snapshot()
+        if not count:
+            return None
+        rank = max(1, math.ceil(q * count))
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.bounds[index] if index < len(self.bounds) else math.inf
+        return math.inf
+
+
+class MetricFamily:
+    def __init__(self, name: str, help_text: str, kind: str, labelnames: Sequence[str], factory: Callable[[], Any]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def labels(self, *values: Any) -> Any:
+        key = tuple(str(value) for value in values)
+        if len(key) != len(self.labelnames):
+            raise ValueError("{0} expects labels {1}".format(self.name, self.labelnames))
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._factory())
+        return child
+
+    def children(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        with self._lock:
+            return sorted(self._children.items())
+
+    def render(self) -> Iterable[str]:
+        yield "# HELP {0} {1}".format(self.name, self.help_text)
+        yield "# TYPE {0} {1}".format(self.name, self.kind)
+        for values, child in self.children():
+            if self.kind == "counter":
+                yield "{0}_total{1} {2}".format(self.name, _format_labels(self.labelnames, values), _format_value(child.value))
+                continue
+            counts, count, total = child.snapshot()
+            cumulative = 0
+            for bound, bucket_count in zip(child.bounds + [math.inf], counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, values, ("le", _format_value(bound)))
+                yield "{0}_bucket{1} {2}".format(self.name, labels, cumulative)
+            yield "{0}_sum{1} {2}".format(self.name, _format_labels(self.labelnames, values), _format_value(total))
+            yield "{0}_count{1} {2}".format(self.name, _format_labels(self.labelnames, values), count)
+
+
+class GaugeFamily:
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str], collect: Callable[[], Dict[Tuple[str, ...], float]]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._collect = collect
+
+    def render(self) -> Iterable[str]:
+        yield "# HELP {0} {1}".format(self.name, self.help_text)
+        yield "# TYPE {0} gauge".format(self.name)
+        for values, value in sorted(self._collect().items()):
+            yield "{0}{1} {2}".format(self.name, _format_labels(self.labelnames, values), _format_value(float(value)))
+
+
+class MetricsRegistry:
+    def __init__(self, *, prefix: str = "datavis") -> None:
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._families: Dict[str, Any] = {}
+
+    def _register(self, family: Any) -> Any:
+        with self._lock:
+            existing = self._families.get(family.name)
+            if existing is not None:
+                return existing
+            self._families[family.name] = family
+            return family
+
+    def _name(self, name: str) -> str:
+        return "{0}_{1}".format(self.prefix, name) if self.prefix else name
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._register(MetricFamily(self._name(name), help_text, "counter", labelnames, Counter))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (), **bucket_options: Any) -> MetricFamily:
+        return self._register(
+            MetricFamily(self._name(name), help_text, "histogram", labelnames, lambda: LatencyHistogram(**bucket_options))
+        )
+
+    def gauge(self, name: str, help_text: str, collect: Callable[[], Dict[Tuple[str, ...], float]], labelnames: Sequence[str] = ()) -> GaugeFamily:
+        return self._register(GaugeFamily(self._name(name), help_text, labelnames, collect))
+
+    def render(self) -> str:
+        with self._lock:
+            families = [self._families[name] for name in sorted(self._families)]
+        lines: List[str] = []
+        for family in families:
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
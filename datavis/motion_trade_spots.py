@@ -15,7 +15,7 @@ import psycopg2
 import psycopg2.extras
 from dotenv import load_dotenv
 
-from datavis.backbone import describe_days_table
+from datavis.backbone import DAY_REFS, describe_days_table
 from datavis.brokerday import BROKER_TIMEZONE, brokerday_bounds, brokerday_for_timestamp, tick_mid
 BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(BASE_DIR / ".env")
@@ -1641,6 +1641,18 @@ def _dayref_from_row(row: Dict[str, Any], *, descriptor: Any) -> Optional[DayRef
 
 def recent_day_refs(conn: Any, *, symbol: str, last_broker_days: int, anchor_ts: datetime) -> List[DayRef]:
     count = max(1, int(last_broker_days))
+    # Every anchor inside one brokerday selects the same days, so the list is shared until the day turns.
+    anchor_day = brokerday_for_timestamp(anchor_ts)
+    key = ("recent", symbol, anchor_day, count)
+    cached = DAY_REFS.get(key)
+    if cached is not None:
+        return list(cached)
+    refs = _query_recent_day_refs(conn, symbol=symbol, count=count, anchor_ts=anchor_ts)
+    DAY_REFS.put(key, tuple(refs), provisional=not refs or refs[-1].brokerday != anchor_day)
+    return refs
+
+
+def _query_recent_day_refs(conn: Any, *, symbol: str, count: int, anchor_ts: datetime) -> List[DayRef]:
     descriptor = describe_days_table(conn)
     if descriptor is not None:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
@@ -0,0 +1,439 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from datavis.structure import SharedStructureEngine
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MIN_SPEED = 0.1
+MAX_SPEED = 1000.0
+
+# load_chunk(after_tick_id, end_tick_id, limit) -> (tick rows, mavg point rows for those ticks)
+ChunkLoader = Callable[[int, int, int], Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]
+
+
+class ReviewPlaybackError(RuntimeError):
+    def __init__(self, message: str, *, code: str = "REVIEW_ERROR", status_code: int = 400) -> None:
+        super().__init__(message)
+        self.code = code
+        self.status_code = status_code
+
+
+def _to_us(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def _from_us(value: int) -> datetime:
+    return EPOCH + timedelta(microseconds=int(value))
+
+
+def _optional_float(value: Any) -> float:
+    return float(value) if value is not None else math.nan
+
+
+def _restore_float(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def clamp_speed(value: Any) -> float:
+    try:
+        speed = float(value)
+    except (TypeError, ValueError):
+        speed = 1.0
+    return max(MIN_SPEED, min(MAX_SPEED, speed))
+
+
+class ReviewTimeline:
+    # Column arrays keep a few hundred thousand ticks at roughly 50 bytes each instead of a dict per row.
+    def __init__(self, *, symbol: str, max_gap_ms: int, previous_time: Optional[datetime] = None) -> None:
+        self.symbol = symbol
+        self.max_gap_ms = max(1, int(max_gap_ms))
+        self.ids = array("q")
+        self.times_us = array("q")
+        self.bids = array("d")
+        self.asks = array("d")
+        self.mids = array("d")
+        self.spreads = array("d")
+        self.play_ms = array("d")
+        self.mavg_tick_index = array("q")
+        self.mavg_ids = array("q")
+        self.mavg_config_ids = array("q")
+        self.mavg_times_us = array("q")
+        self.mavg_values = array("d")
+        self._previous_us = _to_us(previous_time) if previous_time is not None else None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(self, rows: List[Dict[str, Any]], mavg_rows: List[Dict[str, Any]]) -> None:
+        base_index = len(self.ids)
+        for row in rows:
+            timestamp_us = _to_us(row["timestamp"])
+            gap_ms = 0.0
+            if self._previous_us is not None:
+                gap_ms = min(float(self.max_gap_ms), max(0.0, (timestamp_us - self._previous_us) / 1000.0))
+            self.play_ms.append((self.play_ms[-1] if self.play_ms else 0.0) + gap_ms)
+            self._previous_us = timestamp_us
+            self.ids.append(int(row["id"]))
+            self.times_us.append(timestamp_us)
+            self.bids.append(_optional_float(row.get("bid")))
+            self.asks.append(_optional_float(row.get("ask")))
+            self.mids.append(_optional_float(row.get("mid")))
+            self.spreads.append(_optional_float(row.get("spread")))
+        for mavg_row in sorted(mavg_rows, key=lambda item: (int(item["tickid"]), int(item["id"]))):
+            index = bisect_left(self.ids, int(mavg_row["tickid"]), base_index)
+            if index >= len(self.ids) or self.ids[index] != int(mavg_row["tickid"]):
+                continue
+            self.mavg_tick_index.append(index)
+            self.mavg_ids.append(int(mavg_row["id"]))
+            self.mavg_config_ids.append(int(mavg_row["configid"]))
+            self.mavg_times_us.append(_to_us(mavg_row["ticktime"]) if mavg_row.get("ticktime") is not None else 0)
+            self.mavg_values.append(float(mavg_row["value"]))
+
+    def row(self, index: int) -> Dict[str, Any]:
+        return {
+            "id": self.ids[index],
+            "symbol": self.symbol,
+            "timestamp": _from_us(self.times_us[index]),
+            "bid": _restore_float(self.bids[index]),
+            "ask": _restore_float(self.asks[index]),
+            "mid": _restore_float(self.mids[index]),
+            "spread": _restore_float(self.spreads[index]),
+        }
+
+    def rows(self, start: int, end: int) -> List[Dict[str, Any]]:
+        return [self.row(index) for index in range(max(0, start), min(end, len(self.ids)))]
+
+    def mavg_rows(self, start: int, end: int) -> List[Dict[str, Any]]:
+        first = bisect_left(self.mavg_tick_index, start)
+        last = bisect_left(self.mavg_tick_index, end)
+        return [
+            {
+                "id": self.mavg_ids[index],
+                "configid": self.mavg_config_ids[index],
+                "tickid": self.ids[self.mavg_tick_index[index]],
+                "ticktime": _from_us(self.mavg_times_us[index]) if self.mavg_times_us[index] else None,
+                "value": self.mavg_values[index],
+            }
+            for index in range(first, last)
+        ]
+
+
+@dataclass
+class ReviewSubscriber:
+    cursor: int = 0
+    epoch: int = 0
+
+
+@dataclass
+class ReviewFrame:
+    kind: str
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    mavg_rows: List[Dict[str, Any]] = field(default_factory=list)
+    structure: Dict[str, List[Dict[str, Any]]] = field(default_factory=lambda: {"bars": [], "rangeBoxes": [], "events": []})
+    last_id: int = 0
+    complete: bool = False
+
+
+class ReviewPlaybackSession:
+    def __init__(
+        self,
+        *,
+        session_id: str,
+        symbol: str,
+        after_id: int,
+        end_id: int,
+        seed_rows: List[Dict[str, Any]],
+        load_chunk: ChunkLoader,
+        on_tick: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        retain_ticks: int,
+        chunk_size: int,
+        max_gap_ms: int,
+        speed: float = 1.0,
+    ) -> None:
+        self.session_id = session_id
+        self.after_id = int(after_id)
+        self.end_id = int(end_id)
+        self.retain_ticks = max(1, int(retain_ticks))
+        self.chunk_size = max(1, int(chunk_size))
+        self._load_chunk = load_chunk
+        self._on_tick = on_tick
+        self._cond = threading.Condition(threading.RLock())
+        self._seed_rows = list(seed_rows[-self.retain_ticks:])
+        self._timeline = ReviewTimeline(
+            symbol=symbol,
+            max_gap_ms=max_gap_ms,
+            previous_time=self._seed_rows[-1]["timestamp"] if self._seed_rows else None,
+        )
+        self._exhausted = False
+        self._loading = False
+        self._structure = SharedStructureEngine(symbol, retain_ticks=self.retain_ticks)
+        self._structure.reset(self._seed_rows)
+        self._engine_index = 0
+        self._epoch = 0
+        self._speed = clamp_speed(speed)
+        self._paused = False
+        self._idle_paused = False
+        self._anchor_play_ms = 0.0
+        self._anchor_monotonic = time.monotonic()
+        self._subscribers = 0
+        self.idle_since = time.monotonic()
+        self._ensure_loaded(lambda: not len(self._timeline), wait=True)
+
+    def _play_ms_locked(self, now: float) -> float:
+        if self._paused:
+            return self._anchor_play_ms
+        return self._anchor_play_ms + (now - self._anchor_monotonic) * 1000.0 * self._speed
+
+    def _reanchor_locked(self, play_ms: float, now: float) -> None:
+        self._anchor_play_ms = play_ms
+        self._anchor_monotonic = now
+
+    def _due_index_locked(self, now: float) -> int:
+        return bisect_right(self._timeline.play_ms, self._play_ms_locked(now))
+
+    def _prefetch_due_locked(self) -> bool:
+        return self._due_index_locked(time.monotonic()) + max(1, self.chunk_size // 4) >= len(self._timeline)
+
+    def _ensure_loaded(self, needs_more: Callable[[], bool], *, wait: bool) -> None:
+        # The chunk query runs outside _cond so frames and controls keep flowing; one loader at a time swaps rows in.
+        while True:
+            with self._cond:
+                while self._loading:
+                    if not wait:
+                        return
+                    self._cond.wait()
+                if self._exhausted or not needs_more():
+                    return
+                loaded_through = self._timeline.ids[-1] if len(self._timeline) else self.after_id
+                if loaded_through >= self.end_id:
+                    self._exhausted = True
+                    return
+                self._loading = True
+            try:
+                rows, mavg_rows = self._load_chunk(loaded_through, self.end_id, self.chunk_size)
+            except BaseException:
+                with self._cond:
+                    self._loading = False
+                    self._cond.notify_all()
+                raise
+            with self._cond:
+                self._loading = False
+                if rows:
+                    self._timeline.append(rows, mavg_rows)
+                if len(rows) < self.chunk_size or int(rows[-1]["id"]) >= self.end_id:
+                    self._exhausted = True
+                self._cond.notify_all()
+
+    def _advance_locked(self, target: int) -> None:
+        if target == self._engine_index:
+            return
+        if self._on_tick is not None:
+            # Paper-trade state follows every tick played through, including ones a forward seek skips over.
+            for index in range(self._engine_index, target):
+                self._on_tick(self._timeline.row(index))
+        if target < self._engine_index or target - self._engine_index > self.retain_ticks:
+            start = max(0, target - self.retain_ticks)
+            seed = self._seed_rows[-max(0, self.retain_ticks - target):] if target < self.retain_ticks else []
+            self._structure.reset(seed + self._timeline.rows(start, target))
+        else:
+            self._structure.advance(self._timeline.rows(self._engine_index, target))
+        self._engine_index = target
+
+    def join(self, *, after_id: Optional[int] = None) -> ReviewSubscriber:
+        with self._cond:
+            cursor = self._engine_index
+            if after_id is not None:
+                cursor = min(cursor, bisect_right(self._timeline.ids, int(after_id)))
+            self._subscribers += 1
+            if self._subscribers == 1 and self._idle_paused:
+                self._idle_paused = False
+                self._paused = False
+                self._reanchor_locked(self._anchor_play_ms, time.monotonic())
+            return ReviewSubscriber(cursor=cursor, epoch=self._epoch)
+
+    def leave(self) -> None:
+        with self._cond:
+            self._subscribers = max(0, self._subscribers - 1)
+            if self._subscribers == 0:
+                now = time.monotonic()
+                self._reanchor_locked(self._play_ms_locked(now), now)
+                self._idle_paused = not self._paused
+                self._paused = True
+                self.idle_since = now
+            self._cond.notify_all()
+
+    @property
+    def subscribers(self) -> int:
+        with self._cond:
+            return self._subscribers
+
+    def set_speed(self, speed: Any) -> None:
+        with self._cond:
+            now = time.monotonic()
+            self._reanchor_locked(self._play_ms_locked(now), now)
+            self._speed = clamp_speed(speed)
+            self._cond.notify_all()
+
+    def pause(self) -> None:
+        with self._cond:
+            now = time.monotonic()
+            self._reanchor_locked(self._play_ms_locked(now), now)
+            self._paused = True
+            self._idle_paused = False
+            self._cond.notify_all()
+
+    def resume(self) -> None:
+        with self._cond:
+            self._reanchor_locked(self._play_ms_locked(time.monotonic()), time.monotonic())
+            self._paused = False
+            self._idle_paused = False
+            self._cond.notify_all()
+
+    def seek(self, tick_id: int) -> None:
+        target_id = max(self.after_id, min(int(tick_id), self.end_id))
+        self._ensure_loaded(lambda: not len(self._timeline) or self._timeline.ids[-1] < target_id, wait=True)
+        with self._cond:
+            index = bisect_right(self._timeline.ids, target_id)
+            play_ms = self._timeline.play_ms[index - 1] if index > 0 else 0.0
+            self._reanchor_locked(play_ms, time.monotonic())
+            self._advance_locked(index)
+            self._epoch += 1
+            self._cond.notify_all()
+
+    @property
+    def finished(self) -> bool:
+        with self._cond:
+            return self._exhausted and self._engine_index >= len(self._timeline)
+
+    def state(self) -> Dict[str, Any]:
+        with self._cond:
+            position = self._engine_index
+            return {
+                "sessionId": self.session_id,
+                "afterId": self.after_id,
+                "endId": self.end_id,
+                "positionId": self._timeline.ids[position - 1] if position > 0 else self.after_id,
+                "loadedThroughId": self._timeline.ids[-1] if len(self._timeline) else self.after_id,
+                "loadedTicks": len(self._timeline),
+                "speed": self._speed,
+                "paused": self._paused,
+                "subscribers": self._subscribers,
+                "complete": self._exhausted and position >= len(self._timeline),
+            }
+
+    def next_frame(self, subscriber: ReviewSubscriber, *, timeout: float, min_interval: float) -> Optional[ReviewFrame]:
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            self._ensure_loaded(self._prefetch_due_locked, wait=False)
+            with self._cond:
+                now = time.monotonic()
+                self._advance_locked(self._due_index_locked(now))
+                position = self._engine_index
+                if subscriber.epoch != self._epoch or position - subscriber.cursor > self.retain_ticks:
+                    return self._reset_frame_locked(subscriber)
+                if position > subscriber.cursor:
+                    return self._delta_frame_locked(subscriber)
+                if self._exhausted and position >= len(self._timeline):
+                    return ReviewFrame(kind="complete", last_id=self._position_id_locked(), complete=True)
+                remaining = deadline - now
+                if remaining <= 0:
+                    return None
+                wait = remaining
+                if not self._paused and position < len(self._timeline):
+                    due_in = (self._timeline.play_ms[position] - self._play_ms_locked(now)) / self._speed / 1000.0
+                    wait = min(remaining, max(min_interval, due_in))
+                self._cond.wait(wait)
+
+    def _position_id_locked(self) -> int:
+        return self._timeline.ids[self._engine_index - 1] if self._engine_index > 0 else self.after_id
+
+    def _delta_frame_locked(self, subscriber: ReviewSubscriber) -> ReviewFrame:
+        start = subscriber.cursor
+        end = self._engine_index
+        previous_id = self._timeline.ids[start - 1] if start > 0 else self.after_id
+        last_id = self._timeline.ids[end - 1]
+        structure = self._structure.updates_after(previous_id, through_tick_id=last_id)
+        if structure is None:
+            return self._reset_frame_locked(subscriber)
+        subscriber.cursor = end
+        return ReviewFrame(
+            kind="delta",
+            rows=self._timeline.rows(start, end),
+            mavg_rows=self._timeline.mavg_rows(start, end),
+            structure=structure,
+            last_id=last_id,
+            complete=self._exhausted and end >= len(self._timeline),
+        )
+
+    def _reset_frame_locked(self, subscriber: ReviewSubscriber) -> ReviewFrame:
+        end = self._engine_index
+        start = max(0, end - self.retain_ticks)
+        rows = self._timeline.rows(start, end)
+        snapshot = self._structure.snapshot(start_tick_id=rows[0]["id"] if rows else None) or {}
+        subscriber.cursor = end
+        subscriber.epoch = self._epoch
+        return ReviewFrame(
+            kind="seek",
+            rows=rows,
+            mavg_rows=self._timeline.mavg_rows(start, end),
+            structure={
+                "bars": snapshot.get("structureBars", []),
+                "rangeBoxes": snapshot.get("rangeBoxes", []),
+                "events": snapshot.get("structureEvents", []),
+            },
+            last_id=self._position_id_locked(),
+            complete=self._exhausted and end >= len(self._timeline),
+        )
+
+
+class ReviewPlaybackRegistry:
+    def __init__(self, *, idle_seconds: float) -> None:
+        self.idle_seconds = max(0.0, float(idle_seconds))
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, ReviewPlaybackSession] = {}
+
+    def get(self, session_id: str) -> ReviewPlaybackSession:
+        with self._lock:
+            self._evict_idle_locked()
+            session = self._sessions.get(session_id)
+        if session is None:
+            raise ReviewPlaybackError("Review session was not found.", code="REVIEW_SESSION_NOT_FOUND", status_code=404)
+        return session
+
+    def get_or_create(self, session_id: str, factory: Callable[[], ReviewPlaybackSession]) -> Tuple[ReviewPlaybackSession, bool]:
+        with self._lock:
+            self._evict_idle_locked()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                return session, False
+        created = factory()
+        with self._lock:
+            session = self._sessions.setdefault(session_id, created)
+        return session, session is created
+
+    def discard(self, session_id: str, session: ReviewPlaybackSession) -> None:
+        with self._lock:
+            if self._sessions.get(session_id) is session:
+                del self._sessions[session_id]
+
+    def sessions(self) -> List[ReviewPlaybackSession]:
+        with self._lock:
+            self._evict_idle_locked()
+            return list(self._sessions.values())
+
+    def _evict_idle_locked(self) -> None:
+        now = time.monotonic()
+        for session_id, session in list(self._sessions.items()):
+            if session.subscribers == 0 and now - session.idle_since >= self.idle_seconds:
+                del self._sessions[session_id]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+@dataclass
+class _ServiceEntry:
+    name: str
+    factory: Callable[[], Any]
+    stop: Optional[Callable[[Any], None]] = None
+    lock: threading.RLock = field(default_factory=threading.RLock)
+    instance: Any = None
+    ready: bool = False
+    elapsed_ms: Optional[float] = None
+
+
+class ServiceRegistry:
+    def __init__(self, *, logger: Optional[logging.Logger] = None) -> None:
+        self._logger = logger or logging.getLogger("datavis.services")
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _ServiceEntry] = {}
+        self._order: List[str] = []
+        self._phases: Dict[str, float] = {}
+
+    def register(self, name: str, factory: Callable[[], Any], *, stop: Optional[Callable[[Any], None]] = None) -> None:
+        with self._lock:
+            self._entries[name] = _ServiceEntry(name=name, factory=factory, stop=stop)
+
+    def get(self, name: str) -> Any:
+        entry = self._entries[name]
+        if entry.ready:
+            return entry.instance
+        # Per-service re-entrant locks let one factory resolve another without a global lock.
+        with entry.lock:
+            if not entry.ready:
+                started = time.perf_counter()
+                entry.instance = entry.factory()
+                entry.elapsed_ms = round((time.perf_counter() - started) * 1000.0, 2)
+                entry.ready = True
+                with self._lock:
+                    self._order.append(name)
+                self._logger.info("service_ready name=%s elapsed_ms=%.2f", name, entry.elapsed_ms)
+        return entry.instance
+
+    def started(self, name: str) -> bool:
+        entry = self._entries.get(name)
+        return bool(entry and entry.ready)
+
+    def warm(self, names: Iterable[str]) -> threading.Thread:
+        pending = [name for name in names if name in self._entries]
+
+        def run() -> None:
+            for name in pending:
+                try:
+                    self.get(name)
+                except Exception:
+                    self._logger.exception("service_warm_failed name=%s", name)
+
+        thread = threading.Thread(target=run, name="datavis-service-warm", daemon=True)
+        thread.start()
+        return thread
+
+    def stop_all(self) -> None:
+        with self._lock:
+            order = list(reversed(self._order))
+        for name in order:
+            entry = self._entries[name]
+            if entry.stop is None:
+                continue
+            try:
+                entry.stop(entry.instance)
+            except Exception:
+                self._logger.exception("service_stop_failed name=%s", name)
+
+    def record_phase(self, name: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self._phases[name] = round(float(elapsed_ms), 2)
+        self._logger.info("startup_phase name=%s elapsed_ms=%.2f", name, elapsed_ms)
+
+    def timings(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            phases = dict(self._phases)
+            services = {name: entry.elapsed_ms for name, entry in self._entries.items() if entry.elapsed_ms is not None}
+        return {"phases": phases, "services": services}
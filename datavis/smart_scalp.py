@@ -181,6 +181,7 @@ class SmartScalpService:
         place_market_order: Callable[..., Dict[str, Any]],
         close_position: Callable[..., Dict[str, Any]],
         smart_lot_size: float = 0.01,
+        evaluation_observer: Optional[Callable[[float], None]] = None,
     ):
         self._symbol = symbol
         self._logger = logging.getLogger("datavis.smart_scalp")
@@ -191,6 +192,7 @@ class SmartScalpService:
         self._fetch_broker_status = fetch_broker_status
         self._place_market_order = place_market_order
         self._close_position = close_position
+        self._evaluation_observer = evaluation_observer
         self._smart_lot_size = 0.01
         self._lock = threading.RLock()
         self._stop_event = threading.Event()
@@ -477,6 +479,16 @@ class SmartScalpService:
             self._apply_close_preference_locked()
             return self.snapshot_state()
 
+    def progress(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "lastTickId": int(self._state.get("lastTickId") or 0),
+                "lastTickTimestampMs": self._state.get("lastTickTimestampMs"),
+                "active": bool(self._any_entry_armed_locked() or self._close_enabled_locked()),
+                "backendState": self._state.get("backendState"),
+                "lastPollAtMs": (self._state.get("workerMetrics") or {}).get("lastPollAtMs"),
+            }
+
     def snapshot_state(self) -> Dict[str, Any]:
         with self._lock:
             self._sync_public_state_locked()
@@ -604,6 +616,8 @@ class SmartScalpService:
             3,
         )
         metrics["lastEvaluationMs"] = round(float(elapsed_ms), 3)
+        if self._evaluation_observer is not None:
+            self._evaluation_observer(float(elapsed_ms))
         now_ms = _now_ms()
         if elapsed_ms >= self._slow_eval_ms:
             metrics["slowEvaluationCount"] = int(metrics.get("slowEvaluationCount") or 0) + 1
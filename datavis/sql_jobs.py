@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import json
+import re
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import psycopg2
+
+
+PAGE_INDEX_ROWS = 1000
+EXPLAIN_HEADS = {"SELECT", "WITH", "INSERT", "UPDATE", "DELETE"}
+SERVER_CURSOR_HEADS = {"SELECT", "WITH", "VALUES", "TABLE"}
+# DECLARE rejects SELECT INTO and data-modifying WITH queries; anything that may be one stays client-side.
+SERVER_CURSOR_UNSAFE = re.compile(r"\b(?:INSERT|UPDATE|DELETE|MERGE|INTO)\b", re.IGNORECASE)
+SEQ_SCAN_NODES = {"Seq Scan", "Parallel Seq Scan"}
+TERMINAL_STATUSES = {"done", "failed", "cancelled"}
+
+
+class SqlJobError(RuntimeError):
+    def __init__(self, message: str, *, code: str = "SQL_JOB_ERROR", status_code: int = 400) -> None:
+        super().__init__(message)
+        self.code = code
+        self.status_code = status_code
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+@dataclass
+class SqlJobResult:
+    index: int
+    statement: str
+    statement_type: str
+    command_tag: Optional[str] = None
+    columns: List[Dict[str, Any]] = field(default_factory=list)
+    has_result_set: bool = False
+    row_count: int = 0
+    truncated: bool = False
+    elapsed_ms: float = 0.0
+    spill_path: Optional[Path] = None
+    offsets: List[int] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "statement": self.statement,
+            "statementType": self.statement_type,
+            "commandTag": self.command_tag or self.statement_type,
+            "columns": self.columns,
+            "hasResultSet": self.has_result_set,
+            "rowCount": self.row_count,
+            "truncated": self.truncated,
+            "elapsedMs": self.elapsed_ms,
+        }
+
+
+@dataclass
+class SqlJob:
+    job_id: str
+    statements: List[str]
+    statement_types: List[str]
+    warnings: List[Dict[str, Any]] = field(default_factory=list)
+    status: str = "queued"
+    created_at_ms: int = field(default_factory=_now_ms)
+    started_at_ms: Optional[int] = None
+    finished_at_ms: Optional[int] = None
+    backend_pid: Optional[int] = None
+    current_index: Optional[int] = None
+    rows_fetched: int = 0
+    cancel_requested: bool = False
+    error: Optional[Dict[str, Any]] = None
+    results: List[SqlJobResult] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        finished = self.finished_at_ms or _now_ms()
+        return {
+            "jobId": self.job_id,
+            "status": self.status,
+            "statementCount": len(self.statements),
+            "currentIndex": self.current_index,
+            "rowsFetched": self.rows_fetched,
+            "createdAtMs": self.created_at_ms,
+            "startedAtMs": self.started_at_ms,
+            "finishedAtMs": self.finished_at_ms,
+            "elapsedMs": (finished - self.started_at_ms) if self.started_at_ms else 0,
+            "cancelRequested": self.cancel_requested,
+            "warnings": self.warnings,
+            "error": self.error,
+            "results": [result.summary() for result in self.results],
+        }
+
+
+def describe_columns(description: Any) -> List[Dict[str, Any]]:
+    return [{"name": item.name, "typeCode": item.type_code} for item in description or []]
+
+
+def uses_server_cursor(statement: str, head: str) -> bool:
+    return head.upper() in SERVER_CURSOR_HEADS and SERVER_CURSOR_UNSAFE.search(statement) is None
+
+
+def plan_warnings(plan: Any, *, statement_index: int, cost_warn: float, ticks_table: str = "ticks") -> List[Dict[str, Any]]:
+    warnings: List[Dict[str, Any]] = []
+    root = plan[0]["Plan"] if isinstance(plan, list) and plan else (plan or {}).get("Plan", {})
+    total_cost = float(root.get("Total Cost") or 0.0)
+    if total_cost >= cost_warn:
+        warnings.append(
+            {
+                "statementIndex": statement_index,
+                "code": "HIGH_COST",
+                "message": "Planner estimates cost {0:,.0f}, above the {1:,.0f} warning threshold.".format(total_cost, cost_warn),
+                "totalCost": total_cost,
+            }
+        )
+    pending = [root]
+    while pending:
+        node = pending.pop()
+        pending.extend(node.get("Plans") or [])
+        if node.get("Node Type") in SEQ_SCAN_NODES and node.get("Relation Name") == ticks_table and node.get("Schema", "public") == "public":
+            warnings.append(
+                {
+                    "statementIndex": statement_index,
+                    "code": "TICKS_SEQ_SCAN",
+                    "message": "Sequential scan of public.{0} (~{1:,} rows estimated).".format(ticks_table, int(node.get("Plan Rows") or 0)),
+                    "planRows": int(node.get("Plan Rows") or 0),
+                }
+            )
+    return warnings
+
+
+class SqlJobManager:
+    def __init__(
+        self,
+        *,
+        connect: Callable[[], Any],
+        spill_dir: Path,
+        statement_timeout_ms: int,
+        lock_timeout_ms: int,
+        max_result_rows: int,
+        cost_warn: float,
+        serialize_value: Callable[[Any], Any],
+        serialize_error: Callable[[Exception, Optional[str]], Dict[str, Any]],
+        preflight_timeout_ms: int = 5000,
+        max_workers: int = 2,
+        max_jobs: int = 50,
+        fetch_batch: int = 2000,
+    ) -> None:
+        self._connect = connect
+        self.spill_dir = spill_dir
+        self.statement_timeout_ms = statement_timeout_ms
+        self.lock_timeout_ms = lock_timeout_ms
+        self.max_result_rows = max(1, int(max_result_rows))
+        self.cost_warn = float(cost_warn)
+        self.preflight_timeout_ms = preflight_timeout_ms
+        self._serialize_value = serialize_value
+        self._serialize_error = serialize_error
+        self.max_jobs = max(1, int(max_jobs))
+        self.fetch_batch = max(1, int(fetch_batch))
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix="datavis-sql-job")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, SqlJob] = {}
+
+    def preflight(self, statements: List[str], statement_types: List[str]) -> List[Dict[str, Any]]:
+        warnings: List[Dict[str, Any]] = []
+        conn = self._connect()
+        try:
+            conn.set_session(readonly=True, autocommit=False)
+            with conn.cursor() as cur:
+                cur.execute("SET LOCAL statement_timeout = %s", (self.preflight_timeout_ms,))
+                for index, (statement, head) in enumerate(zip(statements, statement_types), start=1):
+                    if head not in EXPLAIN_HEADS:
+                        continue
+                    try:
+                        cur.execute("SAVEPOINT sql_job_preflight")
+                        cur.execute("EXPLAIN (FORMAT JSON) " + statement)
+                        plan = cur.fetchone()[0]
+                        cur.execute("RELEASE SAVEPOINT sql_job_preflight")
+                    except psycopg2.Error:
+                        # Scripts that depend on their own earlier DDL cannot be planned up front.
+                        cur.execute("ROLLBACK TO SAVEPOINT sql_job_preflight")
+                        continue
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    warnings.extend(plan_warnings(plan, statement_index=index, cost_warn=self.cost_warn))
+            conn.rollback()
+        finally:
+            conn.close()
+        return warnings
+
+    def submit(self, statements: List[str], statement_types: List[str], *, warnings: Iterable[Dict[str, Any]] = ()) -> SqlJob:
+        job = SqlJob(
+            job_id=secrets.token_hex(8),
+            statements=list(statements),
+            statement_types=list(statement_types),
+            warnings=list(warnings),
+        )
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._evict_locked()
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> SqlJob:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise SqlJobError("SQL job not found.", code="SQL_JOB_NOT_FOUND", status_code=404)
+        return job
+
+    def summary(self, job_id: str) -> Dict[str, Any]:
+        job = self.get(job_id)
+        with self._lock:
+            return job.summary()
+
+    def cancel(self, job_id: str) -> Dict[str, Any]:
+        job = self.get(job_id)
+        with self._lock:
+            if job.status in TERMINAL_STATUSES:
+                return job.summary()
+            job.cancel_requested = True
+            backend_pid = job.backend_pid if job.status == "running" else None
+        if backend_pid is not None:
+            conn = self._connect()
+            try:
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute("SELECT pg_cancel_backend(%s)", (backend_pid,))
+            finally:
+                conn.close()
+        return self.summary(job_id)
+
+    def page(self, job_id: str, result_index: int, *, offset: int, limit: int) -> Dict[str, Any]:
+        job = self.get(job_id)
+        with self._lock:
+            result = next((item for item in job.results if item.index == result_index), None)
+            if result is None:
+                raise SqlJobError("SQL job result not found.", code="SQL_JOB_RESULT_NOT_FOUND", status_code=404)
+            summary = result.summary()
+            spill_path = result.spill_path
+            offsets = list(result.offsets)
+            row_count = result.row_count
+        offset = max(0, int(offset))
+        limit = max(1, int(limit))
+        rows: List[Any] = []
+        if spill_path is not None and offset < row_count and spill_path.exists():
+            with spill_path.open("r", encoding="utf-8") as handle:
+                block = offset // PAGE_INDEX_ROWS
+                handle.seek(offsets[block])
+                skip = offset - block * PAGE_INDEX_ROWS
+                for line in handle:
+                    if skip:
+                        skip -= 1
+                        continue
+                    rows.append(json.loads(line))
+                    if len(rows) >= limit or offset + len(rows) >= row_count:
+                        break
+        return {**summary, "maxRows": self.max_result_rows, "offset": offset, "limit": limit, "rows": rows}
+
+    def shutdown(self) -> None:
+        with self._lock:
+            active = [job.job_id for job in self._jobs.values() if job.status not in TERMINAL_STATUSES]
+        for job_id in active:
+            try:
+                self.cancel(job_id)
+            except Exception:
+                pass
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _evict_locked(self) -> None:
+        finished = [job for job in self._jobs.values() if job.status in TERMINAL_STATUSES]
+        finished.sort(key=lambda job: job.finished_at_ms or 0)
+        while len(self._jobs) > self.max_jobs and finished:
+            job = finished.pop(0)
+            self._jobs.pop(job.job_id, None)
+            self._remove_spills(job)
+
+    def _remove_spills(self, job: SqlJob) -> None:
+        for result in job.results:
+            if result.spill_path is not None:
+                try:
+                    result.spill_path.unlink()
+                except OSError:
+                    pass
+
+    def _finish(self, job: SqlJob, status: str, error: Optional[Dict[str, Any]] = None) -> None:
+        with self._lock:
+            job.status = status
+            job.error = error
+            job.current_index = None
+            job.finished_at_ms = _now_ms()
+            self._evict_locked()
+
+    def _run(self, job: SqlJob) -> None:
+        with self._lock:
+            if job.cancel_requested:
+                job.status = "cancelled"
+                job.finished_at_ms = _now_ms()
+                return
+            job.status = "running"
+            job.started_at_ms = _now_ms()
+        active_statement: Optional[str] = None
+        try:
+            conn = self._connect()
+        except Exception as exc:
+            self._finish(job, "failed", self._serialize_error(exc, None))
+            return
+        try:
+            conn.autocommit = False
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_backend_pid()")
+                with self._lock:
+                    job.backend_pid = int(cur.fetchone()[0])
+                cur.execute("SET LOCAL statement_timeout = %s", (self.statement_timeout_ms,))
+                cur.execute("SET LOCAL lock_timeout = %s", (self.lock_timeout_ms,))
+                for index, (statement, head) in enumerate(zip(job.statements, job.statement_types), start=1):
+                    active_statement = statement
+                    with self._lock:
+                        job.current_index = index
+                    self._run_statement(cur, job, index, statement, head)
+            conn.commit()
+            self._finish(job, "done")
+        except Exception as exc:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            with self._lock:
+                cancelled = job.cancel_requested and isinstance(exc, psycopg2.extensions.QueryCanceledError)
+            self._finish(job, "cancelled" if cancelled else "failed", self._serialize_error(exc, active_statement))
+        finally:
+            conn.close()
+
+    def _check_cancel(self, job: SqlJob) -> None:
+        # pg_cancel_backend only interrupts a running statement, so also stop between statements and batches.
+        with self._lock:
+            if job.cancel_requested:
+                raise psycopg2.extensions.QueryCanceledError("canceling statement due to user request")
+
+    def _run_statement(self, cur: Any, job: SqlJob, index: int, statement: str, head: str) -> None:
+        self._check_cancel(job)
+        started = time.perf_counter()
+        result = SqlJobResult(index=index, statement=statement, statement_type=head)
+        with self._lock:
+            job.results.append(result)
+        if uses_server_cursor(statement, head):
+            # Queries stream through a named cursor so only one fetch batch is held in memory.
+            with cur.connection.cursor(name="sql_job_{0}_{1}".format(job.job_id, index)) as named:
+                named.itersize = self.fetch_batch
+                named.execute(statement)
+                self._spill_rows(named, job, index, result)
+            result.command_tag = "SELECT {0}".format(result.row_count)
+        else:
+            cur.execute(statement)
+            result.command_tag = getattr(cur, "statusmessage", None)
+            if cur.description is None:
+                result.row_count = max(0, cur.rowcount)
+            else:
+                self._spill_rows(cur, job, index, result)
+        result.elapsed_ms = round((time.perf_counter() - started) * 1000.0, 3)
+
+    def _spill_rows(self, cur: Any, job: SqlJob, index: int, result: SqlJobResult) -> None:
+        result.has_result_set = True
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        spill_path = self.spill_dir / "{0}_{1}.jsonl".format(job.job_id, index)
+        offsets: List[int] = []
+        row_count = 0
+        with spill_path.open("w", encoding="utf-8") as handle:
+            while row_count < self.max_result_rows:
+                self._check_cancel(job)
+                batch = cur.fetchmany(min(self.fetch_batch, self.max_result_rows - row_count))
+                if not result.columns:
+                    # Named cursors only describe their columns after the first FETCH.
+                    result.columns = describe_columns(cur.description)
+                if not batch:
+                    break
+                for row in batch:
+                    if row_count % PAGE_INDEX_ROWS == 0:
+                        offsets.append(handle.tell())
+                    handle.write(json.dumps([self._serialize_value(value) for value in row]))
+                    handle.write("\n")
+                    row_count += 1
+                with self._lock:
+                    job.rows_fetched += len(batch)
+                    result.row_count = row_count
+            result.truncated = row_count >= self.max_result_rows and cur.fetchone() is not None
+        with self._lock:
+            result.spill_path = spill_path
+            result.offsets = offsets
+            result.row_count = row_count
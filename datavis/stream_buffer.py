@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from datavis.live_hub import LiveChannel, _merge_by_id
+
+
+SseEvent = Tuple[Dict[str, Any], Optional[str]]
+
+SSE_CHANNELS: Dict[str, LiveChannel] = {
+    "live": LiveChannel(
+        "live",
+        append_keys=("rows", "structureEvents", "mavgPoints"),
+        merge_keys=("structureBarUpdates", "rangeBoxUpdates"),
+    ),
+    "backbone": LiveChannel("backbone", append_keys=("rows",), merge_keys=("pivotUpdates", "moveUpdates")),
+}
+COUNT_KEYS = {"rows": "rowCount", "pivotUpdates": "pivotCount", "moveUpdates": "moveCount"}
+MERGEABLE_MODES = frozenset({"delta", "catchup"})
+
+
+@dataclass
+class _PendingEvent:
+    payload: Dict[str, Any]
+    event_name: Optional[str]
+    data: bytes
+    enqueued_at: float
+    merged: int = 1
+
+
+class SseClientBuffer:
+    """Per-client SSE queue that folds pending deltas once the client stops draining it."""
+
+    def __init__(
+        self,
+        *,
+        client_id: str,
+        stream_name: str,
+        channel: LiveChannel,
+        encode: Callable[[Dict[str, Any], Optional[str]], bytes],
+        coalesce_bytes: int,
+        resync_bytes: int,
+        max_items: int,
+        notify: Optional[Callable[[], None]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.client_id = client_id
+        self.stream_name = stream_name
+        self.channel = channel
+        self.coalesce_bytes = max(1, int(coalesce_bytes))
+        self.resync_bytes = max(self.coalesce_bytes, int(resync_bytes))
+        self.max_items = max(1, int(max_items))
+        self.coalesced = 0
+        self.resyncs = 0
+        self.sent_bytes = 0
+        self._encode = encode
+        self._notify = notify
+        self._logger = logger or logging.getLogger("datavis.stream")
+        self._lock = threading.Lock()
+        self._pending: Deque[_PendingEvent] = deque()
+        self._pending_bytes = 0
+        self._resync_pending = False
+        self._closed = False
+        self._finished = False
+
+    def offer(self, payload: Dict[str, Any], *, event_name: Optional[str] = None) -> bool:
+        with self._lock:
+            if self._closed or self._resync_pending:
+                return False
+            if event_name == "heartbeat" and self._pending:
+                # Queued data already tells the client the stream is alive.
+                return True
+            data = self._encode(payload, event_name)
+            self._pending.append(_PendingEvent(payload, event_name, data, time.monotonic()))
+            self._pending_bytes += len(data)
+            if self._pending_bytes > self.coalesce_bytes:
+                self._coalesce_locked()
+            if self._pending_bytes > self.resync_bytes or any(self._item_count(event.payload) > self.max_items for event in self._pending):
+                self._resync_locked()
+            accepted = not self._resync_pending
+        self._wake()
+        return accepted
+
+    def take(self) -> Optional[bytes]:
+        with self._lock:
+            if not self._pending:
+                return None
+            event = self._pending.popleft()
+            self._pending_bytes -= len(event.data)
+            self.sent_bytes += len(event.data)
+            if self._resync_pending and not self._pending:
+                self._closed = True
+            return event.data
+
+    def pump(self, events: Iterable[SseEvent]) -> None:
+        iterator: Iterator[SseEvent] = iter(events)
+        try:
+            for payload, event_name in iterator:
+                if not self.offer(payload, event_name=event_name):
+                    break
+        except Exception:
+            self._logger.exception("sse_producer_failed stream=%s client=%s", self.stream_name, self.client_id)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+            with self._lock:
+                self._finished = True
+            self._wake()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+            self._pending_bytes = 0
+
+    @property
+    def finished(self) -> bool:
+        with self._lock:
+            return self._finished and not self._pending
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            oldest = self._pending[0].enqueued_at if self._pending else None
+            return {
+                "bufferedBytes": float(self._pending_bytes),
+                "pendingEvents": float(len(self._pending)),
+                "lagSeconds": max(0.0, time.monotonic() - oldest) if oldest is not None else 0.0,
+            }
+
+    def _wake(self) -> None:
+        if self._notify is None:
+            return
+        try:
+            self._notify()
+        except RuntimeError:
+            # The event loop is gone once the response has been torn down.
+            pass
+
+    def _item_count(self, payload: Dict[str, Any]) -> int:
+        return sum(len(payload.get(key) or []) for key in self.channel.append_keys + self.channel.merge_keys)
+
+    def _coalesce_locked(self) -> None:
+        merged: List[_PendingEvent] = []
+        for event in self._pending:
+            if event.event_name == "heartbeat":
+                continue
+            previous = merged[-1] if merged else None
+            if (
+                previous is not None
+                and previous.event_name is None
+                and event.event_name is None
+                and previous.payload.get("streamMode") in MERGEABLE_MODES
+                and event.payload.get("streamMode") in MERGEABLE_MODES
+            ):
+                previous.payload = self._merge_payloads(previous.payload, event.payload)
+                previous.merged += event.merged
+                previous.data = b""
+                self.coalesced += 1
+                continue
+            merged.append(_PendingEvent(event.payload, event.event_name, event.data, event.enqueued_at, event.merged))
+        for event in merged:
+            if not event.data:
+                event.payload["streamMode"] = "catchup"
+                event.payload["coalescedEvents"] = event.merged
+                event.data = self._encode(event.payload, event.event_name)
+        self._pending = deque(merged)
+        self._pending_bytes = sum(len(event.data) for event in merged)
+
+    def _merge_payloads(self, current: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+        merged = dict(current)
+        for key, value in update.items():
+            if key in self.channel.append_keys:
+                merged[key] = list(merged.get(key) or []) + list(value or [])
+            elif key in self.channel.merge_keys:
+                merged[key] = _merge_by_id(list(merged.get(key) or []), list(value or []))
+            else:
+                merged[key] = value
+        for key, count_key in COUNT_KEYS.items():
+            if key in merged and count_key in merged:
+                merged[count_key] = len(merged[key] or [])
+        return merged
+
+    def _resync_locked(self) -> None:
+        # Too far behind to catch up incrementally: tell the client to reload its window over REST.
+        latest = self._pending[-1].payload if self._pending else {}
+        payload = {
+            key: value
+            for key, value in latest.items()
+            if key not in self.channel.append_keys + self.channel.merge_keys and key not in COUNT_KEYS.values()
+        }
+        payload.update({"streamMode": "resync", "resync": True})
+        oldest = self._pending[0].enqueued_at if self._pending else time.monotonic()
+        data = self._encode(payload, None)
+        self._pending = deque([_PendingEvent(payload, None, data, oldest)])
+        self._pending_bytes = len(data)
+        self._resync_pending = True
+        self.resyncs += 1
+        self._logger.warning("sse_client_resync stream=%s client=%s", self.stream_name, self.client_id)
+
+
+class SseClientRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._clients: Dict[str, SseClientBuffer] = {}
+        self._sequence = 0
+
+    def next_client_id(self, stream_name: str) -> str:
+        with self._lock:
+            self._sequence += 1
+            return "{0}-{1}".format(stream_name, self._sequence)
+
+    def register(self, client: SseClientBuffer) -> None:
+        with self._lock:
+            self._clients[client.client_id] = client
+
+    def unregister(self, client: SseClientBuffer) -> None:
+        with self._lock:
+            self._clients.pop(client.client_id, None)
+
+    def snapshot(self) -> List[Tuple[SseClientBuffer, Dict[str, float]]]:
+        with self._lock:
+            clients = list(self._clients.values())
+        return [(client, client.stats()) for client in clients]
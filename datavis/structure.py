@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import bisect
+import threading
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional
 
 
 def dt_to_ms(value: Optional[datetime]) -> Optional[int]:
@@ -123,6 +126,9 @@ class StructureEngine:
     low_tick: Optional[Dict[str, Any]] = None
     last_pullback_size: float = 0.0
     last_range_touch: Optional[str] = None
+    bar_count: int = 0
+    range_box_count: int = 0
+    event_count: int = 0
 
     @property
     def active_bar(self) -> Optional[StructureBar]:
@@ -192,8 +198,9 @@ class StructureEngine:
         }
 
     def _open_bar(self, bar_type: str, tick: Dict[str, Any]) -> StructureBar:
+        self.bar_count += 1
         bar = StructureBar(
-            id=len(self.bars) + 1,
+            id=self.bar_count,
             symbol=self.symbol,
             type=bar_type,
             status="active",
@@ -211,8 +218,9 @@ class StructureEngine:
         return bar
 
     def _open_range_box(self, tick: Dict[str, Any]) -> RangeBox:
+        self.range_box_count += 1
         box = RangeBox(
-            id=len(self.range_boxes) + 1,
+            id=self.range_box_count,
             symbol=self.symbol,
             status="active",
             start_tick_id=int(tick["id"]),
@@ -235,8 +243,9 @@ class StructureEngine:
         updates["bars"].append(bar.serialize())
 
     def _event(self, event_type: str, tick: Dict[str, Any], price: float, **extra: Any) -> Dict[str, Any]:
+        self.event_count += 1
         payload = {
-            "id": len(self.events) + 1,
+            "id": self.event_count,
             "symbol": self.symbol,
             "type": event_type,
             "state": self.mode,
@@ -398,16 +407,123 @@ class StructureEngine:
         updates["bars"].append(bar.serialize())
         updates["rangeBoxes"].append(box.serialize())
 
-    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+    def snapshot(self, *, start_tick_id: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        floor = int(start_tick_id) if start_tick_id is not None else None
         return {
-            "structureBars": [bar.serialize() for bar in self.bars],
-            "rangeBoxes": [box.serialize() for box in self.range_boxes],
-            "structureEvents": list(self.events),
+            "structureBars": [bar.serialize() for bar in self.bars if floor is None or bar.end_tick_id >= floor],
+            "rangeBoxes": [box.serialize() for box in self.range_boxes if floor is None or box.end_tick_id >= floor],
+            "structureEvents": [event for event in self.events if floor is None or int(event["tickId"]) >= floor],
         }
 
+    def prune_before(self, tick_id: int) -> None:
+        floor = int(tick_id)
+        self.bars = [bar for bar in self.bars if bar.status == "active" or bar.end_tick_id >= floor]
+        self.range_boxes = [box for box in self.range_boxes if box.status == "active" or box.end_tick_id >= floor]
+        self.events = [event for event in self.events if int(event["tickId"]) >= floor]
+
 
 def replay_ticks(symbol: str, rows: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
     engine = StructureEngine(symbol=symbol)
     for row in rows:
         engine.process_tick(row)
     return engine.snapshot()
+
+
+def empty_structure_updates() -> Dict[str, List[Dict[str, Any]]]:
+    return {"bars": [], "rangeBoxes": [], "events": []}
+
+
+class SharedStructureEngine:
+    def __init__(self, symbol: str, *, retain_ticks: int) -> None:
+        self.symbol = symbol
+        self.retain_ticks = max(1, int(retain_ticks))
+        self._lock = threading.Lock()
+        self._engine: Optional[StructureEngine] = None
+        # Parallel lists keyed by increasing tick id so updates_after can bisect instead of scanning.
+        self._delta_ids: List[int] = []
+        self._deltas: List[Dict[str, List[Dict[str, Any]]]] = []
+        self._tick_ids: Deque[int] = deque()
+        self._log_floor_id: Optional[int] = None
+        self._last_tick_id: Optional[int] = None
+        self._ticks_since_prune = 0
+
+    @property
+    def last_tick_id(self) -> Optional[int]:
+        with self._lock:
+            return self._last_tick_id
+
+    def reset(self, rows: List[Dict[str, Any]]) -> None:
+        engine = StructureEngine(symbol=self.symbol)
+        tick_ids: Deque[int] = deque()
+        for row in rows:
+            engine.process_tick(row)
+            tick_ids.append(int(row["id"]))
+        with self._lock:
+            self._engine = engine
+            self._delta_ids = []
+            self._deltas = []
+            self._tick_ids = tick_ids
+            self._last_tick_id = tick_ids[-1] if tick_ids else None
+            self._log_floor_id = self._last_tick_id or 0
+            self._ticks_since_prune = len(tick_ids)
+            self._trim_locked()
+
+    def advance(self, rows: List[Dict[str, Any]]) -> int:
+        processed = 0
+        with self._lock:
+            if self._engine is None:
+                return 0
+            for row in rows:
+                tick_id = int(row["id"])
+                if self._last_tick_id is not None and tick_id <= self._last_tick_id:
+                    continue
+                delta = self._engine.process_tick(row)
+                self._delta_ids.append(tick_id)
+                self._deltas.append(delta)
+                self._tick_ids.append(tick_id)
+                self._last_tick_id = tick_id
+                processed += 1
+            if processed:
+                self._ticks_since_prune += processed
+                self._trim_locked()
+        return processed
+
+    def updates_after(self, after_tick_id: int, *, through_tick_id: Optional[int] = None) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        # None means the subscriber is older than the retained delta log and needs a snapshot instead.
+        with self._lock:
+            if self._engine is None or self._log_floor_id is None or int(after_tick_id) < self._log_floor_id:
+                return None
+            bars: Dict[int, Dict[str, Any]] = {}
+            boxes: Dict[int, Dict[str, Any]] = {}
+            events: List[Dict[str, Any]] = []
+            start = bisect.bisect_right(self._delta_ids, int(after_tick_id))
+            stop = len(self._delta_ids) if through_tick_id is None else bisect.bisect_right(self._delta_ids, int(through_tick_id))
+            for delta in self._deltas[start:stop]:
+                for bar in delta["bars"]:
+                    bars.pop(bar["id"], None)
+                    bars[bar["id"]] = bar
+                for box in delta["rangeBoxes"]:
+                    boxes.pop(box["id"], None)
+                    boxes[box["id"]] = box
+                events.extend(delta["events"])
+            return {"bars": list(bars.values()), "rangeBoxes": list(boxes.values()), "events": events}
+
+    def snapshot(self, *, start_tick_id: Optional[int] = None) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        with self._lock:
+            if self._engine is None:
+                return None
+            return self._engine.snapshot(start_tick_id=start_tick_id)
+
+    def _trim_locked(self) -> None:
+        while len(self._tick_ids) > self.retain_ticks:
+            self._tick_ids.popleft()
+        # Drop expired deltas in slices rather than one by one so the lists stay cheap to trim.
+        excess = len(self._delta_ids) - self.retain_ticks
+        if excess > 0 and excess >= max(1, self.retain_ticks // 20):
+            self._log_floor_id = self._delta_ids[excess - 1]
+            del self._delta_ids[:excess]
+            del self._deltas[:excess]
+        # Pruning rebuilds the engine lists, so only do it once a slice of the window has rolled off.
+        if self._engine is not None and self._tick_ids and self._ticks_since_prune >= max(1, self.retain_ticks // 20):
+            self._engine.prune_before(self._tick_ids[0])
+            self._ticks_since_prune = 0
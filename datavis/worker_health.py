@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import psycopg2
+
+
+@dataclass
+class WorkerPosition:
+    name: str
+    last_tick_id: Optional[int]
+    last_tick_time: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    active: bool = True
+    error: Optional[str] = None
+    detail: Dict[str, Any] = field(default_factory=dict)
+
+
+def _fetch_all(cur: Any, sql: str, params: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
+    cur.execute(sql, params)
+    return [dict(row) for row in cur.fetchall()]
+
+
+def query_head(cur: Any, *, symbol: str) -> Optional[Dict[str, Any]]:
+    rows = _fetch_all(
+        cur,
+        """
+        SELECT id, timestamp
+        FROM public.ticks
+        WHERE symbol = %s
+        ORDER BY id DESC
+        LIMIT 1
+        """,
+        (symbol,),
+    )
+    return rows[0] if rows else None
+
+
+def query_mavg_positions(cur: Any, *, symbol: str) -> List[WorkerPosition]:
+    rows = _fetch_all(
+        cur,
+        """
+        SELECT s.configid, c.name, s.lasttickid, s.lastticktime, s.updatedat
+        FROM public.mavgstate s
+        JOIN public.mavgconfig c
+          ON c.id = s.configid
+        WHERE c.isenabled = TRUE
+          AND s.symbol = %s
+        ORDER BY s.lasttickid ASC NULLS FIRST, s.configid ASC
+        """,
+        (symbol,),
+    )
+    if not rows:
+        return [WorkerPosition("mavg", None, active=False)]
+    slowest = rows[0]
+    return [
+        WorkerPosition(
+            "mavg",
+            int(slowest["lasttickid"]) if slowest.get("lasttickid") is not None else None,
+            last_tick_time=slowest.get("lastticktime"),
+            updated_at=slowest.get("updatedat"),
+            detail={"configCount": len(rows), "slowestConfigId": int(slowest["configid"]), "slowestConfig": slowest.get("name")},
+        )
+    ]
+
+
+def query_backbone_positions(cur: Any, *, symbol: str) -> List[WorkerPosition]:
+    # Latest write wins: synthetic YYYYMMDD dayids sort above real days-table ids, so dayid cannot pick the current row.
+    rows = _fetch_all(
+        cur,
+        """
+        SELECT DISTINCT ON (source) source, dayid, lastprocessedtickid, updatedat
+        FROM public.backbonestate
+        WHERE symbol = %s
+        ORDER BY source ASC, updatedat DESC NULLS LAST, dayid DESC
+        """,
+        (symbol,),
+    )
+    return [
+        WorkerPosition(
+            "backbone:{0}".format(row.get("source")),
+            int(row["lastprocessedtickid"]) if row.get("lastprocessedtickid") is not None else None,
+            updated_at=row.get("updatedat"),
+            detail={"dayId": int(row["dayid"])},
+        )
+        for row in rows
+    ] or [WorkerPosition("backbone", None, active=False)]
+
+
+def query_motion_positions(cur: Any, *, symbol: str) -> List[WorkerPosition]:
+    rows = _fetch_all(cur, "SELECT lasttickid, updatedat FROM public.motionstate WHERE id = 1")
+    row = rows[0] if rows else {}
+    return [
+        WorkerPosition(
+            "motion",
+            int(row["lasttickid"]) if row.get("lasttickid") is not None else None,
+            updated_at=row.get("updatedat"),
+            active=bool(rows),
+        )
+    ]
+
+
+STATE_TABLE_READERS: Tuple[Tuple[str, Callable[..., List[WorkerPosition]]], ...] = (
+    ("mavg", query_mavg_positions),
+    ("backbone", query_backbone_positions),
+    ("motion", query_motion_positions),
+)
+
+
+def query_worker_positions(cur: Any, *, symbol: str) -> List[WorkerPosition]:
+    """Read each worker's state table; expects an autocommit cursor so one missing table does not abort the rest."""
+    positions: List[WorkerPosition] = []
+    for name, reader in STATE_TABLE_READERS:
+        try:
+            positions.extend(reader(cur, symbol=symbol))
+        except psycopg2.Error as exc:
+            positions.append(WorkerPosition(name, None, active=False, error=str(exc).strip().splitlines()[0]))
+    return positions
+
+
+class WorkerLagTracker:
+    """Derives processing rates from successive state-table reads of the last processed tick id."""
+
+    def __init__(self, *, window_seconds: float = 300.0, min_interval_seconds: float = 1.0, lag_warn_ticks: int = 500) -> None:
+        self.window_seconds = max(1.0, float(window_seconds))
+        self.min_interval_seconds = max(0.0, float(min_interval_seconds))
+        self.lag_warn_ticks = max(1, int(lag_warn_ticks))
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[Tuple[float, int]]] = {}
+        self._last_report: Dict[str, Any] = {}
+
+    def observe(self, name: str, tick_id: int, *, now: Optional[float] = None) -> Optional[float]:
+        now = time.monotonic() if now is None else float(now)
+        with self._lock:
+            samples = self._samples.setdefault(name, deque())
+            if samples and tick_id < samples[-1][1]:
+                # A rebuilt or reset worker starts a new rate history.
+                samples.clear()
+            if not samples or now - samples[-1][0] >= self.min_interval_seconds:
+                samples.append((now, int(tick_id)))
+            while len(samples) > 2 and now - samples[1][0] >= self.window_seconds:
+                samples.popleft()
+            if len(samples) < 2:
+                return None
+            (first_at, first_id), (last_at, last_id) = samples[0], samples[-1]
+            if last_at - first_at <= 0:
+                return None
+            return (last_id - first_id) / (last_at - first_at)
+
+    def report(
+        self,
+        *,
+        head: Optional[Dict[str, Any]],
+        positions: List[WorkerPosition],
+        now: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        head_id = int(head["id"]) if head and head.get("id") is not None else None
+        head_time = head.get("timestamp") if head else None
+        head_rate = self.observe("__head__", head_id, now=now) if head_id is not None else None
+        workers: List[Dict[str, Any]] = []
+        for position in positions:
+            rate = self.observe(position.name, position.last_tick_id, now=now) if position.last_tick_id is not None else None
+            lag_ticks = max(0, head_id - position.last_tick_id) if head_id is not None and position.last_tick_id is not None else None
+            lag_seconds = (
+                max(0.0, (head_time - position.last_tick_time).total_seconds())
+                if head_time is not None and position.last_tick_time is not None
+                else None
+            )
+            eta_seconds: Optional[float] = None
+            if lag_ticks == 0:
+                eta_seconds = 0.0
+            elif lag_ticks and rate is not None and rate > (head_rate or 0.0):
+                eta_seconds = lag_ticks / (rate - (head_rate or 0.0))
+            if position.error:
+                state = "unavailable"
+            elif not position.active:
+                state = "idle"
+            elif lag_ticks is None:
+                state = "unknown"
+            elif lag_ticks <= self.lag_warn_ticks:
+                state = "ok"
+            elif rate is not None and rate <= 0:
+                state = "stalled"
+            elif eta_seconds is None and rate is not None:
+                state = "falling_behind"
+            else:
+                state = "behind"
+            workers.append(
+                {
+                    "name": position.name,
+                    "state": state,
+                    "active": position.active,
+                    "lastTickId": position.last_tick_id,
+                    "lagTicks": lag_ticks,
+                    "lagSeconds": round(lag_seconds, 3) if lag_seconds is not None else None,
+                    "ratePerSecond": round(rate, 3) if rate is not None else None,
+                    "etaSeconds": round(eta_seconds, 1) if eta_seconds is not None else None,
+                    "updatedAt": position.updated_at.isoformat() if position.updated_at is not None else None,
+                    "error": position.error,
+                    **position.detail,
+                }
+            )
+        active = [worker for worker in workers if worker["active"] and worker["lagTicks"] is not None]
+        bottleneck = max(active, key=lambda worker: worker["lagTicks"], default=None)
+        report = {
+            "headId": head_id,
+            "headTimestamp": head_time.isoformat() if head_time is not None else None,
+            "headRatePerSecond": round(head_rate, 3) if head_rate is not None else None,
+            "bottleneck": bottleneck["name"] if bottleneck and bottleneck["lagTicks"] > self.lag_warn_ticks else None,
+            "workers": workers,
+        }
+        with self._lock:
+            self._last_report = report
+        return report
+
+    def last_report(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._last_report
@@ -6,6 +6,9 @@ REPO_ROOT="$(cd "${SCRIPT_DIR}/../.." && pwd)"
 LOG_DIR="${REPO_ROOT}/logs/update_journal"
 SUMMARY_PATH="${REPO_ROOT}/deploy/updateJournal.md"
 HEALTH_URL="http://127.0.0.1:8000/api/health"
+ENV_FILE="/etc/datavis.env"
+NGINX_SITE_CONF="/etc/nginx/conf.d/datavis.au.conf"
+VENV_PYTHON="/home/ec2-user/venvs/datavis/bin/python"
 TIMESTAMP="$(date '+%Y%m%d_%H%M%S')"
 RUN_LOG_PATH="${LOG_DIR}/update_${TIMESTAMP}.log"
 
@@ -96,6 +99,35 @@ run_health_check() {
   return 1
 }
 
+run_logged() {
+  local label="$1"
+  shift
+  log "${label}: $*"
+  "$@" 2>&1 | while IFS= read -r line; do
+    log "${label}: ${line}"
+  done
+}
+
+load_datavis_env() {
+  # The services read the same file through EnvironmentFile=; migrations need its DATABASE_URL.
+  if sudo test -f "${ENV_FILE}"; then
+    set -a
+    # shellcheck disable=SC1090
+    source <(sudo cat "${ENV_FILE}")
+    set +a
+  fi
+  DB_URL="$(python3 "${REPO_ROOT}/deploy/scripts/resolve_db_url.py")"
+  if [[ -z "${DB_URL}" ]]; then
+    log "DATABASE_URL or DATAVIS_DB_URL is not set in ${ENV_FILE} or the environment."
+    return 1
+  fi
+}
+
+run_sql_file() {
+  local relative_path="$1"
+  run_logged "psql ${relative_path}" psql "${DB_URL}" -v ON_ERROR_STOP=1 -q -f "${REPO_ROOT}/${relative_path}"
+}
+
 write_summary() {
   if [[ -e "${SUMMARY_PATH}" && ! -f "${SUMMARY_PATH}" ]]; then
     log "Skipping summary write because ${SUMMARY_PATH} is not a regular file."
@@ -120,8 +152,22 @@ commit message: ${COMMIT_MESSAGE}
 result: ${RUN_RESULT}
 log: logs/update_journal/$(basename "${RUN_LOG_PATH}")
 steps:
-1. restart datavis.service
-2. health check retry every 2 seconds for up to 60 seconds
+1. install requirements.txt into the datavis venv
+2. stop backbone.service
+3. apply deploy/sql/20261018_backbone_checkpoints.sql
+4. apply deploy/sql/20261018_backbone_move_ranges.sql
+5. apply deploy/sql/20261018_backbone_day_summary.sql
+6. apply deploy/sql/20261018_backbone_symbol.sql
+7. restart datavis.service
+8. health check retry every 2 seconds for up to 60 seconds
+9. install deploy/nginx/datavis.au.conf, nginx -t, reload nginx
+10. start backbone.service
+11. python -m datavis.backbone_jobs backfill-move-ranges
+12. python -m datavis.backbone_jobs backfill-day-summaries
+13. stop mavg.service
+14. apply deploy/sql/20261018_mavg_lod.sql
+15. python -m datavis.mavg_jobs rebuild-lod
+16. start mavg.service
 EOF
 }
 
@@ -156,11 +202,52 @@ main() {
   log "Commit message: ${COMMIT_MESSAGE}"
   log "Journal: logs/update_journal/$(basename "${RUN_LOG_PATH}")"
 
+  load_datavis_env
+
+  # backbone.py now imports numpy at module load, so the venv must carry it before any service restarts.
+  run_logged "pip install" "${VENV_PYTHON}" -m pip install --quiet -r "${REPO_ROOT}/requirements.txt"
+
+  # The symbol migration swaps the unique indexes the worker's upserts target, so the worker is down meanwhile.
+  log "Stopping backbone.service"
+  sudo systemctl stop backbone.service
+
+  run_sql_file "deploy/sql/20261018_backbone_checkpoints.sql"
+  run_sql_file "deploy/sql/20261018_backbone_move_ranges.sql"
+  run_sql_file "deploy/sql/20261018_backbone_day_summary.sql"
+  run_sql_file "deploy/sql/20261018_backbone_symbol.sql"
+
   log "Restarting datavis.service"
   sudo systemctl restart datavis.service
 
   log "Running health check with retries: ${HEALTH_URL}"
   run_health_check
+
+  # /ws/ needs the Upgrade/Connection headers from the managed site config, which nginx only picks up on reload.
+  log "Installing ${NGINX_SITE_CONF}"
+  sudo install -m 0644 "${REPO_ROOT}/deploy/nginx/datavis.au.conf" "${NGINX_SITE_CONF}"
+  run_logged "nginx -t" sudo nginx -t
+  log "Reloading nginx"
+  sudo systemctl reload nginx
+
+  log "Starting backbone.service"
+  sudo systemctl start backbone.service
+  sudo systemctl is-active --quiet backbone.service
+
+  # Candles scan ticks for moves without a stored range, so this only speeds reads up; it commits one day at a time.
+  run_logged "backbone backfill-move-ranges" "${VENV_PYTHON}" -m datavis.backbone_jobs backfill-move-ranges
+  # The overview reads only backbonedaysummary; the worker keeps the current day, this fills the rest.
+  run_logged "backbone backfill-day-summaries" "${VENV_PYTHON}" -m datavis.backbone_jobs backfill-day-summaries
+
+  # The MA worker folds new values into mavglod, so it stays down until the table exists and is seeded.
+  log "Stopping mavg.service"
+  sudo systemctl stop mavg.service
+
+  run_sql_file "deploy/sql/20261018_mavg_lod.sql"
+  run_logged "mavg rebuild-lod" "${VENV_PYTHON}" -m datavis.mavg_jobs rebuild-lod
+
+  log "Starting mavg.service"
+  sudo systemctl start mavg.service
+  sudo systemctl is-active --quiet mavg.service
 }
 
 main "$@"
@@ -0,0 +1,13 @@
+BEGIN;
+
+ALTER TABLE public.backbonestate
+    ADD COLUMN IF NOT EXISTS checkpointtickid BIGINT,
+    ADD COLUMN IF NOT EXISTS checkpointat TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS checkpoint BYTEA;
+
+-- The rolling window now lives in the binary checkpoint; drop it from the per-batch JSON state.
+UPDATE public.backbonestate
+SET statejson = statejson - 'absdeltas'
+WHERE statejson ? 'absdeltas';
+
+COMMIT;
@@ -0,0 +1,35 @@
+BEGIN;
+
+-- One row per (day, symbol, source), kept current by the backbone worker whenever
+-- a poll confirms moves; `backbone_jobs backfill-day-summaries` fills older days.
+-- Multi-day overviews read this table instead of scanning pivots and moves.
+CREATE TABLE IF NOT EXISTS public.backbonedaysummary (
+    dayid BIGINT NOT NULL,
+    symbol TEXT NOT NULL,
+    source TEXT NOT NULL,
+    brokerday DATE NOT NULL,
+    firstmovetime TIMESTAMPTZ,
+    lastmovetime TIMESTAMPTZ,
+    pivotcount INTEGER NOT NULL DEFAULT 0,
+    movecount INTEGER NOT NULL DEFAULT 0,
+    upmovecount INTEGER NOT NULL DEFAULT 0,
+    downmovecount INTEGER NOT NULL DEFAULT 0,
+    avgmovesize DOUBLE PRECISION,
+    maxmovesize DOUBLE PRECISION,
+    avgmoveseconds DOUBLE PRECISION,
+    avgmoveticks DOUBLE PRECISION,
+    thresholdp10 DOUBLE PRECISION,
+    thresholdp50 DOUBLE PRECISION,
+    thresholdp90 DOUBLE PRECISION,
+    dayopen DOUBLE PRECISION,
+    dayhigh DOUBLE PRECISION,
+    daylow DOUBLE PRECISION,
+    dayclose DOUBLE PRECISION,
+    updatedat TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (dayid, symbol, source)
+);
+
+CREATE INDEX IF NOT EXISTS backbonedaysummary_symbol_source_brokerday_idx
+    ON public.backbonedaysummary (symbol, source, brokerday DESC);
+
+COMMIT;
@@ -0,0 +1,9 @@
+BEGIN;
+
+-- Intra-move extremes written by the backbone engine; older rows are filled by
+-- `backbone_jobs backfill-move-ranges` and read back as the endpoints until then.
+ALTER TABLE public.backbonemoves
+    ADD COLUMN IF NOT EXISTS highprice DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS lowprice DOUBLE PRECISION;
+
+COMMIT;
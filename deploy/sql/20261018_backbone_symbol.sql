@@ -0,0 +1,48 @@
+BEGIN;
+
+-- Pivots and moves carry their symbol so that one worker can run several symbols:
+-- dayids are only unique per symbol when the days table is, and the synthetic
+-- YYYYMMDD fallback is shared by every symbol.
+ALTER TABLE public.backbonepivots
+    ADD COLUMN IF NOT EXISTS symbol TEXT;
+
+ALTER TABLE public.backbonemoves
+    ADD COLUMN IF NOT EXISTS symbol TEXT;
+
+-- Existing rows take the symbol of the worker state for their day. A day that already
+-- has state for more than one symbol mixed their rows; it stays NULL (invisible to
+-- every reader) until `backbone_jobs --symbol ... rebuild-range` rebuilds it.
+UPDATE public.backbonepivots p
+SET symbol = owner.symbol
+FROM (
+    SELECT dayid, source, MIN(symbol) AS symbol
+    FROM public.backbonestate
+    GROUP BY dayid, source
+    HAVING COUNT(DISTINCT symbol) = 1
+) owner
+WHERE p.symbol IS NULL
+  AND p.dayid = owner.dayid
+  AND p.source = owner.source;
+
+UPDATE public.backbonemoves m
+SET symbol = owner.symbol
+FROM (
+    SELECT dayid, source, MIN(symbol) AS symbol
+    FROM public.backbonestate
+    GROUP BY dayid, source
+    HAVING COUNT(DISTINCT symbol) = 1
+) owner
+WHERE m.symbol IS NULL
+  AND m.dayid = owner.dayid
+  AND m.source = owner.source;
+
+DROP INDEX IF EXISTS backbonepivots_dayid_tickid_type_source_idx;
+DROP INDEX IF EXISTS backbonemoves_dayid_start_end_dir_source_idx;
+
+CREATE UNIQUE INDEX IF NOT EXISTS backbonepivots_dayid_symbol_tickid_type_source_idx
+    ON public.backbonepivots (dayid, symbol, tickid, pivottype, source);
+
+CREATE UNIQUE INDEX IF NOT EXISTS backbonemoves_dayid_symbol_start_end_dir_source_idx
+    ON public.backbonemoves (dayid, symbol, starttickid, endtickid, direction, source);
+
+COMMIT;
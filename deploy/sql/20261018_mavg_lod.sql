@@ -0,0 +1,33 @@
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.mavglod (
+    configid BIGINT NOT NULL REFERENCES public.mavgconfig (id) ON DELETE CASCADE,
+    resolutionseconds INTEGER NOT NULL,
+    bucketstart TIMESTAMPTZ NOT NULL,
+    valuecount BIGINT NOT NULL DEFAULT 0,
+    firstvalueid BIGINT NOT NULL,
+    firsttickid BIGINT NOT NULL,
+    firstticktime TIMESTAMPTZ NOT NULL,
+    firstvalue DOUBLE PRECISION NOT NULL,
+    lowvalueid BIGINT NOT NULL,
+    lowtickid BIGINT NOT NULL,
+    lowticktime TIMESTAMPTZ NOT NULL,
+    lowvalue DOUBLE PRECISION NOT NULL,
+    highvalueid BIGINT NOT NULL,
+    hightickid BIGINT NOT NULL,
+    highticktime TIMESTAMPTZ NOT NULL,
+    highvalue DOUBLE PRECISION NOT NULL,
+    lastvalueid BIGINT NOT NULL,
+    lasttickid BIGINT NOT NULL,
+    lastticktime TIMESTAMPTZ NOT NULL,
+    lastvalue DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (configid, resolutionseconds, bucketstart),
+    CONSTRAINT mavglod_resolutionseconds_positive CHECK (resolutionseconds > 0)
+);
+
+CREATE INDEX IF NOT EXISTS mavglod_resolution_bucketstart_idx
+    ON public.mavglod (resolutionseconds, bucketstart ASC, configid);
+
+COMMIT;
+
+-- Seed existing history after applying: python -m datavis.mavg_jobs rebuild-lod
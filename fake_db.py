@@ -0,0 +1,29 @@
+"""Minimal psycopg2 stand-ins shared by the tests that only need to record statements."""
+from __future__ import annotations
+
+
+class RecordingCursor:
+    def __init__(self, rows, executed):
+        self.rows = rows
+        self.executed = executed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+    def fetchall(self):
+        return self.rows
+
+
+class RecordingConnection:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.executed = []
+
+    def cursor(self, *args, **kwargs):
+        return RecordingCursor(self.rows, self.executed)
@@ -1016,12 +1016,18 @@
     if (config.view === "detailed") {
       endpoint = "/api/backbone/detail";
       params.set("ticks", String(config.ticks));
+      if (window.DatavisColumnar) {
+        params.set("encoding", window.DatavisColumnar.encoding);
+      }
     } else {
       params.set("candles", String(config.candles));
       params.set("layer", String(config.layer));
     }
     try {
       const payload = await fetchJson(endpoint + "?" + params.toString());
+      if (window.DatavisColumnar) {
+        window.DatavisColumnar.decodePayload(payload);
+      }
       if (token !== state.loadToken) {
         return;
       }
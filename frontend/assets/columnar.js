@@ -0,0 +1,81 @@
+(function () {
+  if (window.DatavisColumnar) {
+    return;
+  }
+
+  const COLUMNAR_KEYS = ["rows", "mavgPoints", "pivots", "pivotUpdates"];
+
+  function cumulative(data, scale) {
+    const output = new Array(data.length);
+    let running = 0;
+    for (let index = 0; index < data.length; index += 1) {
+      running += data[index];
+      output[index] = scale ? running / scale : running;
+    }
+    return output;
+  }
+
+  function decodeColumn(column, count) {
+    if (column.type === "const") {
+      return new Array(count).fill(column.value);
+    }
+    if (column.type === "delta") {
+      return cumulative(column.data || [], 0);
+    }
+    if (column.type === "scaled") {
+      return cumulative(column.data || [], Number(column.scale) || 1);
+    }
+    return column.data || [];
+  }
+
+  function decodeColumns(block) {
+    if (!block || Array.isArray(block)) {
+      return block || [];
+    }
+    const count = Number(block.count) || 0;
+    const columns = block.columns || {};
+    const names = [];
+    const values = [];
+    const isoColumns = [];
+    Object.keys(columns).forEach(function (name) {
+      const column = columns[name];
+      if (column.type === "iso") {
+        isoColumns.push([name, column.from]);
+        return;
+      }
+      names.push(name);
+      values.push(decodeColumn(column, count));
+    });
+    const items = new Array(count);
+    for (let index = 0; index < count; index += 1) {
+      const item = {};
+      for (let columnIndex = 0; columnIndex < names.length; columnIndex += 1) {
+        item[names[columnIndex]] = values[columnIndex][index];
+      }
+      isoColumns.forEach(function (pair) {
+        const ms = item[pair[1]];
+        item[pair[0]] = Number.isFinite(ms) ? new Date(ms).toISOString() : null;
+      });
+      items[index] = item;
+    }
+    return items;
+  }
+
+  function decodePayload(payload) {
+    if (!payload || payload.encoding !== "columnar") {
+      return payload;
+    }
+    COLUMNAR_KEYS.forEach(function (key) {
+      if (Object.prototype.hasOwnProperty.call(payload, key)) {
+        payload[key] = decodeColumns(payload[key]);
+      }
+    });
+    return payload;
+  }
+
+  window.DatavisColumnar = {
+    encoding: "columnar",
+    decodeColumns: decodeColumns,
+    decodePayload: decodePayload,
+  };
+})();
@@ -65,8 +65,13 @@
     rangeBoxes: [],
     structureEvents: [],
     source: null,
+    socketQueue: [],
+    socketFrame: 0,
+    socketChannels: [],
     reviewTimer: 0,
     reviewEndId: null,
+    reviewSessionId: null,
+    reviewPaused: false,
     loadToken: 0,
     lastMetrics: null,
     streamConnected: false,
@@ -162,6 +167,11 @@
     tickId: document.getElementById("tickId"),
     reviewStart: document.getElementById("reviewStart"),
     reviewSpeedToggle: document.getElementById("reviewSpeedToggle"),
+    reviewPauseButton: document.getElementById("reviewPauseButton"),
+    reviewSeekId: document.getElementById("reviewSeekId"),
+    reviewSeekButton: document.getElementById("reviewSeekButton"),
+    reviewSessionInput: document.getElementById("reviewSessionInput"),
+    reviewSessionSummary: document.getElementById("reviewSessionSummary"),
     windowSize: document.getElementById("windowSize"),
     applyButton: document.getElementById("applyButton"),
     loadMoreLeftButton: document.getElementById("loadMoreLeftButton"),
@@ -749,6 +759,14 @@
     };
   }
 
+  function encodingParams() {
+    return window.DatavisColumnar ? { encoding: window.DatavisColumnar.encoding } : {};
+  }
+
+  function decodePayload(payload) {
+    return window.DatavisColumnar ? window.DatavisColumnar.decodePayload(payload) : payload;
+  }
+
   function setSidebarCollapsed(collapsed) {
     state.ui.sidebarCollapsed = Boolean(collapsed);
     elements.liveWorkspace.classList.toggle("is-sidebar-collapsed", state.ui.sidebarCollapsed);
@@ -770,6 +788,9 @@
     elements.reviewSpeedToggle.querySelectorAll("button").forEach((button) => {
       button.disabled = !reviewMode;
     });
+    [elements.reviewPauseButton, elements.reviewSeekId, elements.reviewSeekButton, elements.reviewSessionInput].forEach((control) => {
+      control.disabled = !reviewMode;
+    });
   }
 
   function formatMavgWindow(seconds) {
@@ -4214,7 +4235,62 @@
     }
   }
 
+  function applySeekPayload(payload) {
+    replaceRows(payload.rows || []);
+    state.structureBars = (payload.structureBarUpdates || []).slice();
+    state.rangeBoxes = (payload.rangeBoxUpdates || []).slice();
+    state.structureEvents = (payload.structureEvents || []).slice();
+    state.mavg.pointsByConfig = {};
+    mergeMavgPoints(payload.mavgPoints || [], payload.mavgCursorId);
+    trimStructureToRows();
+    return true;
+  }
+
+  function renderReviewSession(review) {
+    if (!review?.sessionId) {
+      state.reviewPaused = false;
+      elements.reviewPauseButton.textContent = "Pause";
+      elements.reviewSessionSummary.textContent = "Tabs reviewing the same range share one playback clock.";
+      return;
+    }
+    state.reviewSessionId = review.sessionId;
+    state.reviewPaused = Boolean(review.paused);
+    elements.reviewPauseButton.textContent = state.reviewPaused ? "Resume" : "Pause";
+    elements.reviewSessionSummary.textContent = [
+      "session " + review.sessionId,
+      (review.subscribers || 0) + " tab" + (review.subscribers === 1 ? "" : "s"),
+      (state.reviewPaused ? "paused" : "playing") + " at " + review.positionId,
+      review.speed + "x",
+    ].join(" | ");
+  }
+
+  async function controlReviewSession(body, failureMessage) {
+    if (!state.reviewSessionId || !state.streamConnected) {
+      status("Run the review first; playback controls drive its shared session.", true);
+      return;
+    }
+    try {
+      const review = await fetchJson("/api/live/review-session", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ sessionId: state.reviewSessionId, ...body }),
+      });
+      renderReviewSession(review);
+    } catch (error) {
+      status(error.message || failureMessage, true);
+    }
+  }
+
   function applyStreamPayload(payload) {
+    if (payload.review?.sessionId) {
+      renderReviewSession(payload.review);
+    }
+    if (payload.streamMode === "seek") {
+      if (Object.prototype.hasOwnProperty.call(payload || {}, "rect")) {
+        applyPaperPayload(payload.rect || null);
+      }
+      return applySeekPayload(payload);
+    }
     if (payload.lastId != null) {
       state.rangeLastId = payload.lastId;
     }
@@ -4241,6 +4317,12 @@
       state.source.close();
       state.source = null;
     }
+    if (state.socketFrame) {
+      window.cancelAnimationFrame(state.socketFrame);
+      state.socketFrame = 0;
+    }
+    state.socketQueue = [];
+    state.socketChannels = [];
     if (state.reviewTimer) {
       window.clearTimeout(state.reviewTimer);
       state.reviewTimer = 0;
@@ -4311,7 +4393,7 @@
 
   function scheduleSmartPolling() {
     stopSmartPolling();
-    if (!state.trade.authenticated || !smartContextReady()) {
+    if (!state.trade.authenticated || !smartContextReady() || state.socketChannels.includes("smart")) {
       return;
     }
     state.trade.smart.pollTimer = window.setTimeout(() => {
@@ -5226,6 +5308,7 @@
       mode: config.mode,
       window: String(config.window),
       ...visibilityParams(config),
+      ...encodingParams(),
     });
     if (config.mode === "review" && startId != null) {
       params.set("id", String(startId));
@@ -5239,6 +5322,7 @@
       limit: String(limit),
       window: String(config.window),
       ...visibilityParams(config),
+      ...encodingParams(),
     });
     if (endId != null) {
       params.set("endId", String(endId));
@@ -5251,21 +5335,24 @@
       beforeId: String(state.rangeFirstId || 1),
       currentLastId: String(state.rangeLastId || state.rangeFirstId || 1),
       limit: String(limit),
-      mode: config.mode,
       ...visibilityParams(config),
+      ...encodingParams(),
     }).toString();
   }
 
   async function loadBootstrap(resetView) {
     const config = currentConfig();
     const startId = config.mode === "review" ? await resolveReviewStartId(config) : null;
-    const payload = await fetchJson(bootstrapUrl(config, startId));
+    const payload = decodePayload(await fetchJson(bootstrapUrl(config, startId)));
     state.loadedWindow = Number(payload.window) || config.window;
     replaceRows(payload.rows || []);
     replaceMavgPayload(payload);
     replaceStructure(payload);
     applyRangePayload(payload);
     state.reviewEndId = payload.reviewEndId || null;
+    // An explicit session id joins that replay; otherwise the stream shares the session of its range.
+    state.reviewSessionId = elements.reviewSessionInput.value.trim() || null;
+    renderReviewSession(null);
     state.hasMoreLeft = Boolean(payload.hasMoreLeft);
     state.lastMetrics = payload.metrics || null;
     applyPaperPayload(payload.rect || null);
@@ -5287,7 +5374,118 @@
     }
   }
 
+  function liveSocketUrl() {
+    const protocol = window.location.protocol === "https:" ? "wss:" : "ws:";
+    return protocol + "//" + window.location.host + "/ws/live?" + new URLSearchParams(encodingParams()).toString();
+  }
+
+  function liveSocketChannels() {
+    return ["ticks", "mavg", "rect", "acd"].concat(state.trade.authenticated ? ["smart"] : []);
+  }
+
   function connectStream(afterId) {
+    if (typeof window.WebSocket !== "function") {
+      connectEventStream(afterId);
+      return;
+    }
+    clearActivity();
+    const config = currentConfig();
+    const socket = new WebSocket(liveSocketUrl());
+    let opened = false;
+    state.source = socket;
+    socket.onopen = function () {
+      opened = true;
+      state.streamConnected = true;
+      socket.send(JSON.stringify({
+        action: "subscribe",
+        channels: liveSocketChannels(),
+        afterId: afterId || 0,
+        afterMavgId: state.mavg.cursorId || 0,
+        options: Object.fromEntries(Object.entries(visibilityParams(config)).map(([key, value]) => [key, value === "1"])),
+      }));
+      renderPerf();
+      status("Live socket connected.", false);
+    };
+    socket.onmessage = function (event) {
+      state.socketQueue.push(JSON.parse(event.data));
+      if (!state.socketFrame) {
+        state.socketFrame = window.requestAnimationFrame(flushLiveSocket);
+      }
+    };
+    socket.onclose = function () {
+      if (state.source !== socket) {
+        return;
+      }
+      state.source = null;
+      if (!opened) {
+        connectEventStream(afterId);
+        return;
+      }
+      clearActivity();
+      status("Live stream disconnected. Click Load or Run to reconnect.", true);
+    };
+  }
+
+  function flushLiveSocket() {
+    state.socketFrame = 0;
+    let changed = false;
+    state.socketQueue.splice(0).forEach((message) => {
+      if (message.type === "subscribed") {
+        state.socketChannels = message.channels || [];
+        if (state.socketChannels.includes("smart")) {
+          stopSmartPolling();
+        }
+        changed = applySocketChannels(message.catchup || {}) || changed;
+      } else if (message.type === "batch") {
+        changed = applySocketChannels(message.channels || {}) || changed;
+      } else if (message.type === "error") {
+        status(message.message || "Live socket error.", true);
+      }
+    });
+    renderMeta();
+    renderPerf();
+    if (changed) {
+      renderChart({ shiftWithRun: currentConfig().run === "run" });
+    }
+  }
+
+  function applySocketChannels(channels) {
+    const ticks = channels.ticks ? decodePayload(channels.ticks) : null;
+    const mavg = channels.mavg ? decodePayload(channels.mavg) : null;
+    if (ticks?.resync || mavg?.resync) {
+      status("Live socket fell behind; reloading the window.", true);
+      loadBootstrap(false).catch((error) => status(error.message || "Live reload failed.", true));
+      return false;
+    }
+    let changed = false;
+    if (ticks || mavg || channels.rect) {
+      const payload = {
+        ...(ticks || {}),
+        mavgPoints: mavg ? mavg.mavgPoints : [],
+        mavgCursorId: mavg ? mavg.mavgCursorId : null,
+      };
+      if (channels.rect) {
+        payload.rect = channels.rect.rect;
+      }
+      if (ticks) {
+        state.lastMetrics = ticks;
+      }
+      changed = Boolean(applyStreamPayload(payload)) || Boolean(channels.rect);
+    }
+    if (channels.acd) {
+      state.acd = channels.acd;
+      renderAcdHud();
+      changed = true;
+    }
+    if (channels.smart) {
+      applySmartPayload(channels.smart);
+      renderTradeEntryOverlay();
+      renderTradeLists();
+    }
+    return changed;
+  }
+
+  function connectEventStream(afterId) {
     clearActivity();
     const config = currentConfig();
     const source = new EventSource("/api/live/stream?" + new URLSearchParams({
@@ -5296,6 +5494,7 @@
       limit: "250",
       window: String(config.window),
       ...visibilityParams(config),
+      ...encodingParams(),
     }).toString());
     state.source = source;
     source.onopen = function () {
@@ -5304,7 +5503,13 @@
       status("Live stream connected.", false);
     };
     source.onmessage = function (event) {
-      const payload = JSON.parse(event.data);
+      const payload = decodePayload(JSON.parse(event.data));
+      if (payload.resync) {
+        clearActivity();
+        status("Live stream fell behind; reloading the window.", true);
+        loadBootstrap(false).catch((error) => status(error.message || "Live reload failed.", true));
+        return;
+      }
       state.lastMetrics = payload;
       const changed = applyStreamPayload(payload);
       renderMeta();
@@ -5332,13 +5537,18 @@
       status("Review reached the current end snapshot.", false);
       return;
     }
-    const source = new EventSource("/api/live/review-stream?" + new URLSearchParams({
+    const params = new URLSearchParams({
       afterId: String(afterId || 0),
       endId: String(endId),
       speed: String(config.reviewSpeed),
       window: String(config.window),
       ...visibilityParams(config),
-    }).toString());
+      ...encodingParams(),
+    });
+    if (state.reviewSessionId) {
+      params.set("session", state.reviewSessionId);
+    }
+    const source = new EventSource("/api/live/review-stream?" + params.toString());
     state.source = source;
     source.onopen = function () {
       state.streamConnected = true;
@@ -5346,7 +5556,7 @@
       status("Review replay connected.", false);
     };
     source.onmessage = function (event) {
-      const payload = JSON.parse(event.data);
+      const payload = decodePayload(JSON.parse(event.data));
       state.lastMetrics = payload;
       const changed = applyStreamPayload(payload);
       renderMeta();
@@ -5359,6 +5569,13 @@
         status("Review reached the current end snapshot.", false);
       }
     };
+    source.addEventListener("heartbeat", function (event) {
+      const payload = decodePayload(JSON.parse(event.data));
+      state.lastMetrics = payload;
+      // Heartbeats carry the shared session state, so pauses from other tabs show up here too.
+      renderReviewSession(payload.review);
+      renderPerf();
+    });
     source.onerror = function () {
       const reachedEnd = state.reviewEndId && state.rangeLastId != null && Number(state.rangeLastId) >= Number(state.reviewEndId);
       state.streamConnected = false;
@@ -5382,7 +5599,7 @@
       return;
     }
     const limit = Math.max(25, Math.min(500, Math.round(100 * config.reviewSpeed)));
-    const payload = await fetchJson(nextUrl(config, state.rangeLastId, state.reviewEndId, limit));
+    const payload = decodePayload(await fetchJson(nextUrl(config, state.rangeLastId, state.reviewEndId, limit)));
     state.lastMetrics = payload.metrics || null;
     const appended = dedupeAppend(payload.rows || []);
     const mavgChanged = mergeMavgPoints(payload.mavgPoints || [], payload.mavgCursorId);
@@ -5437,7 +5654,7 @@
       await resumeRunIfNeeded();
       return;
     }
-    const payload = await fetchJson(previousUrl(config, limit));
+    const payload = decodePayload(await fetchJson(previousUrl(config, limit)));
     state.lastMetrics = payload.metrics || null;
     if (Object.prototype.hasOwnProperty.call(payload || {}, "rect")) {
       applyPaperPayload(payload.rect || null);
@@ -5564,6 +5781,10 @@
     setSegment(elements.reviewSpeedToggle, value);
     writeQuery();
     if (currentConfig().mode === "review" && currentConfig().run === "run") {
+      if (state.source && state.streamConnected && state.reviewSessionId) {
+        controlReviewSession({ action: "speed", speed: Number(value) }, "Review speed change failed.");
+        return;
+      }
       clearActivity();
       resumeRunIfNeeded();
     }
@@ -5584,6 +5805,17 @@
   elements.sidebarBackdrop.addEventListener("click", function () {
     setSidebarCollapsed(true);
   });
+  elements.reviewPauseButton.addEventListener("click", function () {
+    controlReviewSession({ action: state.reviewPaused ? "resume" : "pause" }, "Review pause failed.");
+  });
+  elements.reviewSeekButton.addEventListener("click", function () {
+    const tickId = Number.parseInt(elements.reviewSeekId.value, 10);
+    if (!Number.isFinite(tickId) || tickId < 1) {
+      status("Enter a tick id to seek the review to.", true);
+      return;
+    }
+    controlReviewSession({ action: "seek", tickId: tickId }, "Review seek failed.");
+  });
   elements.applyButton.addEventListener("click", function () {
     loadAll(true);
   });
@@ -4,8 +4,13 @@
     activeTable: null,
     running: false,
     exporting: false,
+    job: null,
+    jobPages: {},
   };
 
+  const JOB_POLL_MS = 400;
+  const JOB_PAGE_ROWS = 500;
+
   const elements = {
     connectionMeta: document.getElementById("connectionMeta"),
     tableFilter: document.getElementById("tableFilter"),
@@ -13,7 +18,9 @@
     publicTableList: document.getElementById("publicTableList"),
     editor: document.getElementById("sqlEditor"),
     exportFilename: document.getElementById("exportFilename"),
+    exportCompression: document.getElementById("exportCompression"),
     exportButton: document.getElementById("exportCsvButton"),
+    streamButton: document.getElementById("streamCsvButton"),
     runButton: document.getElementById("runQueryButton"),
     status: document.getElementById("queryStatus"),
     resultsMeta: document.getElementById("resultsMeta"),
@@ -69,9 +76,12 @@
 
   function syncActionControls() {
     const busy = state.running || state.exporting;
-    elements.runButton.disabled = busy;
+    elements.runButton.disabled = state.exporting || Boolean(state.job && state.job.cancelRequested);
+    elements.runButton.textContent = state.running ? "Cancel" : "Run";
     elements.exportButton.disabled = busy;
+    elements.streamButton.disabled = busy;
     elements.exportFilename.disabled = busy;
+    elements.exportCompression.disabled = busy;
   }
 
   function errorMessage(error) {
@@ -214,6 +224,15 @@
       ].join("");
     }
 
+    const offset = result.offset || 0;
+    const total = result.rowCount == null ? rows.length : result.rowCount;
+    const pager = total > rows.length ? [
+      "<span class=\"sql-result-pager\">",
+      "<button class=\"ghost-button compact-button\" type=\"button\" data-page-index=\"", escapeHtml(result.index), "\" data-page-offset=\"", escapeHtml(Math.max(0, offset - (result.limit || rows.length))), "\"", offset > 0 ? "" : " disabled", ">Prev</button>",
+      " ", escapeHtml(offset + 1), "-", escapeHtml(offset + rows.length), " ",
+      "<button class=\"ghost-button compact-button\" type=\"button\" data-page-index=\"", escapeHtml(result.index), "\" data-page-offset=\"", escapeHtml(offset + rows.length), "\"", offset + rows.length < total ? "" : " disabled", ">Next</button>",
+      "</span>",
+    ].join("") : "";
     const head = columns.map((column) => "<th>" + escapeHtml(column.name) + "</th>").join("");
     const body = rows.length
       ? rows.map((row) => {
@@ -229,8 +248,9 @@
     return [
       "<section class=\"sql-result-block\">",
       "<div class=\"sql-result-title\">", escapeHtml(result.commandTag || "SQL"),
-      " | ", escapeHtml(result.rowCount == null ? rows.length : result.rowCount), " row(s)",
+      " | ", escapeHtml(total), " row(s)",
       result.truncated ? " | truncated at " + escapeHtml(result.maxRows) : "",
+      pager,
       "</div>",
       "<table class=\"sql-results-table\"><thead><tr>", head, "</tr></thead><tbody>", body, "</tbody></table>",
       "</section>",
@@ -255,6 +275,52 @@
     setStatus("Ready.", null);
   }
 
+  function warningText(warnings) {
+    return warnings.map((warning) => "Statement " + warning.statementIndex + ": " + warning.message).join("\n");
+  }
+
+  function jobProgress(job) {
+    const parts = [job.status === "queued" ? "Queued" : "Running"];
+    if (job.currentIndex) {
+      parts.push("statement " + job.currentIndex + "/" + job.statementCount);
+    }
+    parts.push(job.rowsFetched + " row(s) fetched");
+    parts.push(Math.round((job.elapsedMs || 0) / 100) / 10 + " s");
+    return parts.join(" | ");
+  }
+
+  function sleep(ms) {
+    return new Promise((resolve) => window.setTimeout(resolve, ms));
+  }
+
+  async function loadJobPage(job, index, offset) {
+    const url = "/api/sql/jobs/" + encodeURIComponent(job.jobId) + "/results/" + index + "?offset=" + offset + "&limit=" + JOB_PAGE_ROWS;
+    state.jobPages[index] = await fetchJson(url);
+  }
+
+  function renderJob(job) {
+    const results = job.results.map((result) => state.jobPages[result.index] || result);
+    renderResults({ elapsedMs: job.elapsedMs, statementCount: job.statementCount, results: results });
+  }
+
+  async function finishJob(job) {
+    state.jobPages = {};
+    for (const result of job.results) {
+      if (result.hasResultSet) {
+        await loadJobPage(job, result.index, 0);
+      }
+    }
+    renderJob(job);
+    if (job.status === "done") {
+      setStatus("SQL completed.", "success");
+    } else if (job.status === "cancelled") {
+      elements.resultsMeta.textContent = "Query cancelled.";
+      setStatus("SQL cancelled; the transaction was rolled back.", "error");
+    } else {
+      showRunError({ detail: job.error });
+    }
+  }
+
   async function runQuery() {
     if (state.running || state.exporting) {
       return;
@@ -266,13 +332,30 @@
     }
 
     state.running = true;
+    state.job = null;
     syncActionControls();
     elements.resultsMeta.textContent = "Running SQL...";
-    setStatus("Running SQL...", null);
+    setStatus("Checking query plan...", null);
     try {
-      const payload = await postJson("/api/sql/query", { sql: sql });
-      renderResults(payload);
-      setStatus("SQL completed.", "success");
+      let submitted = await postJson("/api/sql/jobs", { sql: sql });
+      if (submitted.requiresConfirmation) {
+        if (!window.confirm(warningText(submitted.warnings) + "\n\nRun anyway?")) {
+          elements.resultsMeta.textContent = "Query not started.";
+          setStatus("Query not started.", null);
+          return;
+        }
+        submitted = await postJson("/api/sql/jobs", { sql: sql, confirm: true });
+      }
+      let job = submitted.job;
+      state.job = job;
+      while (job.status === "queued" || job.status === "running") {
+        setStatus(jobProgress(job), null);
+        await sleep(JOB_POLL_MS);
+        job = await fetchJson("/api/sql/jobs/" + encodeURIComponent(job.jobId));
+        state.job = job;
+        syncActionControls();
+      }
+      await finishJob(job);
     } catch (error) {
       showRunError(error);
     } finally {
@@ -281,6 +364,32 @@
     }
   }
 
+  async function cancelQuery() {
+    if (!state.job || state.job.cancelRequested) {
+      return;
+    }
+    state.job = Object.assign({}, state.job, { cancelRequested: true });
+    syncActionControls();
+    setStatus("Cancelling...", null);
+    try {
+      await postJson("/api/sql/jobs/" + encodeURIComponent(state.job.jobId) + "/cancel", {});
+    } catch (error) {
+      setStatus(errorMessage(error), "error");
+    }
+  }
+
+  async function showJobPage(index, offset) {
+    if (!state.job || state.running) {
+      return;
+    }
+    try {
+      await loadJobPage(state.job, index, offset);
+      renderJob(state.job);
+    } catch (error) {
+      setStatus(errorMessage(error), "error");
+    }
+  }
+
   async function exportCsv() {
     if (state.running || state.exporting) {
       return;
@@ -291,7 +400,7 @@
       return;
     }
 
-    const payload = { query: query };
+    const payload = { query: query, compression: elements.exportCompression.value };
     const filename = elements.exportFilename.value.trim();
     if (filename) {
       payload.filename = filename;
@@ -321,6 +430,35 @@
     }
   }
 
+  async function streamCsv() {
+    if (state.running || state.exporting) {
+      return;
+    }
+    const query = elements.editor.value.trim();
+    if (!query) {
+      setStatus("SQL text is required.", "error");
+      return;
+    }
+    const payload = { query: query, compression: elements.exportCompression.value };
+    const filename = elements.exportFilename.value.trim();
+    if (filename) {
+      payload.filename = filename;
+    }
+    try {
+      // The SQL goes in the POST body; the download link only carries a short-lived, single-use id.
+      const response = await postJson("/api/sql/export-csv-stream", payload);
+      const link = document.createElement("a");
+      link.href = response.downloadUrl;
+      link.rel = "noopener";
+      document.body.appendChild(link);
+      link.click();
+      link.remove();
+      setStatus("Streaming export started; the browser is downloading it directly.", "success");
+    } catch (error) {
+      setStatus(errorMessage(error), "error");
+    }
+  }
+
   function selectTable(schema, name) {
     const table = allTables().find((candidate) => candidate.schema === schema && candidate.name === name);
     if (!table) {
@@ -333,10 +471,25 @@
   }
 
   elements.exportButton.addEventListener("click", exportCsv);
-  elements.runButton.addEventListener("click", runQuery);
+  elements.streamButton.addEventListener("click", streamCsv);
+  elements.runButton.addEventListener("click", function () {
+    if (state.running) {
+      cancelQuery();
+    } else {
+      runQuery();
+    }
+  });
 
   elements.tableFilter.addEventListener("input", renderTables);
 
+  elements.resultsHost.addEventListener("click", function (event) {
+    const button = event.target.closest("[data-page-index]");
+    if (!button || button.disabled) {
+      return;
+    }
+    showJobPage(Number(button.dataset.pageIndex), Number(button.dataset.pageOffset));
+  });
+
   elements.tableList.addEventListener("click", function (event) {
     const button = event.target.closest(".sql-table-button");
     if (!button) {
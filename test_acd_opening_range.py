@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timedelta
+
+from datavis.acd import AcdOpeningRangeCache, build_acd_payload
+from datavis.brokerday import brokerday_bounds
+
+
+DAY_START, _ = brokerday_bounds(datetime(2026, 3, 3).date())
+
+
+def _tick(tick_id, minutes, bid):
+    return {"id": tick_id, "timestamp": DAY_START + timedelta(minutes=minutes), "bid": bid, "ask": bid + 0.2, "mid": None}
+
+
+class _FakeCursor:
+    def __init__(self, ticks):
+        self.ticks = ticks
+        self.queries = 0
+        self._row = None
+
+    def execute(self, sql, params):
+        self.queries += 1
+        _, after_id, through_id, start, end = params
+        window = [tick for tick in self.ticks if after_id < tick["id"] <= through_id and start <= tick["timestamp"] < end]
+        self._row = {
+            "opening_low": min((tick["bid"] for tick in window), default=None),
+            "opening_high": max((tick["ask"] for tick in window), default=None),
+            "start_tick_id": min((tick["id"] for tick in window), default=None),
+            "end_tick_id": max((tick["id"] for tick in window), default=None),
+            "tick_count": len(window),
+        }
+
+    def fetchone(self):
+        return self._row
+
+
+class AcdOpeningRangeCacheTests(unittest.TestCase):
+    def test_forming_range_folds_new_ticks_then_freezes(self):
+        ticks = [_tick(1, 1, 2900.0), _tick(2, 5, 2905.0)]
+        cursor = _FakeCursor(ticks)
+        cache = AcdOpeningRangeCache(symbol="XAUUSD")
+
+        opening = cache.resolve(cursor, ticks[-1])
+        self.assertEqual((opening.low, opening.high, opening.tick_count), (2900.0, 2905.2, 2))
+        self.assertFalse(opening.final)
+
+        ticks.extend([_tick(3, 20, 2895.0), _tick(4, 31, 2950.0)])
+        opening = cache.resolve(cursor, ticks[-1])
+        self.assertEqual((opening.low, opening.high, opening.tick_count), (2895.0, 2905.2, 3))
+        self.assertEqual((opening.start_tick_id, opening.end_tick_id), (1, 3))
+        self.assertTrue(opening.final)
+
+        queries = cursor.queries
+        ticks.append(_tick(5, 45, 2960.0))
+        payload = build_acd_payload(ticks[-1], cache.resolve(cursor, ticks[-1]))
+        self.assertEqual(cursor.queries, queries)
+        self.assertEqual(payload["direction"], "up")
+        self.assertEqual(payload["tickCount"], 3)
+        self.assertAlmostEqual(payload["levels"]["aUp"], 2905.2 + 5.1)
+
+    def test_repeated_latest_tick_does_not_requery(self):
+        ticks = [_tick(1, 1, 2900.0), _tick(2, 2, 2901.0)]
+        cursor = _FakeCursor(ticks)
+        cache = AcdOpeningRangeCache(symbol="XAUUSD")
+        cache.resolve(cursor, ticks[-1])
+        cache.resolve(cursor, ticks[-1])
+
+        self.assertEqual(cursor.queries, 1)
+
+    def test_flat_range_is_reported_unavailable(self):
+        ticks = [_tick(1, 40, 2900.0)]
+        payload = build_acd_payload(ticks[0], AcdOpeningRangeCache(symbol="XAUUSD").resolve(_FakeCursor(ticks), ticks[0]))
+
+        self.assertFalse(payload["available"])
+        self.assertEqual(payload["brokerDay"], "2026-03-03")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import unittest
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from starlette.requests import Request
+
+from datavis import app
+
+
+def _request(if_none_match: str = "") -> Request:
+    headers = [(b"if-none-match", if_none_match.encode("latin-1"))] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "query_string": b""})
+
+
+class RangeCacheTests(unittest.TestCase):
+    def setUp(self):
+        app.clear_range_cache()
+
+    def tearDown(self):
+        app.clear_range_cache()
+
+    def test_second_request_reuses_serialized_body(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {"rows": [{"id": 1}], "lastId": 1}
+
+        first = app.cached_range_response(_request(), key="k", version="v1", build=build)
+        second = app.cached_range_response(_request(), key="k", version="v1", build=build)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(first.body, second.body)
+        self.assertEqual(json.loads(first.body), {"rows": [{"id": 1}], "lastId": 1})
+        self.assertEqual(first.headers["etag"], second.headers["etag"])
+
+    def test_matching_validator_returns_not_modified(self):
+        response = app.cached_range_response(_request(), key="k", version="v1", build=lambda: {"ok": True})
+        etag = response.headers["etag"]
+
+        cached = app.cached_range_response(_request(etag), key="k", version="v1", build=lambda: self.fail("rebuilt"))
+        changed = app.cached_range_response(_request(etag), key="k", version="v2", build=lambda: {"ok": False})
+
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["etag"], etag)
+
+    def test_missing_version_bypasses_cache(self):
+        payload = app.cached_range_response(_request(), key="k", version=None, build=lambda: {"ok": True})
+
+        self.assertEqual(payload, {"ok": True})
+        self.assertEqual(len(app.RANGE_CACHE), 0)
+
+    def test_cache_is_bounded(self):
+        with patch("datavis.app.RANGE_CACHE_MAX_ENTRIES", 2):
+            for version in ("a", "b", "c"):
+                app.cached_range_response(_request(), key="k", version=version, build=lambda: {"v": version})
+
+        self.assertEqual(len(app.RANGE_CACHE), 2)
+        self.assertNotIn(app.range_cache_etag("k", "a"), app.RANGE_CACHE)
+
+    def test_version_lookup_and_build_share_one_connection(self):
+        opened = []
+        seen = []
+
+        @contextmanager
+        def connection(**kwargs):
+            opened.append(kwargs)
+            yield "conn-{0}".format(len(opened))
+
+        def version(conn, **kwargs):
+            seen.append(("version", conn))
+            return "v1"
+
+        def build(**kwargs):
+            seen.append(("build", kwargs["conn"]))
+            return {"ok": True}
+
+        with patch.object(app, "db_connection", connection), patch.object(app, "tick_range_cache_version", version), patch.object(
+            app, "load_bigpicture_window_payload", build
+        ):
+            app.bigpicture_window(_request(), startTsMs=1000, endTsMs=2000, points=600)
+
+        self.assertEqual(opened, [{"readonly": True}])
+        self.assertEqual(seen, [("version", "conn-1"), ("build", "conn-1")])
+
+        with patch.object(app, "db_connection", connection):
+            with app.readonly_connection("given") as conn:
+                self.assertEqual(conn, "given")
+        self.assertEqual(len(opened), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
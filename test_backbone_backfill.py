@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import csv
+import io
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from datavis import backbone
+from datavis.backbone import BACKBONE_VERSION, DayRef, copy_moves, copy_pivots
+from datavis.backbone_backfill import RebuildJournal, brokerday_range, rebuild_range
+
+
+class _CopyCursor:
+    def __init__(self, sink):
+        self.sink = sink
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def copy_expert(self, sql, file, size=8192):
+        self.sink.append((sql, file.read()))
+
+
+class _CopyConnection:
+    def __init__(self):
+        self.copies = []
+
+    def cursor(self, *args, **kwargs):
+        return _CopyCursor(self.copies)
+
+
+class CopyWriterTests(unittest.TestCase):
+    def test_rows_are_streamed_as_csv_with_nulls_and_full_precision(self):
+        conn = _CopyConnection()
+        ticktime = datetime(2026, 3, 2, 10, 0, 0, 125000, tzinfo=timezone.utc)
+        copy_pivots(
+            conn,
+            [{"dayid": 7, "tickid": 11, "ticktime": ticktime, "price": 2901.1300000000001, "pivottype": "High", "threshold": None, "symbol": "XAUUSD", "source": "adaptivehysteresis"}],
+        )
+        copy_moves(conn, [])
+        self.assertEqual(len(conn.copies), 1)
+        sql, body = conn.copies[0]
+        self.assertIn("COPY public.backbonepivots (dayid, tickid, ticktime, price, pivottype, threshold, symbol, source)", sql)
+        row = next(csv.reader(io.StringIO(body)))
+        self.assertEqual(row, ["7", "11", "2026-03-02 10:00:00.125000+00:00", repr(2901.13), "High", "", "XAUUSD", "adaptivehysteresis"])
+
+
+class RebuildJournalTests(unittest.TestCase):
+    def test_last_entry_per_day_wins_and_version_must_match(self):
+        with tempfile.TemporaryDirectory() as directory:
+            journal = RebuildJournal(Path(directory) / "nested" / "XAUUSD.jsonl")
+            journal.record({"symbol": "XAUUSD", "brokerday": "2026-03-02", "status": "failed", "engineVersion": BACKBONE_VERSION})
+            journal.record({"symbol": "XAUUSD", "brokerday": "2026-03-02", "status": "done", "engineVersion": BACKBONE_VERSION})
+            journal.record({"symbol": "XAUUSD", "brokerday": "2026-03-03", "status": "done", "engineVersion": BACKBONE_VERSION})
+            journal.record({"symbol": "XAUUSD", "brokerday": "2026-03-03", "status": "failed", "engineVersion": BACKBONE_VERSION})
+            journal.record({"symbol": "XAUUSD", "brokerday": "2026-03-04", "status": "done", "engineVersion": BACKBONE_VERSION - 1})
+            journal.record({"symbol": "EURUSD", "brokerday": "2026-03-05", "status": "done", "engineVersion": BACKBONE_VERSION})
+            with journal.path.open("a", encoding="utf-8") as handle:
+                handle.write('{"symbol": "XAUUSD", "brokerday": "2026-03-0')
+            self.assertEqual(journal.completed(symbol="XAUUSD"), {date(2026, 3, 2)})
+
+
+class RebuildRangeTests(unittest.TestCase):
+    def test_days_run_in_a_capped_pool_and_resume_skips_finished_days(self):
+        lock = threading.Lock()
+        active = {"now": 0, "peak": 0}
+        calls = []
+
+        def worker(symbol, brokerday, batch_size):
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+                calls.append(brokerday)
+            try:
+                if brokerday == date(2026, 3, 4):
+                    raise RuntimeError("ticks unavailable")
+                if brokerday.weekday() >= 5:
+                    return {"dayid": None, "brokerday": brokerday, "tickcount": 0, "empty": True, "reason": "no days row"}
+                return {"dayid": brokerday.toordinal(), "tickcount": 10, "pivotcount": 2, "movecount": 1, "elapsedms": 1.0}
+            finally:
+                with lock:
+                    active["now"] -= 1
+
+        with tempfile.TemporaryDirectory() as directory:
+            journal = RebuildJournal(Path(directory) / "journal.jsonl")
+            days = brokerday_range(date(2026, 3, 1), date(2026, 3, 8))
+            results = []
+            summary = rebuild_range(
+                symbol="XAUUSD",
+                brokerdays=days,
+                journal=journal,
+                workers=6,
+                max_connections=2,
+                resume=True,
+                on_result=results.append,
+                executor_factory=lambda size: ThreadPoolExecutor(max_workers=size),
+                worker=worker,
+            )
+            self.assertEqual(summary, {"days": 8, "skipped": 0, "done": 4, "empty": 3, "failed": 1, "workers": 2})
+            self.assertLessEqual(active["peak"], 2)
+            self.assertEqual(len(results), 8)
+            failed = [entry for entry in results if entry["status"] == "failed"]
+            self.assertEqual(failed[0]["brokerday"], "2026-03-04")
+            self.assertIn("ticks unavailable", failed[0]["error"])
+            empty = sorted(entry["brokerday"] for entry in results if entry["status"] == "empty")
+            self.assertEqual(empty, ["2026-03-01", "2026-03-07", "2026-03-08"])
+
+            calls.clear()
+            summary = rebuild_range(
+                symbol="XAUUSD",
+                brokerdays=days,
+                journal=journal,
+                workers=6,
+                max_connections=2,
+                executor_factory=lambda size: ThreadPoolExecutor(max_workers=size),
+                worker=worker,
+            )
+            self.assertEqual(calls, [date(2026, 3, 4)])
+            self.assertEqual(summary["skipped"], 7)
+
+
+class RebuildDayTests(unittest.TestCase):
+    def test_a_day_without_ticks_writes_nothing(self):
+        dayref = DayRef(
+            dayid=7,
+            brokerday=date(2026, 3, 7),
+            starttime=datetime(2026, 3, 6, 22, tzinfo=timezone.utc),
+            endtime=datetime(2026, 3, 7, 22, tzinfo=timezone.utc),
+        )
+        writes = []
+
+        def record(name):
+            return lambda *args, **kwargs: writes.append(name)
+
+        with patch.object(backbone, "fetch_tick_columns_for_day", lambda conn, **kwargs: {}), patch.object(
+            backbone, "tick_input_arrays", lambda **kwargs: SimpleNamespace(rowcount=0)
+        ), patch.multiple(
+            backbone,
+            delete_day=record("delete"),
+            copy_pivots=record("pivots"),
+            copy_moves=record("moves"),
+            upsert_state=record("state"),
+            write_checkpoint=record("checkpoint"),
+            refresh_day_summaries=record("summary"),
+            notify_backbone=record("notify"),
+        ):
+            engine = backbone.BackboneEngine(symbol="XAUUSD", source=backbone.BACKBONE_SOURCE, input_kind="ticks")
+            result = backbone.rebuild_day(None, symbol="XAUUSD", dayref=dayref, backbone_engine=engine)
+
+        self.assertEqual(writes, [])
+        self.assertTrue(result["empty"])
+        self.assertEqual(engine.dayref, dayref)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import math
+import random
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from datavis.backbone import (
+    BACKBONE_SOURCE,
+    BIGBONES_SOURCE,
+    BackboneEngine,
+    DayRef,
+    RollingPercentileWindow,
+    rolling_quantile_series,
+)
+from datavis.brokerday import tick_mid
+
+
+DAYREF = DayRef(
+    dayid=7,
+    brokerday=date(2026, 3, 2),
+    starttime=datetime(2026, 3, 1, 22, tzinfo=timezone.utc),
+    endtime=datetime(2026, 3, 2, 22, tzinfo=timezone.utc),
+)
+
+
+def make_ticks(count, *, seed, gaps=True):
+    generator = random.Random(seed)
+    started = datetime(2026, 3, 1, 22, 5, tzinfo=timezone.utc)
+    price = 2900.0
+    rows = []
+    for index in range(count):
+        price += generator.gauss(0.0, 0.35)
+        bid = Decimal(str(round(price, 2)))
+        ask = bid + Decimal(str(round(generator.uniform(0.1, 0.6), 2)))
+        row = {
+            "id": 1000 + index,
+            "symbol": "XAUUSD",
+            "timestamp": started + timedelta(milliseconds=index * 250),
+            "bid": bid,
+            "ask": ask,
+            "mid": None,
+            "spread": None,
+        }
+        roll = generator.random()
+        if gaps and roll < 0.02:
+            row["bid"] = None
+            row["ask"] = None
+        elif gaps and roll < 0.04:
+            row["spread"] = float("nan")
+        elif gaps and roll < 0.05:
+            row["mid"] = float(bid) + 0.05
+        elif gaps and roll < 0.052:
+            row["id"] = 0
+        rows.append(row)
+    return rows
+
+
+def engine(source=BACKBONE_SOURCE, input_kind="ticks"):
+    item = BackboneEngine(symbol="XAUUSD", source=source, input_kind=input_kind)
+    item.reset(DAYREF)
+    return item
+
+
+def comparable_state(item):
+    row = dict(item.current_state_row())
+    row.pop("updatedat")
+    row["statejson"] = row["statejson"].adapted
+    row["checkpoint"] = item.checkpoint_bytes()
+    return row
+
+
+class BackboneBatchEquivalenceTests(unittest.TestCase):
+    def assert_same(self, streaming, batch, streamed, batched):
+        self.assertEqual(streamed, batched)
+        self.assertEqual(comparable_state(streaming), comparable_state(batch))
+
+    def test_full_day_matches_streaming_engine(self):
+        rows = make_ticks(6000, seed=11)
+        streaming, batch = engine(), engine()
+        streamed = streaming.process_rows(rows)
+        batched = batch.process_batch(rows)
+        self.assertGreater(len(streamed[1]), 10)
+        self.assert_same(streaming, batch, streamed, batched)
+
+        bigbones_streaming = engine(BIGBONES_SOURCE, "backbone_moves")
+        bigbones_batch = engine(BIGBONES_SOURCE, "backbone_moves")
+        self.assert_same(
+            bigbones_streaming,
+            bigbones_batch,
+            bigbones_streaming.process_rows(streamed[1]),
+            bigbones_batch.process_batch(batched[1]),
+        )
+
+    def test_batch_continues_from_streamed_state(self):
+        rows = make_ticks(3000, seed=23)
+        streaming, batch = engine(), engine()
+        for start in range(0, 1700, 400):
+            streaming.process_rows(rows[start : start + 400])
+            batch.process_rows(rows[start : start + 400])
+        self.assert_same(streaming, batch, streaming.process_rows(rows[1700:]), batch.process_batch(rows[1700:]))
+
+    def test_chunked_streaming_matches_when_every_tick_has_a_spread(self):
+        rows = make_ticks(2500, seed=5, gaps=False)
+        streaming, batch = engine(), engine()
+        pivots, moves = [], []
+        for start in range(0, len(rows), 400):
+            chunk_pivots, chunk_moves = streaming.process_rows(rows[start : start + 400])
+            pivots.extend(chunk_pivots)
+            moves.extend(chunk_moves)
+        self.assert_same(streaming, batch, (pivots, moves), batch.process_batch(rows))
+
+    def test_empty_and_unpriced_batches_keep_state(self):
+        streaming, batch = engine(), engine()
+        self.assert_same(streaming, batch, streaming.process_rows([]), batch.process_batch([]))
+        rows = [dict(row, bid=None, ask=None) for row in make_ticks(30, seed=3, gaps=False)]
+        self.assert_same(streaming, batch, streaming.process_rows(rows), batch.process_batch(rows))
+
+
+class MovePriceRangeTests(unittest.TestCase):
+    def test_ranges_match_a_scan_of_the_move_ticks(self):
+        rows = make_ticks(5000, seed=41)
+        streaming, batch = engine(), engine()
+        pivots, moves = [], []
+        for start in range(0, len(rows), 333):
+            chunk_pivots, chunk_moves = streaming.process_rows(rows[start : start + 333])
+            pivots.extend(chunk_pivots)
+            moves.extend(chunk_moves)
+        self.assertEqual(moves, batch.process_batch(rows)[1])
+
+        mids = {row["id"]: tick_mid(row) for row in rows if row["id"] > 0 and tick_mid(row) is not None}
+        for move in moves:
+            prices = [price for tickid, price in mids.items() if move["starttickid"] <= tickid <= move["endtickid"]]
+            self.assertEqual((move["highprice"], move["lowprice"]), (max(prices), min(prices)))
+
+        # BigBones legs span whole backbone moves, so their range covers every child move inside them.
+        bigbones = engine(BIGBONES_SOURCE, "backbone_moves")
+        for move in bigbones.process_batch(moves)[1]:
+            children = [child for child in moves if move["starttickid"] < child["endtickid"] <= move["endtickid"]]
+            self.assertEqual(move["highprice"], max([move["startprice"]] + [child["highprice"] for child in children]))
+            self.assertEqual(move["lowprice"], min([move["startprice"]] + [child["lowprice"] for child in children]))
+
+
+class RollingQuantileSeriesTests(unittest.TestCase):
+    def test_matches_window_including_restored_values(self):
+        generator = random.Random(9)
+        values = [round(generator.uniform(0, 3), 2) for _ in range(900)]
+        window = RollingPercentileWindow(window=50, quantile=0.8, min_periods=5)
+        window.restore(values[:30])
+        expected = [window.add(value) for value in values[30:]]
+        series = rolling_quantile_series(values, start=30, window=50, quantile=0.8, min_periods=5)
+        self.assertEqual([None if math.isnan(value) else value for value in series], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
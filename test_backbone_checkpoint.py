@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import threading
+import unittest
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from datavis import backbone
+from datavis.backbone_runtime import run_worker
+from datavis.backbone import BACKBONE_SOURCE, BIGBONES_SOURCE, CHECKPOINT_HEADER, BackboneEngine, BackboneLiveRuntime
+from test_backbone_batch import DAYREF, comparable_state, engine, make_ticks
+
+
+class BackboneCheckpointTests(unittest.TestCase):
+    def test_restart_from_checkpoint_replays_to_the_same_output(self):
+        rows = make_ticks(3000, seed=31)
+        live = engine()
+        bigbones = engine(BIGBONES_SOURCE, "backbone_moves")
+        checkpoint = bigbones_checkpoint = None
+        emitted_after = []
+        for start in range(0, len(rows), 400):
+            pivots, moves = live.process_rows(rows[start : start + 400])
+            bigbone_pivots, bigbone_moves = bigbones.process_rows(moves)
+            if checkpoint is not None:
+                emitted_after.append((pivots, moves, bigbone_pivots, bigbone_moves))
+            if start == 1200:
+                checkpoint, bigbones_checkpoint = live.checkpoint_bytes(), bigbones.checkpoint_bytes()
+                checkpoint_tickid = live.lastprocessedtickid
+
+        restarted = BackboneEngine(symbol="XAUUSD", source=BACKBONE_SOURCE, input_kind="ticks")
+        restarted_bigbones = BackboneEngine(symbol="XAUUSD", source=BIGBONES_SOURCE, input_kind="backbone_moves")
+        self.assertTrue(restarted.restore_checkpoint(dayref=DAYREF, blob=memoryview(checkpoint)))
+        self.assertTrue(restarted_bigbones.restore_checkpoint(dayref=DAYREF, blob=bigbones_checkpoint))
+        self.assertLessEqual(len(checkpoint), CHECKPOINT_HEADER.size + 8 * backbone.NOISE_WINDOW)
+
+        replay = [row for row in rows if row["id"] > checkpoint_tickid]
+        replayed = []
+        for start in range(0, len(replay), 400):
+            pivots, moves = restarted.process_rows(replay[start : start + 400])
+            replayed.append((pivots, moves) + restarted_bigbones.process_rows(moves))
+        flatten = lambda batches, index: [item for batch in batches for item in batch[index]]
+        for index in range(4):
+            self.assertEqual(flatten(replayed, index), flatten(emitted_after, index))
+        self.assertEqual(comparable_state(restarted), comparable_state(live))
+        self.assertEqual(comparable_state(restarted_bigbones), comparable_state(bigbones))
+        self.assertNotIn("absdeltas", comparable_state(live)["statejson"])
+
+    def test_foreign_or_truncated_blobs_are_rejected(self):
+        item = engine()
+        item.process_rows(make_ticks(300, seed=2))
+        blob = item.checkpoint_bytes()
+        fresh = engine()
+        self.assertFalse(fresh.restore_checkpoint(dayref=DAYREF, blob=None))
+        self.assertFalse(fresh.restore_checkpoint(dayref=DAYREF, blob=blob[:-8]))
+        self.assertFalse(fresh.restore_checkpoint(dayref=DAYREF, blob=b"XXXX" + blob[4:]))
+        with patch.object(backbone, "BACKBONE_VERSION", backbone.BACKBONE_VERSION + 1):
+            self.assertFalse(fresh.restore_checkpoint(dayref=DAYREF, blob=blob))
+
+
+class RuntimeCheckpointCadenceTests(unittest.TestCase):
+    def test_checkpoints_are_throttled_and_skipped_when_nothing_moved(self):
+        runtime = BackboneLiveRuntime(symbol="XAUUSD", checkpoint_seconds=30.0)
+        runtime.backbone_engine.reset(DAYREF)
+        runtime.bigbones_engine.reset(DAYREF)
+        written = []
+        clock = [1000.0]
+        with patch.object(backbone, "write_checkpoint", lambda conn, item: written.append(item.source)), patch.object(
+            backbone.time, "monotonic", lambda: clock[0]
+        ):
+            runtime.backbone_engine.process_rows(make_ticks(10, seed=1))
+            runtime._maybe_checkpoint(None)
+            self.assertEqual(written, [BACKBONE_SOURCE, BIGBONES_SOURCE])
+            runtime.backbone_engine.process_rows(make_ticks(20, seed=1)[10:])
+            clock[0] += 10.0
+            runtime._maybe_checkpoint(None)
+            self.assertEqual(len(written), 2)
+            clock[0] += 25.0
+            runtime._maybe_checkpoint(None)
+            self.assertEqual(len(written), 4)
+            clock[0] += 60.0
+            runtime._maybe_checkpoint(None)
+            self.assertEqual(len(written), 4)
+
+
+class _Conn:
+    def __init__(self, log):
+        self.log = log
+
+    def commit(self):
+        self.log.append("commit")
+
+
+class _Runtime:
+    def __init__(self, log, stop, *, fail_on=None):
+        self.log = log
+        self.stop = stop
+        self.fail_on = fail_on
+        self.polls = 0
+
+    def bootstrap(self, conn):
+        self.log.append("bootstrap")
+
+    def process_once(self, conn):
+        self.polls += 1
+        self.log.append("poll")
+        if self.polls == self.fail_on:
+            raise RuntimeError("poll failed")
+        if self.polls == 2:
+            # SIGTERM lands mid-poll; the poll still commits before the worker stops.
+            self.stop.set()
+        return {"XAUUSD": {"tickcount": 1}}
+
+    def checkpoint(self, conn):
+        self.log.append("checkpoint")
+
+
+class RuntimeShutdownTests(unittest.TestCase):
+    def run_worker(self, log, *, fail_on=None):
+        stop = threading.Event()
+
+        @contextmanager
+        def connect(**kwargs):
+            log.append("connect")
+            yield _Conn(log)
+
+        runtime = _Runtime(log, stop, fail_on=fail_on)
+        run_worker(runtime, poll_seconds=0.01, stop=stop, connect=connect)
+
+    def test_stop_request_checkpoints_only_after_the_current_poll_commits(self):
+        log = []
+        self.run_worker(log)
+        self.assertEqual(log, ["connect", "bootstrap", "commit", "poll", "commit", "poll", "commit", "checkpoint", "commit"])
+
+    def test_a_failed_poll_never_writes_a_checkpoint(self):
+        log = []
+        with self.assertRaises(RuntimeError):
+            self.run_worker(log, fail_on=2)
+        self.assertEqual(log, ["connect", "bootstrap", "commit", "poll", "commit", "poll"])
+
+
+if __name__ == "__main__":
+    unittest.main()
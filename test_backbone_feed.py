@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+import socket
+import threading
+import time
+import unittest
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+from datavis.backbone import BACKBONE_NOTIFY_CHANNEL, DayRef, notify_backbone
+from datavis.backbone_feed import BackboneFeed
+
+
+class _Cursor:
+    def __init__(self, statements):
+        self.statements = statements
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, sql, params=None):
+        self.statements.append((sql, params))
+
+
+class _ListenConnection:
+    """Readable through a socketpair whenever the test queues a notification, like a psycopg2 connection."""
+
+    def __init__(self):
+        self.reader, self.writer = socket.socketpair()
+        self.reader.setblocking(False)
+        self.statements = []
+        self.notifies = []
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def fileno(self):
+        return self.reader.fileno()
+
+    def cursor(self, *args, **kwargs):
+        return _Cursor(self.statements)
+
+    def notify(self, payload):
+        with self._lock:
+            self._pending.append(SimpleNamespace(channel=BACKBONE_NOTIFY_CHANNEL, payload=json.dumps(payload)))
+        self.writer.send(b"x")
+
+    def poll(self):
+        try:
+            self.reader.recv(4096)
+        except BlockingIOError:
+            pass
+        with self._lock:
+            self.notifies.extend(self._pending)
+            self._pending.clear()
+
+    def close(self):
+        self.reader.close()
+        self.writer.close()
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class BackboneFeedTests(unittest.TestCase):
+    def setUp(self):
+        self.conn = _ListenConnection()
+        self.loads = []
+
+        @contextmanager
+        def connect():
+            yield self.conn
+
+        def load(conn, cursor, notifications, wants_ticks):
+            self.loads.append((notifications, wants_ticks))
+            last_id = max([cursor["lastId"]] + [int(item.get("lastTickId") or 0) for item in notifications])
+            if last_id == cursor["lastId"]:
+                return [], cursor
+            return [{"streamMode": "delta", "lastId": last_id}], dict(cursor, lastId=last_id)
+
+        self.feed = BackboneFeed(
+            channel=BACKBONE_NOTIFY_CHANNEL,
+            connect=connect,
+            prime=lambda conn: {"dayId": 7, "lastId": 100},
+            load=load,
+            safety_seconds=60.0,
+            idle_seconds=0.05,
+        )
+
+    def tearDown(self):
+        self.feed.stop()
+        self.conn.close()
+
+    def test_one_load_per_notification_fans_out_to_every_subscriber(self):
+        first, cursor = self.feed.subscribe(wants_ticks=False)
+        second, _ = self.feed.subscribe(wants_ticks=True)
+        self.assertEqual(cursor, {"dayId": 7, "lastId": 100})
+        self.assertEqual(self.conn.statements[0][0], "LISTEN {0}".format(BACKBONE_NOTIFY_CHANNEL))
+
+        self.conn.notify({"dayId": 7, "lastTickId": 140, "reset": False})
+        self.assertEqual(first.get(2.0), {"streamMode": "delta", "lastId": 140})
+        self.assertEqual(second.get(2.0), {"streamMode": "delta", "lastId": 140})
+        self.assertEqual(self.loads, [([{"dayId": 7, "lastTickId": 140, "reset": False}], True)])
+        self.assertEqual(self.feed.cursor()["lastId"], 140)
+
+        # A later subscriber starts from the published cursor and only sees what follows it.
+        third, cursor = self.feed.subscribe(wants_ticks=False)
+        self.assertEqual(cursor["lastId"], 140)
+        self.assertIsNone(third.get(0.05))
+
+    def test_idle_subscribers_cost_no_loads_and_the_listener_exits_when_nobody_is_left(self):
+        subscription, _ = self.feed.subscribe(wants_ticks=False)
+        self.assertIsNone(subscription.get(0.2))
+        self.assertEqual(self.loads, [])
+        self.feed.unsubscribe(subscription)
+        self.assertTrue(wait_until(lambda: self.feed._thread is None))
+
+        # The next subscriber restarts it from the cursor it already had rather than re-priming.
+        subscription, cursor = self.feed.subscribe(wants_ticks=False)
+        self.assertEqual(cursor["lastId"], 100)
+        self.assertEqual(self.loads, [([], False)])
+
+
+class NotifyBackboneTests(unittest.TestCase):
+    def test_payload_is_queued_inside_the_caller_transaction(self):
+        statements = []
+        conn = SimpleNamespace(cursor=lambda *args, **kwargs: _Cursor(statements))
+        dayref = DayRef(
+            dayid=7,
+            brokerday=date(2026, 3, 2),
+            starttime=datetime(2026, 3, 1, 22, tzinfo=timezone.utc),
+            endtime=datetime(2026, 3, 2, 22, tzinfo=timezone.utc),
+        )
+        notify_backbone(conn, symbol="XAUUSD", dayref=dayref, lastprocessedtickid=1234, reset=True)
+        sql, (channel, payload) = statements[0]
+        self.assertEqual(sql, "SELECT pg_notify(%s, %s)")
+        self.assertEqual(channel, BACKBONE_NOTIFY_CHANNEL)
+        self.assertEqual(
+            json.loads(payload),
+            {"symbol": "XAUUSD", "dayId": 7, "brokerday": "2026-03-02", "lastTickId": 1234, "reset": True},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import unittest
+from contextlib import contextmanager
+from datetime import date
+from unittest.mock import patch
+
+from datavis import app, backbone
+from fake_db import RecordingConnection
+
+
+def summary_row(brokerday, *, movecount, avgmovesize, high, low):
+    return {
+        "dayid": brokerday.toordinal(),
+        "brokerday": brokerday,
+        "firstmovetime": None,
+        "lastmovetime": None,
+        "pivotcount": movecount + 1,
+        "movecount": movecount,
+        "upmovecount": movecount // 2,
+        "downmovecount": movecount - movecount // 2,
+        "avgmovesize": avgmovesize,
+        "maxmovesize": avgmovesize * 3 if avgmovesize is not None else None,
+        "avgmoveseconds": 120.0,
+        "avgmoveticks": 40.0,
+        "thresholdp10": 0.5,
+        "thresholdp50": 0.8,
+        "thresholdp90": 1.4,
+        "dayopen": low,
+        "dayhigh": high,
+        "daylow": low,
+        "dayclose": high,
+        "updatedat": None,
+    }
+
+
+def load_overview(rows, **kwargs):
+    conn = RecordingConnection(rows)
+
+    @contextmanager
+    def connection(**_):
+        yield conn
+
+    with patch.object(app, "db_connection", connection):
+        payload = app.load_backbone_overview_payload(**kwargs)
+    return payload, conn.executed
+
+
+class BackboneOverviewTests(unittest.TestCase):
+    def test_overview_reads_only_the_summary_table_and_weights_the_window_totals(self):
+        rows = [
+            summary_row(date(2026, 3, 2), movecount=30, avgmovesize=1.0, high=2910.0, low=2890.0),
+            summary_row(date(2026, 3, 3), movecount=10, avgmovesize=3.0, high=2925.0, low=2900.0),
+            summary_row(date(2026, 3, 4), movecount=0, avgmovesize=None, high=None, low=None),
+        ]
+        payload, executed = load_overview(rows, days=5000, layer="bigbones", end=date(2026, 3, 4))
+
+        self.assertEqual(len(executed), 1)
+        sql, params = executed[0]
+        self.assertIn("public.backbonedaysummary", sql)
+        self.assertNotIn("backbonemoves", sql)
+        self.assertEqual(params, (app.TICK_SYMBOL, app.BIGBONES_SOURCE, date(2026, 3, 4), date(2026, 3, 4), app.MAX_BACKBONE_OVERVIEW_DAYS))
+        self.assertEqual([day["brokerday"] for day in payload["days"]], ["2026-03-02", "2026-03-03", "2026-03-04"])
+        self.assertEqual(payload["days"][0]["thresholdP90"], 1.4)
+        self.assertIsNone(payload["days"][2]["avgMoveSize"])
+        self.assertEqual(
+            payload["summary"],
+            {"dayCount": 3, "moveCount": 40, "movesPerDay": 13.33, "avgMoveSize": 1.5, "high": 2925.0, "low": 2890.0},
+        )
+
+    def test_empty_range_has_no_days_and_null_aggregates(self):
+        payload, executed = load_overview([], days=20, layer="backbone", end=None)
+
+        self.assertEqual(executed[0][1], (app.TICK_SYMBOL, app.BACKBONE_SOURCE, None, None, 20))
+        self.assertEqual(payload["days"], [])
+        self.assertEqual(
+            payload["summary"],
+            {"dayCount": 0, "moveCount": 0, "movesPerDay": None, "avgMoveSize": None, "high": None, "low": None},
+        )
+
+    def test_partially_summarised_range_only_aggregates_the_summarised_days(self):
+        # Five days requested, but only two have been summarised so far (the rest await the backfill).
+        rows = [
+            summary_row(date(2026, 3, 3), movecount=12, avgmovesize=2.0, high=2920.0, low=2895.0),
+            summary_row(date(2026, 3, 6), movecount=4, avgmovesize=6.0, high=2940.0, low=2910.0),
+        ]
+        payload, _ = load_overview(rows, days=5, layer="backbone", end=date(2026, 3, 6))
+
+        self.assertEqual(payload["requestedDays"], 5)
+        self.assertEqual([day["brokerday"] for day in payload["days"]], ["2026-03-03", "2026-03-06"])
+        self.assertEqual(
+            payload["summary"],
+            {"dayCount": 2, "moveCount": 16, "movesPerDay": 8.0, "avgMoveSize": 3.0, "high": 2940.0, "low": 2895.0},
+        )
+
+
+class RefreshDaySummariesTests(unittest.TestCase):
+    def test_refresh_upserts_one_row_per_source_for_the_day(self):
+        conn = RecordingConnection()
+        backbone.refresh_day_summaries(conn, symbol="XAUUSD", dayid=7, brokerday=date(2026, 3, 2), sources=(backbone.BIGBONES_SOURCE,))
+
+        self.assertEqual(len(conn.executed), 1)
+        sql, params = conn.executed[0]
+        self.assertIn("INSERT INTO public.backbonedaysummary", sql)
+        self.assertIn("GROUP BY m.dayid, m.symbol, m.source", sql)
+        self.assertIn("ON CONFLICT (dayid, symbol, source)", sql)
+        self.assertIn("movecount = EXCLUDED.movecount", sql)
+        self.assertEqual(params, {"symbol": "XAUUSD", "brokerday": date(2026, 3, 2), "dayid": 7, "sources": [backbone.BIGBONES_SOURCE]})
+
+    def test_refresh_without_changed_sources_does_not_touch_the_table(self):
+        conn = RecordingConnection()
+        backbone.refresh_day_summaries(conn, symbol="XAUUSD", dayid=7, brokerday=date(2026, 3, 2), sources=())
+        self.assertEqual(conn.executed, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
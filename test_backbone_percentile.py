@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import math
+import random
+import unittest
+
+from datavis.backbone import OrderedMultiset, RollingPercentileWindow
+
+
+def reference_quantile(values, quantile, min_periods):
+    ordered = sorted(values)
+    if len(ordered) < min_periods:
+        return None
+    if len(ordered) == 1:
+        return float(ordered[0])
+    position = (len(ordered) - 1) * quantile
+    lower = int(math.floor(position))
+    upper = int(math.ceil(position))
+    if lower == upper:
+        return float(ordered[lower])
+    return float(ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower))
+
+
+class OrderedMultisetTests(unittest.TestCase):
+    def test_ranks_survive_splits_and_merges(self):
+        generator = random.Random(5)
+        multiset = OrderedMultiset(load=4)
+        shadow = []
+        for step in range(4000):
+            if shadow and generator.random() < 0.45:
+                value = generator.choice(shadow)
+                shadow.remove(value)
+                self.assertTrue(multiset.discard(value))
+            else:
+                value = round(generator.uniform(0, 2), 1)
+                shadow.append(value)
+                multiset.add(value)
+            shadow.sort()
+            self.assertEqual(len(multiset), len(shadow))
+            if shadow:
+                index = generator.randrange(len(shadow))
+                self.assertEqual(multiset[index], shadow[index], step)
+                self.assertEqual(multiset.pair(0, len(shadow) - 1), (shadow[0], shadow[-1]))
+        self.assertFalse(multiset.discard(99.0))
+
+
+class RollingPercentileWindowTests(unittest.TestCase):
+    def test_q80_matches_a_full_sort_across_window_sizes(self):
+        generator = random.Random(17)
+        ticks = [abs(round(generator.gauss(0, 0.12), 2)) for _ in range(3000)]
+        ticks[100:110] = [None, float("nan"), float("inf")] + ticks[103:110]
+        for window in (1, 7, 200, 2500):
+            rolling = RollingPercentileWindow(window=window, quantile=0.80, min_periods=min(20, window))
+            rolling.sorted_values.load = 8
+            seen = []
+            for value in ticks:
+                result = rolling.add(value)
+                if value is not None and math.isfinite(value):
+                    seen.append(value)
+                self.assertEqual(result, reference_quantile(seen[-window:], 0.80, min(20, window)))
+
+    def test_restore_keeps_only_the_window_tail(self):
+        rolling = RollingPercentileWindow(window=3, quantile=0.5, min_periods=1)
+        rolling.restore([9.0, 1.0, 2.0, 3.0])
+        self.assertEqual(list(rolling.values), [1.0, 2.0, 3.0])
+        self.assertEqual(rolling.current(), 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import dataclasses
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+
+from datavis import backbone
+from datavis.backbone import BACKBONE_SOURCE, BackboneEngine, BackboneMultiRuntime, fetch_ticks_after_for_symbols
+from fake_db import RecordingConnection
+from test_backbone_batch import DAYREF, make_ticks
+
+
+DAYREFS = {"XAUUSD": DAYREF, "EURUSD": dataclasses.replace(DAYREF, dayid=8)}
+
+
+def symbol_ticks(symbol, count, seed):
+    return [dict(row, symbol=symbol) for row in make_ticks(count, seed=seed)]
+
+
+class FetchTicksForSymbolsTests(unittest.TestCase):
+    def test_one_statement_carries_every_cursor_and_rows_come_back_per_symbol(self):
+        rows = symbol_ticks("XAUUSD", 2, seed=1) + symbol_ticks("EURUSD", 1, seed=2)
+        conn = RecordingConnection(rows)
+        fetched = fetch_ticks_after_for_symbols(
+            conn, cursors=[("XAUUSD", DAYREF, 10), ("EURUSD", DAYREF, 20), ("GBPUSD", DAYREF, 0)], limit=400
+        )
+        self.assertEqual(len(conn.executed), 1)
+        symbols, starts, ends, after_ids, limit = conn.executed[0][1]
+        self.assertEqual((symbols, after_ids, limit), (["XAUUSD", "EURUSD", "GBPUSD"], [10, 20, 0], 400))
+        self.assertEqual(starts, [DAYREF.starttime] * 3)
+        self.assertEqual({symbol: len(items) for symbol, items in fetched.items()}, {"XAUUSD": 2, "EURUSD": 1, "GBPUSD": 0})
+        self.assertEqual(fetch_ticks_after_for_symbols(conn, cursors=[], limit=400), {})
+        self.assertEqual(len(conn.executed), 1)
+
+
+class BackboneMultiRuntimeTests(unittest.TestCase):
+    def test_one_fetch_and_one_write_group_per_poll_match_separate_engines(self):
+        ticks = {"XAUUSD": symbol_ticks("XAUUSD", 900, seed=3), "EURUSD": symbol_ticks("EURUSD", 600, seed=4)}
+        runtime = BackboneMultiRuntime(symbols=["xauusd", "EURUSD", "XAUUSD"], batch_size=250, checkpoint_seconds=3600.0)
+        self.assertEqual(list(runtime.runtimes), ["XAUUSD", "EURUSD"])
+        for symbol, item in runtime.runtimes.items():
+            item.backbone_engine.reset(DAYREFS[symbol])
+            item.bigbones_engine.reset(DAYREFS[symbol])
+
+        fetches = []
+        written = {"pivots": [], "moves": [], "states": [], "notified": [], "summaries": []}
+
+        def fetch(conn, *, cursors, limit):
+            fetches.append([(symbol, after_id) for symbol, _, after_id in cursors])
+            # Resume after the last processed row in timestamp order, as the real query does.
+            ids = {symbol: [row["id"] for row in rows] for symbol, rows in ticks.items()}
+            return {
+                symbol: ticks[symbol][ids[symbol].index(after_id) + 1 if after_id else 0 :][:limit]
+                for symbol, _, after_id in cursors
+            }
+
+        with patch.object(backbone, "utc_now", lambda: DAYREF.endtime - timedelta(hours=1)), patch.object(
+            backbone, "fetch_ticks_after_for_symbols", fetch
+        ), patch.object(backbone, "insert_pivots", lambda conn, rows: written["pivots"].extend(rows)), patch.object(
+            backbone, "insert_moves", lambda conn, rows: written["moves"].extend(rows)
+        ), patch.object(backbone, "upsert_states", lambda conn, rows: written["states"].append(len(rows))), patch.object(
+            backbone, "notify_backbone", lambda conn, **kwargs: written["notified"].append(kwargs["symbol"])
+        ), patch.object(
+            backbone, "refresh_day_summaries", lambda conn, **kwargs: written["summaries"].append((kwargs["dayid"], kwargs["sources"]))
+        ), patch.object(backbone, "write_checkpoint", lambda conn, engine: None):
+            polls = []
+            while True:
+                results = runtime.process_once(None)
+                polls.append({symbol: result["tickcount"] for symbol, result in results.items()})
+                if not any(polls[-1].values()):
+                    break
+
+        self.assertEqual(
+            polls,
+            [
+                {"XAUUSD": 250, "EURUSD": 250},
+                {"XAUUSD": 250, "EURUSD": 250},
+                {"XAUUSD": 250, "EURUSD": 100},
+                {"XAUUSD": 150, "EURUSD": 0},
+                {"XAUUSD": 0, "EURUSD": 0},
+            ],
+        )
+        self.assertEqual(len(fetches), len(polls))
+        self.assertEqual(fetches[0], [("XAUUSD", 0), ("EURUSD", 0)])
+        self.assertEqual([symbol for symbol, _ in fetches[-1]], ["XAUUSD", "EURUSD"])
+        self.assertEqual(written["states"], [4] * len(polls))
+        self.assertEqual(written["notified"].count("EURUSD"), 3)
+        owners = {dayref.dayid: symbol for symbol, dayref in DAYREFS.items()}
+        self.assertTrue(all(row["symbol"] == owners[row["dayid"]] for row in written["pivots"] + written["moves"]))
+        # Summaries are only recomputed for days and sources whose moves changed in that poll.
+        self.assertTrue(written["summaries"])
+        self.assertTrue(all(sources for _, sources in written["summaries"]))
+        self.assertEqual({dayid for dayid, _ in written["summaries"]}, {7, 8})
+
+        for symbol, rows in ticks.items():
+            dayref = DAYREFS[symbol]
+            expected = BackboneEngine(symbol=symbol, source=BACKBONE_SOURCE, input_kind="ticks")
+            expected.reset(dayref)
+            expected_pivots, expected_moves = expected.process_rows(rows)
+            self.assertTrue(expected_moves)
+            self.assertEqual(
+                [(pivot["tickid"], pivot["pivottype"]) for pivot in expected_pivots],
+                [(pivot["tickid"], pivot["pivottype"]) for pivot in written["pivots"] if pivot["dayid"] == dayref.dayid and pivot["source"] == BACKBONE_SOURCE],
+            )
+            self.assertEqual(
+                [(move["starttickid"], move["endtickid"], move["highprice"]) for move in expected_moves],
+                [(move["starttickid"], move["endtickid"], move["highprice"]) for move in written["moves"] if move["dayid"] == dayref.dayid and move["source"] == BACKBONE_SOURCE],
+            )
+            engine = runtime.runtimes[symbol].backbone_engine
+            self.assertEqual((engine.lastprocessedtickid, engine.current_state_row()["symbol"]), (rows[-1]["id"], symbol))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import dataclasses
+import unittest
+from datetime import date
+
+from datavis.backbone import BACKBONE_SOURCE, DEFAULT_PARAMS, BackboneEngine, prepare_input_arrays
+from datavis.backbone_sweep import SharedDaySet, evaluate_params, parse_grid, run_sweep
+from test_backbone_batch import DAYREF, make_ticks
+
+
+def day_arrays(seed):
+    return prepare_input_arrays(make_ticks(2500, seed=seed), previous_spread=None, input_kind="ticks")
+
+
+class ParseGridTests(unittest.TestCase):
+    def test_cartesian_product_over_defaults(self):
+        param_sets = parse_grid(["spread_weight=0.4,0.6", "noise-window=100,200,300"])
+        self.assertEqual(len(param_sets), 6)
+        self.assertEqual(param_sets[1], dataclasses.replace(DEFAULT_PARAMS, spread_weight=0.4, noise_window=200))
+        self.assertIsInstance(param_sets[0].noise_window, int)
+        self.assertEqual(parse_grid([]), [DEFAULT_PARAMS])
+        with self.assertRaises(ValueError):
+            parse_grid(["bogus=1"])
+
+
+class SweepTests(unittest.TestCase):
+    def test_shared_days_replay_like_the_engine_and_workers_agree(self):
+        days = {date(2026, 3, 2): day_arrays(11), date(2026, 3, 3): day_arrays(12)}
+        param_sets = parse_grid(["delta_q80_weight=2,3", "threshold_smooth_span=20,50"])
+
+        shared = SharedDaySet.create(days)
+        try:
+            brokerday, arrays = next(shared.day_arrays())
+            self.assertEqual(brokerday, date(2026, 3, 2))
+            expected = BackboneEngine(symbol="XAUUSD", source=BACKBONE_SOURCE, input_kind="ticks")
+            expected.reset(DAYREF)
+            expected_moves = expected.process_arrays(days[brokerday])[1]
+            replayed = BackboneEngine(symbol="XAUUSD", source=BACKBONE_SOURCE, input_kind="ticks")
+            replayed.reset(DAYREF)
+            moves = replayed.process_arrays(arrays)[1]
+            self.assertEqual(
+                [(move["starttickid"], move["endtickid"], move["endtime"], move["highprice"]) for move in moves],
+                [(move["starttickid"], move["endtickid"], move["endtime"], move["highprice"]) for move in expected_moves],
+            )
+            in_process = [evaluate_params(shared, params, symbol="XAUUSD") for params in param_sets]
+        finally:
+            shared.close()
+
+        seen = []
+        results = run_sweep(symbol="XAUUSD", days=days, param_sets=param_sets, workers=2, on_result=seen.append)
+        strip = lambda items: [{key: value for key, value in item.items() if key != "elapsedMs"} for item in items]
+        self.assertEqual(strip(results), strip(in_process))
+        self.assertEqual(len(seen), 4)
+        self.assertEqual([result["params"]["delta_q80_weight"] for result in results], [2.0, 2.0, 3.0, 3.0])
+        self.assertEqual(results[0]["days"], 2)
+        self.assertGreater(results[0]["movesPerDay"], results[3]["movesPerDay"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from datavis import app
+from datavis.columnar import decode_columns, encode_columnar_payload, encode_columns, TICK_COLUMNS
+
+
+def _tick_rows(count: int):
+    started = datetime(2026, 3, 2, 0, 0, tzinfo=timezone.utc)
+    rows = []
+    for index in range(count):
+        bid = round(2900.0 + (index % 37) * 0.01 - (index % 11) * 0.03, 2)
+        rows.append(
+            {
+                "id": 1000 + index * 2,
+                "symbol": "XAUUSD",
+                "timestamp": started + timedelta(milliseconds=index * 137),
+                "bid": bid,
+                "ask": round(bid + 0.25, 2),
+            }
+        )
+    return rows
+
+
+class ColumnarEncodingTests(unittest.TestCase):
+    def test_tick_rows_round_trip(self):
+        serialized = app.serialize_tick_rows(_tick_rows(500))
+        decoded = decode_columns(encode_columns(serialized, TICK_COLUMNS))
+
+        for original, restored in zip(serialized, decoded):
+            self.assertEqual({key: value for key, value in original.items() if key != "timestamp"}, restored)
+
+    def test_payload_is_much_smaller_than_row_objects(self):
+        payload = {"rows": app.serialize_tick_rows(_tick_rows(5000)), "lastId": 10998}
+        encoded = encode_columnar_payload(payload)
+
+        self.assertEqual(encoded["encoding"], "columnar")
+        self.assertEqual(encoded["lastId"], 10998)
+        self.assertLess(len(json.dumps(encoded)) * 5, len(json.dumps(payload)))
+
+    def test_mavg_points_and_pivots_fall_back_to_plain_columns(self):
+        payload = {
+            "mavgPoints": [
+                {"valueId": 7, "configId": 1, "tickId": 10, "timestamp": None, "timestampMs": None, "value": 2900.123456789},
+                {"valueId": 8, "configId": 2, "tickId": 10, "timestamp": None, "timestampMs": None, "value": 2900.5},
+            ],
+            "pivotUpdates": [],
+        }
+        encoded = encode_columnar_payload(payload)
+
+        self.assertEqual(encoded["pivotUpdates"], {"count": 0, "columns": encoded["pivotUpdates"]["columns"]})
+        restored = decode_columns(encoded["mavgPoints"])
+        self.assertEqual([item["value"] for item in restored], [2900.123456789, 2900.5])
+        self.assertEqual([item["timestampMs"] for item in restored], [None, None])
+
+    def test_format_sse_encodes_only_when_requested(self):
+        payload = {"rows": app.serialize_tick_rows(_tick_rows(3))}
+
+        self.assertNotIn(b"columns", app.format_sse(payload))
+        self.assertEqual(json.loads(app.format_sse(payload, encoding="columnar")[len(b"data: "):])["encoding"], "columnar")
+
+
+if __name__ == "__main__":
+    unittest.main()
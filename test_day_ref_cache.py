@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
+
+from datavis import backbone
+from datavis.backbone import BackboneLiveRuntime, DayRefCache, DaysTableDescriptor, resolve_day_ref_for_timestamp
+from datavis.brokerday import brokerday_bounds
+
+
+DESCRIPTOR = DaysTableDescriptor(datecol="brokerday", endcol="endtime", startcol="starttime", symbolcol="symbol")
+
+
+class _DaysCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.row = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, sql, params):
+        self.conn.queries += 1
+        timestamp = params[0]
+        self.row = None
+        for row in self.conn.days:
+            if isinstance(timestamp, datetime) and row["starttime"] <= timestamp < row["endtime"]:
+                self.row = row
+            elif row["brokerday"] == timestamp:
+                self.row = row
+
+    def fetchone(self):
+        return self.row
+
+
+class _DaysConnection:
+    def __init__(self, days):
+        self.days = days
+        self.queries = 0
+
+    def cursor(self, *args, **kwargs):
+        return _DaysCursor(self)
+
+
+def day_row(dayid, brokerday):
+    starttime, endtime = brokerday_bounds(brokerday)
+    return {"id": dayid, "brokerday": brokerday, "starttime": starttime, "endtime": endtime}
+
+
+class DayRefCacheTests(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(backbone, "_DAYS_TABLE_DESCRIPTOR", DESCRIPTOR)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_confirmed_days_are_served_from_cache_for_the_whole_brokerday(self):
+        conn = _DaysConnection([day_row(41, date(2026, 3, 2)), day_row(42, date(2026, 3, 3))])
+        cache = DayRefCache()
+        start, end = brokerday_bounds(date(2026, 3, 2))
+        first = resolve_day_ref_for_timestamp(conn, symbol="XAUUSD", timestamp=start + timedelta(hours=1), cache=cache)
+        again = resolve_day_ref_for_timestamp(conn, symbol="XAUUSD", timestamp=end - timedelta(seconds=1), cache=cache)
+        self.assertEqual((first.dayid, again.dayid, conn.queries), (41, 41, 1))
+
+        # Crossing the computed 08:00 Sydney boundary is a new key, not a stale hit.
+        after = resolve_day_ref_for_timestamp(conn, symbol="XAUUSD", timestamp=end, cache=cache)
+        self.assertEqual((after.dayid, conn.queries), (42, 2))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+        cache.invalidate("EURUSD")
+        resolve_day_ref_for_timestamp(conn, symbol="XAUUSD", timestamp=end, cache=cache)
+        self.assertEqual(conn.queries, 2)
+        cache.invalidate("XAUUSD")
+        resolve_day_ref_for_timestamp(conn, symbol="XAUUSD", timestamp=end, cache=cache)
+        self.assertEqual(conn.queries, 3)
+
+    def test_synthetic_fallback_expires_so_a_late_days_row_is_picked_up(self):
+        conn = _DaysConnection([])
+        cache = DayRefCache(provisional_seconds=30.0)
+        timestamp = brokerday_bounds(date(2026, 3, 2))[0] + timedelta(minutes=5)
+        clock = [100.0]
+        with patch.object(backbone.time, "monotonic", lambda: clock[0]):
+            synthetic = resolve_day_ref_for_timestamp(conn, symbol="XAUUSD", timestamp=timestamp, cache=cache)
+            self.assertEqual(synthetic.dayid, 20260302)
+            conn.days.append(day_row(41, date(2026, 3, 2)))
+            resolve_day_ref_for_timestamp(conn, symbol="XAUUSD", timestamp=timestamp, cache=cache)
+            self.assertEqual(conn.queries, 2)
+            clock[0] += 31.0
+            self.assertEqual(resolve_day_ref_for_timestamp(conn, symbol="XAUUSD", timestamp=timestamp, cache=cache).dayid, 41)
+
+    def test_live_runtime_skips_the_lookup_until_its_day_ends(self):
+        runtime = BackboneLiveRuntime(symbol="XAUUSD")
+        starttime, endtime = brokerday_bounds(date(2026, 3, 2))
+        dayref = backbone.DayRef(dayid=41, brokerday=date(2026, 3, 2), starttime=starttime, endtime=endtime)
+        runtime.backbone_engine.reset(dayref)
+        runtime.bigbones_engine.reset(dayref)
+        lookups = []
+        with patch.object(backbone, "resolve_current_day_ref", lambda conn, symbol: lookups.append(symbol)):
+            with patch.object(backbone, "utc_now", lambda: endtime - timedelta(seconds=1)):
+                self.assertIs(runtime.current_dayref(None), dayref)
+            self.assertEqual(lookups, [])
+            with patch.object(backbone, "utc_now", lambda: endtime.astimezone(timezone.utc)):
+                runtime.current_dayref(None)
+            self.assertEqual(lookups, ["XAUUSD"])
+
+
+if __name__ == "__main__":
+    unittest.main()
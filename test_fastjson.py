@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import json
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+
+from datavis import fastjson
+
+
+class FastJsonTests(unittest.TestCase):
+    def test_matches_the_fastapi_encoder_output(self):
+        payload = {
+            "timestamp": datetime(2026, 3, 2, 1, 2, 3, 456000, tzinfo=timezone(timedelta(hours=11))),
+            "naive": datetime(2026, 3, 2, 1, 2, 3),
+            "day": date(2026, 3, 2),
+            "price": Decimal("2900.25"),
+            "raw": b"\x01\xff",
+            "nested": [{"id": 1, "value": None, "ok": True}],
+            "text": "XAU·USD",
+        }
+        expected = jsonable_encoder({key: value for key, value in payload.items() if key != "raw"})
+
+        decoded = json.loads(fastjson.dumps(payload))
+        self.assertEqual({key: value for key, value in decoded.items() if key != "raw"}, expected)
+        self.assertEqual(decoded["raw"], "01ff")
+
+    def test_sse_event_frames_bytes(self):
+        self.assertEqual(fastjson.sse_event({"a": 1}), b'data: {"a":1}\n\n')
+        self.assertEqual(fastjson.sse_event({"a": 1}, event_name="heartbeat"), b'event: heartbeat\ndata: {"a":1}\n\n')
+
+    def test_response_renders_with_the_fast_encoder(self):
+        response = fastjson.FastJSONResponse({"price": Decimal("1.5")})
+        self.assertEqual(response.body, b'{"price":1.5}')
+        self.assertEqual(response.media_type, "application/json")
+
+
+if __name__ == "__main__":
+    unittest.main()
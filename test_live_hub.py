@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import unittest
+
+from datavis import app
+from datavis.live_hub import LiveHub
+
+
+def _tick_payload(first_id: int, count: int):
+    return {
+        "rows": [{"id": first_id + index} for index in range(count)],
+        "structureBarUpdates": [{"id": 1, "endTickId": first_id + count - 1}],
+        "rangeBoxUpdates": [],
+        "structureEvents": [{"id": first_id, "tickId": first_id}],
+        "lastId": first_id + count - 1,
+    }
+
+
+class LiveHubTests(unittest.TestCase):
+    def test_deltas_coalesce_into_one_pending_batch(self):
+        hub = LiveHub(max_pending_items=1000)
+        subscriber = hub.subscribe(["ticks"])
+        hub.publish("ticks", _tick_payload(1, 3))
+        hub.publish("ticks", _tick_payload(4, 2))
+
+        batch = subscriber.drain()
+        self.assertEqual([row["id"] for row in batch["ticks"]["rows"]], [1, 2, 3, 4, 5])
+        self.assertEqual(batch["ticks"]["structureBarUpdates"], [{"id": 1, "endTickId": 5}])
+        self.assertEqual(len(batch["ticks"]["structureEvents"]), 2)
+        self.assertEqual(batch["ticks"]["lastId"], 5)
+        self.assertEqual(subscriber.coalesced, 1)
+        self.assertEqual(subscriber.drain(), {})
+
+    def test_published_payloads_are_not_mutated_by_coalescing(self):
+        hub = LiveHub(max_pending_items=1000)
+        first = hub.subscribe(["ticks"])
+        second = hub.subscribe(["ticks"])
+        payload = _tick_payload(1, 2)
+        hub.publish("ticks", payload)
+        hub.publish("ticks", _tick_payload(3, 2))
+
+        self.assertEqual(len(payload["rows"]), 2)
+        self.assertEqual(len(first.drain()["ticks"]["rows"]), 4)
+        self.assertEqual(len(second.drain()["ticks"]["rows"]), 4)
+
+    def test_slow_subscriber_is_told_to_resync_instead_of_buffering(self):
+        hub = LiveHub(max_pending_items=10)
+        slow = hub.subscribe(["ticks", "mavg"])
+        for first_id in range(1, 40, 4):
+            hub.publish("ticks", _tick_payload(first_id, 4))
+        hub.publish("mavg", {"mavgPoints": [{"valueId": 1}], "mavgCursorId": 1})
+
+        batch = slow.drain()
+        self.assertEqual(batch["ticks"], {"resync": True, "lastId": 40})
+        self.assertEqual(batch["mavg"]["mavgPoints"], [{"valueId": 1}])
+        self.assertEqual(slow.resyncs, 1)
+        self.assertGreater(slow.dropped, 0)
+
+        hub.publish("ticks", _tick_payload(41, 1))
+        self.assertEqual([row["id"] for row in slow.drain()["ticks"]["rows"]], [41])
+
+    def test_state_channels_keep_latest_and_seed_new_subscribers(self):
+        hub = LiveHub()
+        notified = []
+        early = hub.subscribe(["rect", "acd"], notify=lambda: notified.append(1))
+        hub.publish("rect", {"rect": {"id": 1}})
+        hub.publish("rect", {"rect": {"id": 2}})
+        self.assertEqual(hub.publish("rect", {"rect": {"id": 2}}), 0)
+
+        self.assertEqual(early.drain(), {"rect": {"rect": {"id": 2}}})
+        self.assertEqual(len(notified), 2)
+        late = hub.subscribe(["rect", "unknown"])
+        self.assertEqual(late.channels, frozenset({"rect"}))
+        self.assertEqual(late.drain(), {"rect": {"rect": {"id": 2}}})
+
+    def test_wants_tracks_subscriptions(self):
+        hub = LiveHub()
+        subscriber = hub.subscribe(["acd"])
+        self.assertTrue(hub.wants("acd"))
+        self.assertFalse(hub.wants("smart"))
+        hub.unsubscribe(subscriber)
+        self.assertFalse(hub.wants("acd"))
+        self.assertEqual(hub.subscriber_count(), 0)
+
+
+class LiveSocketHelperTests(unittest.TestCase):
+    def test_smart_channel_requires_trade_login(self):
+        self.assertEqual(app.resolve_live_socket_channels(["ticks", "smart", "bogus"], authenticated=False), (["ticks"], ["smart", "bogus"]))
+        self.assertEqual(app.resolve_live_socket_channels(["smart", "smart"], authenticated=True), (["smart"], []))
+
+    def test_batch_honours_visibility_options(self):
+        batch = {"ticks": _tick_payload(1, 2), "acd": {"available": False}}
+        filtered = app.filter_live_socket_batch(batch, {"showTicks": False, "showEvents": False}, encoding="json")
+
+        self.assertEqual(filtered["ticks"]["rows"], [])
+        self.assertEqual(filtered["ticks"]["structureEvents"], [])
+        self.assertEqual(len(filtered["ticks"]["structureBarUpdates"]), 1)
+        self.assertEqual(len(batch["ticks"]["rows"]), 2)
+        self.assertEqual(filtered["acd"], {"available": False})
+
+
+if __name__ == "__main__":
+    unittest.main()
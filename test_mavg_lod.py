@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import random
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import psycopg2.errors
+
+from datavis import mavg
+
+
+START = datetime(2026, 3, 2, tzinfo=timezone.utc)
+
+
+def make_points(count, *, configid=1, step_seconds=7, seed=3):
+    generator = random.Random(seed)
+    value = 2900.0
+    points = []
+    for index in range(count):
+        value += generator.uniform(-1.0, 1.0)
+        points.append(
+            {
+                "id": configid * 1_000_000 + index,
+                "configid": configid,
+                "tickid": 500_000 + index,
+                # Half-second offsets keep points off bucket edges, where the SQL scan's epsilon differs.
+                "ticktime": START + timedelta(seconds=index * step_seconds + 0.5),
+                "value": round(value, 3),
+            }
+        )
+    return points
+
+
+def raw_selection(points, *, start_ts, end_ts, bucket_count):
+    span = (end_ts - start_ts).total_seconds() + 0.000001
+    buckets = {}
+    for point in points:
+        if not start_ts <= point["ticktime"] <= end_ts:
+            continue
+        offset = (point["ticktime"] - start_ts).total_seconds()
+        bucket = min(bucket_count, max(1, int(offset / span * bucket_count) + 1))
+        buckets.setdefault((point["configid"], bucket), []).append(point)
+    selected = set()
+    for members in buckets.values():
+        selected.add(min(members, key=lambda p: (p["ticktime"], p["tickid"]))["id"])
+        selected.add(max(members, key=lambda p: (p["ticktime"], p["tickid"]))["id"])
+        selected.add(min(members, key=lambda p: (p["value"], p["ticktime"], p["tickid"]))["id"])
+        selected.add(min(members, key=lambda p: (-p["value"], p["ticktime"], p["tickid"]))["id"])
+    return selected
+
+
+def lod_rows(buckets, resolution):
+    rows = []
+    for (configid, bucket_resolution, bucketstart), bucket in buckets.items():
+        if bucket_resolution != resolution:
+            continue
+        row = {"configid": configid, "resolutionseconds": resolution, "bucketstart": bucketstart, "valuecount": bucket["valuecount"]}
+        for slot in mavg.LOD_SLOTS:
+            point = bucket[slot]
+            row.update(
+                {
+                    slot + "valueid": point["id"],
+                    slot + "tickid": point["tickid"],
+                    slot + "ticktime": point["ticktime"],
+                    slot + "value": point["value"],
+                }
+            )
+        rows.append(row)
+    return rows
+
+
+class _Cursor:
+    def __init__(self, *, lod_error=None, raw_rows=()):
+        self.connection = type("Conn", (), {"autocommit": False})()
+        self.statements = []
+        self._lod_error = lod_error
+        self._raw_rows = list(raw_rows)
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, sql, params=None):
+        self.statements.append(" ".join(sql.split())[:40])
+        if "FROM public.mavglod" in sql and self._lod_error is not None:
+            raise self._lod_error
+        self._rows = self._raw_rows if "width_bucket" in sql else []
+
+    def fetchall(self):
+        return self._rows
+
+
+class MavgLodTests(unittest.TestCase):
+    def test_batches_fold_to_the_same_buckets_as_one_pass(self):
+        points = make_points(3000)
+        whole = mavg.fold_lod_buckets(points)
+        merged = {}
+        for offset in range(0, len(points), 317):
+            for key, bucket in mavg.fold_lod_buckets(points[offset : offset + 317]).items():
+                if key in merged:
+                    mavg.merge_lod_bucket(merged[key], bucket)
+                else:
+                    merged[key] = bucket
+
+        self.assertEqual(set(merged), set(whole))
+        for key, bucket in whole.items():
+            self.assertEqual(merged[key]["valuecount"], bucket["valuecount"])
+            for slot in mavg.LOD_SLOTS:
+                self.assertEqual(merged[key][slot]["id"], bucket[slot]["id"], (key, slot))
+
+    def test_lod_downsampling_matches_the_bucketed_scan_on_aligned_ranges(self):
+        points = make_points(6000) + make_points(6000, configid=2, seed=9)
+        buckets = mavg.fold_lod_buckets(points)
+        start_ts = START
+        end_ts = START + timedelta(seconds=300 * 120)
+        bucket_count = 120
+        resolution = mavg.lod_resolution_for_range(start_ts, end_ts, bucket_count)
+        self.assertEqual(resolution, 300)
+
+        rows = mavg.downsample_lod_rows(lod_rows(buckets, resolution), start_ts=start_ts, end_ts=end_ts, bucket_count=bucket_count)
+
+        self.assertEqual({row["id"] for row in rows}, raw_selection(points, start_ts=start_ts, end_ts=end_ts, bucket_count=bucket_count))
+        self.assertEqual(rows, sorted(rows, key=lambda row: (row["configid"], row["tickid"])))
+
+    def test_rewritten_values_recompute_their_buckets_instead_of_merging(self):
+        points = [dict(point, id=None) for point in make_points(3)]
+        calls = []
+
+        def execute_values(cur, sql, values, page_size=100, fetch=False):
+            calls.append((sql, list(values)))
+            if fetch:
+                # The second point already existed, so ON CONFLICT rewrote it.
+                return [(10 + index, point["configid"], point["tickid"], index != 1) for index, point in enumerate(points)]
+            return None
+
+        conn = type("Conn", (), {"cursor": lambda self: _Cursor()})()
+        with patch("psycopg2.extras.execute_values", execute_values):
+            mavg.insert_values(conn, points)
+
+        (_, _), (upsert_sql, merged), (recompute_sql, recomputed) = calls
+        self.assertIn("l.valuecount + EXCLUDED.valuecount", upsert_sql)
+        self.assertIn("valuecount = EXCLUDED.valuecount", recompute_sql)
+        self.assertIn("ORDER BY v.value DESC", recompute_sql)
+        rewritten = set(mavg.fold_lod_buckets([dict(points[1], id=11)]))
+        self.assertEqual(set(recomputed), rewritten)
+        self.assertFalse({(row[0], row[1], row[2]) for row in merged} & rewritten)
+        self.assertEqual(
+            {(row[0], row[1], row[2]) for row in merged} | rewritten,
+            set(mavg.fold_lod_buckets([dict(point, id=10 + index) for index, point in enumerate(points)])),
+        )
+
+    def test_short_ranges_use_the_bucketed_scan(self):
+        self.assertIsNone(mavg.lod_resolution_for_range(START, START + timedelta(minutes=5), 600))
+
+    def test_missing_lod_table_falls_back_to_the_bucketed_scan(self):
+        raw = [{"id": 1, "configid": 1, "tickid": 1, "ticktime": START, "value": 1.0}]
+        cur = _Cursor(lod_error=psycopg2.errors.UndefinedTable("relation does not exist"), raw_rows=raw)
+        rows = mavg.query_point_rows_for_time_range(
+            cur,
+            page="big",
+            start_ts=START,
+            end_ts=START + timedelta(days=3),
+            target_points=2400,
+        )
+
+        self.assertEqual(rows, raw)
+        self.assertIn("ROLLBACK TO SAVEPOINT mavg_lod", cur.statements)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import random
+import unittest
+
+from datavis import app
+from datavis.metrics import LatencyHistogram, MetricsRegistry
+
+
+class LatencyHistogramTests(unittest.TestCase):
+    def test_bucket_index_matches_a_sorted_search(self):
+        histogram = LatencyHistogram()
+        generator = random.Random(7)
+        values = [generator.uniform(0, 200) * generator.random() ** 6 for _ in range(5000)]
+        for value in values + histogram.bounds + [0.0, 1e9]:
+            self.assertEqual(histogram._index(value), bisect.bisect_left(histogram.bounds, value), value)
+
+    def test_quantiles_stay_within_one_sub_bucket(self):
+        histogram = LatencyHistogram()
+        for value_ms in range(1, 1001):
+            histogram.observe_ms(value_ms)
+
+        self.assertLessEqual(abs(histogram.quantile(0.5) - 0.5) / 0.5, 0.25)
+        self.assertLessEqual(abs(histogram.quantile(0.99) - 0.99) / 0.99, 0.25)
+        self.assertIsNone(LatencyHistogram().quantile(0.5))
+
+
+class MetricsRegistryTests(unittest.TestCase):
+    def test_prometheus_text_exposition(self):
+        registry = MetricsRegistry(prefix="test")
+        latency = registry.histogram("latency_seconds", "Request latency.", ("route",), lowest=0.001, highest=1.0, sub_buckets=1)
+        requests = registry.counter("requests", "Requests served.", ("route",))
+        registry.gauge("streams", "Open streams.", lambda: {("live",): 2.0}, ("stream",))
+        latency.labels('/api/"x"').observe(0.003)
+        latency.labels('/api/"x"').observe(5.0)
+        requests.labels("/api").inc()
+        self.assertIs(registry.counter("requests", "again", ("route",)), requests)
+
+        lines = registry.render().splitlines()
+        self.assertIn("# TYPE test_latency_seconds histogram", lines)
+        self.assertIn('test_latency_seconds_bucket{route="/api/\\"x\\"",le="0.00390625"} 1', lines)
+        self.assertIn('test_latency_seconds_bucket{route="/api/\\"x\\"",le="1"} 1', lines)
+        self.assertIn('test_latency_seconds_bucket{route="/api/\\"x\\"",le="+Inf"} 2', lines)
+        self.assertIn('test_latency_seconds_count{route="/api/\\"x\\""} 2', lines)
+        self.assertIn('test_requests_total{route="/api"} 1', lines)
+        self.assertIn('test_streams{stream="live"} 2', lines)
+
+    def test_payload_metrics_feed_source_histograms(self):
+        app.serialize_metrics_payload(fetch_ms=12.5, serialize_ms=0.0, latest_row=None, source="metrics_test")
+        fetch = app.DB_FETCH_LATENCY.labels("metrics_test").snapshot()
+        serialize = app.SERIALIZE_LATENCY.labels("metrics_test").snapshot()
+
+        self.assertEqual(fetch[1], 1)
+        self.assertAlmostEqual(fetch[2], 0.0125)
+        self.assertEqual(serialize[1], 0)
+
+    def test_request_latency_middleware_labels_by_route_template_and_passes_the_stream_through(self):
+        route = type("Route", (), {"path": "/api/metrics-test/{day}"})()
+        sent = []
+
+        async def endpoint(scope, receive, send):
+            scope["route"] = route
+            await send({"type": "http.response.start", "status": 204, "headers": []})
+            await send({"type": "http.response.body", "body": b"a", "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+
+        async def failing(scope, receive, send):
+            raise RuntimeError("boom")
+
+        async def send(message):
+            sent.append(message["type"])
+
+        scope = {"type": "http", "method": "GET", "path": "/api/metrics-test/7"}
+        asyncio.run(app.RequestLatencyMiddleware(endpoint)(dict(scope), None, send))
+        with self.assertRaises(RuntimeError):
+            asyncio.run(app.RequestLatencyMiddleware(failing)(dict(scope), None, send))
+
+        self.assertEqual(sent, ["http.response.start", "http.response.body", "http.response.body"])
+        self.assertEqual(app.HTTP_LATENCY.labels("GET", "/api/metrics-test/{day}", 204).snapshot()[1], 1)
+        self.assertEqual(app.HTTP_LATENCY.labels("GET", "unmatched", 500).snapshot()[1], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
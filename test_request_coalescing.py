@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from datavis import app
+
+
+class RequestCoalescingTests(unittest.TestCase):
+    def setUp(self):
+        with app.COALESCE_LOCK:
+            app.COALESCE_INFLIGHT.clear()
+            app.COALESCE_RESULTS.clear()
+
+    def test_concurrent_identical_reads_share_one_build(self):
+        calls = []
+        release = threading.Event()
+
+        def build():
+            calls.append(1)
+            release.wait(2.0)
+            return {"rows": [1, 2, 3]}
+
+        def request():
+            return app.coalesced_json_response(endpoint="test", key="test?a", ttl_seconds=0.0, build=build)
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            futures = [pool.submit(request) for _ in range(6)]
+            time.sleep(0.2)
+            release.set()
+            bodies = {future.result().body for future in futures}
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(bodies, {b'{"rows":[1,2,3]}'})
+        self.assertEqual(app.COALESCE_RESULTS, {})
+
+    def test_latest_results_are_reused_within_ttl(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {"n": len(calls)}
+
+        first = app.coalesced_json_response(endpoint="test", key="test?b", ttl_seconds=60.0, build=build)
+        second = app.coalesced_json_response(endpoint="test", key="test?b", ttl_seconds=60.0, build=build)
+        other = app.coalesced_json_response(endpoint="test", key="test?c", ttl_seconds=60.0, build=build)
+
+        self.assertEqual(first.body, second.body)
+        self.assertEqual(json.loads(other.body), {"n": 2})
+
+    def test_errors_reach_every_waiter_and_are_not_cached(self):
+        def build():
+            raise app.HTTPException(status_code=503, detail="db down")
+
+        with self.assertRaises(app.HTTPException):
+            app.coalesced_json_response(endpoint="test", key="test?d", ttl_seconds=60.0, build=build)
+        response = app.coalesced_json_response(endpoint="test", key="test?d", ttl_seconds=60.0, build=lambda: {"ok": True})
+        self.assertEqual(json.loads(response.body), {"ok": True})
+
+    def test_keys_ignore_parameter_order(self):
+        self.assertEqual(app.coalesce_key("live", mode="live", id=None), app.coalesce_key("live", id=None, mode="live"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import threading
+import unittest
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from datavis import app
+from datavis.review_playback import ReviewPlaybackRegistry, ReviewPlaybackSession, ReviewTimeline
+from datavis.structure import replay_ticks
+
+
+STARTED = datetime(2026, 3, 2, tzinfo=timezone.utc)
+
+
+def _ticks(count: int, *, first_id: int = 1, step_ms: int = 10):
+    rows = []
+    for index in range(count):
+        bid = round(2900.0 + ((index * 7) % 23 - 11) * 0.05, 2)
+        rows.append(
+            {
+                "id": first_id + index,
+                "symbol": "XAUUSD",
+                "timestamp": STARTED + timedelta(milliseconds=index * step_ms),
+                "bid": bid,
+                "ask": round(bid + 0.2, 2),
+                "mid": None,
+                "spread": None,
+            }
+        )
+    return rows
+
+
+class _Loader:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = 0
+
+    def __call__(self, after_id, end_id, limit):
+        self.calls += 1
+        chunk = [row for row in self.rows if after_id < row["id"] <= end_id][:limit]
+        mavg = [
+            {"id": 10000 + row["id"], "configid": 1, "tickid": row["id"], "ticktime": row["timestamp"], "value": row["bid"]}
+            for row in chunk
+            if row["id"] % 5 == 0
+        ]
+        return chunk, mavg
+
+
+def _session(rows, *, seed=(), speed=1.0, chunk_size=50, retain_ticks=500, on_tick=None, loader=None):
+    loader = loader or _Loader(rows)
+    session = ReviewPlaybackSession(
+        session_id="test",
+        symbol="XAUUSD",
+        after_id=rows[0]["id"] - 1,
+        end_id=rows[-1]["id"],
+        seed_rows=list(seed),
+        load_chunk=loader,
+        on_tick=on_tick,
+        retain_ticks=retain_ticks,
+        chunk_size=chunk_size,
+        max_gap_ms=1500,
+        speed=speed,
+    )
+    return session, loader
+
+
+class ReviewTimelineTests(unittest.TestCase):
+    def test_rows_round_trip_and_gaps_are_capped(self):
+        rows = _ticks(3)
+        rows[2]["timestamp"] = rows[1]["timestamp"] + timedelta(hours=2)
+        timeline = ReviewTimeline(symbol="XAUUSD", max_gap_ms=1500)
+        timeline.append(rows, [])
+
+        self.assertEqual(list(timeline.play_ms), [0.0, 10.0, 1510.0])
+        self.assertEqual(timeline.row(1), rows[1])
+
+
+class ReviewPlaybackSessionTests(unittest.TestCase):
+    def test_fast_playback_streams_everything_from_memory(self):
+        rows = _ticks(300)
+        session, loader = _session(rows, speed=1000.0)
+        subscriber = session.join()
+        received = []
+        mavg = []
+        while True:
+            frame = session.next_frame(subscriber, timeout=2.0, min_interval=0.001)
+            self.assertIsNotNone(frame)
+            received.extend(frame.rows)
+            mavg.extend(frame.mavg_rows)
+            if frame.complete:
+                break
+
+        self.assertEqual([row["id"] for row in received], [row["id"] for row in rows])
+        self.assertEqual([item["tickid"] for item in mavg], [row["id"] for row in rows if row["id"] % 5 == 0])
+        self.assertEqual(loader.calls, 6)
+        self.assertTrue(session.state()["complete"])
+
+    def test_structure_updates_match_replay(self):
+        rows = _ticks(400)
+        session, _ = _session(rows[100:], seed=rows[:100], speed=1000.0)
+        subscriber = session.join()
+        bars = {}
+        while True:
+            frame = session.next_frame(subscriber, timeout=2.0, min_interval=0.001)
+            for bar in frame.structure["bars"]:
+                bars[bar["id"]] = bar
+            if frame.complete:
+                break
+
+        expected = replay_ticks("XAUUSD", rows)["structureBars"]
+        changed = [bar for bar in expected if bar["endTickId"] > 100]
+        self.assertEqual([bars[bar["id"]] for bar in changed], changed)
+
+    def test_pause_stops_emission_and_seek_resets_subscribers(self):
+        rows = _ticks(200)
+        session, _ = _session(rows, speed=1000.0)
+        first = session.join()
+        second = session.join()
+        session.pause()
+        while session.next_frame(first, timeout=0.01, min_interval=0.001) is not None:
+            pass
+        position = session.state()["positionId"]
+        self.assertIsNone(session.next_frame(first, timeout=0.05, min_interval=0.001))
+        self.assertEqual(session.state()["positionId"], position)
+
+        session.seek(150)
+        for subscriber in (first, second):
+            frame = session.next_frame(subscriber, timeout=0.05, min_interval=0.001)
+            self.assertEqual(frame.kind, "seek")
+            self.assertEqual(frame.last_id, 150)
+            self.assertEqual(frame.rows[-1]["id"], 150)
+        self.assertTrue(session.state()["paused"])
+
+    def test_forward_seek_feeds_every_skipped_tick_to_on_tick(self):
+        rows = _ticks(200)
+        played = []
+        session, _ = _session(rows, retain_ticks=20, on_tick=lambda row: played.append(row["id"]))
+        session.pause()
+        session.seek(30)
+        session.seek(180)
+        session.seek(10)
+
+        self.assertEqual(played, list(range(1, 181)))
+        self.assertEqual(session.state()["positionId"], 10)
+
+    def test_chunks_load_without_holding_the_session_lock(self):
+        rows = _ticks(200)
+        probes = []
+
+        class _ProbingLoader(_Loader):
+            def __call__(self, after_id, end_id, limit):
+                if self.calls:
+                    probe = threading.Thread(target=lambda: probes.append(session.state()["loadedTicks"]))
+                    probe.start()
+                    probe.join(1.0)
+                return super().__call__(after_id, end_id, limit)
+
+        session, loader = _session(rows, loader=_ProbingLoader(rows))
+        session.seek(120)
+
+        self.assertEqual(loader.calls, 3)
+        self.assertEqual(probes, [50, 100])
+        self.assertEqual(session.state()["positionId"], 120)
+
+    def test_last_subscriber_leaving_pauses_until_someone_joins(self):
+        rows = _ticks(50)
+        session, _ = _session(rows)
+        subscriber = session.join()
+        session.leave()
+        self.assertTrue(session.state()["paused"])
+        session.join()
+        self.assertFalse(session.state()["paused"])
+        self.assertEqual(subscriber.cursor, 0)
+
+
+class ReviewPlaybackRegistryTests(unittest.TestCase):
+    def test_sessions_are_shared_by_id(self):
+        registry = ReviewPlaybackRegistry(idle_seconds=60)
+        rows = _ticks(10)
+        first, created = registry.get_or_create("a", lambda: _session(rows)[0])
+        second, created_again = registry.get_or_create("a", lambda: self.fail("created twice"))
+
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertIs(first, second)
+        self.assertIs(registry.get("a"), first)
+
+
+class OpenReviewSessionTests(unittest.TestCase):
+    def test_tabs_on_one_range_share_a_session_and_finished_ones_restart(self):
+        rows = _ticks(20)
+        registry = ReviewPlaybackRegistry(idle_seconds=60)
+
+        @contextmanager
+        def connection(**kwargs):
+            yield type("Conn", (), {"cursor": lambda self, **kw: nullcontext()})()
+
+        def open_session(session_id=None, *, fresh=False, speed=1000.0):
+            return app.open_review_session(session_id=session_id, after_id=0, end_id=20, speed=speed, window=50, rect_mode="review", fresh=fresh)
+
+        played = []
+        paper = type("Paper", (), {"process_tick": lambda self, mode, row: played.append(row["id"])})()
+        with patch.object(app, "REVIEW_SESSIONS", registry), patch.object(app, "db_connection", connection), patch.object(
+            app, "load_review_chunk", _Loader(rows)
+        ), patch.object(app, "rect_paper_service", lambda: paper):
+            first = open_session()
+            second = open_session(speed=500.0)
+            private = open_session(fresh=True)
+            self.assertIs(first, second)
+            self.assertEqual(first.state()["speed"], 500.0)
+            self.assertIsNot(private, first)
+            self.assertTrue(private.session_id.startswith(first.session_id + "-"))
+            self.assertIs(open_session(private.session_id), private)
+
+            subscriber = first.join()
+            while not first.next_frame(subscriber, timeout=2.0, min_interval=0.001).complete:
+                pass
+            self.assertTrue(first.finished)
+            replay = open_session(first.session_id)
+            self.assertIs(open_session(), replay)
+
+        self.assertEqual(played, [row["id"] for row in rows])
+        self.assertIsNot(replay, first)
+        self.assertEqual(replay.session_id, first.session_id)
+        self.assertFalse(replay.finished)
+
+if __name__ == "__main__":
+    unittest.main()
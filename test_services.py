@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import sys
+import threading
+import unittest
+
+from datavis import app
+from datavis.services import ServiceRegistry
+
+
+class ServiceRegistryTests(unittest.TestCase):
+    def test_services_are_built_once_on_first_use(self):
+        registry = ServiceRegistry()
+        built = []
+        release = threading.Event()
+
+        def factory():
+            release.wait(1.0)
+            built.append(object())
+            return built[-1]
+
+        registry.register("slow", factory)
+        self.assertFalse(registry.started("slow"))
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get("slow"))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(built), 1)
+        self.assertTrue(all(result is built[0] for result in results))
+        self.assertIn("slow", registry.timings()["services"])
+
+    def test_factories_can_resolve_dependencies_and_stop_in_reverse(self):
+        registry = ServiceRegistry()
+        stopped = []
+        registry.register("gateway", lambda: "gateway", stop=lambda service: stopped.append(service))
+        registry.register("worker", lambda: "worker:" + registry.get("gateway"), stop=lambda service: stopped.append(service))
+
+        self.assertEqual(registry.get("worker"), "worker:gateway")
+        registry.stop_all()
+        self.assertEqual(stopped, ["worker:gateway", "gateway"])
+
+    def test_warm_swallows_factory_errors(self):
+        registry = ServiceRegistry()
+        registry.register("broken", lambda: 1 / 0)
+        registry.register("fine", lambda: "ok")
+        registry.warm(["broken", "fine", "unknown"]).join(2.0)
+
+        self.assertFalse(registry.started("broken"))
+        self.assertTrue(registry.started("fine"))
+
+
+class AppImportTests(unittest.TestCase):
+    def test_importing_the_app_does_not_build_trading_services(self):
+        self.assertFalse(app.SERVICES.started("trade_gateway"))
+        self.assertFalse(app.SERVICES.started("smart_scalp"))
+        self.assertNotIn("datavis.trading", sys.modules)
+        self.assertIn("app_module", app.SERVICES.timings()["phases"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import gzip
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from datavis import app
+
+
+CSV_ROWS = ["id,bid\n"] + ["{0},{1:.2f}\n".format(index, 2900 + index / 100) for index in range(20000)]
+
+
+class _FakeCursor:
+    description = [("id",), ("bid",)]
+
+    def __init__(self):
+        self.rowcount = -1
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, sql, params=None):
+        self.executed.append(sql)
+
+    def copy_expert(self, sql, file, size=8192):
+        self.executed.append(sql)
+        for line in CSV_ROWS:
+            file.write(line)
+        self.rowcount = len(CSV_ROWS) - 1
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.cursors = []
+
+    def cursor(self, *args, **kwargs):
+        cursor = _FakeCursor()
+        self.cursors.append(cursor)
+        return cursor
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class _FakeDbConnection:
+    def __init__(self, *args, **kwargs):
+        self.connection = _FakeConnection()
+
+    def __enter__(self):
+        return self.connection
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class SqlExportCopyTests(unittest.TestCase):
+    def test_sink_batches_and_compresses(self):
+        chunks = []
+        sink = app.SqlExportSink(chunks.append, "gzip")
+        for line in CSV_ROWS:
+            sink.write(line)
+        sink.close()
+
+        self.assertLess(len(chunks), 10)
+        self.assertEqual(gzip.decompress(b"".join(chunks)).decode("utf-8"), "".join(CSV_ROWS))
+        self.assertEqual(sink.bytes_out, sum(len(chunk) for chunk in chunks))
+
+    def test_filenames_keep_compression_suffix(self):
+        self.assertEqual(app.sanitize_sql_export_filename("ticks day.csv.gz", "gzip"), "ticks_day.csv.gz")
+        self.assertEqual(app.sanitize_sql_export_filename("ticks.csv", "zstd"), "ticks.csv.zst")
+        self.assertEqual(app.split_sql_export_filename("ticks.csv.zst"), ("ticks", "zstd"))
+        self.assertEqual(app.split_sql_export_filename("ticks.csv"), ("ticks", "none"))
+
+    def test_copy_export_writes_file_and_metadata(self):
+        with tempfile.TemporaryDirectory() as tmp, patch("datavis.app.SQL_EXPORT_DIR", Path(tmp)), patch("datavis.app.db_connection", _FakeDbConnection):
+            payload = app.export_query_to_csv("select id, bid from public.ticks", "ticks", compression="gzip")
+            export_path = Path(tmp) / "ticks.csv.gz"
+            metadata = json.loads((Path(tmp) / "ticks.json").read_text(encoding="utf-8"))
+            content = gzip.decompress(export_path.read_bytes()).decode("utf-8")
+
+        self.assertEqual(payload["filename"], "ticks.csv.gz")
+        self.assertEqual(payload["rows"], 20000)
+        self.assertEqual(payload["download_url"], "/api/sql/export-csv/ticks.csv.gz")
+        self.assertEqual(content, "".join(CSV_ROWS))
+        self.assertEqual(metadata["engine"], "copy")
+        self.assertEqual(metadata["rowCount"], 20000)
+
+    def test_stream_yields_copy_output(self):
+        with patch("datavis.app.db_connection", _FakeDbConnection):
+            body = app.stream_query_to_csv("select id, bid from public.ticks", filename="ticks.csv")
+            content = b"".join(body).decode("utf-8")
+
+        self.assertEqual(content, "".join(CSV_ROWS))
+
+    def test_stream_ids_are_single_use_and_expire(self):
+        payload = app.QueryExportRequest(query="select id, bid from public.ticks", filename="ticks", compression="gzip")
+        stream_id = app.register_sql_export_stream(payload)
+        self.assertNotIn("select", stream_id)
+        self.assertEqual(app.claim_sql_export_stream(stream_id), payload)
+        self.assertIsNone(app.claim_sql_export_stream(stream_id))
+
+        expired = app.register_sql_export_stream(payload)
+        with patch("datavis.app.time.monotonic", lambda: float("inf")):
+            self.assertIsNone(app.claim_sql_export_stream(expired))
+
+    def test_cursor_engine_rejects_compression(self):
+        with self.assertRaises(app.HTTPException) as ctx:
+            app.export_query_to_csv("select 1", engine="cursor", compression="gzip")
+        self.assertEqual(ctx.exception.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+import time
+import unittest
+from collections import namedtuple
+from pathlib import Path
+
+import psycopg2
+
+from datavis import app
+from datavis.sql_jobs import SqlJobError, SqlJobManager, plan_warnings
+
+
+Column = namedtuple("Column", ["name", "type_code"])
+ROWS = [(index, 2900 + index / 100) for index in range(2500)]
+
+
+class _FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = None
+        self.rowcount = -1
+        self.statusmessage = None
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, sql, params=None):
+        self.connection.executed.append(sql)
+        if sql == "SELECT pg_backend_pid()":
+            self.description = [Column("pg_backend_pid", 23)]
+            self._rows = [(4242,)]
+        elif sql.startswith("SELECT pg_cancel_backend"):
+            self.connection.cancelled.append(params[0])
+        elif sql.startswith("SET LOCAL"):
+            self.description = None
+        elif sql.startswith("select id, bid"):
+            self.connection.started.set()
+            self.connection.release.wait(2.0)
+            self.description = [Column("id", 23), Column("bid", 701)]
+            self._rows = list(ROWS)
+            self.statusmessage = "SELECT {0}".format(len(ROWS))
+        else:
+            self.description = None
+            self.rowcount = 3
+            self.statusmessage = "UPDATE 3"
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size):
+        batch, self._rows = self._rows[:size], self._rows[size:]
+        return batch
+
+
+class _FakeConnection:
+    def __init__(self, *, release=None):
+        self.executed = []
+        self.cancelled = []
+        self.started = threading.Event()
+        self.release = release or threading.Event()
+        self.committed = False
+        self.autocommit = False
+        self.cursor_names = []
+
+    def cursor(self, *args, **kwargs):
+        self.cursor_names.append(kwargs.get("name"))
+        return _FakeCursor(self)
+
+    def set_session(self, **kwargs):
+        pass
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _manager(spill_dir, connections, **kwargs):
+    return SqlJobManager(
+        connect=lambda: connections.pop(0),
+        spill_dir=Path(spill_dir),
+        statement_timeout_ms=1000,
+        lock_timeout_ms=1000,
+        max_result_rows=kwargs.pop("max_result_rows", 10000),
+        cost_warn=1000.0,
+        serialize_value=app.serialize_value,
+        serialize_error=app.serialize_pg_error,
+        **kwargs,
+    )
+
+
+def _wait(manager, job_id):
+    deadline = time.monotonic() + 5.0
+    while time.monotonic() < deadline:
+        summary = manager.summary(job_id)
+        if summary["status"] in {"done", "failed", "cancelled"}:
+            return summary
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+class PlanWarningTests(unittest.TestCase):
+    def test_flags_expensive_plans_and_ticks_seq_scans(self):
+        plan = [
+            {
+                "Plan": {
+                    "Node Type": "Aggregate",
+                    "Total Cost": 250000.0,
+                    "Plans": [{"Node Type": "Parallel Seq Scan", "Relation Name": "ticks", "Plan Rows": 900000}],
+                }
+            }
+        ]
+        warnings = plan_warnings(plan, statement_index=2, cost_warn=1000.0)
+        self.assertEqual([warning["code"] for warning in warnings], ["HIGH_COST", "TICKS_SEQ_SCAN"])
+        self.assertEqual(warnings[1]["planRows"], 900000)
+        self.assertEqual({warning["statementIndex"] for warning in warnings}, {2})
+
+    def test_index_scans_under_threshold_are_quiet(self):
+        plan = [{"Plan": {"Node Type": "Index Scan", "Relation Name": "ticks", "Total Cost": 8.5}}]
+        self.assertEqual(plan_warnings(plan, statement_index=1, cost_warn=1000.0), [])
+
+
+class SqlJobManagerTests(unittest.TestCase):
+    def test_results_spill_to_disk_and_page(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            connection = _FakeConnection()
+            connection.release.set()
+            manager = _manager(tmp, [connection], fetch_batch=700)
+            job = manager.submit(["select id, bid from public.ticks", "update t set x = 1"], ["SELECT", "UPDATE"])
+            summary = _wait(manager, job.job_id)
+
+            self.assertEqual(summary["status"], "done")
+            self.assertEqual(summary["rowsFetched"], len(ROWS))
+            self.assertEqual(summary["results"][0]["rowCount"], len(ROWS))
+            self.assertEqual(summary["results"][1]["rowCount"], 3)
+            self.assertTrue(connection.committed)
+            page = manager.page(job.job_id, 1, offset=1995, limit=10)
+            self.assertEqual(page["rows"], [list(row) for row in ROWS[1995:2005]])
+            tail = manager.page(job.job_id, 1, offset=2490, limit=100)
+            self.assertEqual(len(tail["rows"]), 10)
+            self.assertEqual(manager.page(job.job_id, 2, offset=0, limit=10)["rows"], [])
+
+    def test_queries_stream_through_a_named_cursor_and_commands_stay_client_side(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            connection = _FakeConnection()
+            connection.release.set()
+            manager = _manager(tmp, [connection], fetch_batch=700)
+            job = manager.submit(
+                ["select id, bid from public.ticks", "update t set x = 1", "select id into t2 from public.ticks"],
+                ["SELECT", "UPDATE", "SELECT"],
+            )
+            summary = _wait(manager, job.job_id)
+
+        self.assertEqual(summary["status"], "done")
+        self.assertEqual(connection.cursor_names, [None, "sql_job_{0}_1".format(job.job_id)])
+        self.assertEqual(summary["results"][0]["commandTag"], "SELECT {0}".format(len(ROWS)))
+        self.assertEqual(summary["results"][0]["columns"], [{"name": "id", "typeCode": 23}, {"name": "bid", "typeCode": 701}])
+        self.assertEqual(summary["results"][1]["commandTag"], "UPDATE 3")
+
+    def test_truncates_at_max_rows(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            connection = _FakeConnection()
+            connection.release.set()
+            manager = _manager(tmp, [connection], max_result_rows=1000)
+            job = manager.submit(["select id, bid from public.ticks"], ["SELECT"])
+            result = _wait(manager, job.job_id)["results"][0]
+
+        self.assertEqual(result["rowCount"], 1000)
+        self.assertTrue(result["truncated"])
+
+    def test_cancel_signals_the_backend_and_rolls_back(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            worker = _FakeConnection()
+            control = _FakeConnection()
+            manager = _manager(tmp, [worker, control])
+            job = manager.submit(["select id, bid from public.ticks"], ["SELECT"])
+            self.assertTrue(worker.started.wait(2.0))
+            manager.cancel(job.job_id)
+            worker.release.set()
+            summary = _wait(manager, job.job_id)
+
+        self.assertEqual(summary["status"], "cancelled")
+        self.assertEqual(control.cancelled, [4242])
+        self.assertFalse(worker.committed)
+
+    def test_finished_jobs_are_evicted_with_their_spills(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            connections = [_FakeConnection() for _ in range(3)]
+            for connection in connections:
+                connection.release.set()
+            manager = _manager(tmp, connections, max_jobs=2)
+            first = manager.submit(["select id, bid from public.ticks"], ["SELECT"])
+            _wait(manager, first.job_id)
+            for _ in range(2):
+                _wait(manager, manager.submit(["update t set x = 1"], ["UPDATE"]).job_id)
+
+            with self.assertRaises(SqlJobError) as ctx:
+                manager.get(first.job_id)
+            self.assertEqual(ctx.exception.status_code, 404)
+            self.assertEqual(list(Path(tmp).iterdir()), [])
+
+    def test_failed_statement_reports_error(self):
+        class _Failing(_FakeConnection):
+            def cursor(self, *args, **kwargs):
+                cursor = _FakeCursor(self)
+                original = cursor.execute
+
+                def execute(sql, params=None):
+                    if sql == "bogus":
+                        raise psycopg2.ProgrammingError("syntax error at or near \"bogus\"")
+                    return original(sql, params)
+
+                cursor.execute = execute
+                return cursor
+
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = _manager(tmp, [_Failing()])
+            summary = _wait(manager, manager.submit(["bogus"], ["BOGUS"]).job_id)
+
+        self.assertEqual(summary["status"], "failed")
+        self.assertEqual(summary["error"]["statement"], "bogus")
+
+
+if __name__ == "__main__":
+    unittest.main()
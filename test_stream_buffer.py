@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import unittest
+
+from datavis import app
+from datavis.stream_buffer import SSE_CHANNELS, SseClientBuffer
+
+
+def encode(payload, event_name):
+    return app.format_sse(payload, event_name=event_name)
+
+
+def delta(first_id, count):
+    rows = [{"id": first_id + index, "bid": 1.0} for index in range(count)]
+    return {
+        "rows": rows,
+        "rowCount": len(rows),
+        "structureBarUpdates": [{"id": first_id, "high": first_id}],
+        "rangeBoxUpdates": [],
+        "structureEvents": [],
+        "mavgPoints": [],
+        "lastId": rows[-1]["id"],
+        "streamMode": "delta",
+    }
+
+
+def decode(chunk):
+    return json.loads(chunk.split(b"data: ", 1)[1])
+
+
+def make_buffer(**overrides):
+    options = {
+        "client_id": "test-1",
+        "stream_name": "test",
+        "channel": SSE_CHANNELS["live"],
+        "encode": encode,
+        "coalesce_bytes": 1_000_000,
+        "resync_bytes": 10_000_000,
+        "max_items": 10_000,
+    }
+    options.update(overrides)
+    return SseClientBuffer(**options)
+
+
+class SseClientBufferTests(unittest.TestCase):
+    def test_fast_clients_receive_every_delta(self):
+        buffer = make_buffer()
+        buffer.offer(delta(1, 2))
+        self.assertEqual(decode(buffer.take())["lastId"], 2)
+        buffer.offer(delta(3, 2))
+        self.assertEqual(decode(buffer.take())["streamMode"], "delta")
+        self.assertIsNone(buffer.take())
+
+    def test_slow_clients_get_one_catchup_payload(self):
+        buffer = make_buffer(coalesce_bytes=len(encode(delta(1, 5), None)) * 2)
+        buffer.offer(delta(1, 5))
+        buffer.offer({"rows": [], "streamMode": "heartbeat"}, event_name="heartbeat")
+        buffer.offer(delta(6, 5))
+        buffer.offer(delta(11, 5))
+
+        payload = decode(buffer.take())
+        self.assertIsNone(buffer.take())
+        self.assertEqual(payload["streamMode"], "catchup")
+        self.assertEqual([row["id"] for row in payload["rows"]], list(range(1, 16)))
+        self.assertEqual(payload["rowCount"], 15)
+        self.assertEqual([bar["id"] for bar in payload["structureBarUpdates"]], [1, 6, 11])
+        self.assertEqual(payload["lastId"], 15)
+        self.assertEqual(payload["coalescedEvents"], 3)
+        self.assertEqual(buffer.coalesced, 2)
+
+    def test_clients_too_far_behind_are_told_to_resync(self):
+        buffer = make_buffer(coalesce_bytes=1, max_items=12)
+        self.assertTrue(buffer.offer(delta(1, 5)))
+        self.assertTrue(buffer.offer(delta(6, 5)))
+        self.assertFalse(buffer.offer(delta(11, 5)))
+        self.assertFalse(buffer.offer(delta(16, 5)))
+
+        payload = decode(buffer.take())
+        self.assertEqual(payload["streamMode"], "resync")
+        self.assertTrue(payload["resync"])
+        self.assertEqual(payload["lastId"], 15)
+        self.assertNotIn("rows", payload)
+        self.assertEqual(buffer.resyncs, 1)
+        self.assertIsNone(buffer.take())
+
+    def test_stats_report_buffered_bytes(self):
+        buffer = make_buffer()
+        buffer.offer(delta(1, 3))
+        stats = buffer.stats()
+        self.assertEqual(stats["bufferedBytes"], float(len(encode(delta(1, 3), None))))
+        self.assertEqual(stats["pendingEvents"], 1.0)
+
+
+class BufferedSseTests(unittest.TestCase):
+    def test_stream_drains_and_closes_the_producer(self):
+        closed = []
+
+        def events():
+            try:
+                for index in range(3):
+                    yield delta(index * 2 + 1, 2), None
+            finally:
+                closed.append(True)
+
+        async def collect():
+            return [chunk async for chunk in app.buffered_sse(events(), stream_name="test_stream", channel="live")]
+
+        chunks = asyncio.run(collect())
+        self.assertEqual(decode(chunks[-1])["lastId"], 6)
+        self.assertEqual(sum(len(decode(chunk)["rows"]) for chunk in chunks), 6)
+        self.assertEqual(closed, [True])
+        self.assertEqual(app.SSE_CLIENTS.snapshot(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import random
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from datavis.structure import SharedStructureEngine, StructureEngine, replay_ticks
+
+
+def _ticks(count: int, *, seed: int = 7):
+    rng = random.Random(seed)
+    started = datetime(2026, 3, 2, tzinfo=timezone.utc)
+    price = 2900.0
+    rows = []
+    for index in range(count):
+        price += rng.choice([-0.35, -0.1, 0.0, 0.1, 0.35])
+        rows.append(
+            {
+                "id": 100 + index * 3,
+                "timestamp": started + timedelta(milliseconds=index * 250),
+                "bid": round(price, 2),
+                "ask": round(price + 0.2, 2),
+            }
+        )
+    return rows
+
+
+class SharedStructureEngineTests(unittest.TestCase):
+    def test_incremental_batches_match_full_replay(self):
+        rows = _ticks(2500)
+        shared = SharedStructureEngine("XAUUSD", retain_ticks=10000)
+        shared.reset(rows[:800])
+        for offset in range(800, len(rows), 41):
+            shared.advance(rows[offset:offset + 41])
+
+        self.assertEqual(shared.snapshot(), replay_ticks("XAUUSD", rows))
+
+    def test_updates_after_collapse_to_latest_versions(self):
+        rows = _ticks(600)
+        shared = SharedStructureEngine("XAUUSD", retain_ticks=10000)
+        shared.reset(rows[:300])
+        shared.advance(rows[300:])
+
+        engine = StructureEngine(symbol="XAUUSD")
+        for row in rows[:300]:
+            engine.process_tick(row)
+        expected_bars = {}
+        expected_events = []
+        for row in rows[300:]:
+            delta = engine.process_tick(row)
+            for bar in delta["bars"]:
+                expected_bars[bar["id"]] = bar
+            expected_events.extend(delta["events"])
+
+        updates = shared.updates_after(int(rows[299]["id"]))
+        self.assertEqual({bar["id"]: bar for bar in updates["bars"]}, expected_bars)
+        self.assertEqual(len(updates["bars"]), len(expected_bars))
+        self.assertEqual(updates["events"], expected_events)
+        self.assertEqual(shared.updates_after(int(rows[-1]["id"])), {"bars": [], "rangeBoxes": [], "events": []})
+
+    def test_subscriber_older_than_retained_log_needs_snapshot(self):
+        rows = _ticks(400)
+        shared = SharedStructureEngine("XAUUSD", retain_ticks=100)
+        shared.reset(rows[:50])
+        shared.advance(rows[50:])
+
+        self.assertIsNone(shared.updates_after(int(rows[10]["id"])))
+        self.assertIsNotNone(shared.updates_after(int(rows[-50]["id"])))
+        snapshot = shared.snapshot()
+        self.assertTrue(all(bar["endTickId"] >= rows[-100]["id"] or bar["status"] == "active" for bar in snapshot["structureBars"]))
+
+    def test_windows_between_and_off_tick_ids_match_the_logged_deltas(self):
+        rows = _ticks(700)
+        shared = SharedStructureEngine("XAUUSD", retain_ticks=10000)
+        shared.reset(rows[:100])
+        engine = StructureEngine(symbol="XAUUSD")
+        for row in rows[:100]:
+            engine.process_tick(row)
+        logged = []
+        for offset in range(100, len(rows), 37):
+            shared.advance(rows[offset:offset + 37])
+        for row in rows[100:]:
+            logged.append((row["id"], engine.process_tick(row)))
+
+        # Tick ids step by 3, so +1 bounds fall between logged ids.
+        for after, through in [(rows[150]["id"], rows[420]["id"]), (rows[150]["id"] + 1, rows[420]["id"] + 1), (rows[99]["id"], None), (rows[500]["id"], rows[500]["id"])]:
+            window = [delta for tick_id, delta in logged if tick_id > after and (through is None or tick_id <= through)]
+            updates = shared.updates_after(after, through_tick_id=through)
+            self.assertEqual({bar["id"]: bar for bar in updates["bars"]}, {bar["id"]: bar for delta in window for bar in delta["bars"]})
+            self.assertEqual(updates["events"], [event for delta in window for event in delta["events"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
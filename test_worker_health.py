@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import psycopg2
+
+from datavis.worker_health import WorkerLagTracker, WorkerPosition, query_worker_positions
+
+
+HEAD_TIME = datetime(2026, 3, 2, 12, tzinfo=timezone.utc)
+
+
+class _Cursor:
+    def __init__(self, results):
+        self._results = results
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        for table, rows in self._results.items():
+            if table in sql:
+                if isinstance(rows, Exception):
+                    raise rows
+                self._rows = rows
+                return
+        self._rows = []
+
+    def fetchall(self):
+        return self._rows
+
+
+class WorkerLagTrackerTests(unittest.TestCase):
+    def test_rates_and_catch_up_time_come_from_successive_reads(self):
+        tracker = WorkerLagTracker(lag_warn_ticks=100)
+        tracker.report(head={"id": 10_000, "timestamp": HEAD_TIME}, positions=[WorkerPosition("mavg", 8_000)], now=0.0)
+        report = tracker.report(
+            head={"id": 10_100, "timestamp": HEAD_TIME},
+            positions=[WorkerPosition("mavg", 8_600, last_tick_time=HEAD_TIME - timedelta(seconds=90))],
+            now=10.0,
+        )
+
+        worker = report["workers"][0]
+        self.assertEqual(report["headRatePerSecond"], 10.0)
+        self.assertEqual(worker["lagTicks"], 1_500)
+        self.assertEqual(worker["lagSeconds"], 90.0)
+        self.assertEqual(worker["ratePerSecond"], 60.0)
+        self.assertEqual(worker["etaSeconds"], 30.0)
+        self.assertEqual(worker["state"], "behind")
+        self.assertEqual(report["bottleneck"], "mavg")
+
+    def test_stalled_idle_and_caught_up_workers(self):
+        tracker = WorkerLagTracker(lag_warn_ticks=100)
+        positions = [WorkerPosition("backbone", 5_000), WorkerPosition("motion", 10_000), WorkerPosition("smart_scalp", 1, active=False)]
+        tracker.report(head={"id": 10_000, "timestamp": HEAD_TIME}, positions=positions, now=0.0)
+        report = tracker.report(head={"id": 10_000, "timestamp": HEAD_TIME}, positions=positions, now=5.0)
+
+        states = {worker["name"]: worker["state"] for worker in report["workers"]}
+        self.assertEqual(states, {"backbone": "stalled", "motion": "ok", "smart_scalp": "idle"})
+        self.assertEqual(report["bottleneck"], "backbone")
+        self.assertEqual(report["workers"][1]["etaSeconds"], 0.0)
+
+    def test_a_reset_worker_starts_a_new_rate_history(self):
+        tracker = WorkerLagTracker()
+        tracker.observe("mavg", 500, now=0.0)
+        self.assertEqual(tracker.observe("mavg", 600, now=1.0), 100.0)
+        self.assertIsNone(tracker.observe("mavg", 10, now=2.0))
+
+
+class WorkerPositionQueryTests(unittest.TestCase):
+    def test_missing_state_tables_are_reported_without_hiding_the_rest(self):
+        cur = _Cursor(
+            {
+                "public.mavgstate": [{"configid": 3, "name": "SMA 14m mid", "lasttickid": 90, "lastticktime": None, "updatedat": None}],
+                "public.backbonestate": [
+                    {"source": "adaptivehysteresis", "dayid": 7, "lastprocessedtickid": 95, "updatedat": None},
+                    {"source": "bigbones", "dayid": 7, "lastprocessedtickid": 80, "updatedat": None},
+                ],
+                "public.motionstate": psycopg2.errors.UndefinedTable('relation "public.motionstate" does not exist'),
+            }
+        )
+        positions = {position.name: position for position in query_worker_positions(cur, symbol="XAUUSD")}
+
+        self.assertEqual(positions["mavg"].last_tick_id, 90)
+        self.assertEqual(positions["mavg"].detail["slowestConfigId"], 3)
+        self.assertEqual(positions["backbone:bigbones"].last_tick_id, 80)
+        self.assertEqual(positions["motion"].error, 'relation "public.motionstate" does not exist')
+
+
+if __name__ == "__main__":
+    unittest.main()